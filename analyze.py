@@ -0,0 +1,12 @@
+"""
+Analyze and plot the neuron data of one or more designs.
+
+Usage: python analyze.py optimal|heatmap|behavior|static [--design besrour ...]
+"""
+
+import sys
+
+from neuronsim.analysis.runner import main
+
+if __name__ == "__main__":
+    sys.exit(main())
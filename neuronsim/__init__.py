@@ -0,0 +1,9 @@
+"""
+Simulation and analysis tooling for the 7nm FinFET spiking neuron designs.
+
+The modules in this package drive ngspice from Python (netlist generation,
+parallel parameter sweeps) and hold the design definitions shared by the
+sweep engine and the plotting scripts.
+"""
+
+from .designs import DESIGNS, get_design
@@ -0,0 +1,267 @@
+"""
+Adaptive refinement sweep.
+
+Most of the exhaustive VDD x Cap1 x Cap2 grid lies where the neuron does not
+spike or where the optimization score is close to zero. The adaptive sweep
+simulates a coarse sub-grid first (every ``initial_stride``-th value of each
+axis), scores it with the freq_norm * (1 - energy_norm) metric of the
+analysis scripts, and then halves the stride only where it matters:
+
+- every point whose score is within ``peak_fraction`` of the best score so
+  far gets its full neighbourhood at the finer stride,
+- every pair of neighbours on the spiking / non-spiking boundary (one has
+  Energy_Per_Spike == 0, the other does not) is bisected.
+
+Refinement repeats until the stride is one grid step, so the optimum is
+resolved on the same grid as the exhaustive sweep. The points always come
+from the exhaustive grid, which means their results can be shared with
+full sweeps through the result store.
+
+Example:
+    python -m neuronsim.adaptive --design besrour --workers 24 --store sweeps.db
+"""
+
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .analysis.optimal import optimization_score
+from .designs import RESULT_COLUMNS, VDD_VALUES, get_design, parameter_columns
+
+
+def _axis_lattice(length, stride):
+    # Every stride-th index, always including the last one
+    return sorted(set(range(0, length, stride)) | {length - 1})
+
+
+def score_points(results):
+    """
+    Optimization score of evaluated points.
+
+    Parameters:
+    -----------
+    results : dict
+        Grid index -> (spikes, frequency, energy_per_spike)
+
+    Returns:
+    --------
+    dict
+        Grid index -> score; points without a completed spike score 0
+    """
+    spiking = [(i, v) for i, v in results.items() if v[2] != 0]
+    scores = {i: 0.0 for i in results}
+    if len(spiking) < 2:
+        return scores
+    values = np.array([v for _, v in spiking], dtype=float)
+    score = np.nan_to_num(optimization_score(values[:, 1], values[:, 2]))
+    scores.update({i: float(s) for (i, _), s in zip(spiking, score)})
+    return scores
+
+
+def _neighbours(index, step, shape):
+    for axis in range(len(shape)):
+        for direction in (-1, 1):
+            other = list(index)
+            other[axis] += direction * step
+            if 0 <= other[axis] < shape[axis]:
+                yield tuple(other)
+
+
+def peak_points(results, peak_fraction=0.9):
+    """
+    Points scoring at least peak_fraction times the best score so far.
+    """
+    scores = score_points(results)
+    best = max(scores.values(), default=0.0)
+    if best <= 0:
+        return set()
+    return {i for i, s in scores.items() if s >= peak_fraction * best}
+
+
+def best_point(results):
+    """
+    Grid index of the best-scoring point, None if no point spikes.
+    """
+    scores = score_points(results)
+    best = max(scores, key=scores.get, default=None)
+    if best is None or scores[best] <= 0:
+        return None
+    return best
+
+
+def boundary_midpoints(results, step, shape):
+    """
+    Bisect the spiking / non-spiking boundary.
+
+    Parameters:
+    -----------
+    results : dict
+        Grid index -> (spikes, frequency, energy_per_spike) of evaluated points
+    step : int
+        Current stride; pairs of points this far apart along one axis are
+        checked
+    shape : tuple of int
+        Number of values on each axis
+
+    Returns:
+    --------
+    set of tuple
+        Midpoints of every pair of evaluated neighbours where one spikes and
+        the other does not
+    """
+    half = step // 2
+    midpoints = set()
+    if half == 0:
+        return midpoints
+    for index, values in results.items():
+        spiking = values[2] != 0
+        for other in _neighbours(index, step, shape):
+            if other > index and other in results and (results[other][2] != 0) != spiking:
+                midpoints.add(tuple(i + (o - i) // 2 for i, o in zip(index, other)))
+    return midpoints
+
+
+def refine_around(targets, step, shape):
+    """
+    Grid indices at half the stride surrounding every target point.
+    """
+    half = max(step // 2, 1)
+    offsets = list(itertools.product((-half, 0, half), repeat=len(shape)))
+    new = set()
+    for index in targets:
+        for offset in offsets:
+            point = tuple(i + o for i, o in zip(index, offset))
+            if all(0 <= p < n for p, n in zip(point, shape)):
+                new.add(point)
+    return new
+
+
+def adaptive_sweep(design, evaluate=None, vdd_values=None, cap_values=None, initial_stride=8,
+                   peak_fraction=0.9, refine_boundary=True, **sweep_options):
+    """
+    Sweep a design's grid adaptively around the score peak and spiking boundary.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    evaluate : callable, optional
+        evaluate(points) -> DataFrame of sweep rows for a list of grid
+        points; runs neuronsim.sweep.run_sweep() with sweep_options by default
+    vdd_values, cap_values : list of float, optional
+        Axes of the exhaustive grid, the design's sweep axes by default
+    initial_stride : int
+        Stride of the coarse grid, in grid steps; halved at every level
+    peak_fraction : float
+        Score threshold (relative to the best score) for refinement
+    refine_boundary : bool
+        Refine the spiking / non-spiking boundary as well
+    **sweep_options
+        Passed to run_sweep() (workers, simulator, settings, store, ...)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Every simulated point in grid order, with the sweep-table columns
+    """
+    design_def = get_design(design)
+    columns = parameter_columns(design_def)
+    axes = [list(vdd_values or VDD_VALUES)] + \
+           [list(cap_values or design_def['cap_values'])] * (len(columns) - 1)
+    shape = tuple(len(a) for a in axes)
+
+    if evaluate is None:
+        from .sweep import run_sweep
+
+        def evaluate(points):
+            return run_sweep(design, points=points, **sweep_options)
+
+    def point_of(index):
+        return dict(zip(columns, (axis[i] for axis, i in zip(axes, index))))
+
+    results = {}
+
+    def simulate(indices):
+        indices = sorted(i for i in indices if i not in results)
+        if not indices:
+            return 0
+        df = evaluate([point_of(i) for i in indices])
+        found = {tuple(row[:len(columns)]): tuple(row[len(columns):])
+                 for row in df[columns + RESULT_COLUMNS].itertuples(index=False)}
+        for index in indices:
+            key = tuple(point_of(index)[c] for c in columns)
+            if key in found:
+                results[index] = found[key]
+        return len(indices)
+
+    step = max(int(initial_stride), 1)
+    coarse = set(itertools.product(*(_axis_lattice(n, step) for n in shape)))
+    simulated = simulate(coarse)
+    print(f"Coarse grid (stride {step}): {simulated} points")
+
+    while step > 1:
+        targets = peak_points(results, peak_fraction)
+        new = refine_around(targets, step, shape)
+        if refine_boundary:
+            new |= boundary_midpoints(results, step, shape)
+        step //= 2
+        simulated = simulate(new)
+        print(f"Stride {step}: refined around {len(targets)} peak points, {simulated} new points")
+
+    # Final polish: make sure every neighbour of the best point is known
+    best = best_point(results)
+    if best is not None:
+        simulate(refine_around({best}, 2, shape))
+
+    total = int(np.prod(shape))
+    print(f"Simulated {len(results)} of {total} grid points "
+          f"({total / max(len(results), 1):.1f}x fewer than the exhaustive grid)")
+
+    rows = [[point_of(i)[c] for c in columns] + list(results[i]) for i in sorted(results)]
+    df = pd.DataFrame(rows, columns=columns + RESULT_COLUMNS)
+    df['Spikes'] = df['Spikes'].astype(int)
+    best = best_point(results)
+    if best is None:
+        print("Best point: none, no spiking points")
+    else:
+        print("Best point: " + ', '.join(f"{c}={point_of(best)[c]:g}" for c in columns) +
+              f" (score {score_points(results)[best]:.3f})")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Adaptive sweep refined around the score peak.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent ngspice processes')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltage axis')
+    parser.add_argument('--caps', type=float, nargs='+', default=None, help='capacitor axis')
+    parser.add_argument('--initial-stride', type=int, default=8, help='coarse grid stride (default: 8)')
+    parser.add_argument('--peak-fraction', type=float, default=0.9,
+                        help='refine points scoring above this fraction of the best (default: 0.9)')
+    parser.add_argument('--no-boundary', action='store_true',
+                        help='do not refine the spiking / non-spiking boundary')
+    parser.add_argument('--store', default=None, help='SQLite result store shared with full sweeps')
+    parser.add_argument('-o', '--output', default=None, help='table of the simulated points')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+
+    df = adaptive_sweep(args.design.lower(), vdd_values=args.vdd, cap_values=args.caps,
+                        initial_stride=args.initial_stride, peak_fraction=args.peak_fraction,
+                        refine_boundary=not args.no_boundary, workers=args.workers,
+                        simulator=simulator, store=args.store)
+    if args.output:
+        from .sweep import write_table
+        write_table(df, args.output)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
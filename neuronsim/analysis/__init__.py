@@ -0,0 +1,15 @@
+"""
+Analysis and plotting of the neuron sweep, behavior and static power data.
+
+One implementation of each plot serves all three designs; the scripts in
+the per-design data directories are thin wrappers around it. Run
+``python analyze.py <analysis> --design ...`` (or
+``python -m neuronsim.analysis``) to analyze several designs at once.
+"""
+
+from .behavior import plot_multiple_files
+from .compare import compare_designs
+from .heatmaps import analyze_cap_sweep, create_combined_heatmaps, load_and_process_data
+from .optimal import analyze_voltage_sweeps, optimization_score, summarize_sweep
+from .static import plot_static_power, read_power_data
+from .units import get_si_prefix, get_si_prefix_for_range
@@ -0,0 +1,126 @@
+"""
+Transient behavior plots: stacked node voltages of one simulation.
+"""
+
+import numpy as np
+
+from ..waveforms import load_waveform
+
+
+def load_node_voltage(filename, node=None):
+    """
+    Load time (ns) and one node voltage from a behavior data file.
+
+    Parameters:
+    -----------
+    filename : str
+        wrdata text file (``time time v(node)``) or ngspice .raw file
+    node : str, optional
+        Node name, e.g. 'net4'; defaults to the first voltage in the file
+
+    Returns:
+    --------
+    tuple : (time_ns, voltage)
+    """
+    vectors = load_waveform(filename)
+    if node is None:
+        name = next(n for n in vectors if n != 'time')
+    else:
+        name = f'v({node.lower()})'
+    return vectors['time'] * 1e9, vectors[name]
+
+
+def plot_multiple_files(filenames, ylabels, style_params=None, nodes=None):
+    """
+    Plot data from multiple files with responsive sizing and streamlined labels.
+    The plots will automatically adjust to window size and only show the x-axis
+    label on the bottom plot.
+
+    Parameters:
+    -----------
+    filenames : list
+        List of paths to the data files, one subplot each from top to bottom
+    ylabels : list of str
+        Y-axis label of each subplot
+    style_params : dict
+        Dictionary containing all styling parameters; 'show' (default True)
+        opens the plot window
+    nodes : list of str, optional
+        Node plotted from each file; the first voltage in the file by default
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import ScalarFormatter
+
+    if style_params is None:
+        style_params = {}
+    if nodes is None:
+        nodes = [None] * len(filenames)
+
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+
+    # constrained_layout helps with automatic sizing and spacing
+    fig = plt.figure(constrained_layout=True)
+    gs = fig.add_gridspec(len(filenames), 1)
+    axes = [fig.add_subplot(gs[i, 0]) for i in range(len(filenames))]
+
+    colors = style_params.get('colors', plt.cm.Set2(np.linspace(0, 1, len(filenames))))
+
+    for idx, (filename, node, ax, color) in enumerate(zip(filenames, nodes, axes, colors)):
+        time_ns, voltage = load_node_voltage(filename, node)
+
+        ax.plot(
+            time_ns,
+            voltage,
+            linewidth=style_params.get('line_width', 2),
+            marker=style_params.get('marker', ''),
+            color=color
+        )
+
+        if style_params.get('grid', True):
+            ax.grid(
+                True,
+                linestyle=style_params.get('grid_style', '--'),
+                alpha=style_params.get('grid_alpha', 0.7)
+            )
+
+        formatter = ScalarFormatter(useOffset=False)
+        formatter.set_scientific(False)
+        ax.xaxis.set_major_formatter(formatter)
+
+        ax.tick_params(labelsize=style_params.get('tick_size', 10))
+        for label in ax.get_xticklabels() + ax.get_yticklabels():
+            label.set_fontweight('bold')
+
+        ax.set_xlim(
+            style_params.get('xlim_min', 0),
+            style_params.get('xlim_max', 30)
+        )
+
+        # Only the bottom plot gets an x-axis label
+        if idx != len(filenames) - 1:
+            ax.set_xticklabels([])
+            ax.set_xlabel('')
+        else:
+            ax.set_xlabel(
+                style_params.get('xlabel', 'Time (ns)'),
+                fontsize=style_params.get('label_size', 12),
+                fontweight='bold'
+            )
+
+        ax.set_ylabel(
+            ylabels[idx],
+            fontsize=style_params.get('label_size', 12),
+            fontweight='bold'
+        )
+
+    if 'output_path' in style_params:
+        plt.savefig(
+            style_params['output_path'],
+            dpi=style_params.get('dpi', 300),
+            bbox_inches='tight'
+        )
+
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close(fig)
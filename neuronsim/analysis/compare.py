@@ -0,0 +1,241 @@
+"""
+Side-by-side comparison of the neuron designs.
+
+The optimal VDD sweep, static power table and output-node transient of
+every design are loaded concurrently (the loads are I/O and parsing, so a
+thread pool is enough), aligned on VDD and reported as one table and one
+set of figures. The alignment keeps every VDD any design was simulated at,
+so each design is plotted over its own VDD range.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..designs import DESIGNS, REPO_ROOT, data_path
+from ..tables import read_table
+from .behavior import load_node_voltage
+from .optimal import load_sweep, summarize_sweep
+from .styles import STATIC_ORDER
+from .units import format_si
+
+# VDD values are compared at 10 mV resolution
+VDD_DECIMALS = 2
+
+
+def load_design(name):
+    """
+    Load the optimal sweep, static power and output transient of one design.
+
+    Missing files are reported as None rather than failing the comparison.
+
+    Returns:
+    --------
+    dict
+        'name', 'label', 'sweep' (DataFrame), 'static' (DataFrame with VDD
+        and Static_Power) and 'behavior' ((time_ns, voltage) of the output node)
+    """
+    design = DESIGNS[name]
+    sweep_file = data_path(design, 'optimal_file')
+    static_file = data_path(design, 'static_file', None)
+    behavior_file = os.path.join(REPO_ROOT, design['behavior_dir'],
+                                 f"{design['output_node']}_data.txt")
+
+    static = None
+    if os.path.exists(static_file):
+        static = read_table(static_file)
+        static.columns = ['VDD', 'Static_Power']
+    return {
+        'name': name,
+        'label': design['label'],
+        'sweep': load_sweep(sweep_file) if os.path.exists(sweep_file) else None,
+        'static': static,
+        'behavior': (load_node_voltage(behavior_file, design['output_node'])
+                     if os.path.exists(behavior_file) else None),
+    }
+
+
+def load_designs(design_names=None, workers=None):
+    """
+    Load several designs concurrently.
+
+    Returns:
+    --------
+    list of dict
+        load_design() results in the order of design_names
+    """
+    names = list(design_names or STATIC_ORDER)
+    with ThreadPoolExecutor(max_workers=workers or len(names)) as pool:
+        return list(pool.map(load_design, names))
+
+
+def align_on_vdd(datasets):
+    """
+    Join the designs' sweeps and static power on VDD.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per VDD present in any table, with '<label>_Frequency',
+        '<label>_Energy_Per_Spike' and '<label>_Static_Power' columns that
+        are NaN where that table has no row; only a VDD column when no
+        design has a sweep or static power table
+    """
+    aligned = None
+    for data in datasets:
+        frames = []
+        if data['sweep'] is not None:
+            frames.append(data['sweep'][['VDD', 'Frequency', 'Energy_Per_Spike']])
+        if data['static'] is not None:
+            frames.append(data['static'])
+        for frame in frames:
+            frame = frame.assign(VDD=frame['VDD'].round(VDD_DECIMALS))
+            frame = frame.rename(columns={c: f"{data['label']}_{c}"
+                                          for c in frame.columns if c != 'VDD'})
+            aligned = frame if aligned is None else aligned.merge(frame, on='VDD', how='outer')
+    if aligned is None:
+        return pd.DataFrame({'VDD': pd.Series(dtype=float)})
+    return aligned.sort_values('VDD').reset_index(drop=True)
+
+
+def summary_table(datasets):
+    """
+    One row per design: optimal operating point and its static power.
+    """
+    rows = []
+    for data in datasets:
+        if data['sweep'] is None:
+            continue
+        summary = summarize_sweep(data['sweep'])
+        opt = summary['optimal']
+        static_power = np.nan
+        if data['static'] is not None:
+            static_power = np.interp(opt['vdd'], data['static']['VDD'],
+                                     data['static']['Static_Power'])
+        rows.append({
+            'Design': data['label'],
+            'Optimal_VDD': opt['vdd'],
+            'Frequency': opt['frequency'],
+            'Energy_Per_Spike': opt['energy'],
+            'Score': opt['score'],
+            'Static_Power': static_power,
+            'Min_Energy_VDD': summary['energy_min']['vdd'],
+            'Min_Energy': summary['energy_min']['energy'],
+            'Max_Frequency_VDD': summary['freq_max']['vdd'],
+            'Max_Frequency': summary['freq_max']['frequency'],
+        })
+    return pd.DataFrame(rows)
+
+
+def plot_comparison(datasets, aligned, output_path=None, style_params=None):
+    """
+    Overlay frequency, energy per spike and static power against VDD, and
+    stack the output-node transients of the designs.
+
+    Returns:
+    --------
+    list of str
+        Paths of the saved figures
+    """
+    import matplotlib.pyplot as plt
+
+    if style_params is None:
+        style_params = {}
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+    plt.rcParams['font.weight'] = 'bold'
+    colors = style_params.get('colors', ['#1f77b4', '#ff7f0e', '#2ca02c'])
+    saved = []
+
+    panels = [('Frequency', 'Spiking Frequency (Hz)', 'log'),
+              ('Energy_Per_Spike', 'Energy per Spike (J)', 'log'),
+              ('Static_Power', 'Static Power (W)', 'log')]
+    fig, axes = plt.subplots(1, len(panels), figsize=style_params.get('figsize', (18, 5)),
+                             constrained_layout=True)
+    for ax, (column, ylabel, scale) in zip(axes, panels):
+        for data, color in zip(datasets, colors):
+            key = f"{data['label']}_{column}"
+            if key in aligned:
+                valid = aligned[key].notna()
+                ax.plot(aligned['VDD'][valid], aligned[key][valid], '-', color=color,
+                        linewidth=style_params.get('line_width', 2.4), label=data['label'])
+        ax.set_yscale(scale)
+        ax.set_xlabel('Supply Voltage (V)', fontsize=style_params.get('label_size', 13),
+                      fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=style_params.get('label_size', 13), fontweight='bold')
+        ax.grid(True, which='major', linestyle='--', alpha=0.7)
+        ax.tick_params(labelsize=style_params.get('tick_size', 12))
+        if ax.lines:
+            ax.legend(fontsize=style_params.get('legend_size', 12))
+    if output_path:
+        fig.savefig(output_path, dpi=style_params.get('dpi', 175), bbox_inches='tight')
+        saved.append(output_path)
+
+    behaviors = [(d, c) for d, c in zip(datasets, colors) if d['behavior'] is not None]
+    if behaviors:
+        fig2, axes2 = plt.subplots(len(behaviors), 1, sharex=True, constrained_layout=True,
+                                   figsize=style_params.get('behavior_figsize', (10, 2.5 * len(behaviors))))
+        for ax, (data, color) in zip(np.atleast_1d(axes2), behaviors):
+            time_ns, voltage = data['behavior']
+            ax.plot(time_ns, voltage, color=color, linewidth=2)
+            ax.set_ylabel(f"{data['label']}\nOutput (V)", fontweight='bold')
+            ax.set_xlim(0, style_params.get('xlim_max', 30))
+            ax.grid(True, linestyle='--', alpha=0.7)
+        np.atleast_1d(axes2)[-1].set_xlabel('Time (ns)', fontweight='bold')
+        if output_path:
+            behavior_path = os.path.splitext(output_path)[0] + '_behavior.png'
+            fig2.savefig(behavior_path, dpi=style_params.get('dpi', 175), bbox_inches='tight')
+            saved.append(behavior_path)
+
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close('all')
+    return saved
+
+
+def compare_designs(design_names=None, output_dir='.', show=False, workers=None):
+    """
+    Build the design comparison report: tables and figures in one pass.
+
+    Writes ``design_comparison.txt`` (one row per design),
+    ``design_comparison_vdd.txt`` (the VDD-aligned sweeps) and the
+    comparison figures to output_dir.
+
+    Returns:
+    --------
+    tuple : (summary, aligned) DataFrames
+    """
+    datasets = load_designs(design_names, workers)
+    aligned = align_on_vdd(datasets)
+    summary = summary_table(datasets)
+
+    os.makedirs(output_dir, exist_ok=True)
+    summary.to_csv(os.path.join(output_dir, 'design_comparison.txt'), sep=' ',
+                   index=False, float_format='%.6g')
+    aligned.to_csv(os.path.join(output_dir, 'design_comparison_vdd.txt'), sep=' ',
+                   index=False, float_format='%.6g')
+
+    print("\nDesign Comparison (optimal operating points):")
+    print("-" * 78)
+    print(f"{'Design':<8}{'VDD':>8}{'Frequency':>14}{'Energy':>12}{'Score':>8}"
+          f"{'Static Power':>15}{'Min Energy':>13}")
+    for _, row in summary.iterrows():
+        print(f"{row['Design']:<8}{row['Optimal_VDD']:>7.2f}V{format_si(row['Frequency'], 'Hz'):>14}"
+              f"{format_si(row['Energy_Per_Spike'], 'J'):>12}{row['Score']:>8.3f}"
+              f"{format_si(row['Static_Power'], 'W'):>15}{format_si(row['Min_Energy'], 'J'):>13}")
+    print("-" * 78)
+    shared = aligned.dropna()
+    for label, rows in (('VDD points', aligned), ('Shared by every table', shared)):
+        if len(rows):
+            print(f"{label}: {len(rows)} "
+                  f"({rows['VDD'].min():.2f}V to {rows['VDD'].max():.2f}V)")
+        else:
+            print(f"{label}: 0")
+
+    saved = plot_comparison(datasets, aligned, os.path.join(output_dir, 'design_comparison.png'),
+                            {'show': show})
+    for path in saved:
+        print(f"Figure saved to {path}")
+    return summary, aligned
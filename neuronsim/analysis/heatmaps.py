@@ -0,0 +1,462 @@
+"""
+Capacitor sweep analysis: Cap1 x Cap2 heatmaps and the single-capacitor
+(Danneville) sweep averaged over VDD.
+"""
+
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from ..display import DEFAULT_TILE_ROWS, display_points, memory_report, score_surface
+from ..interpolation import interpolate_pivot
+from ..tables import read_table
+from .units import get_si_prefix, get_si_prefix_for_range
+
+
+def load_and_process_data(data_file):
+    """
+    Load and process the input data file, converting capacitor values to femtofarads.
+
+    Parameters:
+    -----------
+    data_file : str or pandas.DataFrame
+        Path to the input data file containing capacitor sweep data, or
+        the already loaded table
+
+    Returns:
+    --------
+    tuple : (frequency_pivot, energy_pivot)
+        Two pivot tables containing the processed frequency and energy data
+    """
+    df = read_table(data_file) if isinstance(data_file, str) else data_file.copy()
+    df = df[df['Energy_Per_Spike'] != 0]
+    df['Cap1_fF'] = df['Cap1'] * 1e15
+    df['Cap2_fF'] = df['Cap2'] * 1e15
+
+    frequency_pivot = df.pivot_table(values='Frequency', index='Cap1_fF', columns='Cap2_fF')
+    energy_pivot = df.pivot_table(values='Energy_Per_Spike', index='Cap1_fF', columns='Cap2_fF')
+
+    return frequency_pivot, energy_pivot
+
+
+def normalize_data(data):
+    """
+    Normalize data to range [0, 1] while properly handling NaN values.
+    """
+    min_val = np.nanmin(data)
+    max_val = np.nanmax(data)
+    return (data - min_val) / (max_val - min_val)
+
+
+def interpolate_data(pivot_table, num_points=100, space='linear', method='auto', tile_rows=None):
+    """
+    Create smooth interpolated data for heatmap visualization.
+
+    Complete Cap1 x Cap2 grids are interpolated cell by cell (bilinear);
+    tables with missing cells fall back to Delaunay interpolation (griddata).
+    space='log' spaces and interpolates the points evenly in log10, matching
+    the log-scaled axes. The returned coordinate grids are broadcast views of
+    the two display axes, so they take no extra memory.
+    """
+    xi, yi, zi = interpolate_pivot(pivot_table, num_points, space=space, method=method,
+                                   tile_rows=tile_rows)
+    shape = (len(yi), len(xi))
+    return np.broadcast_to(xi[None, :], shape), np.broadcast_to(yi[:, None], shape), zi
+
+
+def create_combined_heatmaps(frequency_pivot, energy_pivot, style_params=None):
+    """
+    Create three heatmaps showing energy, frequency, and optimization score.
+    Also prints minimum frequency and maximum energy values.
+
+    style_params['render_mode'] = 'bounded' caps the interpolation at the
+    subplot's pixel resolution and tiles the score computation; 'show'
+    (default True) opens the plot window and 'output_path' saves the figure.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
+
+    if style_params is None:
+        style_params = {}
+
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+    plt.rcParams['font.weight'] = 'bold'
+
+    figsize = style_params.get('figsize', (18, 6))
+    fig = plt.figure(figsize=figsize, constrained_layout=True)
+    gs = GridSpec(1, 3, figure=fig)
+
+    # 'bounded' mode never interpolates beyond the pixels of one subplot and
+    # builds the score tile by tile, so large interpolation_points values
+    # cost no more memory than the figure can show
+    bounded = style_params.get('render_mode', 'full') == 'bounded'
+    num_points = style_params.get('interpolation_points', 100)
+    tile_rows = None
+    if bounded:
+        pixels = display_points(figsize, style_params.get('dpi', fig.dpi), ncols=3)
+        if num_points > pixels:
+            print(f"Interpolation capped at {pixels} x {pixels} points (subplot pixel size)")
+            num_points = pixels
+        tile_rows = style_params.get('tile_rows', DEFAULT_TILE_ROWS)
+
+    interpolation = {
+        'num_points': num_points,
+        'space': style_params.get('interpolation_space', 'linear'),
+        'method': style_params.get('interpolation_method', 'auto'),
+        'tile_rows': tile_rows,
+    }
+    with memory_report() if bounded else nullcontext():
+        x_freq, y_freq, z_freq = interpolate_data(frequency_pivot, **interpolation)
+        x_energy, y_energy, z_energy = interpolate_data(energy_pivot, **interpolation)
+
+        if bounded:
+            z_combined = score_surface(z_freq, z_energy, tile_rows)
+        else:
+            z_freq_norm = normalize_data(z_freq)
+            z_energy_norm = 1 - normalize_data(z_energy)
+            z_combined = z_freq_norm * z_energy_norm
+
+    min_freq_idx = np.unravel_index(np.nanargmin(z_freq), z_freq.shape)
+    min_freq = z_freq[min_freq_idx]
+    min_freq_x = x_freq[min_freq_idx[0], min_freq_idx[1]]
+    min_freq_y = y_freq[min_freq_idx[0], min_freq_idx[1]]
+    print("\nMinimum Frequency Values:")
+    print(f"Frequency: {min_freq:.3e} Hz")
+    print(f"Reset Capacitor: {min_freq_x:.2f} fF")
+    print(f"Membrane Capacitor: {min_freq_y:.2f} fF")
+
+    max_energy_idx = np.unravel_index(np.nanargmax(z_energy), z_energy.shape)
+    max_energy = z_energy[max_energy_idx]
+    max_energy_x = x_energy[max_energy_idx[0], max_energy_idx[1]]
+    max_energy_y = y_energy[max_energy_idx[0], max_energy_idx[1]]
+    print("\nMaximum Energy Values:")
+    print(f"Energy: {max_energy:.3e} J")
+    print(f"Reset Capacitor: {max_energy_x:.2f} fF")
+    print(f"Membrane Capacitor: {max_energy_y:.2f} fF")
+
+    plot_configs = [
+        {
+            'data': z_energy,
+            'x': x_energy,
+            'y': y_energy,
+            'title': 'Energy per Spike',
+            'base_unit': 'J',
+            'cmap': 'RdYlGn_r',
+            'subplot': gs[0],
+            'optimal_func': np.nanargmin
+        },
+        {
+            'data': z_freq,
+            'x': x_freq,
+            'y': y_freq,
+            'title': 'Spiking Frequency',
+            'base_unit': 'Hz',
+            'cmap': 'RdYlGn',
+            'subplot': gs[1],
+            'optimal_func': np.nanargmax
+        },
+        {
+            'data': z_combined,
+            'x': x_freq,
+            'y': y_freq,
+            'title': 'Optimization Score',
+            'base_unit': '',
+            'cmap': 'RdYlGn',
+            'subplot': gs[2],
+            'optimal_func': np.nanargmax
+        }
+    ]
+
+    for i, config in enumerate(plot_configs):
+        ax = fig.add_subplot(config['subplot'])
+
+        if config['base_unit']:
+            scale_factor, prefix = get_si_prefix_for_range(config['data'])
+            plot_data = config['data'] / scale_factor
+        else:
+            scale_factor, prefix = 1, ''
+            plot_data = config['data']
+
+        im = ax.pcolormesh(config['x'], config['y'], plot_data,
+                           cmap=config['cmap'],
+                           shading=style_params.get('shading', 'auto'))
+
+        opt_idx = np.unravel_index(config['optimal_func'](config['data']), config['data'].shape)
+        opt_x = config['x'][opt_idx[0], opt_idx[1]]
+        opt_y = config['y'][opt_idx[0], opt_idx[1]]
+
+        marker_size = style_params.get('optimal_point_size', 10)
+        ax.plot(opt_x, opt_y, 'o', color='#FF00FF',
+                markersize=marker_size,
+                markeredgecolor='white',
+                markeredgewidth=marker_size/10)
+
+        ax.set_title(config['title'],
+                     fontsize=style_params.get('title_size', 14),
+                     pad=style_params.get('title_pad', 10),
+                     weight='bold')
+        ax.set_xlabel(style_params.get('xlabel', 'Reset Capacitor (fF)'),
+                      fontsize=style_params.get('label_size', 12),
+                      weight='bold')
+        if i == 0:
+            ax.set_ylabel(style_params.get('ylabel', 'Membrane Capacitor (fF)'),
+                          fontsize=style_params.get('label_size', 12),
+                          weight='bold')
+
+        cbar = fig.colorbar(im, ax=ax)
+        if config['base_unit']:
+            cbar.ax.set_title(f'{prefix}{config["base_unit"]}',
+                              size=style_params.get('colorbar_label_size', 14),
+                              pad=10,
+                              weight='bold')
+
+        ax.tick_params(labelsize=style_params.get('tick_size', 10))
+        cbar.ax.tick_params(labelsize=style_params.get('tick_size', 10))
+
+        # --- Set both axes to log scale with logarithmically spaced tick positions ---
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+
+        def format_tick(val):
+            return f"{val:.0f}" if val >= 1 else f"{val:.1f}"
+
+        xticks = np.logspace(np.log10(config['x'].min()), np.log10(config['x'].max()), num=7)
+        yticks = np.logspace(np.log10(config['y'].min()), np.log10(config['y'].max()), num=7)
+        ax.set_xticks(xticks)
+        ax.set_xticklabels([format_tick(x) for x in xticks])
+        ax.set_yticks(yticks)
+        ax.set_yticklabels([format_tick(y) for y in yticks])
+        # -----------------------------------------------------------
+
+        if config['base_unit']:
+            print(f"\n{config['title']} Optimal Point:")
+            print(f"Value: {config['data'][opt_idx]/scale_factor:.3g} {prefix}{config['base_unit']}")
+        else:
+            print(f"\n{config['title']} Optimal Point:")
+            print(f"Score: {config['data'][opt_idx]:.3g}")
+        print(f"Membrane Capacitor: {opt_y:.2f} fF")
+        print(f"Reset Capacitor: {opt_x:.2f} fF")
+
+    if 'output_path' in style_params:
+        plt.savefig(style_params['output_path'],
+                    dpi=style_params.get('dpi', 300),
+                    bbox_inches='tight')
+
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close(fig)
+
+
+def analyze_cap_sweep(filename, style_params=None):
+    """
+    Analyze and plot single-capacitor sweep data with customizable styling.
+    Frequency and energy per spike are averaged over VDD for every
+    capacitor value. Creates a single figure with three horizontally
+    arranged plots.
+
+    Parameters:
+    -----------
+    filename : str or pandas.DataFrame
+        Path to the sweep table (VDD Cap Spikes Frequency Energy_Per_Spike),
+        or the already loaded table
+    style_params : dict
+        Dictionary containing styling parameters for plot customization
+
+    Returns:
+    --------
+    dict
+        'cap_fF', 'frequency', 'energy' and 'score' per capacitor value and
+        'optimal_cap_fF', the capacitor with the highest score
+    """
+    import matplotlib.pyplot as plt
+
+    if style_params is None:
+        style_params = {}
+
+    # Set global font family and weight
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+    plt.rcParams['font.weight'] = 'bold'  # Make all text bold by default
+
+    # Read and process data
+    df = read_table(filename) if isinstance(filename, str) else filename.copy()
+    df = df[df['Energy_Per_Spike'] != 0]
+    df['Cap_fF'] = pd.to_numeric(df['Cap']) * 1e15
+
+    avg_data = df.groupby('Cap_fF').agg({
+        'Frequency': 'mean',
+        'Energy_Per_Spike': 'mean'
+    }).reset_index()
+
+    avg_data = avg_data.sort_values('Cap_fF')
+
+    # Calculate maximum/minimum points
+    freq_max_idx = np.argmax(avg_data['Frequency'].values)
+    freq_max_x = avg_data['Cap_fF'].values[freq_max_idx]
+    freq_max_y = avg_data['Frequency'].values[freq_max_idx]
+
+    energy_min_idx = np.argmin(avg_data['Energy_Per_Spike'].values)
+    energy_min_x = avg_data['Cap_fF'].values[energy_min_idx]
+    energy_min_y = avg_data['Energy_Per_Spike'].values[energy_min_idx]
+
+    x = avg_data['Cap_fF'].values
+    x_smooth = np.linspace(x.min(), x.max(), 300)
+
+    # Calculate optimization score
+    freq_norm = (avg_data['Frequency'].values - avg_data['Frequency'].min()) / \
+               (avg_data['Frequency'].max() - avg_data['Frequency'].min())
+    energy_norm = 1 - (avg_data['Energy_Per_Spike'].values - avg_data['Energy_Per_Spike'].min()) / \
+                     (avg_data['Energy_Per_Spike'].max() - avg_data['Energy_Per_Spike'].min())
+    opt_score = freq_norm * energy_norm
+
+    # Find optimal point
+    opt_idx = np.argmax(opt_score)
+    opt_cap = x[opt_idx]
+    max_score = opt_score[opt_idx]
+
+    # Create plot configurations for all three plots with updated titles
+    plot_configs = [
+        {
+            'data': avg_data['Energy_Per_Spike'].values,
+            'title': 'Average Energy per Spike',  # Removed "vs Reset Capacitor"
+            'ylabel': 'Energy per Spike',
+            'unit': 'J',
+            'color': style_params.get('line_color1', 'darkblue'),
+            'max_x': energy_min_x,
+            'max_y': energy_min_y,
+            'smooth_data': np.interp(x_smooth, x, avg_data['Energy_Per_Spike'].values)
+        },
+        {
+            'data': avg_data['Frequency'].values,
+            'title': 'Average Frequency',  # Removed "vs Reset Capacitor"
+            'ylabel': 'Frequency',
+            'unit': 'Hz',
+            'color': style_params.get('line_color2', 'darkorange'),
+            'max_x': freq_max_x,
+            'max_y': freq_max_y,
+            'smooth_data': np.interp(x_smooth, x, avg_data['Frequency'].values)
+        },
+        {
+            'data': opt_score,
+            'title': 'Optimization Score',  # Removed "vs Reset Capacitor"
+            'ylabel': 'Optimization Score',
+            'unit': '',
+            'color': style_params.get('line_color3', 'darkgreen'),
+            'max_x': opt_cap,
+            'max_y': max_score,
+            'smooth_data': np.interp(x_smooth, x, opt_score)
+        }
+    ]
+
+    # Create a single figure with three subplots arranged horizontally
+    fig = plt.figure(figsize=style_params.get('figsize', (21, 5)), dpi=style_params.get('dpi', 175))
+
+    # Create a grid of subplots with proper spacing
+    gs = fig.add_gridspec(1, 3, hspace=0, wspace=0.3)
+
+    # Create axes for each subplot
+    axes = [fig.add_subplot(gs[0, i]) for i in range(3)]
+
+    # Plot each subplot
+    for ax, config in zip(axes, plot_configs):
+        y = config['data']
+        y_smooth = config['smooth_data']
+
+        # Get SI prefix for y-axis if needed
+        if config['unit']:
+            _, prefix, scale = get_si_prefix(np.max(np.abs(y)))
+            y_scaled = y / scale
+            y_smooth_scaled = y_smooth / scale
+            ylabel = f"{config['ylabel']} ({prefix}{config['unit']})"
+        else:
+            scale = 1
+            y_scaled = y
+            y_smooth_scaled = y_smooth
+            ylabel = config['ylabel']
+
+        # Plot smoothed line
+        ax.plot(x_smooth, y_smooth_scaled, '-',
+               color=config['color'],
+               linewidth=style_params.get('line_width', 1.4))
+
+        # Add only the optimal point marker in neon purple with larger size
+        ax.plot(config['max_x'], config['max_y']/scale, 'o',
+               color='#FF00FF',
+               markersize=style_params.get('marker_size', 8))
+
+        # Set axis limits and ticks
+        ax.set_xlim(x.min(), x.max())
+        ax.xaxis.set_major_locator(plt.MultipleLocator(1))  # Set step size to 1
+        if config['unit']:
+            ax.set_ylim(np.min(y_scaled) * 0.95, np.max(y_scaled) * 1.05)
+        else:
+            ax.set_ylim(0, 1.05)
+
+        # Set labels and title with bold weight
+        ax.set_title(config['title'],
+                    fontsize=style_params.get('title_size', 14),
+                    fontweight='bold',
+                    pad=style_params.get('title_pad', 10))
+
+        ax.set_xlabel('Reset Capacitor (fF)',
+                     fontsize=style_params.get('label_size', 12),
+                     fontweight='bold')
+
+        ax.set_ylabel(ylabel,
+                     fontsize=style_params.get('label_size', 12),
+                     fontweight='bold')
+
+        # Add grid
+        if style_params.get('grid', True):
+            ax.grid(True,
+                   linestyle=style_params.get('grid_style', '--'),
+                   alpha=style_params.get('grid_alpha', 0.7))
+
+        # Set tick parameters and make tick labels bold
+        ax.tick_params(labelsize=style_params.get('tick_size', 10))
+        for label in ax.get_xticklabels() + ax.get_yticklabels():
+            label.set_fontweight('bold')
+
+    # Adjust layout to prevent overlap
+    plt.tight_layout()
+
+    if 'output_path' in style_params:
+        plt.savefig(style_params['output_path'],
+                   dpi=style_params.get('dpi', 300),
+                   bbox_inches='tight')
+
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close(fig)
+
+    # Print optimization results with clear formatting
+    print("\nAnalysis Results:")
+    print("-" * 50)
+    print("Maximum Frequency Point:")
+    print(f"  Capacitor: {freq_max_x:.2f} fF")
+    _, freq_prefix, freq_scale = get_si_prefix(freq_max_y)
+    print(f"  Frequency: {freq_max_y/freq_scale:.2f} {freq_prefix}Hz")
+    print("\nMinimum Energy Point:")
+    print(f"  Capacitor: {energy_min_x:.2f} fF")
+    _, energy_prefix, energy_scale = get_si_prefix(energy_min_y)
+    print(f"  Energy: {energy_min_y/energy_scale:.2f} {energy_prefix}J")
+    print("\nOptimal Point (Balanced Score):")
+    print(f"  Capacitor: {opt_cap:.2f} fF")
+    opt_freq = avg_data['Frequency'].values[opt_idx]
+    opt_energy = avg_data['Energy_Per_Spike'].values[opt_idx]
+    _, opt_freq_prefix, opt_freq_scale = get_si_prefix(opt_freq)
+    _, opt_energy_prefix, opt_energy_scale = get_si_prefix(opt_energy)
+    print(f"  Frequency: {opt_freq/opt_freq_scale:.2f} {opt_freq_prefix}Hz")
+    print(f"  Energy: {opt_energy/opt_energy_scale:.2f} {opt_energy_prefix}J")
+    print(f"  Score: {max_score:.3f}")
+    print("-" * 50)
+
+    return {
+        'cap_fF': x,
+        'frequency': avg_data['Frequency'].values,
+        'energy': avg_data['Energy_Per_Spike'].values,
+        'score': opt_score,
+        'optimal_cap_fF': opt_cap,
+    }
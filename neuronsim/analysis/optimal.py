@@ -0,0 +1,423 @@
+"""
+VDD sweep analysis: frequency, energy per spike and optimization score.
+
+The optimization score of a sweep point is freq_norm * (1 - energy_norm),
+both normalized to [0, 1] over the sweep, so 1 means the fastest and most
+frugal point of the sweep.
+"""
+
+import numpy as np
+
+from ..tables import read_table
+from .units import format_tick_value, get_si_prefix
+
+# Panels of the voltage-sweep figure and printed reports, see analyze_voltage_sweeps()
+PANEL_ORDER = ('frequency', 'energy', 'score')
+REPORTS = ('summary', 'analysis')
+_LINE_COLORS = ('darkblue', 'darkorange', 'darkgreen')
+
+
+def optimization_score(frequency, energy):
+    """
+    Score each point by freq_norm * (1 - energy_norm).
+
+    Parameters:
+    -----------
+    frequency, energy : numpy.ndarray
+        Spiking frequency and energy per spike of every point
+
+    Returns:
+    --------
+    numpy.ndarray
+        Score in [0, 1] (NaN where either input is NaN)
+    """
+    frequency = np.asarray(frequency, dtype=float)
+    energy = np.asarray(energy, dtype=float)
+    freq_norm = (frequency - np.nanmin(frequency)) / (np.nanmax(frequency) - np.nanmin(frequency))
+    energy_norm = 1 - (energy - np.nanmin(energy)) / (np.nanmax(energy) - np.nanmin(energy))
+    return freq_norm * energy_norm
+
+
+def load_sweep(filename):
+    """
+    Load a VDD sweep table without the points that never completed a spike.
+    """
+    df = read_table(filename)
+    return df[df['Energy_Per_Spike'] != 0].reset_index(drop=True)
+
+
+def split_corners(df):
+    """
+    Split a corner table (Corner and Temperature columns) into its conditions.
+
+    Returns:
+    --------
+    list of tuple
+        (label such as 'FF 125°C', rows of that condition sorted by VDD)
+    """
+    return [(f"{corner} {float(temperature):g}°C",
+             group.sort_values('VDD').reset_index(drop=True))
+            for (corner, temperature), group in df.groupby(['Corner', 'Temperature'],
+                                                           sort=False)]
+
+
+def summarize_sweep(df):
+    """
+    Extreme and optimal points of a VDD sweep.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Sweep with VDD, Frequency and Energy_Per_Spike columns
+
+    Returns:
+    --------
+    dict
+        'score': score of every row, and for each of 'freq_max', 'freq_min',
+        'energy_min', 'energy_max' and 'optimal' a dict with the row's
+        'vdd', 'frequency', 'energy' and 'score'
+    """
+    x = df['VDD'].values
+    frequency = df['Frequency'].values
+    energy = df['Energy_Per_Spike'].values
+    score = optimization_score(frequency, energy)
+
+    def point(index):
+        return {'vdd': x[index], 'frequency': frequency[index],
+                'energy': energy[index], 'score': score[index]}
+
+    return {
+        'score': score,
+        'freq_max': point(np.argmax(frequency)),
+        'freq_min': point(np.argmin(frequency)),
+        'energy_min': point(np.argmin(energy)),
+        'energy_max': point(np.argmax(energy)),
+        'optimal': point(np.nanargmax(score)),
+    }
+
+
+def _print_extremes(summary):
+    opt = summary['optimal']
+    print("\nExtreme Values:")
+    freq_min_val, freq_min_prefix, _ = get_si_prefix(summary['freq_min']['frequency'])
+    energy_max_val, energy_max_prefix, _ = get_si_prefix(summary['energy_max']['energy'])
+    print(f"Minimum Frequency: {freq_min_val:.3g} {freq_min_prefix}Hz at "
+          f"{summary['freq_min']['vdd']:.3f}V")
+    print(f"Maximum Energy: {energy_max_val:.3g} {energy_max_prefix}J at "
+          f"{summary['energy_max']['vdd']:.3f}V")
+
+    # Print metrics at optimal voltage
+    opt_freq_val, opt_freq_prefix, _ = get_si_prefix(opt['frequency'])
+    opt_energy_val, opt_energy_prefix, _ = get_si_prefix(opt['energy'])
+    print(f"\nMetrics at Optimal Voltage ({opt['vdd']:.3f}V):")
+    print(f"Frequency: {opt_freq_val:.3g} {opt_freq_prefix}Hz")
+    print(f"Energy: {opt_energy_val:.3g} {opt_energy_prefix}J")
+    print(f"Optimization Score: {opt['score']:.3f}")
+
+
+def _print_values_at(df, report_vdd):
+    x = df['VDD'].values
+    for vdd in report_vdd:
+        freq_val, freq_pre, _ = get_si_prefix(np.interp(vdd, x, df['Frequency'].values))
+        energy_val, energy_pre, _ = get_si_prefix(np.interp(vdd, x, df['Energy_Per_Spike'].values))
+        print(f"\nValues at {vdd:g}V:")
+        print(f"  Frequency: {freq_val:.2f} {freq_pre}Hz")
+        print(f"  Energy: {energy_val:.2f} {energy_pre}J")
+
+
+def _print_summary(df, summary, report_vdd):
+    # Comprehensive summary with SI prefixes
+    opt = summary['optimal']
+    opt_freq_val, opt_freq_prefix, _ = get_si_prefix(opt['frequency'])
+    opt_energy_val, opt_energy_prefix, _ = get_si_prefix(opt['energy'])
+    print("\nSummary Statistics:")
+    freq_lo, freq_lo_prefix, _ = get_si_prefix(df['Frequency'].min())
+    freq_hi, freq_hi_prefix, _ = get_si_prefix(df['Frequency'].max())
+    energy_lo, energy_lo_prefix, _ = get_si_prefix(df['Energy_Per_Spike'].min())
+    energy_hi, energy_hi_prefix, _ = get_si_prefix(df['Energy_Per_Spike'].max())
+
+    print(f"\nVDD range: {df['VDD'].min():.3f}V to {df['VDD'].max():.3f}V")
+    print(f"Frequency range: {freq_lo:.2f} {freq_lo_prefix}Hz to {freq_hi:.2f} {freq_hi_prefix}Hz")
+    print(f"Energy range: {energy_lo:.2f} {energy_lo_prefix}J to {energy_hi:.2f} {energy_hi_prefix}J")
+    print(f"\nOptimal voltage point: {opt['vdd']:.3f}V")
+    print(f"  - Frequency: {opt_freq_val:.3g} {opt_freq_prefix}Hz")
+    print(f"  - Energy: {opt_energy_val:.3g} {opt_energy_prefix}J")
+    print(f"  - Score: {opt['score']:.3f}")
+    _print_values_at(df, report_vdd)
+
+
+def _format_2f(value, unit):
+    scaled, prefix, _ = get_si_prefix(value)
+    return f'{scaled:.2f} {prefix}{unit}'
+
+
+def _print_analysis_results(df, summary, report_vdd):
+    # The report of the original Danneville script
+    _print_values_at(df, report_vdd)
+    freq_max, energy_min, opt = summary['freq_max'], summary['energy_min'], summary['optimal']
+    print("\nAnalysis Results:")
+    print("-" * 50)
+    print("Maximum Frequency Point:")
+    print(f"  Supply Voltage: {freq_max['vdd']:.3f} V")
+    print(f"  Frequency: {_format_2f(freq_max['frequency'], 'Hz')}")
+    print("\nMinimum Energy Point:")
+    print(f"  Supply Voltage: {energy_min['vdd']:.3f} V")
+    print(f"  Energy: {_format_2f(energy_min['energy'], 'J')}")
+    print("\nOptimal Point (Balanced Score):")
+    print(f"  Supply Voltage: {opt['vdd']:.3f} V")
+    print(f"  Frequency: {_format_2f(opt['frequency'], 'Hz')}")
+    print(f"  Energy: {_format_2f(opt['energy'], 'J')}")
+    print(f"  Score: {opt['score']:.3f}")
+    print("-" * 50)
+
+
+def analyze_voltage_sweeps(filename, style_params=None):
+    """
+    Analyze and plot voltage sweep data with customizable styling.
+    Creates three plots showing frequency, energy per spike, and optimization score.
+    Prints comprehensive analysis including minimum/maximum values and optimal point metrics.
+
+    Parameters:
+    -----------
+    filename : str or pandas.DataFrame
+        Path to the input data file, or an already loaded sweep
+    style_params : dict
+        Dictionary containing styling parameters for plot customization.
+        'report_vdd' (list of volts) additionally prints the interpolated
+        frequency and energy at those supplies; 'show' (default True)
+        opens the plot window. 'panel_order' orders the 'frequency',
+        'energy' and 'score' panels (line_color1-3 follow the position);
+        'report' selects the printed report: 'summary' (default) or
+        'analysis', the "Analysis Results" block of the original Danneville
+        script.
+
+    Returns:
+    --------
+    dict
+        The summary from summarize_sweep(); for a corner table (see
+        neuronsim.corners) the result of plot_corner_sweeps()
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
+    from matplotlib.ticker import FuncFormatter, ScalarFormatter
+
+    if style_params is None:
+        style_params = {}
+
+    # Set global font settings
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+    plt.rcParams['font.weight'] = 'bold'
+
+    df = load_sweep(filename) if isinstance(filename, str) else filename
+    if 'Corner' in df.columns:
+        return plot_corner_sweeps(df, style_params)
+    x = df['VDD'].values
+    x_smooth = np.linspace(x.min(), x.max(), 300)
+    summary = summarize_sweep(df)
+    opt = summary['optimal']
+    report = style_params.get('report', 'summary')
+    if report not in REPORTS:
+        raise ValueError(f"Unknown report '{report}', expected one of: {', '.join(REPORTS)}")
+    verbose = report == 'summary'
+
+    # Print minimum frequency and maximum energy information
+    if verbose:
+        _print_extremes(summary)
+
+    # Get SI prefix information for scaling
+    _, freq_prefix, freq_scale = get_si_prefix(df['Frequency'].max())
+    _, energy_prefix, energy_scale = get_si_prefix(df['Energy_Per_Spike'].max())
+    freq_max = summary['freq_max']
+    energy_min = summary['energy_min']
+
+    # Configure the three plots with SI-adjusted labels
+    panels = {
+        'frequency': {
+            'data': df['Frequency'].values / freq_scale,
+            'title': 'Spiking Frequency',
+            'ylabel': f'Frequency ({freq_prefix}Hz)',
+            'max_x': freq_max['vdd'],
+            'max_y': freq_max['frequency'] / freq_scale,
+            'text': f"Max: {freq_max['vdd']:.3g}V\n"
+                    f"{freq_max['frequency'] / freq_scale:.3g} {freq_prefix}Hz"
+        },
+        'energy': {
+            'data': df['Energy_Per_Spike'].values / energy_scale,
+            'title': 'Energy per Spike',
+            'ylabel': f'Energy per Spike ({energy_prefix}J)',
+            'max_x': energy_min['vdd'],
+            'max_y': energy_min['energy'] / energy_scale,
+            'text': f"Min: {energy_min['vdd']:.3g}V\n"
+                    f"{energy_min['energy'] / energy_scale:.3g} {energy_prefix}J"
+        },
+        'score': {
+            'data': summary['score'],
+            'title': 'Optimization Score',
+            'ylabel': 'Optimization Score',
+            'max_x': opt['vdd'],
+            'max_y': opt['score'],
+            'text': f"Optimal: {opt['vdd']:.3g}V\nScore: {opt['score']:.3g}"
+        }
+    }
+    plot_configs = [panels[name] for name in style_params.get('panel_order', PANEL_ORDER)]
+    for i, (config, default) in enumerate(zip(plot_configs, _LINE_COLORS)):
+        config['color'] = style_params.get(f'line_color{i + 1}', default)
+
+    # Create figure with three subplots
+    fig = plt.figure(figsize=style_params.get('figsize', (18, 6)), constrained_layout=True)
+    gs = GridSpec(1, 3, figure=fig)
+
+    for i, config in enumerate(plot_configs):
+        ax = fig.add_subplot(gs[i])
+
+        # Create smoothed data for plotting
+        y = config['data']
+        y_smooth = np.interp(x_smooth, x, y)
+
+        ax.plot(x_smooth, y_smooth, '-',
+                color=config['color'],
+                linewidth=style_params.get('line_width', 1.4),
+                label='_nolegend_')
+
+        # Add optimal point marker
+        ax.plot(config['max_x'], config['max_y'], 'o',
+                color='#FF00FF',
+                markersize=style_params.get('marker_size', 10),
+                markeredgecolor='white',
+                markeredgewidth=1)
+
+        # Set axis limits with padding
+        x_range = x.max() - x.min()
+        ax.set_xlim(x.min() - x_range * 0.05, x.max() + x_range * 0.05)
+        if config is not panels['score']:
+            y_range = y.max() - y.min()
+            ax.set_ylim(y.min() - y_range * 0.1, y.max() + y_range * 0.1)
+        else:
+            ax.set_ylim(-0.05, 1.1)
+
+        ax.yaxis.set_major_formatter(FuncFormatter(format_tick_value))
+
+        ax.set_title(config['title'],
+                     fontsize=style_params.get('title_size', 14),
+                     fontweight='bold',
+                     pad=style_params.get('title_pad', 10))
+        ax.set_xlabel('Supply Voltage (V)',
+                      fontsize=style_params.get('label_size', 12),
+                      fontweight='bold')
+        ax.set_ylabel(config['ylabel'],
+                      fontsize=style_params.get('label_size', 12),
+                      fontweight='bold')
+
+        if style_params.get('grid', True):
+            ax.grid(True,
+                    linestyle=style_params.get('grid_style', '--'),
+                    alpha=style_params.get('grid_alpha', 0.7))
+
+        ax.tick_params(labelsize=style_params.get('tick_size', 10))
+
+        x_formatter = ScalarFormatter(useOffset=False)
+        x_formatter.set_scientific(False)
+        ax.xaxis.set_major_formatter(x_formatter)
+
+        if verbose:
+            print(f"\nPlot {i+1} Information:")
+            print(config['text'])
+
+    if 'output_path' in style_params:
+        plt.savefig(style_params['output_path'],
+                    dpi=style_params.get('dpi', 300),
+                    bbox_inches='tight')
+
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close(fig)
+
+    if verbose:
+        _print_summary(df, summary, style_params.get('report_vdd', []))
+    else:
+        _print_analysis_results(df, summary, style_params.get('report_vdd', []))
+
+    return summary
+
+
+def plot_corner_sweeps(df, style_params=None):
+    """
+    Plot the VDD sweeps of every corner and temperature of a corner table.
+
+    Frequency, energy per spike and optimization score get one line per
+    condition; each score is normalized over its own condition.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Corner table (Corner, Temperature, VDD, Frequency, Energy_Per_Spike)
+        without the points that never completed a spike
+    style_params : dict
+        Styling parameters as in analyze_voltage_sweeps(); 'corner_colors'
+        (list) replaces the default color cycle
+
+    Returns:
+    --------
+    dict
+        Condition label -> summarize_sweep() result
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import FuncFormatter
+
+    if style_params is None:
+        style_params = {}
+    plt.rcParams['font.family'] = style_params.get('font_family', 'Arial')
+    plt.rcParams['font.weight'] = 'bold'
+
+    conditions = split_corners(df)
+    summaries = {label: summarize_sweep(group) for label, group in conditions}
+    _, freq_prefix, freq_scale = get_si_prefix(df['Frequency'].max())
+    _, energy_prefix, energy_scale = get_si_prefix(df['Energy_Per_Spike'].max())
+    colors = style_params.get('corner_colors',
+                              plt.rcParams['axes.prop_cycle'].by_key()['color'])
+
+    fig, axes = plt.subplots(1, 3, figsize=style_params.get('figsize', (18, 6)),
+                             constrained_layout=True)
+    panels = [('Spiking Frequency', f'Frequency ({freq_prefix}Hz)'),
+              ('Energy per Spike', f'Energy per Spike ({energy_prefix}J)'),
+              ('Optimization Score', 'Optimization Score')]
+    print(f"\n{'Condition':<14} {'Optimal VDD':>11} {'Frequency':>12} {'Energy':>12}")
+    for n, (label, group) in enumerate(conditions):
+        summary = summaries[label]
+        color = colors[n % len(colors)]
+        series = [group['Frequency'].values / freq_scale,
+                  group['Energy_Per_Spike'].values / energy_scale, summary['score']]
+        for ax, y in zip(axes, series):
+            ax.plot(group['VDD'].values, y, '-', color=color, label=label,
+                    linewidth=style_params.get('line_width', 1.4))
+        opt = summary['optimal']
+        axes[2].plot(opt['vdd'], opt['score'], 'o', color=color,
+                     markersize=style_params.get('marker_size', 8), markeredgecolor='white')
+        freq_val, freq_pre, _ = get_si_prefix(opt['frequency'])
+        energy_val, energy_pre, _ = get_si_prefix(opt['energy'])
+        print(f"{label:<14} {opt['vdd']:>10.3f}V {freq_val:>9.3g} {freq_pre}Hz "
+              f"{energy_val:>9.3g} {energy_pre}J")
+
+    for ax, (title, ylabel) in zip(axes, panels):
+        ax.set_title(title, fontsize=style_params.get('title_size', 14), fontweight='bold',
+                     pad=style_params.get('title_pad', 10))
+        ax.set_xlabel('Supply Voltage (V)', fontsize=style_params.get('label_size', 12),
+                      fontweight='bold')
+        ax.set_ylabel(ylabel, fontsize=style_params.get('label_size', 12), fontweight='bold')
+        ax.yaxis.set_major_formatter(FuncFormatter(format_tick_value))
+        ax.tick_params(labelsize=style_params.get('tick_size', 10))
+        if style_params.get('grid', True):
+            ax.grid(True, linestyle=style_params.get('grid_style', '--'),
+                    alpha=style_params.get('grid_alpha', 0.7))
+    axes[2].set_ylim(-0.05, 1.1)
+    axes[0].legend(fontsize=style_params.get('legend_size', 10))
+
+    if 'output_path' in style_params:
+        plt.savefig(style_params['output_path'], dpi=style_params.get('dpi', 300),
+                    bbox_inches='tight')
+    if style_params.get('show', True):
+        plt.show()
+    else:
+        plt.close(fig)
+    return summaries
@@ -0,0 +1,253 @@
+"""
+Command-line entry point running the analyses for one or more designs.
+
+Every design is analyzed in a worker process of its own, so the three
+designs share one launch instead of one Python and matplotlib start-up per
+data directory. Worker output is collected and printed design by design.
+
+Example:
+    python analyze.py optimal --design besrour sourikopoulos
+    python analyze.py heatmap --design all --workers 3 --output-dir figures
+    python analyze.py behavior --design sourikopoulos --data-dir "sourikopoulous behavior/burst behavior"
+    python analyze.py static
+    python analyze.py compare --output-dir report
+"""
+
+import argparse
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from ..designs import DESIGNS, REPO_ROOT, data_path, get_design
+from .styles import BEHAVIOR_PANELS, STATIC_ORDER, get_style
+
+ANALYSES = ('optimal', 'heatmap', 'behavior', 'static', 'compare')
+
+
+def _design_name(design_name):
+    get_design(design_name)
+    return design_name.lower()
+
+
+def run_analysis(kind, design_name, data_dir=None, output_path=None, show=True,
+                 style_overrides=None, filename=None):
+    """
+    Run one per-design analysis with that design's default style.
+
+    Parameters:
+    -----------
+    kind : str
+        'optimal', 'heatmap' or 'behavior'
+    design_name : str
+        Design to analyze
+    data_dir : str, optional
+        Directory holding the input files; the design's data directory by default
+    output_path : str, optional
+        Where to save the figure; the style's own output_path by default
+    show : bool
+        Open the plot window
+    style_overrides : dict, optional
+        style_params entries replacing the defaults
+    filename : str, optional
+        Table analyzed instead of the design's own ('optimal' also plots
+        every corner of a neuronsim.corners table)
+
+    Returns:
+    --------
+    The analysis function's return value
+    """
+    name = _design_name(design_name)
+    design = DESIGNS[name]
+    style = get_style(kind, name)
+    style.update(style_overrides or {})
+    style['show'] = show
+    if output_path is not None:
+        style['output_path'] = output_path
+
+    if kind == 'optimal':
+        from .optimal import analyze_voltage_sweeps
+        directory = data_dir or os.path.join(REPO_ROOT, design['optimal_dir'])
+        filename = filename or os.path.join(directory, design['optimal_file'])
+        return analyze_voltage_sweeps(filename, style)
+
+    if kind == 'heatmap':
+        from .heatmaps import analyze_cap_sweep, create_combined_heatmaps, load_and_process_data
+        directory = data_dir or os.path.join(REPO_ROOT, design['optimal_dir'])
+        filename = filename or os.path.join(directory, design['sweep_file'])
+        if len(design['capacitors']) == 1:
+            return analyze_cap_sweep(filename, style)
+        frequency_pivot, energy_pivot = load_and_process_data(filename)
+        return create_combined_heatmaps(frequency_pivot, energy_pivot, style)
+
+    if kind == 'behavior':
+        from .behavior import plot_multiple_files
+        directory = data_dir or os.path.join(REPO_ROOT, design['behavior_dir'])
+        panels = BEHAVIOR_PANELS[name]
+        filenames = [os.path.join(directory, f'{node}_data.txt') for node, _ in panels]
+        return plot_multiple_files(filenames, [label for _, label in panels], style,
+                                   nodes=[node for node, _ in panels])
+
+    raise ValueError(f"Unknown analysis '{kind}', expected one of: {', '.join(ANALYSES)}")
+
+
+def run_static(design_names=None, output_path='static_power_comparison.png', show=True,
+               file_paths=None, style_overrides=None):
+    """
+    Plot the static power of several designs on one figure.
+
+    Parameters:
+    -----------
+    design_names : list of str, optional
+        Designs to compare, in legend order; SML, DAH, BLIF by default
+    output_path : str
+        Where to save the figure
+    show : bool
+        Open the plot window
+    file_paths : list of str, optional
+        Static power tables replacing the designs' shipped files
+    style_overrides : dict, optional
+        style_params entries replacing the defaults
+    """
+    from .static import plot_static_power
+    names = [_design_name(n) for n in (design_names or STATIC_ORDER)]
+    if file_paths is None:
+        file_paths = [data_path(DESIGNS[n], 'static_file', None) for n in names]
+    style = get_style('static')
+    style['legend_labels'] = [DESIGNS[n]['label'] for n in names]
+    style.update(style_overrides or {})
+    style['show'] = show
+    return plot_static_power(file_paths, output_path, style)
+
+
+def _run_captured(job):
+    # Worker side: run one analysis and hand its report back as text
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        try:
+            run_analysis(**job)
+            error = None
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+    return job['design_name'], buffer.getvalue(), error
+
+
+def run_designs(kind, design_names, workers=None, output_dir=None, data_dir=None, show=False,
+                filename=None):
+    """
+    Run one analysis for several designs, in parallel unless plots are shown.
+
+    Parameters:
+    -----------
+    kind : str
+        'optimal', 'heatmap' or 'behavior'
+    design_names : list of str
+        Designs to analyze
+    workers : int, optional
+        Worker processes; one per design (up to the CPU count) by default
+    output_dir : str, optional
+        Save each figure as <output_dir>/<design>_<kind>.png
+    data_dir : str, optional
+        Input directory used for every design instead of the design's own
+    show : bool
+        Open the plot windows; runs the designs one after the other
+    filename : str, optional
+        Table analyzed instead of each design's own
+
+    Returns:
+    --------
+    list of str
+        Designs whose analysis failed
+    """
+    jobs = []
+    for name in design_names:
+        output_path = None
+        if output_dir is not None:
+            output_path = os.path.join(output_dir, f'{_design_name(name)}_{kind}.png')
+        jobs.append({'kind': kind, 'design_name': _design_name(name), 'data_dir': data_dir,
+                     'output_path': output_path, 'show': show, 'filename': filename})
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if show or workers <= 1 or len(jobs) == 1:
+        # Plot windows need the main process
+        results = []
+        for job in jobs:
+            print(f"\n===== {job['design_name']} ({DESIGNS[job['design_name']]['label']}) =====")
+            try:
+                run_analysis(**job)
+            except Exception as e:
+                print(f'Error: {type(e).__name__}: {e}')
+                results.append(job['design_name'])
+        return results
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, report, error in pool.map(_run_captured, jobs):
+            print(f"\n===== {name} ({DESIGNS[name]['label']}) =====")
+            print(report, end='')
+            if error:
+                print(f'Error: {error}')
+                failed.append(name)
+    return failed
+
+
+def _designs_argument(values):
+    if not values or values == ['all']:
+        return list(DESIGNS)
+    return [_design_name(v) for v in values]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='analyze',
+        description='Analyze and plot the neuron sweep, behavior and static power data.')
+    parser.add_argument('analysis', choices=ANALYSES, help='analysis to run')
+    parser.add_argument('--design', nargs='+', default=None,
+                        help="designs to analyze, or 'all' (default: all)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='parallel worker processes (default: one per design)')
+    parser.add_argument('--output-dir', default='.',
+                        help='directory for the figures (default: current directory)')
+    parser.add_argument('--data-dir', default=None,
+                        help="read input files from here instead of each design's directory")
+    parser.add_argument('--table', default=None,
+                        help='analyze this table instead, e.g. a neuronsim.corners table '
+                             '(optimal and static)')
+    parser.add_argument('--show', action='store_true', help='open the plot windows')
+    args = parser.parse_args(argv)
+
+    if not args.show:
+        # Workers only write image files
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.analysis == 'compare':
+        from .compare import compare_designs
+        names = STATIC_ORDER if args.design is None else _designs_argument(args.design)
+        compare_designs(names, args.output_dir, args.show, args.workers)
+        return 0
+
+    if args.analysis == 'static':
+        names = STATIC_ORDER if args.design is None else _designs_argument(args.design)
+        output_path = os.path.join(args.output_dir, 'static_power_comparison.png')
+        file_paths = [args.table] if args.table else None
+        if args.data_dir is not None and not args.table:
+            file_paths = [os.path.join(args.data_dir, os.path.basename(DESIGNS[n]['static_file']))
+                          for n in names]
+        if not run_static(names, output_path, args.show, file_paths):
+            return 1
+        print(f"Plot successfully saved to {output_path}")
+        return 0
+
+    failed = run_designs(args.analysis, _designs_argument(args.design), args.workers,
+                         args.output_dir, args.data_dir, args.show, args.table)
+    if failed:
+        print(f"\nFailed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Static power comparison of the neuron designs.
+"""
+
+import os
+
+import numpy as np
+
+from ..tables import read_table
+from .optimal import split_corners
+
+DEFAULT_STYLE = {
+    # Font settings
+    'font_family': 'Arial',
+    'font_weight': 'bold',
+
+    # Line settings
+    'line_width': 2.6,
+    'line_styles': ['-', '-', '-'],
+    'colors': ['#1f77b4', '#ff7f0e', '#2ca02c'],
+
+    # Axis settings
+    'label_size': 17,
+    'label_weight': 'bold',
+    'x_label': 'Supply Voltage (V)',
+    'y_label': 'Static Power (W)',
+
+    # Title settings
+    'title': 'Static Power Comparison of Neuron Models',
+    'title_size': 17,
+    'title_weight': 'bold',
+    'title_pad': 15,
+
+    # Legend settings
+    'legend_size': 17,
+    'legend_weight': 'bold',
+    'legend_location': 'best',
+    'legend_labels': ['SML', 'DAH', 'BLIF'],
+
+    # Tick settings
+    'tick_size': 18,
+    'tick_weight': 'bold',
+    'x_ticks': None,
+    'y_ticks': None,
+
+    # Grid settings
+    'grid_major_alpha': 0.2,
+    'grid_minor_alpha': 0.2,
+    'grid_major_style': '-',
+    'grid_minor_style': ':',
+
+    # Figure settings
+    'figure_size': (10, 6),
+    'dpi': 300,
+
+    # Plot scale settings
+    'x_scale': 'linear',
+    'y_scale': 'log',
+    'y_min': 2e-10,
+    'axis_buffer_percent': 0.05,
+    'show': True,
+}
+
+
+def read_power_data(filename):
+    """
+    Read a two-column ``VDD Static_Power`` table.
+
+    Returns:
+    --------
+    tuple : (vdd, power) numpy arrays
+    """
+    df = read_table(filename)
+    return df.iloc[:, 0].to_numpy(dtype=float), df.iloc[:, 1].to_numpy(dtype=float)
+
+
+def plot_static_power(file_paths, output_path='static_power_comparison.png', style_params=None):
+    """
+    Plot the static power of several designs against VDD on one axis.
+
+    Parameters:
+    -----------
+    file_paths : list of str
+        Static power tables, in the order of style_params['legend_labels'];
+        a corner table (see neuronsim.corners) adds one line per corner and
+        temperature
+    output_path : str
+        Where the figure is saved
+    style_params : dict
+        Overrides of DEFAULT_STYLE
+
+    Returns:
+    --------
+    bool
+        True if the figure was written
+    """
+    import matplotlib.pyplot as plt
+
+    params = dict(DEFAULT_STYLE)
+    if style_params is not None:
+        params.update(style_params)
+
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            print(f"Error: File {file_path} not found")
+            return False
+
+    try:
+        datasets = []
+        labels = []
+        for i, file_path in enumerate(file_paths):
+            df = read_table(file_path)
+            if 'Corner' not in df.columns:
+                datasets.append(read_power_data(file_path))
+                labels.append(params['legend_labels'][i])
+                continue
+            for label, group in split_corners(df):
+                datasets.append((group['VDD'].to_numpy(dtype=float),
+                                 group['Static_Power'].to_numpy(dtype=float)))
+                labels.append(label if len(file_paths) == 1
+                              else f"{params['legend_labels'][i]} {label}")
+
+        fig = plt.figure(figsize=params['figure_size'])
+        plt.rcParams['font.family'] = params['font_family']
+        plt.rcParams['font.weight'] = params['font_weight']
+
+        # Corner tables can have more lines than the style has colors
+        colors = params['colors']
+        if len(datasets) > len(colors):
+            colors = plt.get_cmap('tab20').colors
+        for i, (vdd, power) in enumerate(datasets):
+            plt.plot(vdd, power,
+                     params['line_styles'][i % len(params['line_styles'])],
+                     label=labels[i],
+                     linewidth=params['line_width'],
+                     color=colors[i % len(colors)])
+
+        plt.xscale(params['x_scale'])
+        plt.yscale(params['y_scale'])
+
+        plt.grid(True, which="major", ls=params['grid_major_style'],
+                 alpha=params['grid_major_alpha'])
+        plt.grid(True, which="minor", ls=params['grid_minor_style'],
+                 alpha=params['grid_minor_alpha'])
+
+        plt.xlabel(params['x_label'],
+                   fontsize=params['label_size'],
+                   fontweight=params['label_weight'])
+        plt.ylabel(params['y_label'],
+                   fontsize=params['label_size'],
+                   fontweight=params['label_weight'])
+        plt.title(params['title'],
+                  fontsize=params['title_size'],
+                  fontweight=params['title_weight'],
+                  pad=params['title_pad'])
+
+        legend = plt.legend(fontsize=params['legend_size'],
+                            loc=params['legend_location'])
+        plt.setp(legend.get_texts(), weight=params['legend_weight'])
+
+        plt.xticks(params['x_ticks'] if params['x_ticks'] is not None else plt.xticks()[0],
+                   fontsize=params['tick_size'],
+                   weight=params['tick_weight'])
+        plt.yticks(params['y_ticks'] if params['y_ticks'] is not None else plt.yticks()[0],
+                   fontsize=params['tick_size'],
+                   weight=params['tick_weight'])
+
+        # Axis limits with a small buffer around all datasets
+        all_x = np.concatenate([data[0] for data in datasets])
+        all_y = np.concatenate([data[1] for data in datasets])
+        x_min, x_max = np.min(all_x), np.max(all_x)
+        y_max = np.max(all_y)
+        x_buffer = (x_max - x_min) * params['axis_buffer_percent']
+        y_buffer = y_max * params['axis_buffer_percent']
+        plt.xlim(x_min - x_buffer, x_max + x_buffer)
+        plt.ylim(params['y_min'], y_max + y_buffer)
+
+        plt.tight_layout()
+        plt.savefig(output_path, dpi=params['dpi'], bbox_inches='tight')
+        if params['show']:
+            plt.show()
+        else:
+            plt.close(fig)
+        return True
+
+    except Exception as e:
+        print(f"Error occurred while plotting: {str(e)}")
+        return False
@@ -0,0 +1,138 @@
+"""
+Per-design plot styles and behavior panels.
+
+These are the style_params the per-directory scripts have always used, so
+the unified analyses reproduce the figures of the original scripts.
+"""
+
+_VOLTAGE_SWEEP_STYLE = {
+    'font_family': 'Arial',
+    'dpi': 175,
+    'line_width': 2.4,
+    'line_color1': 'darkblue',
+    'line_color2': 'darkorange',
+    'line_color3': 'darkgreen',
+    'title_size': 16,
+    'title_pad': 10,
+    'label_size': 13,
+    'tick_size': 18,
+    'grid': True,
+    'grid_style': '--',
+    'grid_alpha': 0.7,
+    'output_path': 'voltage_sweep_analysis.png'
+}
+
+_HEATMAP_STYLE = {
+    'font_family': 'Arial',
+    'dpi': 155,
+    'interpolation_points': 1000,
+    'title_size': 16,
+    'label_size': 16,
+    'tick_size': 16,
+    'colorbar_label_size': 16,
+    'title_pad': 15,
+    'shading': 'auto',
+    'xlabel': 'Reset Capacitor (fF)',
+    'ylabel': 'Membrane Capacitor (fF)',
+    'optimal_point_size': 14,
+    'render_mode': 'bounded'
+}
+
+_BEHAVIOR_STYLE = {
+    'font_family': 'Arial',
+    'dpi': 175,
+    'colors': ['#1f77b4', '#ff7f0e'],  # Blue and Orange
+    'line_width': 2.5,
+    'marker': '',
+    'xlabel': 'Time (ns)',
+    'label_size': 14,
+    'tick_size': 13,
+    'grid': True,
+    'grid_style': '--',
+    'grid_alpha': 0.7,
+    'xlim_min': 0,
+    'xlim_max': 30,
+    'output_path': 'voltage_plots_combined.png'
+}
+
+STYLES = {
+    'optimal': {
+        'besrour': dict(_VOLTAGE_SWEEP_STYLE, line_width=2.2, tick_size=16),
+        'sourikopoulos': dict(_VOLTAGE_SWEEP_STYLE),
+        # Energy, frequency, score and the "Analysis Results" report of the
+        # original dannevilleoptimal script
+        'danneville': dict(_VOLTAGE_SWEEP_STYLE, dpi=130, marker_size=8, title_size=14,
+                           label_size=12, report_vdd=[0.3],
+                           panel_order=('energy', 'frequency', 'score'), report='analysis'),
+    },
+    'heatmap': {
+        'besrour': dict(_HEATMAP_STYLE, interpolation_points=10000),
+        'sourikopoulos': dict(_HEATMAP_STYLE),
+        # Single capacitor: averaged capacitor sweep instead of a heatmap
+        'danneville': {
+            'font_family': 'Arial',
+            'dpi': 130,
+            'line_width': 2.4,
+            'line_color1': 'darkblue',
+            'line_color2': 'darkorange',
+            'line_color3': 'darkgreen',
+            'marker_size': 11,
+            'title_size': 15,
+            'title_pad': 10,
+            'label_size': 12,
+            'tick_size': 18,
+            'grid': True,
+            'grid_style': '--',
+            'grid_alpha': 0.7,
+            'output_path': 'cap_sweep_analysis.png'
+        },
+    },
+    'behavior': {
+        'besrour': dict(_BEHAVIOR_STYLE, colors=['#2ca02c', '#1f77b4', '#ff7f0e']),
+        'sourikopoulos': dict(_BEHAVIOR_STYLE),
+        'danneville': dict(_BEHAVIOR_STYLE),
+    },
+    'static': {
+        'line_width': 3.0,
+        'colors': ['#ff0000', '#00ff00', '#0000ff'],  # Red, Green, Blue
+        'title': 'Static Power Comparison of Neuron Designs',
+        'legend_location': 'upper left',
+        'grid_major_alpha': 0.3,
+        'figure_size': (8, 6),
+        'dpi': 175,
+        'label_size': 17,
+        'title_size': 17,
+        'legend_size': 17,
+        'tick_size': 18,
+    },
+}
+
+# Behavior subplots from top to bottom: (node, y-axis label)
+BEHAVIOR_PANELS = {
+    'besrour': [
+        ('net1', "Incoming Synapse\nVoltage (V)"),
+        ('net2', "Membrane\n Voltage (V)"),
+        ('net4', "Output Spikes\nVoltage (V)"),
+    ],
+    'danneville': [
+        ('net1', "Membrane\nVoltage (V)"),
+        ('net3', "Output Spikes\nVoltage (V)"),
+    ],
+    'sourikopoulos': [
+        ('net3', "Membrane\nVoltage (V)"),
+        ('net1', "Output Spikes\nVoltage (V)"),
+    ],
+}
+
+# Static power legend order
+STATIC_ORDER = ['sourikopoulos', 'danneville', 'besrour']
+
+
+def get_style(kind, design_name=None):
+    """
+    Return a copy of the default style_params of an analysis.
+    """
+    styles = STYLES[kind]
+    if design_name is None:
+        return dict(styles)
+    return dict(styles[design_name.lower()])
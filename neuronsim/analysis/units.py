@@ -0,0 +1,88 @@
+"""
+SI prefix helpers shared by all analysis plots.
+"""
+
+import numpy as np
+
+SI_PREFIXES = {
+    24: 'Y', 21: 'Z', 18: 'E', 15: 'P', 12: 'T', 9: 'G',
+    6: 'M', 3: 'k', 0: '', -3: 'm', -6: 'μ', -9: 'n',
+    -12: 'p', -15: 'f', -18: 'a', -21: 'z', -24: 'y'
+}
+
+
+def _clip_exponent(exponent):
+    return max(min(exponent, max(SI_PREFIXES)), min(SI_PREFIXES))
+
+
+def get_si_prefix(value):
+    """
+    Convert a value to its nearest SI prefix representation.
+
+    Parameters:
+    -----------
+    value : float
+        The value to convert
+
+    Returns:
+    --------
+    tuple : (scaled_value, prefix, scale)
+        scaled_value: The value scaled to its appropriate SI prefix
+        prefix: The SI prefix string
+        scale: The scale factor used
+    """
+    if value == 0 or not np.isfinite(value):
+        return value, '', 1
+
+    exponent = _clip_exponent(int(np.floor(np.log10(abs(value)) / 3) * 3))
+    scale = 10 ** exponent
+    return value / scale, SI_PREFIXES[exponent], scale
+
+
+def get_si_prefix_for_range(data):
+    """
+    Determine the most appropriate SI prefix for a range of values.
+
+    The prefix follows the mean order of magnitude of the finite values.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray
+        Array of values to analyze
+
+    Returns:
+    --------
+    tuple : (scale_factor, prefix)
+    """
+    data = np.asarray(data, dtype=float)
+    finite = data[np.isfinite(data)]
+    if len(finite) == 0:
+        return 1, ''
+
+    mean_abs = np.mean(np.abs(finite))
+    if mean_abs == 0:
+        return 1, ''
+
+    exponent = int(np.floor(np.log10(mean_abs)))
+    si_exponent = _clip_exponent(int(np.floor(exponent / 3) * 3))
+    return 10 ** si_exponent, SI_PREFIXES[si_exponent]
+
+
+def format_si(value, unit, digits=3):
+    """
+    Format a value with its SI prefix, e.g. format_si(1.5e-17, 'J') -> '15 aJ'.
+    """
+    scaled, prefix, _ = get_si_prefix(value)
+    return f'{scaled:.{digits}g} {prefix}{unit}'
+
+
+def format_tick_value(x, pos=None):
+    """
+    Format tick labels with at most 3 significant digits.
+    """
+    if x == 0:
+        return '0'
+    formatted = f'{x:.3g}'
+    if '.' in formatted and 'e' not in formatted:
+        formatted = formatted.rstrip('0').rstrip('.')
+    return formatted
@@ -0,0 +1,427 @@
+"""
+Benchmarks of the analysis pipeline on fixed synthetic datasets.
+
+The datasets are generated once (seeded, so every machine benchmarks the
+same data) into ``.benchmarks/data`` in the formats the simulations write:
+
+- sweep tables ``VDD Cap1 Cap2 Spikes Frequency Energy_Per_Spike`` of about
+  1k, 30k and 1M rows (what ``heatmaps.py`` reads), the matching VDD sweeps
+  (``optplot.py``) and single-capacitor sweeps (``danmap.py``),
+- waveforms of 1k and 1M samples as ``wrdata`` text and binary ``.raw``
+  files (``behaviorplotting.py`` and the sweep extraction).
+
+Each benchmark times one stage, loading, pivoting, interpolation, scoring
+or figure rendering, with the same library calls the scripts make, and
+reports the minimum and median of several runs. ``--save NAME`` stores the
+results as a baseline; ``--compare NAME`` flags every benchmark whose median
+got slower than the baseline by more than ``--threshold`` and exits with
+status 1 if any did.
+
+Example:
+    python -m neuronsim.benchmark --save main
+    python -m neuronsim.benchmark --compare main --sizes 1k 30k
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .designs import REPO_ROOT
+
+RESULTS_DIR = os.path.join(REPO_ROOT, '.benchmarks')
+
+# Rows of each table size as (VDD values, values per capacitor axis)
+TABLE_SIZES = {'1k': (10, 10), '30k': (30, 32), '1M': (81, 111)}
+WAVEFORM_SIZES = {'1k': 1000, '1M': 1000000}
+WAVEFORM_TSTOP = 20e-9
+WAVEFORM_VDD = 0.5
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes):
+    """
+    Register a benchmark run for each of sizes.
+
+    The decorated function does the setup for one size (with the dataset
+    directory) and returns the zero-argument callable that is timed.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, list(sizes))
+        return setup
+    return register
+
+
+def _synthetic_results(vdd, cap1, cap2, rng):
+    # Smooth trends with a few percent of noise; the lowest supplies never spike
+    load = 1 + (cap1 + 0.5 * cap2) * 1e15
+    frequency = 2e9 * vdd ** 2 / load * rng.uniform(0.97, 1.03, vdd.shape)
+    energy = 1e-15 * vdd ** 2 * (1 + (cap1 + cap2) * 1e15) * rng.uniform(0.97, 1.03, vdd.shape)
+    spikes = np.maximum(np.round(frequency * WAVEFORM_TSTOP), 1)
+    energy[vdd < 0.15] = 0
+    return spikes, frequency, energy
+
+
+def _write_sweep(path, columns, values):
+    formats = ['%d' if c == 'Spikes' else '%.6g' for c in columns]
+    np.savetxt(path, np.column_stack(values), fmt=formats, header=' '.join(columns),
+               comments='')
+
+
+def sweep_table(size, data_dir):
+    """
+    Cap1 x Cap2 x VDD sweep table of a given size, generated on first use.
+
+    Returns:
+    --------
+    str
+        Path of the table
+    """
+    path = os.path.join(data_dir, f'sweep_{size}.txt')
+    if not os.path.exists(path):
+        n_vdd, n_cap = TABLE_SIZES[size]
+        vdd, cap1, cap2 = [a.ravel() for a in np.meshgrid(
+            np.linspace(0.1, 0.9, n_vdd), np.linspace(0.1e-15, 10e-15, n_cap),
+            np.linspace(0.1e-15, 10e-15, n_cap), indexing='ij')]
+        spikes, frequency, energy = _synthetic_results(vdd, cap1, cap2, np.random.default_rng(0))
+        _write_sweep(path, ['VDD', 'Cap1', 'Cap2', 'Spikes', 'Frequency', 'Energy_Per_Spike'],
+                     [vdd, cap1, cap2, spikes, frequency, energy])
+    return path
+
+
+def vdd_table(size, data_dir):
+    """
+    VDD sweep at fixed capacitors (optplot.py) with as many rows as sweep_table().
+    """
+    path = os.path.join(data_dir, f'vdd_{size}.txt')
+    if not os.path.exists(path):
+        n_vdd, n_cap = TABLE_SIZES[size]
+        vdd = np.linspace(0.1, 0.9, n_vdd * n_cap * n_cap)
+        cap1, cap2 = np.full_like(vdd, 0.69e-15), np.full_like(vdd, 0.2e-15)
+        spikes, frequency, energy = _synthetic_results(vdd, cap1, cap2, np.random.default_rng(1))
+        _write_sweep(path, ['VDD', 'Cap1', 'Cap2', 'Spikes', 'Frequency', 'Energy_Per_Spike'],
+                     [vdd, cap1, cap2, spikes, frequency, energy])
+    return path
+
+
+def cap_table(size, data_dir):
+    """
+    Single-capacitor sweep (danmap.py) with as many rows as sweep_table().
+    """
+    path = os.path.join(data_dir, f'cap_{size}.txt')
+    if not os.path.exists(path):
+        n_vdd, n_cap = TABLE_SIZES[size]
+        vdd, cap = [a.ravel() for a in np.meshgrid(
+            np.linspace(0.1, 0.9, n_vdd), np.linspace(0.125e-15, 10e-15, n_cap * n_cap),
+            indexing='ij')]
+        spikes, frequency, energy = _synthetic_results(vdd, cap, cap, np.random.default_rng(2))
+        _write_sweep(path, ['VDD', 'Cap', 'Spikes', 'Frequency', 'Energy_Per_Spike'],
+                     [vdd, cap, spikes, frequency, energy])
+    return path
+
+
+def synthetic_waveform(samples):
+    """
+    Spiking output voltage and supply current sampled uniformly over 20 ns.
+
+    Returns:
+    --------
+    dict
+        'time', 'v(net4)' and 'i(vvdd)' arrays
+    """
+    time = np.linspace(0, WAVEFORM_TSTOP, samples)
+    # 250 MHz spikes occupying a fifth of each period, with a smooth edge
+    phase = (time * 250e6) % 1
+    v_out = WAVEFORM_VDD / (1 + np.exp(-(phase - 0.8) * 200))
+    i_vdd = -1e-6 * (0.05 + v_out / WAVEFORM_VDD)
+    return {'time': time, 'v(net4)': v_out, 'i(vvdd)': i_vdd}
+
+
+def waveform_file(size, data_dir, fmt):
+    """
+    Synthetic waveform as a wrdata text file (fmt='txt') or a .raw file.
+    """
+    path = os.path.join(data_dir, f'wave_{size}.{fmt}')
+    if not os.path.exists(path):
+        vectors = synthetic_waveform(WAVEFORM_SIZES[size])
+        if fmt == 'raw':
+            from .rawfile import write_raw
+            write_raw(path, vectors)
+        else:
+            # wrdata without wr_singlescale repeats the scale before each vector
+            columns = [vectors['time'], vectors['time'], vectors['v(net4)'],
+                       vectors['time'], vectors['i(vvdd)']]
+            np.savetxt(path, np.column_stack(columns), fmt='%.8e',
+                       header='time time v(net4) time i(vvdd)', comments='')
+    return path
+
+
+def _pivots(size, data_dir):
+    from .analysis.heatmaps import load_and_process_data
+    from .tables import parse_table
+    return load_and_process_data(parse_table(sweep_table(size, data_dir)))
+
+
+def _quiet_style(data_dir, name):
+    return {'show': False, 'dpi': 100, 'output_path': os.path.join(data_dir, f'{name}.png')}
+
+
+@benchmark('load.parse_table', TABLE_SIZES)
+def bench_parse_table(size, data_dir):
+    from .tables import parse_table
+    path = sweep_table(size, data_dir)
+    return lambda: parse_table(path)
+
+
+@benchmark('load.read_table_cached', TABLE_SIZES)
+def bench_read_table(size, data_dir):
+    from .tables import read_table
+    path = sweep_table(size, data_dir)
+    read_table(path)
+    return lambda: read_table(path)
+
+
+@benchmark('pivot.load_and_process_data', TABLE_SIZES)
+def bench_pivot(size, data_dir):
+    from .analysis.heatmaps import load_and_process_data
+    from .tables import parse_table
+    df = parse_table(sweep_table(size, data_dir))
+    return lambda: load_and_process_data(df)
+
+
+@benchmark('interpolate.pivot', TABLE_SIZES)
+def bench_interpolate(size, data_dir):
+    from .analysis.heatmaps import interpolate_data
+    frequency_pivot, _ = _pivots(size, data_dir)
+    return lambda: interpolate_data(frequency_pivot, num_points=500)
+
+
+@benchmark('score.rows', TABLE_SIZES)
+def bench_score_rows(size, data_dir):
+    from .analysis.optimal import optimization_score
+    from .tables import parse_table
+    df = parse_table(sweep_table(size, data_dir))
+    frequency, energy = df['Frequency'].values, df['Energy_Per_Spike'].values
+    return lambda: optimization_score(frequency, energy)
+
+
+@benchmark('score.surface', TABLE_SIZES)
+def bench_score_surface(size, data_dir):
+    from .analysis.heatmaps import interpolate_data
+    from .display import score_surface
+    frequency_pivot, energy_pivot = _pivots(size, data_dir)
+    z_freq = interpolate_data(frequency_pivot, num_points=500)[2]
+    z_energy = interpolate_data(energy_pivot, num_points=500)[2]
+    return lambda: score_surface(z_freq, z_energy)
+
+
+@benchmark('render.heatmaps', TABLE_SIZES)
+def bench_render_heatmaps(size, data_dir):
+    from .analysis.heatmaps import create_combined_heatmaps
+    frequency_pivot, energy_pivot = _pivots(size, data_dir)
+    style = _quiet_style(data_dir, 'heatmaps')
+    return lambda: create_combined_heatmaps(frequency_pivot, energy_pivot, style)
+
+
+@benchmark('render.optimal', TABLE_SIZES)
+def bench_render_optimal(size, data_dir):
+    from .analysis.optimal import analyze_voltage_sweeps
+    path = vdd_table(size, data_dir)
+    style = _quiet_style(data_dir, 'optimal')
+    return lambda: analyze_voltage_sweeps(path, style)
+
+
+@benchmark('render.cap_sweep', TABLE_SIZES)
+def bench_render_cap_sweep(size, data_dir):
+    from .analysis.heatmaps import analyze_cap_sweep
+    path = cap_table(size, data_dir)
+    style = _quiet_style(data_dir, 'cap_sweep')
+    return lambda: analyze_cap_sweep(path, style)
+
+
+@benchmark('load.waveform_text', WAVEFORM_SIZES)
+def bench_waveform_text(size, data_dir):
+    from .waveforms import load_waveform
+    path = waveform_file(size, data_dir, 'txt')
+    return lambda: load_waveform(path)
+
+
+@benchmark('load.waveform_raw', WAVEFORM_SIZES)
+def bench_waveform_raw(size, data_dir):
+    from .waveforms import load_waveform
+    path = waveform_file(size, data_dir, 'raw')
+    return lambda: load_waveform(path)
+
+
+@benchmark('score.extract_spikes', WAVEFORM_SIZES)
+def bench_extract_spikes(size, data_dir):
+    from .spikes import extract_spikes
+    vectors = synthetic_waveform(WAVEFORM_SIZES[size])
+    args = (vectors['time'], vectors['v(net4)'], vectors['i(vvdd)'], WAVEFORM_VDD)
+    return lambda: extract_spikes(*args, sim_time=WAVEFORM_TSTOP)
+
+
+@benchmark('render.behavior', WAVEFORM_SIZES)
+def bench_render_behavior(size, data_dir):
+    from .analysis.behavior import plot_multiple_files
+    path = waveform_file(size, data_dir, 'raw')
+    style = _quiet_style(data_dir, 'behavior')
+    return lambda: plot_multiple_files([path], ['Vout (V)'], style, nodes=['net4'])
+
+
+def time_call(func, repeat=5):
+    """
+    Time a callable repeat times after one untimed warm-up call.
+
+    Returns:
+    --------
+    dict
+        'min', 'median' and 'runs' (seconds)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+    return {'min': min(runs), 'median': statistics.median(runs), 'runs': runs}
+
+
+def run_benchmarks(names=None, sizes=None, repeat=5, data_dir=None):
+    """
+    Run the registered benchmarks.
+
+    Parameters:
+    -----------
+    names : list of str, optional
+        Substrings selecting benchmarks by name, all by default
+    sizes : list of str, optional
+        Dataset sizes to run ('1k', '30k', '1M'), all by default
+    repeat : int
+        Timed runs per benchmark
+    data_dir : str, optional
+        Dataset directory, .benchmarks/data by default
+
+    Returns:
+    --------
+    dict
+        'machine' information and 'results', 'name[size]' -> time_call() dict
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+
+    data_dir = data_dir or os.path.join(RESULTS_DIR, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    results = {}
+    for name, (setup, bench_sizes) in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        for size in bench_sizes:
+            if sizes and size not in sizes:
+                continue
+            key = f'{name}[{size}]'
+            with contextlib.redirect_stdout(io.StringIO()):
+                func = setup(size, data_dir)
+            results[key] = time_call(func, repeat)
+            print(f"{key:<40} min {results[key]['min'] * 1e3:10.2f} ms   "
+                  f"median {results[key]['median'] * 1e3:10.2f} ms")
+    machine = {'python': platform.python_version(), 'numpy': np.__version__,
+               'platform': platform.platform(), 'processor': platform.processor(),
+               'cpus': os.cpu_count(), 'time': time.strftime('%Y-%m-%d %H:%M:%S')}
+    return {'machine': machine, 'results': results}
+
+
+def baseline_path(name, results_dir=RESULTS_DIR):
+    return os.path.join(results_dir, f'{name}.json')
+
+
+def save_baseline(report, name, results_dir=RESULTS_DIR):
+    """
+    Store a run_benchmarks() report as baseline name.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    path = baseline_path(name, results_dir)
+    # Write to a temporary file first so an interrupted save keeps the old baseline
+    with tempfile.NamedTemporaryFile('w', dir=results_dir, delete=False, suffix='.tmp') as f:
+        json.dump(report, f, indent=1)
+    os.replace(f.name, path)
+    return path
+
+
+def compare(report, baseline, threshold=0.2):
+    """
+    Compare medians against a baseline report.
+
+    Returns:
+    --------
+    list of tuple
+        (benchmark, baseline median, current median, ratio) of every
+        benchmark present in both, slowest ratio first; ratios above
+        1 + threshold are regressions
+    """
+    rows = []
+    for key, current in report['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        ratio = current['median'] / previous['median'] if previous['median'] else float('inf')
+        rows.append((key, previous['median'], current['median'], ratio))
+    return sorted(rows, key=lambda row: -row[3])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analysis pipeline.')
+    parser.add_argument('-k', '--filter', nargs='+', default=None,
+                        help='run only benchmarks whose name contains one of these')
+    parser.add_argument('--sizes', nargs='+', default=None,
+                        help="dataset sizes to run (1k, 30k, 1M; default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark')
+    parser.add_argument('--save', default=None, metavar='NAME', help='store the results as baseline NAME')
+    parser.add_argument('--compare', default=None, metavar='NAME',
+                        help='flag regressions against baseline NAME')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative slowdown of the median flagged as a regression (default: 0.2)')
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help='baseline directory')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, sizes) in BENCHMARKS.items():
+            print(f"{name}: {', '.join(sizes)}")
+        return
+
+    baseline = None
+    if args.compare:
+        with open(baseline_path(args.compare, args.results_dir)) as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(args.filter, args.sizes, args.repeat,
+                            os.path.join(args.results_dir, 'data'))
+    if args.save:
+        print(f"Baseline written to {save_baseline(report, args.save, args.results_dir)}")
+
+    if baseline is not None:
+        rows = compare(report, baseline, args.threshold)
+        regressions = [row for row in rows if row[3] > 1 + args.threshold]
+        print(f"\nCompared with baseline '{args.compare}' ({baseline['machine']['time']}):")
+        for key, before, after, ratio in rows:
+            flag = '  REGRESSION' if ratio > 1 + args.threshold else ''
+            print(f"{key:<40} {before * 1e3:10.2f} ms -> {after * 1e3:10.2f} ms  "
+                  f"x{ratio:5.2f}{flag}")
+        if regressions:
+            print(f"{len(regressions)} regressions above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Convergence-failure triage for the sweep transients.
+
+The schematics set ``itl1 = 1000``, ``itl4 = 1000``, ``gmin = 1e-15`` and
+``method = gear`` for every point of a sweep. Most points converge with far
+less and a few still fail with "Timestep too small". run_chunk() in
+``neuronsim.sweep`` therefore walks a ladder of solver settings. A chunk's
+points are simulated with the first rung. When the simulator log shows a
+convergence failure (convergence_failure()), the points whose own
+transient failed (its waveform stops early, or it started, see
+started_points(), and left nothing) are simulated again with the next
+rung. Points the simulator never reached are rerun with the same rung.
+This repeats until they all have a result or the ladder runs out.
+
+The rungs (LADDER) override the schematics' ``set`` options
+(settings['solver_options'], applied by neuronsim.decks.deck_preamble):
+
+- fast: ngspice's own defaults, trapezoidal integration and few iterations,
+- deck: the schematic's options unchanged,
+- robust: second-order gear, a larger gmin and 5000 iterations,
+- rescue: as robust with gmin = 1e-10, 20000 iterations and a 2 ps maxstep.
+
+settings['ladder'] lists the rungs tried in turn: ('deck', 'robust',
+'rescue') by default, or starting with 'fast' so that easy points run
+cheaper. The rung each point's result came from is kept in the result
+store; report_rungs() counts them.
+
+Example:
+    python -m neuronsim.sweep --design besrour --ladder fast deck robust rescue \
+        --store sweeps.db
+    python -m neuronsim.convergence --store sweeps.db
+"""
+
+import argparse
+import re
+
+from .decks import POINT_MARKER
+
+LADDER = {
+    'fast': {'method': 'trap', 'gmin': '1e-12', 'itl1': 100, 'itl4': 10},
+    'deck': {},
+    'robust': {'method': 'gear', 'maxord': 2, 'gmin': '1e-12', 'itl1': 5000, 'itl4': 5000},
+    'rescue': {'method': 'gear', 'maxord': 2, 'gmin': '1e-10', 'itl1': 20000, 'itl4': 20000,
+               'maxstep': '0.002n'},
+}
+
+DEFAULT_LADDER = ('deck', 'robust', 'rescue')
+
+# ngspice messages of a failed operating point or transient
+CONVERGENCE_ERRORS = re.compile(
+    r'timestep too small|singular matrix|iteration limit reached|'
+    r'gmin stepping failed|source stepping failed|solution failed|no convergence|'
+    r'simulation\(s\) aborted',
+    re.IGNORECASE)
+
+
+def convergence_failure(log):
+    """
+    Return the first convergence-failure message in a simulator log, or None.
+    """
+    match = CONVERGENCE_ERRORS.search(log or '')
+    if match is None:
+        return None
+    start = log.rfind('\n', 0, match.start()) + 1
+    end = log.find('\n', match.end())
+    return log[start:end if end >= 0 else len(log)].strip()
+
+
+_POINT_LINE = re.compile('^' + POINT_MARKER.format(r'(\d+)') + r'\s*$', re.MULTILINE)
+
+
+def started_points(log):
+    """
+    Chunk positions of the points whose transient the simulator started.
+    """
+    return {int(k) for k in _POINT_LINE.findall(log or '')}
+
+
+def rung_settings(settings, rung):
+    """
+    Run settings with one ladder rung's solver options.
+
+    Parameters:
+    -----------
+    settings : dict
+        Run settings, see neuronsim.sweep.DEFAULT_SETTINGS
+    rung : str or None
+        Name of a LADDER rung; None leaves settings as they are
+
+    Returns:
+    --------
+    dict
+    """
+    if rung is None:
+        return settings
+    try:
+        options = LADDER[rung]
+    except KeyError:
+        raise ValueError(f"Unknown ladder rung '{rung}', expected one of: "
+                         f"{', '.join(LADDER)}") from None
+    merged = dict(settings.get('solver_options') or {})
+    merged.update(options)
+    return dict(settings, solver_options=merged)
+
+
+def report_rungs(store, design=None):
+    """
+    Print how many stored results each ladder rung produced.
+
+    Parameters:
+    -----------
+    store : ResultStore
+        Result store holding the rungs recorded by the sweeps
+    design : str, optional
+        Restrict the report to one design
+    """
+    counts = store.rung_counts(design)
+    if not counts:
+        print(f"No ladder rungs recorded in {store.path}")
+        return
+    for (name, integration), by_rung in sorted(counts.items()):
+        total = sum(by_rung.values())
+        ordered = sorted(by_rung.items(), key=lambda item: list(LADDER).index(item[0])
+                         if item[0] in LADDER else len(LADDER))
+        parts = ', '.join(f'{rung} {n} ({n / total * 100:.1f}%)' for rung, n in ordered)
+        print(f"{name} [{integration}]: {total} points: {parts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report which solver settings the stored sweep points converged with.')
+    parser.add_argument('--store', required=True, help='SQLite result store')
+    parser.add_argument('--design', default=None, help='only this design')
+    args = parser.parse_args()
+
+    from .store import ResultStore
+    with ResultStore(args.store) as store:
+        report_rungs(store, args.design)
+
+
+if __name__ == "__main__":
+    main()
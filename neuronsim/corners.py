@@ -0,0 +1,383 @@
+"""
+Process corners and temperatures derived from the typical-typical model card.
+
+Only ``asap7_TT_slvt.sp`` ships with the repository. corner_cards() derives
+the FF, SS, FS and SF cards from it by moving the gate work function
+``phig`` (threshold voltage) and the mobility ``u0`` of each device. The
+first corner letter is the NMOS and the second the PMOS corner, so FS is a
+fast NMOS with a slow PMOS. Temperatures go into the decks as ``.temp``
+lines (the ``temperature`` run setting).
+
+run_corners() runs the optimal VDD sweep, the static power measurement and
+the behavior transient of a design for every corner and temperature,
+all conditions as jobs of one process pool, and merges the VDD results into
+one table:
+
+    Corner Temperature VDD Cap1 Cap2 Spikes Frequency Energy_Per_Spike Static_Power
+
+``optplot.py <table>`` and ``staticpower.py <table>`` plot every corner
+from that table. The behavior waveforms go to one directory per condition.
+
+Example:
+    python -m neuronsim.corners --design besrour --corners TT FF SS FS SF \
+        --temperatures -40 25 125 --store corners.db -o besrour_corners.txt
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .decks import behavior_control, deck_preamble, render_deck
+from .designs import (MODEL_FILE, RESULT_COLUMNS, VDD_VALUES, data_path, get_design,
+                      parameter_columns)
+from .modelcard import card_parameters, read_card, set_parameters, write_card
+from .simulator import run_deck
+from .staticpower import measure_static
+from .store import ResultStore, model_hash, point_key, result_row
+from .sweep import DEFAULT_SETTINGS, chunk_points, run_chunk, write_table
+
+CORNERS = ('TT', 'FF', 'SS', 'FS', 'SF')
+CORNER_ANALYSES = ('optimal', 'static', 'behavior')
+
+# About 30 mV of threshold voltage and 5% of mobility between corners
+PHIG_SHIFT = 0.03
+U0_SPREAD = 0.05
+
+_SPEED = {'F': 1, 'T': 0, 'S': -1}
+
+
+def corner_changes(corner, nominal, phig_shift=PHIG_SHIFT, u0_spread=U0_SPREAD):
+    """
+    Parameter changes of one corner.
+
+    Parameters:
+    -----------
+    corner : str
+        Two letters out of F, T and S: NMOS then PMOS
+    nominal : dict
+        card_parameters() of the TT card
+
+    Returns:
+    --------
+    dict
+        Model name -> {'phig': ..., 'u0': ...}
+    """
+    corner = corner.upper()
+    if len(corner) != 2 or any(c not in _SPEED for c in corner):
+        raise ValueError(f"Unknown corner '{corner}', expected e.g. {', '.join(CORNERS)}")
+    changes = {}
+    for model, params in nominal.items():
+        nmos = int(params.get('type', 1)) == 1
+        speed = _SPEED[corner[0] if nmos else corner[1]]
+        # A faster device has a smaller |Vth|: lower phig for NMOS, higher for PMOS
+        direction = -1 if nmos else 1
+        changes[model] = {'phig': params['phig'] + direction * speed * phig_shift,
+                          'u0': params['u0'] * (1 + speed * u0_spread)}
+    return changes
+
+
+def corner_cards(corners=CORNERS, model_dir='corner_models', phig_shift=PHIG_SHIFT,
+                 u0_spread=U0_SPREAD):
+    """
+    Write the model card of every corner; TT is the shipped card itself.
+
+    Returns:
+    --------
+    dict
+        Corner -> model card path
+    """
+    text = read_card()
+    nominal = card_parameters(text)
+    paths = {}
+    for corner in corners:
+        corner = corner.upper()
+        if corner == 'TT':
+            paths[corner] = MODEL_FILE
+            continue
+        card = set_parameters(text, corner_changes(corner, nominal, phig_shift, u0_spread))
+        path = os.path.abspath(os.path.join(model_dir, f'asap7_{corner}_slvt.sp'))
+        paths[corner] = write_card(card, path)
+    return paths
+
+
+def optimal_caps(design):
+    """
+    Capacitor values of a design's shipped optimal VDD sweep (1 fF if absent).
+    """
+    columns = parameter_columns(design)[1:]
+    try:
+        from .tables import read_table
+        first = read_table(data_path(design, 'optimal_file')).iloc[0]
+        return [float(first[c]) for c in columns]
+    except (OSError, KeyError, IndexError):
+        return [1e-15] * len(columns)
+
+
+def run_static(job):
+    """
+    Simulate one condition's static power deck.
+
+    Returns:
+    --------
+    dict
+        'condition', 'rows' ((VDD, power) pairs), 'returncode' and 'log'
+    """
+    rows, returncode, log = measure_static(job['design'], job['vdd_values'], job['settings'],
+                                           job['directory'], job['simulator'],
+                                           job.get('timeout'))
+    return {'condition': job['condition'], 'rows': rows, 'returncode': returncode, 'log': log}
+
+
+def run_behavior(job):
+    """
+    Simulate one condition's behavior transient into its own directory.
+    """
+    design = get_design(job['design'])
+    directory = job['directory']
+    os.makedirs(directory, exist_ok=True)
+    netlist_lines, options = deck_preamble(design, job['settings'])
+    deck = os.path.join(directory, 'behavior.cir')
+    with open(deck, 'w') as f:
+        f.write(render_deck(netlist_lines, behavior_control(design, job['point'],
+                                                            job['settings'], options),
+                            title=f"{job['design']} behavior {_condition_name(*job['condition'])}"))
+    returncode, log = run_deck(deck, simulator=job['simulator'], cwd=directory,
+                               timeout=job.get('timeout'))
+    return {'condition': job['condition'], 'directory': directory, 'returncode': returncode,
+            'log': log}
+
+
+def _condition_name(corner, temperature):
+    return f'{corner}_{temperature:g}C'
+
+
+def run_corners(design, corners=CORNERS, temperatures=(25,), analyses=CORNER_ANALYSES,
+                vdd_values=None, caps=None, behavior_vdd=0.3, workers=None, simulator=None,
+                settings=None, store=None, output=None, work_dir='corner_runs',
+                model_dir='corner_models', chunk_size=None, timeout=None):
+    """
+    Run a design's analyses at every corner and temperature in parallel.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    corners : list of str
+        Corners, see corner_changes()
+    temperatures : list of float
+        Circuit temperatures (degrees C)
+    analyses : list of str
+        Any of 'optimal' (VDD sweep at fixed capacitors), 'static' and
+        'behavior'
+    vdd_values : list of float, optional
+        Supply voltages of the optimal and static analyses, 0.1 V to 0.9 V
+        by default
+    caps : list of float, optional
+        Capacitor values of the optimal sweep and behavior transient, one per
+        capacitor; those of the shipped optimal sweep by default
+    behavior_vdd : float
+        Supply voltage of the behavior transient
+    workers : int, optional
+        Concurrent simulator processes, defaults to the CPU count
+    simulator : str or list, optional
+        Simulator command
+    settings : dict, optional
+        Overrides for neuronsim.sweep.DEFAULT_SETTINGS
+    store : str or ResultStore, optional
+        Result store for the optimal sweep points
+    output : str, optional
+        Merged table path
+    work_dir : str
+        Directory of the static and behavior runs (one per condition)
+    model_dir : str
+        Directory of the derived corner cards
+    chunk_size : int, optional
+        Optimal sweep points per job
+    timeout : float, optional
+        Per-job simulator timeout in seconds
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Corner, Temperature, the swept parameters and the results of every
+        analysis run ('Static_Power' joined on VDD)
+    """
+    design_def = get_design(design)
+    columns = parameter_columns(design_def)
+    corners = [c.upper() for c in corners]
+    unknown = [a for a in analyses if a not in CORNER_ANALYSES]
+    if unknown:
+        raise ValueError(f"Unknown analyses: {', '.join(unknown)}")
+    vdd_values = list(vdd_values) if vdd_values is not None else VDD_VALUES
+    caps = list(caps) if caps is not None else optimal_caps(design_def)
+    caps = caps + caps[-1:] * (len(columns) - 1 - len(caps))
+    workers = workers or os.cpu_count() or 1
+
+    run_settings = dict(DEFAULT_SETTINGS)
+    if settings:
+        run_settings.update(settings)
+    run_settings['segment'] = None
+    if run_settings['backend'] == 'shared':
+        run_settings['extraction'] = 'numpy'
+
+    cards = corner_cards(corners, model_dir)
+    conditions = list(itertools.product(corners, temperatures))
+    condition_settings = {(c, t): dict(run_settings, model_file=cards[c], temperature=t)
+                          for c, t in conditions}
+    points = [dict(zip(columns, [vdd] + caps)) for vdd in vdd_values]
+    os.makedirs(work_dir, exist_ok=True)
+
+    own_store = isinstance(store, str)
+    if own_store:
+        store = ResultStore(store)
+    values = {}
+    keys = {}
+    if store is not None and 'optimal' in analyses:
+        for condition, condition_set in condition_settings.items():
+            digest = model_hash(condition_set['model_file'])
+            for i, point in enumerate(points):
+                keys[condition + (i,)] = point_key(design, point, condition_set, digest)
+        found = store.lookup(list(keys.values()))
+        values = {k: found[key] for k, key in keys.items() if key in found}
+        print(f"{len(values)} of {len(keys)} corner sweep points already in {store.path}")
+
+    # Optimal sweeps in chunks, static and behavior as one job per condition
+    jobs = []
+    size = chunk_size or max(1, -(-len(points) * len(conditions) // (workers * 2)))
+    for condition, condition_set in condition_settings.items():
+        name = _condition_name(*condition)
+        directory = os.path.join(work_dir, f'{design}_{name}')
+        if 'optimal' in analyses:
+            pending = [i for i in range(len(points)) if condition + (i,) not in values]
+            for chunk in chunk_points(pending, size):
+                jobs.append((run_chunk, {
+                    'design': design, 'points': [points[i] for i in chunk], 'indices': chunk,
+                    'condition': condition, 'index': len(jobs), 'work_dir': work_dir,
+                    'settings': condition_set, 'simulator': simulator, 'timeout': timeout,
+                    'keep': False,
+                }))
+        if 'static' in analyses:
+            jobs.append((run_static, {
+                'design': design, 'condition': condition, 'vdd_values': vdd_values,
+                'directory': os.path.join(directory, 'static'), 'settings': condition_set,
+                'simulator': simulator, 'timeout': timeout,
+            }))
+        if 'behavior' in analyses:
+            point = dict(zip(columns, [behavior_vdd] + caps))
+            jobs.append((run_behavior, {
+                'design': design, 'condition': condition, 'point': point,
+                'directory': os.path.join(directory, 'behavior'), 'settings': condition_set,
+                'simulator': simulator, 'timeout': timeout,
+            }))
+
+    print(f"Running {len(jobs)} {design} jobs for {len(conditions)} corner/temperature "
+          f"conditions on {workers} workers")
+    start = time.time()
+    static = {}
+    behavior = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(func, job): (func, job) for func, job in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                func, job = futures[future]
+                result = future.result()
+                if func is run_chunk:
+                    completed = {job['condition'] + (i,): tuple(row[-len(RESULT_COLUMNS):])
+                                 for i, row in zip(job['indices'], result['rows'])
+                                 if row is not None}
+                    values.update(completed)
+                    if store is not None and completed:
+                        store.insert([(keys[k], v) for k, v in completed.items()])
+                elif func is run_static:
+                    static[job['condition']] = dict(result['rows'])
+                else:
+                    behavior[job['condition']] = result['directory']
+                if result['returncode'] != 0:
+                    print(f"Warning: {func.__name__} for {_condition_name(*job['condition'])} "
+                          f"exited with status {result['returncode']}")
+                if done % max(1, len(jobs) // 10) == 0 or done == len(jobs):
+                    print(f"{done}/{len(jobs)} jobs ({time.time() - start:.1f} s)")
+    finally:
+        if own_store:
+            store.close()
+
+    rows = []
+    for condition in conditions:
+        powers = {round(v, 9): p for v, p in static.get(condition, {}).items()}
+        for i, point in enumerate(points):
+            row = list(condition)
+            if 'optimal' in analyses:
+                if condition + (i,) not in values:
+                    continue
+                row += result_row(design, point, values[condition + (i,)])
+            else:
+                row.append(point['VDD'])
+            if 'static' in analyses:
+                row.append(powers.get(round(point['VDD'], 9), float('nan')))
+            rows.append(row)
+    table_columns = ['Corner', 'Temperature']
+    table_columns += columns + RESULT_COLUMNS if 'optimal' in analyses else ['VDD']
+    if 'static' in analyses:
+        table_columns.append('Static_Power')
+    df = pd.DataFrame(rows, columns=table_columns)
+    if 'Spikes' in df:
+        df['Spikes'] = df['Spikes'].astype(int)
+
+    for condition, directory in sorted(behavior.items()):
+        print(f"Behavior waveforms of {_condition_name(*condition)}: {directory}")
+    if output:
+        write_table(df, output)
+        print(f"Results written to {output}")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a neuron design at process corners and temperatures.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--corners', nargs='+', default=list(CORNERS), help='corners (default: all five)')
+    parser.add_argument('--temperatures', type=float, nargs='+', default=[25.0],
+                        help='circuit temperatures in degrees C (default: 25)')
+    parser.add_argument('--analyses', nargs='+', choices=CORNER_ANALYSES,
+                        default=list(CORNER_ANALYSES), help='analyses to run (default: all)')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages')
+    parser.add_argument('--caps', type=float, nargs='+', default=None,
+                        help='capacitor values (default: those of the shipped optimal sweep)')
+    parser.add_argument('--behavior-vdd', type=float, default=0.3,
+                        help='supply voltage of the behavior transient (default: 0.3)')
+    parser.add_argument('--tstop', default=None, help='transient stop time (e.g. 20n)')
+    parser.add_argument('--static-mode', choices=['dc', 'tran'], default=None,
+                        help='static power from one dc sweep (default) or a transient per VDD')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent simulator processes')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--work-dir', default='corner_runs', help='static and behavior run directories')
+    parser.add_argument('--model-dir', default='corner_models', help='directory of the corner cards')
+    parser.add_argument('--store', default=None, help='SQLite result store for the sweep points')
+    parser.add_argument('-o', '--output', default=None, help='merged corner table')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+    settings = {}
+    if args.tstop:
+        settings['tstop'] = args.tstop
+    if args.static_mode:
+        settings['static_mode'] = args.static_mode
+
+    design = args.design.lower()
+    output = args.output or f'{design}_corners.txt'
+    run_corners(design, corners=args.corners, temperatures=args.temperatures,
+                analyses=args.analyses, vdd_values=args.vdd, caps=args.caps,
+                behavior_vdd=args.behavior_vdd, workers=args.workers, simulator=simulator,
+                settings=settings, store=args.store, output=output, work_dir=args.work_dir,
+                model_dir=args.model_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+"""
+Netlist generation for the sweep, behavior and static analyses.
+
+The nine schematics in ``SimulationModeling`` repeat the same circuit and
+the same ``.control`` options (maxstep, gear, gmin, itl1/itl4, num_threads)
+around hand-typed ``foreach`` lists and output paths on one user's Desktop.
+Here the circuit and the options are extracted once from a design's sweep
+schematic (deck_preamble) and combined with a generated control block:
+
+- sweep: one transient per grid point, spikes counted in the deck or
+  waveforms dumped for ``neuronsim.spikes`` (sweep_control); with
+  warm_start every point after the first starts from the capacitor
+  voltages at the end of the previous point's transient,
+- behavior: one transient whose node voltages are written with ``wrdata``
+  to ``<node>_data.txt`` (behavior_control),
+- static: Isyn = 0 and the supply power -v(vdd!)*i(Vvdd) read as a vector
+  from one ``dc`` sweep of Vvdd (or an ``op`` solve per VDD when the
+  supplies are not evenly spaced); static_mode='tran' keeps the original
+  transient per VDD averaged over its last 20% of time points
+  (static_control).
+
+Every output file is written next to the deck. write_decks() splits a grid
+into slices and writes one minimal deck per slice, so each parallel worker
+only simulates its own part of the grid.
+
+Example:
+    python -m neuronsim.decks --design besrour --analysis sweep --slices 24 \
+        --output-dir besrour_decks
+"""
+
+import argparse
+import math
+import os
+
+from .designs import (MODEL_FILE, RESULT_COLUMNS, VDD_VALUES, get_design,
+                      parameter_columns, schematic_path)
+from .netlist import netlist_schematic, split_commands
+from .spice import format_spice_number, parse_spice_number
+
+ANALYSES = ('sweep', 'behavior', 'static')
+
+RESULTS_FILE = 'results.txt'
+STATIC_FILE = 'static_power.txt'
+WAVEFORM_FILES = {'raw': 'wave{:05d}.raw', 'ascii': 'wave{:05d}.txt'}
+
+STATIC_MODES = ('dc', 'tran')
+
+# Console line printed before each sweep point's transient
+POINT_MARKER = 'Simulating point {}'
+
+
+def deck_preamble(design, settings):
+    """
+    Extract the circuit and simulator options from a design's schematic.
+
+    The COMMANDS block of the schematic supplies the netlist lines (model
+    include, fin parameters, supplies, initial conditions) and the ``set``
+    options of its control block; the swept loops and output paths are
+    dropped. settings['model_file'] replaces the included model card,
+    settings['temperature'] (degrees C) adds a ``.temp`` line and
+    settings['solver_options'] ({name: value}, see neuronsim.convergence)
+    replaces or adds ``set`` options.
+
+    Returns:
+    --------
+    tuple : (netlist_lines, option_lines)
+    """
+    netlist = netlist_schematic(schematic_path(design))
+    commands, control = split_commands(netlist['commands'][0])
+
+    lines = list(netlist['devices'])
+    for line in commands:
+        lowered = line.lower()
+        if lowered.startswith('.include'):
+            line = f'.include "{settings.get("model_file") or MODEL_FILE}"'
+        elif lowered.startswith('.param nffins'):
+            line = f".param NFFins={settings['nffins']}"
+        elif lowered.startswith('.param nfnfins'):
+            line = f".param NFNFins={settings['nfnfins']}"
+        lines.append(line)
+    if settings.get('temperature') is not None:
+        lines.append(f".temp {format_spice_number(settings['temperature'])}")
+
+    options = []
+    for line in control:
+        if not line.lower().startswith('set '):
+            continue
+        if line.lower().replace(' ', '').startswith('setnum_threads'):
+            line = f"set num_threads = {settings['threads']}"
+        options.append(line)
+    overrides = {name.lower(): value
+                 for name, value in (settings.get('solver_options') or {}).items()}
+    for i, line in enumerate(options):
+        name = line[4:].split('=')[0].strip().lower()
+        if name in overrides:
+            options[i] = f'set {name} = {overrides.pop(name)}'
+    options.extend(f'set {name} = {value}' for name, value in overrides.items())
+    return lines, options
+
+
+def spike_measurement(node, tstop):
+    """
+    Control lines counting spikes on node and integrating supply energy.
+
+    This is the hysteresis loop of the original decks: a spike starts when
+    the output rises above vth and ends when it falls below low_th.
+    """
+    return [
+        'let power_vdd = -1*v(vdd!)*i(Vvdd)',
+        'let dt = time[1] - time[0]',
+        'let i = 0',
+        'let count = 0',
+        'let last_state = 0',
+        'let spike_energy = 0',
+        'let current_spike_energy = 0',
+        f'dowhile i < length(v({node}))-1',
+        f'    if (v({node})[i] gt $&vth and last_state eq 0)',
+        '        let count = count + 1',
+        '        let last_state = 1',
+        '        let current_spike_energy = 0',
+        '    end',
+        '    if (last_state eq 1)',
+        '        let current_spike_energy = current_spike_energy + power_vdd[i] * $&dt',
+        '    end',
+        f'    if (v({node})[i] lt $&low_th)',
+        '        if (last_state eq 1)',
+        '            let spike_energy = spike_energy + current_spike_energy',
+        '        end',
+        '        let last_state = 0',
+        '    end',
+        '    let i = i + 1',
+        'end',
+        'let spike_count = count',
+        f'let spiking_freq = spike_count / {format_spice_number(tstop)}',
+        'let energy_per_spike = spike_energy / (spike_count + (spike_count eq 0))',
+    ]
+
+
+def static_measurement():
+    """
+    Control lines averaging supply power over the last 20% of the time points.
+    """
+    return [
+        'let power_vdd = -1*v(vdd!)*i(Vvdd)',
+        'let n_points = length(power_vdd)',
+        'let start_idx = n_points - floor(n_points/5)',
+        'let i = $&start_idx',
+        'let sum_power = 0',
+        'dowhile i < n_points',
+        '    let sum_power = sum_power + power_vdd[i]',
+        '    let i = i + 1',
+        'end',
+        'let static_power = sum_power / (n_points - $&start_idx)',
+    ]
+
+
+def _set_caps(design, point):
+    return [f'alter {device} = {format_spice_number(point[column])}'
+            for column, device in design['capacitors'].items()]
+
+
+GROUND_NODES = ('0', 'gnd', 'gnd!')
+
+
+def capacitor_nodes(design):
+    """
+    Terminal nodes of a design's swept capacitors.
+
+    Returns:
+    --------
+    dict
+        Capacitor device -> (positive node, negative node), a ground node
+        given as None
+    """
+    devices = {device.lower(): device for device in design['capacitors'].values()}
+    nodes = {}
+    for line in netlist_schematic(schematic_path(design))['devices']:
+        fields = line.split()
+        if len(fields) >= 3 and fields[0].lower() in devices:
+            nodes[devices[fields[0].lower()]] = tuple(
+                None if node.lower() in GROUND_NODES else node for node in fields[1:3])
+    return nodes
+
+
+def warm_start_lines(nodes, cold, last=False):
+    """
+    Control lines carrying the capacitor voltages from one transient to the next.
+
+    Before the first point (cold) every swept capacitor's initial voltage is
+    reset to 0, the state the schematics' ``.ic`` lines start from, so a
+    session reused across chunks starts each one alike. After a transient
+    the voltage across each capacitor at its last time point becomes the
+    capacitor's ``ic``, used by the next ``tran ... UIC``. nodes are the
+    capacitor_nodes() of the design.
+
+    Returns:
+    --------
+    tuple : (before, after)
+        Lines preceding and following the transient of a point; after is
+        empty for the last point
+    """
+    before = [f'alter {device} ic=0' for device in nodes] if cold else []
+    after = []
+    if not last:
+        for device, (positive, negative) in nodes.items():
+            terms = [f'v({positive})' if positive else '0']
+            if negative:
+                terms.append(f'v({negative})')
+            name = f'warm_{device.lower()}'
+            after.append(f"let {name} = {' - '.join(terms)}")
+            after.append(f'let {name} = {name}[length({name})-1]')
+            after.append(f'alter {device} ic=$&{name}')
+    return before, after
+
+
+def sweep_control(design, points, settings, options):
+    """
+    Control lines simulating a list of grid points.
+
+    With numpy extraction each point's waveforms go to a binary raw file
+    (or a wrdata text file for waveform_format='ascii') numbered by
+    position in the list; with ngspice extraction the deck
+    counts spikes itself and appends a row to RESULTS_FILE. Either way a
+    console line ('Wrote wave00000.raw' or the decks' 'At VDD=...' line)
+    marks every finished point, and POINT_MARKER every started one. With
+    settings['warm_start'] each point after the first starts from the
+    previous point's final capacitor voltages (warm_start_lines()) and runs
+    for settings['warm_tstop'] only; settings['warm_chain'] = False starts
+    every point cold instead.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    points : list of dict
+        Grid points to simulate
+    settings : dict
+        Run settings, see neuronsim.sweep.DEFAULT_SETTINGS
+    options : list of str
+        Option lines from deck_preamble()
+
+    Returns:
+    --------
+    list of str
+    """
+    columns = parameter_columns(design)
+    tstop = parse_spice_number(str(settings['tstop']))
+    in_deck = settings['extraction'] == 'ngspice'
+
+    raw = settings.get('waveform_format', 'raw') == 'raw' and not in_deck
+    control = [line for line in options
+               if not (raw and line.replace(' ', '').lower().startswith('setfiletype'))]
+    if raw:
+        # The schematics ask for ascii raw files; the reader maps binary ones
+        control.append('set filetype=binary')
+    for option in ('wr_vecnames', 'wr_singlescale'):
+        if not any(line.split()[-1] == option for line in control):
+            control.append(f'set {option}')
+    if in_deck:
+        control.append(f"echo {' '.join(columns + RESULT_COLUMNS)} > {RESULTS_FILE}")
+    control.append(f"alter Isyn = {settings['isyn']}")
+    warm = settings.get('warm_start')
+    if warm:
+        if in_deck:
+            raise ValueError("warm_start needs the Python spike extraction (extraction='numpy')")
+        nodes = capacitor_nodes(design)
+    chain = warm and settings.get('warm_chain', True)
+    for k, point in enumerate(points):
+        vdd = format_spice_number(point['VDD'])
+        control.append(f"* {' '.join(f'{c}={format_spice_number(point[c])}' for c in columns)}")
+        control.append(f'alter Vvdd dc={vdd}')
+        control.extend(_set_caps(design, point))
+        if in_deck:
+            control.append(f'let vth = 0.2 * {vdd}')
+            control.append(f'let low_th = 0.05 * {vdd}')
+        chained = chain and k > 0
+        before, after = (warm_start_lines(nodes, not chained,
+                                          not chain or k == len(points) - 1) if warm
+                         else ([], []))
+        control.extend(before)
+        tstop_point = settings['warm_tstop'] if chained else settings['tstop']
+        control.append(f'echo {POINT_MARKER.format(k)}')
+        control.append(f"tran {settings['tstep']} {tstop_point} UIC")
+        if in_deck:
+            control.extend(spike_measurement(design['output_node'], tstop))
+            values = ' '.join(format_spice_number(point[c]) for c in columns)
+            control.append(f'echo {values} $&spike_count $&spiking_freq '
+                           f'$&energy_per_spike >> {RESULTS_FILE}')
+            # Console line of the original decks, read by neuronsim.stream
+            labels = ' '.join(f'{c}={format_spice_number(point[c])} {"V" if c == "VDD" else "F"}'
+                              for c in columns)
+            control.append(f'echo At {labels} Spikes=$&spike_count Spikes '
+                           f'Freq=$&spiking_freq Hz Energy/Spike=$&energy_per_spike J')
+        else:
+            waveform = WAVEFORM_FILES['raw' if raw else 'ascii'].format(k)
+            control.append(f"{'write' if raw else 'wrdata'} {waveform} "
+                           f"v({design['output_node']}) i(Vvdd)")
+            control.append(f'echo Wrote {waveform}')
+        control.extend(after)
+        control.append('destroy all')
+    return control
+
+
+def behavior_control(design, point, settings, options, nodes=None):
+    """
+    Control lines of one transient writing node voltages for the behavior plots.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    point : dict
+        VDD and capacitor values of the transient
+    settings : dict
+        Run settings (isyn, tstep, behavior_tstop); the transient runs for
+        behavior_tstop, 30 ns like the *Plotting.sch decks, not the sweep's
+        tstop
+    options : list of str
+        Option lines from deck_preamble()
+    nodes : list of str, optional
+        Nodes to write, the design's behavior_nodes by default; node n goes
+        to n_data.txt as in the behavior data directories
+    """
+    control = list(options)
+    control.append(f"alter Isyn = {settings['isyn']}")
+    control.extend(_set_caps(design, point))
+    control.append(f"alter Vvdd dc={format_spice_number(point['VDD'])}")
+    control.append(f"tran {settings['tstep']} {settings['behavior_tstop']} UIC")
+    for node in nodes or design['behavior_nodes']:
+        control.append(f'wrdata {node}_data.txt time v({node})')
+    return control
+
+
+def _sweep_range(values):
+    # (start, stop, step) of evenly spaced increasing values, None otherwise
+    if len(values) < 2:
+        return None
+    step = values[1] - values[0]
+    if step <= 0 or any(abs(b - a - step) > 1e-9 for a, b in zip(values, values[1:])):
+        return None
+    return values[0], values[-1], step
+
+
+def static_control(design, vdd_values, settings, options, cap=None):
+    """
+    Control lines measuring the static power of a design at each VDD.
+
+    The synaptic current is switched off and every capacitor is set to cap,
+    by default the design's 'static_cap' (the value its *Static.sch uses).
+    With settings['static_mode'] = 'dc' (the default) the supply power is
+    computed as one vector over a ``dc`` sweep of Vvdd and written to
+    STATIC_FILE with ``wrdata``; 'tran' runs the original transient per VDD
+    and appends rows of the 'VDD Static_Power' table. read_static_power()
+    reads either. options are the option lines from deck_preamble().
+    """
+    mode = settings.get('static_mode', 'dc')
+    if mode not in STATIC_MODES:
+        raise ValueError(f"Unknown static mode '{mode}', expected one of: "
+                         f"{', '.join(STATIC_MODES)}")
+    if cap is None:
+        cap = design['static_cap']
+    if mode == 'dc':
+        return _static_dc_control(design, list(vdd_values), options, cap)
+
+    control = list(options)
+    control.append(f'echo VDD Static_Power > {STATIC_FILE}')
+    control.append('alter Isyn = 0')
+    control.extend(_set_caps(design, {c: cap for c in design['capacitors']}))
+    for vdd in vdd_values:
+        vdd = format_spice_number(vdd)
+        control.append(f'alter Vvdd dc={vdd}')
+        control.append(f"tran {settings['tstep']} {settings['tstop']} UIC")
+        control.extend(static_measurement())
+        control.append(f'echo {vdd} $&static_power >> {STATIC_FILE}')
+        control.append(f'echo At VDD={vdd} V Static_Power=$&static_power W')
+        control.append('destroy all')
+    return control
+
+
+def _static_dc_control(design, vdd_values, options, cap):
+    control = list(options)
+    control.append('alter Isyn = 0')
+    control.extend(_set_caps(design, {c: cap for c in design['capacitors']}))
+    sweep = _sweep_range([float(v) for v in vdd_values])
+    if sweep is not None:
+        for option in ('wr_vecnames', 'wr_singlescale'):
+            if not any(line.split()[-1] == option for line in control):
+                control.append(f'set {option}')
+        start, stop, step = (format_spice_number(round(v, 12)) for v in sweep)
+        control.append(f'dc Vvdd {start} {stop} {step}')
+        control.append('let static_power = -1*v(vdd!)*i(Vvdd)')
+        control.append(f'wrdata {STATIC_FILE} static_power')
+        control.append(f'echo Static power of {len(vdd_values)} supplies written to {STATIC_FILE}')
+        return control
+
+    # Unevenly spaced supplies: one operating point each
+    control.append(f'echo VDD Static_Power > {STATIC_FILE}')
+    for vdd in vdd_values:
+        vdd = format_spice_number(vdd)
+        control.append(f'alter Vvdd dc={vdd}')
+        control.append('op')
+        control.append('let static_power = -1*v(vdd!)*i(Vvdd)')
+        control.append(f'echo {vdd} $&static_power >> {STATIC_FILE}')
+        control.append(f'echo At VDD={vdd} V Static_Power=$&static_power W')
+        control.append('destroy all')
+    return control
+
+
+def read_static_power(path):
+    """
+    Read the static power written by a static deck.
+
+    Parameters:
+    -----------
+    path : str
+        STATIC_FILE of a static deck: the 'VDD Static_Power' table of the
+        transient and operating-point modes, or the wrdata columns
+        (sweep scale, power) of the dc mode
+
+    Returns:
+    --------
+    list of tuple
+        (VDD, static power) pairs in file order
+    """
+    rows = []
+    with open(path) as f:
+        next(f, None)
+        for line in f:
+            fields = line.split()
+            if len(fields) < 2:
+                continue
+            try:
+                rows.append((float(fields[0]), float(fields[-1])))
+            except ValueError:
+                continue
+    return rows
+
+
+def render_deck(netlist_lines, control, title=''):
+    """
+    Assemble a netlist from circuit lines and a control block.
+    """
+    return (f'* {title}\n' + '\n'.join(netlist_lines) + '\n.control\n' +
+            '\n'.join('    ' + line for line in control) + '\n.endc\n.end\n')
+
+
+def write_chunk_deck(design, points, path, settings, title=''):
+    """
+    Write the netlist simulating one chunk of grid points (see sweep_control()).
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    points : list of dict
+        Grid points of the chunk
+    path : str
+        Output netlist path; results are written next to it
+    settings : dict
+        Run settings, see neuronsim.sweep.DEFAULT_SETTINGS
+    title : str
+        Title line of the netlist
+    """
+    netlist_lines, options = deck_preamble(design, settings)
+    with open(path, 'w') as f:
+        f.write(render_deck(netlist_lines, sweep_control(design, points, settings, options),
+                            title))
+
+
+def write_decks(design_name, analysis, output_dir, points=None, vdd_values=None,
+                slices=1, settings=None):
+    """
+    Write the decks of one analysis, the grid split into slices.
+
+    Parameters:
+    -----------
+    design_name : str
+        Design name
+    analysis : str
+        'sweep', 'behavior' or 'static'
+    output_dir : str
+        Directory receiving one subdirectory per deck
+    points : list of dict, optional
+        Grid points; sweep: the design's full grid by default, behavior: the
+        first point is simulated
+    vdd_values : list of float, optional
+        Supply voltages of the static analysis, 0.1 V to 0.9 V by default
+    slices : int
+        Number of decks the grid is split into (sweep and static)
+    settings : dict, optional
+        Overrides for neuronsim.sweep.DEFAULT_SETTINGS
+
+    Returns:
+    --------
+    list of str
+        Paths of the written decks
+    """
+    from .sweep import DEFAULT_SETTINGS, build_grid, chunk_points
+
+    if analysis not in ANALYSES:
+        raise ValueError(f"Unknown analysis '{analysis}', expected one of: "
+                         f"{', '.join(ANALYSES)}")
+    design = get_design(design_name)
+    run_settings = dict(DEFAULT_SETTINGS)
+    run_settings.update(settings or {})
+    netlist_lines, options = deck_preamble(design, run_settings)
+
+    if analysis == 'sweep':
+        points = points if points is not None else build_grid(design)
+        parts = chunk_points(points, max(1, math.ceil(len(points) / slices)))
+        controls = [sweep_control(design, part, run_settings, options) for part in parts]
+    elif analysis == 'static':
+        values = vdd_values if vdd_values is not None else VDD_VALUES
+        parts = chunk_points(list(values), max(1, math.ceil(len(values) / slices)))
+        controls = [static_control(design, part, run_settings, options) for part in parts]
+    else:
+        if not points:
+            raise ValueError("The behavior analysis needs a grid point")
+        controls = [behavior_control(design, points[0], run_settings, options)]
+
+    paths = []
+    for n, control in enumerate(controls):
+        directory = os.path.join(output_dir, f'{analysis}{n:03d}')
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{design_name.lower()}_{analysis}.cir')
+        title = f'{design_name.lower()} {analysis} deck {n + 1}/{len(controls)}'
+        with open(path, 'w') as f:
+            f.write(render_deck(netlist_lines, control, title))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate ngspice decks for a neuron design.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--analysis', choices=ANALYSES, default='sweep', help='deck type')
+    parser.add_argument('--slices', type=int, default=1,
+                        help='split the grid into this many decks (sweep and static)')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages')
+    parser.add_argument('--caps', type=float, nargs='+', default=None,
+                        help='capacitor values (one per capacitor for behavior decks)')
+    parser.add_argument('--isyn', default=None, help='synaptic current (e.g. 100n)')
+    parser.add_argument('--tstop', default=None, help='transient stop time (default: 20n, 30n for behavior decks)')
+    parser.add_argument('--extraction', choices=['numpy', 'ngspice'], default='ngspice',
+                        help='sweep decks count spikes themselves (default) or dump waveforms')
+    parser.add_argument('--static-mode', choices=STATIC_MODES, default=None,
+                        help='static decks: one dc sweep (default) or a transient per VDD')
+    parser.add_argument('--output-dir', default='decks', help='directory for the decks')
+    args = parser.parse_args()
+
+    from .sweep import build_grid
+
+    design = get_design(args.design)
+    settings = {'extraction': args.extraction}
+    if args.isyn:
+        settings['isyn'] = args.isyn
+    if args.tstop:
+        settings['behavior_tstop' if args.analysis == 'behavior' else 'tstop'] = args.tstop
+    if args.static_mode:
+        settings['static_mode'] = args.static_mode
+    points = None
+    if args.analysis == 'sweep':
+        points = build_grid(design, vdd_values=args.vdd, cap_values=args.caps)
+    elif args.analysis == 'behavior':
+        caps = args.caps or [2e-15]
+        caps = caps + caps[-1:] * (len(design['capacitors']) - len(caps))
+        points = [dict(zip(parameter_columns(design), [(args.vdd or [0.3])[0]] + caps))]
+    paths = write_decks(args.design, args.analysis, args.output_dir, points=points,
+                        vdd_values=args.vdd, slices=args.slices, settings=settings)
+    print(f"Wrote {len(paths)} {args.analysis} deck(s) to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
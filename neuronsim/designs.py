@@ -0,0 +1,134 @@
+"""
+Definitions of the three neuron designs simulated in this repository.
+
+Each design maps onto a family of xschem schematics in ``SimulationModeling``
+and onto the data directories holding their sweep results. The sweep engine
+and the analysis scripts look designs up here instead of hardcoding paths.
+"""
+
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATION_DIR = os.path.join(REPO_ROOT, 'SimulationModeling')
+MODEL_FILE = os.path.join(SIMULATION_DIR, 'asap7_TT_slvt.sp')
+
+# Supply voltages swept by every *.sch deck: 0.1 V to 0.9 V in 10 mV steps
+VDD_VALUES = [round(0.1 + 0.01 * i, 2) for i in range(81)]
+
+# Capacitor values used by the Besrour/Sourikopoulos Cap1 x Cap2 grids
+CAP_VALUES = [round(0.1e-15 * i, 20) for i in range(1, 10)] + \
+             [round(1e-15 * i, 20) for i in range(1, 11)]
+
+# Capacitor values used by the Danneville single-capacitor sweep
+DANNEVILLE_CAP_VALUES = [0.125e-15, 0.25e-15, 0.5e-15] + \
+                        [round(1e-15 * i, 20) for i in range(1, 11)]
+
+DESIGNS = {
+    'besrour': {
+        'label': 'BLIF',
+        'schematic': 'Besrour.sch',
+        'optimal_schematic': 'BesrourOptimal.sch',
+        'static_schematic': 'BesrourStatic.sch',
+        'static_cap': 1e-15,
+        'behavior_schematic': 'BesrourPlotting.sch',
+        'output_node': 'net4',
+        'capacitors': {'Cap1': 'C1', 'Cap2': 'C2'},
+        'cap_values': CAP_VALUES,
+        'optimal_dir': 'besrour optimal',
+        'sweep_file': 'besrourneuron.txt',
+        'optimal_file': 'besrouroptimal.txt',
+        'behavior_dir': 'besrour behavior',
+        'behavior_nodes': ['net1', 'net2', 'net4'],
+        'static_file': os.path.join('static', 'besrourneuron.txt'),
+    },
+    'danneville': {
+        'label': 'DAH',
+        'schematic': 'Danneville.sch',
+        'optimal_schematic': 'DannevilleOptimal.sch',
+        'static_schematic': 'DannevilleStatic.sch',
+        'static_cap': 0.125e-15,
+        'behavior_schematic': 'DannevillePlotting.sch',
+        'output_node': 'net3',
+        'capacitors': {'Cap': 'C1'},
+        'cap_values': DANNEVILLE_CAP_VALUES,
+        'optimal_dir': 'danneville optimal',
+        'sweep_file': 'dannevilleneuron.txt',
+        'optimal_file': 'dannevilleoptimal.txt',
+        'behavior_dir': 'danneville behavior',
+        'behavior_nodes': ['net1', 'net3'],
+        'static_file': os.path.join('static', 'dannevilleneuron.txt'),
+    },
+    'sourikopoulos': {
+        'label': 'SML',
+        'schematic': 'Sourikopolous.sch',
+        'optimal_schematic': 'SourikopolousOptimal.sch',
+        'static_schematic': 'SourikopolousStatic.sch',
+        'static_cap': 1e-15,
+        'behavior_schematic': 'SourikopolousPlotting.sch',
+        'output_node': 'net1',
+        'capacitors': {'Cap1': 'C1', 'Cap2': 'C2'},
+        'cap_values': CAP_VALUES,
+        'optimal_dir': 'sourikopoulous optimal',
+        'sweep_file': 'sourikopolousneuron.txt',
+        'optimal_file': 'sourikopolousoptimal.txt',
+        'behavior_dir': 'sourikopoulous behavior',
+        'behavior_nodes': ['net1', 'net3'],
+        'static_file': os.path.join('static', 'sourikopolousneuron.txt'),
+    },
+}
+
+# Columns written by the spike-counting decks after the swept parameters
+RESULT_COLUMNS = ['Spikes', 'Frequency', 'Energy_Per_Spike']
+
+
+def get_design(name):
+    """
+    Look up a design by name.
+
+    Parameters:
+    -----------
+    name : str
+        Design name ('besrour', 'danneville' or 'sourikopoulos')
+
+    Returns:
+    --------
+    dict
+        The design definition from DESIGNS
+    """
+    try:
+        return DESIGNS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown design '{name}', expected one of: "
+                         f"{', '.join(sorted(DESIGNS))}") from None
+
+
+def parameter_columns(design):
+    """
+    Return the swept-parameter column names of a design's sweep table.
+    """
+    return ['VDD'] + list(design['capacitors'])
+
+
+def schematic_path(design, kind='schematic'):
+    """
+    Return the absolute path of one of a design's schematics.
+    """
+    return os.path.join(SIMULATION_DIR, design[kind])
+
+
+def data_path(design, key, directory_key='optimal_dir'):
+    """
+    Return the absolute path of a data file shipped with the repository.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    key : str
+        Key of the file name in the design ('sweep_file', 'optimal_file', ...)
+    directory_key : str
+        Key of the directory the file lives in, or None for repo-relative names
+    """
+    if directory_key is None:
+        return os.path.join(REPO_ROOT, design[key])
+    return os.path.join(REPO_ROOT, design[directory_key], design[key])
@@ -0,0 +1,94 @@
+"""
+Display-grid helpers for the Cap1 x Cap2 heatmaps.
+
+A heatmap cannot show more points than its axes have pixels, so the bounded
+rendering mode of ``heatmaps.py`` caps the interpolation resolution at the
+pixel size of one subplot and builds the optimization score tile by tile,
+keeping only the frequency, energy and score surfaces in memory.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_TILE_ROWS = 256
+
+
+def display_points(figsize, dpi, ncols=1, nrows=1):
+    """
+    Pixel resolution of one subplot of a figure.
+
+    Parameters:
+    -----------
+    figsize : tuple of float
+        Figure (width, height) in inches
+    dpi : float
+        Figure resolution in dots per inch
+    ncols, nrows : int
+        Subplot grid of the figure
+
+    Returns:
+    --------
+    int
+        The larger of the subplot's width and height in pixels
+    """
+    width = figsize[0] * dpi / ncols
+    height = figsize[1] * dpi / nrows
+    return max(int(np.ceil(max(width, height))), 2)
+
+
+def score_surface(z_freq, z_energy, tile_rows=DEFAULT_TILE_ROWS):
+    """
+    Optimization score freq_norm * (1 - energy_norm), computed in row tiles.
+
+    Equivalent to normalize_data(z_freq) * (1 - normalize_data(z_energy))
+    in ``heatmaps.py`` but without the four full-size temporaries.
+
+    Parameters:
+    -----------
+    z_freq, z_energy : numpy.ndarray
+        Interpolated frequency and energy surfaces of the same shape
+    tile_rows : int
+        Rows processed per tile
+
+    Returns:
+    --------
+    numpy.ndarray
+        Score surface, NaN wherever either input is NaN
+    """
+    f_min, f_max = np.nanmin(z_freq), np.nanmax(z_freq)
+    e_min, e_max = np.nanmin(z_energy), np.nanmax(z_energy)
+    score = np.empty(np.shape(z_freq))
+    for start in range(0, score.shape[0], tile_rows):
+        rows = slice(start, start + tile_rows)
+        tile = score[rows]
+        np.subtract(z_freq[rows], f_min, out=tile)
+        tile /= f_max - f_min
+        tile *= 1 - (z_energy[rows] - e_min) / (e_max - e_min)
+    return score
+
+
+@contextmanager
+def memory_report(label='Heatmap computation'):
+    """
+    Trace NumPy and Python allocations inside the block and print the peak.
+
+    Yields a dict that holds 'peak_bytes' and 'seconds' once the block ends.
+    """
+    report = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report['seconds'] = time.perf_counter() - start
+        report['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        if started:
+            tracemalloc.stop()
+        print(f"\n{label}: peak memory {report['peak_bytes'] / 2**20:.1f} MiB "
+              f"in {report['seconds']:.2f} s")
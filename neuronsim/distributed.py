@@ -0,0 +1,540 @@
+"""
+Distributed sweep scheduler with pluggable execution backends.
+
+The grid is sharded into the same chunk jobs that ``neuronsim.sweep`` runs
+in its process pool (``run_chunk``), but the jobs are handed to a backend:
+
+- LocalBackend: a process pool on this machine,
+- SimulatedClusterBackend: local processes grouped into fake nodes that fail
+  at a configurable rate, to exercise scheduling and retries without a
+  cluster,
+- SSHBackend: ``ssh host python -m neuronsim.distributed --run-job -`` with
+  the job as JSON on stdin and the result as JSON on stdout,
+- QueueBackend: a job script per shard submitted with a batch-queue command
+  (e.g. ``sbatch {script}``); the result is picked up from a JSON file in
+  the shared work directory.
+
+The scheduler keeps every job's state (pending, running, done, failed) and
+attempt count in ``jobs.json`` in the work directory, resubmits the points
+a failed or partial job left without a result, up to ``max_attempts``
+times, and merges every result into one table and, optionally, the result
+store. SSH and queue backends need this repository at the same path and the
+work directory on a filesystem shared with the hosts.
+
+Example:
+    python -m neuronsim.distributed --design besrour --backend ssh \
+        --hosts node1 node2 node3 --slots 24 --work-dir /shared/sweep --store sweeps.db
+"""
+
+import argparse
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from .designs import REPO_ROOT, RESULT_COLUMNS, get_design, parameter_columns
+from .store import ResultStore, model_hash, point_key, result_row
+from .sweep import (DEFAULT_SETTINGS, build_grid, chunk_points, path_order, run_chunk,
+                    write_table)
+
+JOB_STATES = ('pending', 'running', 'done', 'failed')
+STATE_FILE = 'jobs.json'
+# Characters of the simulator log kept in a remote job's result
+LOG_TAIL = 4000
+
+
+class Backend:
+    """
+    Interface of an execution backend.
+
+    submit() starts a job (a run_chunk() job dict) and returns a handle;
+    poll() returns None while the job runs and its run_chunk() result
+    dict when it is over, raising if the job failed outright.
+    """
+
+    slots = 1
+
+    def submit(self, job):
+        raise NotImplementedError
+
+    def poll(self, handle):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LocalBackend(Backend):
+    """
+    Process pool on this machine.
+
+    Parameters:
+    -----------
+    workers : int, optional
+        Concurrent jobs, defaults to the CPU count
+    """
+
+    def __init__(self, workers=None):
+        self.slots = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.slots)
+
+    def submit(self, job):
+        return self.pool.submit(run_chunk, job)
+
+    def poll(self, handle):
+        if not handle.done():
+            return None
+        return handle.result()
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def _flaky_chunk(job, failure_rate, seed):
+    if random.Random(seed).random() < failure_rate:
+        raise RuntimeError(f"simulated failure of node {job['node']}")
+    return run_chunk(job)
+
+
+class SimulatedClusterBackend(LocalBackend):
+    """
+    Local processes posing as a cluster of nodes that sometimes fail.
+
+    Parameters:
+    -----------
+    nodes : int
+        Number of simulated nodes
+    slots_per_node : int
+        Concurrent jobs per node
+    failure_rate : float
+        Probability that a job fails before producing any result
+    seed : int
+        Seed of the failure draws
+    """
+
+    def __init__(self, nodes=3, slots_per_node=2, failure_rate=0.0, seed=0):
+        super().__init__(nodes * slots_per_node)
+        self.nodes = [f'node{n}' for n in range(nodes)]
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.submitted = 0
+
+    def submit(self, job):
+        job = dict(job, node=self.nodes[self.submitted % len(self.nodes)])
+        self.submitted += 1
+        return self.pool.submit(_flaky_chunk, job, self.failure_rate, self.rng.random())
+
+
+def _result_of(text, returncode, errors=''):
+    try:
+        return json.loads(text)
+    except ValueError:
+        detail = f": {errors.strip()[-500:]}" if errors and errors.strip() else ''
+        raise RuntimeError(f"job exited with status {returncode} without a result"
+                           f"{detail}") from None
+
+
+class SSHBackend(Backend):
+    """
+    Jobs run over ssh, one remote python process per job.
+
+    Parameters:
+    -----------
+    hosts : list of str
+        Host names (anything ssh accepts)
+    slots_per_host : int
+        Concurrent jobs per host
+    python : str
+        Python interpreter on the hosts
+    repo_dir : str, optional
+        Repository path on the hosts, this repository's path by default
+    ssh : list of str
+        ssh command and options
+    """
+
+    def __init__(self, hosts, slots_per_host=1, python='python3', repo_dir=None,
+                 ssh=('ssh', '-o', 'BatchMode=yes')):
+        self.hosts = list(hosts)
+        self.slots = len(self.hosts) * slots_per_host
+        self.python = python
+        self.repo_dir = repo_dir or REPO_ROOT
+        self.ssh = list(ssh)
+        self.submitted = 0
+        # One thread per running job keeps both output pipes drained
+        self.readers = ThreadPoolExecutor(max_workers=self.slots)
+
+    def submit(self, job):
+        host = self.hosts[self.submitted % len(self.hosts)]
+        self.submitted += 1
+        remote = (f"cd {shlex.quote(self.repo_dir)} && "
+                  f"{self.python} -m neuronsim.distributed --run-job -")
+        proc = subprocess.Popen(self.ssh + [host, remote], stdin=subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True)
+        return proc, self.readers.submit(proc.communicate, json.dumps(job))
+
+    def poll(self, handle):
+        proc, output = handle
+        if not output.done():
+            return None
+        stdout, stderr = output.result()
+        return _result_of(stdout, proc.returncode, stderr)
+
+    def close(self):
+        self.readers.shutdown()
+
+
+class QueueBackend(Backend):
+    """
+    Jobs submitted to a batch queue through a shared work directory.
+
+    Parameters:
+    -----------
+    submit_command : str
+        Command submitting a job script, with {script} in place of its path,
+        e.g. 'sbatch {script}' or 'qsub {script}'
+    slots : int
+        Jobs kept in the queue at once
+    python : str
+        Python interpreter on the compute nodes
+    preamble : list of str
+        Extra script lines (scheduler directives, module loads)
+    """
+
+    def __init__(self, submit_command, slots=16, python=sys.executable, preamble=()):
+        self.submit_command = submit_command
+        self.slots = slots
+        self.python = python
+        self.preamble = list(preamble)
+
+    def submit(self, job):
+        base = os.path.join(job['work_dir'], f"job{job['index']:05d}_{job['attempt']}")
+        with open(base + '.json', 'w') as f:
+            json.dump(job, f)
+        with open(base + '.sh', 'w') as f:
+            f.write('\n'.join(['#!/bin/sh'] + self.preamble + [
+                f'cd {shlex.quote(REPO_ROOT)}',
+                f'{self.python} -m neuronsim.distributed --run-job {shlex.quote(base)}.json '
+                f'--result {shlex.quote(base)}.result.json',
+            ]) + '\n')
+        command = self.submit_command.format(script=shlex.quote(base + '.sh'))
+        proc = subprocess.run(command, shell=True, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, universal_newlines=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"job submission failed: {proc.stdout.strip()}")
+        return base + '.result.json'
+
+    def poll(self, handle):
+        if not os.path.exists(handle):
+            return None
+        with open(handle) as f:
+            return _result_of(f.read(), None)
+
+
+class DistributedSweep:
+    """
+    Scheduler sharding a grid over a backend, with job tracking and retries.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    backend : Backend
+        Where the jobs run
+    points : list of dict, optional
+        Grid points, defaults to build_grid(design)
+    chunk_size : int, optional
+        Points per job; by default each slot gets about four jobs
+    settings : dict, optional
+        Overrides for neuronsim.sweep.DEFAULT_SETTINGS
+    simulator : str or list, optional
+        Simulator command on the executing hosts
+    work_dir : str, optional
+        Directory for job files and jobs.json (shared with the hosts)
+    store : str or ResultStore, optional
+        Result store; stored points are skipped, finished ones committed
+    max_attempts : int
+        Attempts per point before it is given up
+    timeout : float, optional
+        Per-job simulator timeout in seconds
+    """
+
+    def __init__(self, design, backend, points=None, chunk_size=None, settings=None,
+                 simulator=None, work_dir=None, store=None, max_attempts=3, timeout=None):
+        self.design = design
+        self.backend = backend
+        self.points = points if points is not None else build_grid(get_design(design))
+        self.chunk_size = chunk_size
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        # Early termination needs several rounds per point; not sharded here
+        self.settings['segment'] = None
+        self.simulator = simulator
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix=f'{design}_distributed_')
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.store = store
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.jobs = []
+        self.values = {}
+
+    def _new_job(self, indices, attempt):
+        job = {
+            'index': len(self.jobs),
+            'indices': list(indices),
+            'attempt': attempt,
+            'state': 'pending',
+            'submitted': None,
+            'finished': None,
+            'error': None,
+        }
+        self.jobs.append(job)
+        return job
+
+    def _payload(self, job):
+        return {
+            'design': self.design,
+            'points': [self.points[i] for i in job['indices']],
+            'index': job['index'],
+            'attempt': job['attempt'],
+            'work_dir': self.work_dir,
+            'settings': self.settings,
+            'simulator': self.simulator,
+            'timeout': self.timeout,
+            'keep': False,
+        }
+
+    def save_state(self):
+        """
+        Write every job's state to jobs.json in the work directory.
+        """
+        counts = {s: sum(j['state'] == s for j in self.jobs) for s in JOB_STATES}
+        with open(os.path.join(self.work_dir, STATE_FILE), 'w') as f:
+            json.dump({'design': self.design, 'points': len(self.points),
+                       'completed': len(self.values), 'counts': counts,
+                       'jobs': self.jobs}, f, indent=1)
+
+    def _finish(self, job, result, keys, store):
+        job['finished'] = time.time()
+        left = []
+        if isinstance(result, Exception):
+            job['state'] = 'failed'
+            job['error'] = str(result)
+            left = job['indices']
+        else:
+            completed = {}
+            rungs = {}
+            for i, row, rung in zip(job['indices'], result['rows'], result['rungs']):
+                if row is None:
+                    left.append(i)
+                else:
+                    completed[i] = tuple(row[-len(RESULT_COLUMNS):])
+                    if rung is not None:
+                        rungs[i] = rung
+            self.values.update(completed)
+            if store is not None and completed:
+                store.insert([(keys[i], v) for i, v in completed.items()])
+                store.record_rungs([(keys[i], rung) for i, rung in rungs.items()])
+            job['state'] = 'done' if not left else 'failed'
+            if left:
+                job['error'] = (f"{len(left)} points without a result "
+                                f"(status {result['returncode']})")
+        if left and job['attempt'] < self.max_attempts:
+            return self._new_job(left, job['attempt'] + 1)
+        return None
+
+    def run(self, poll_interval=0.5):
+        """
+        Run every missing point and return the merged table.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Every point with a result (stored or simulated), in grid order
+        """
+        store = self.store
+        own_store = isinstance(store, str)
+        if own_store:
+            store = ResultStore(store)
+        keys = None
+        if store is not None:
+            digest = model_hash(self.settings['model_file'])
+            keys = [point_key(self.design, p, self.settings, digest) for p in self.points]
+            found = store.lookup(keys)
+            self.values.update({i: found[k] for i, k in enumerate(keys) if k in found})
+            print(f"{len(self.values)} of {len(self.points)} points already in {store.path}")
+
+        order = range(len(self.points))
+        if self.settings['warm_start']:
+            order = path_order(self.points, parameter_columns(get_design(self.design)))
+        pending_points = [i for i in order if i not in self.values]
+        size = self.chunk_size or max(1, -(-len(pending_points) // (self.backend.slots * 4)))
+        queue = [self._new_job(chunk, 1) for chunk in chunk_points(pending_points, size)]
+        running = {}
+        print(f"Distributing {len(pending_points)} {self.design} grid points in "
+              f"{len(queue)} jobs over {self.backend.slots} slots")
+        start = time.time()
+        try:
+            while queue or running:
+                while queue and len(running) < self.backend.slots:
+                    job = queue.pop(0)
+                    job['state'] = 'running'
+                    job['submitted'] = time.time()
+                    try:
+                        running[job['index']] = (job, self.backend.submit(self._payload(job)))
+                    except (OSError, RuntimeError) as e:
+                        retry = self._finish(job, e, keys, store)
+                        if retry is not None:
+                            queue.append(retry)
+                self.save_state()
+
+                finished = []
+                for index, (job, handle) in running.items():
+                    try:
+                        result = self.backend.poll(handle)
+                    except Exception as e:
+                        result = e
+                    if result is not None:
+                        finished.append(index)
+                        retry = self._finish(job, result, keys, store)
+                        if retry is not None:
+                            queue.append(retry)
+                        print(f"Job {index} (attempt {job['attempt']}) {job['state']}; "
+                              f"{len(self.values)}/{len(self.points)} points "
+                              f"({time.time() - start:.1f} s)")
+                for index in finished:
+                    del running[index]
+                if not finished:
+                    time.sleep(poll_interval)
+        finally:
+            self.save_state()
+            self.backend.close()
+            if own_store:
+                store.close()
+
+        missing = len(self.points) - len(self.values)
+        if missing:
+            print(f"Warning: {missing} of {len(self.points)} points have no result after "
+                  f"{self.max_attempts} attempts")
+        columns = parameter_columns(get_design(self.design)) + RESULT_COLUMNS
+        rows = [result_row(self.design, self.points[i], self.values[i])
+                for i in range(len(self.points)) if i in self.values]
+        df = pd.DataFrame(rows, columns=columns)
+        df['Spikes'] = df['Spikes'].astype(int)
+        return df
+
+
+def run_job(source, result_path=None):
+    """
+    Execute one job description (JSON file or '-' for stdin) on this host.
+
+    The run_chunk() result is written as JSON to result_path, or to stdout
+    when it is None or '-', with only the last LOG_TAIL characters of the
+    simulator log.
+    """
+    if source == '-':
+        job = json.load(sys.stdin)
+    else:
+        with open(source) as f:
+            job = json.load(f)
+    os.makedirs(job['work_dir'], exist_ok=True)
+    result = run_chunk(job)
+    result['log'] = result['log'][-LOG_TAIL:]
+    # NumPy scalars (spike counts) become plain numbers
+    text = json.dumps(result, default=lambda value: value.item())
+    if result_path in (None, '-'):
+        sys.stdout.write(text)
+        return
+    # Rename into place so the scheduler never reads a partial file
+    with open(result_path + '.tmp', 'w') as f:
+        f.write(text)
+    os.replace(result_path + '.tmp', result_path)
+
+
+def make_backend(name, workers=None, hosts=None, submit=None, nodes=3, failure_rate=0.0):
+    """
+    Build a backend from command-line style options.
+    """
+    if name == 'local':
+        return LocalBackend(workers)
+    if name == 'simulated':
+        return SimulatedClusterBackend(nodes, workers or 2, failure_rate)
+    if name == 'ssh':
+        if not hosts:
+            raise ValueError("The ssh backend needs --hosts")
+        return SSHBackend(hosts, workers or 1)
+    if name == 'queue':
+        if not submit:
+            raise ValueError("The queue backend needs --submit, e.g. 'sbatch {script}'")
+        return QueueBackend(submit, workers or 16)
+    raise ValueError(f"Unknown backend '{name}', expected local, simulated, ssh or queue")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a neuron design sweep across hosts.')
+    parser.add_argument('--run-job', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--design', help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--backend', choices=['local', 'simulated', 'ssh', 'queue'],
+                        default='local', help='where the jobs run (default: local)')
+    parser.add_argument('--slots', type=int, default=None,
+                        help='concurrent jobs (local), per node (simulated, ssh) or queued (queue)')
+    parser.add_argument('--hosts', nargs='+', default=None, help='ssh hosts')
+    parser.add_argument('--submit', default=None, help="queue submit command, e.g. 'sbatch {script}'")
+    parser.add_argument('--nodes', type=int, default=3, help='simulated nodes (default: 3)')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='failure probability of simulated jobs')
+    parser.add_argument('--chunk-size', type=int, default=None, help='grid points per job')
+    parser.add_argument('--max-attempts', type=int, default=3, help='attempts per point')
+    parser.add_argument('--simulator', default=None, help='simulator command on the hosts')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages to sweep')
+    parser.add_argument('--caps', type=float, nargs='+', default=None, help='capacitor values to sweep')
+    parser.add_argument('--tstop', default=None, help='transient stop time (e.g. 20n)')
+    parser.add_argument('--warm-start', action='store_true',
+                        help='start each point of a job from the previous point\'s final '
+                             'capacitor voltages')
+    parser.add_argument('--work-dir', default=None, help='job directory shared with the hosts')
+    parser.add_argument('--store', default=None, help='SQLite result store; reruns skip stored points')
+    parser.add_argument('-o', '--output', default=None, help='merged results table')
+    args = parser.parse_args()
+
+    if args.run_job:
+        run_job(args.run_job, args.result)
+        return
+    if not args.design:
+        parser.error('--design is required')
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+    settings = {}
+    if args.tstop:
+        settings['tstop'] = args.tstop
+    if args.warm_start:
+        settings['warm_start'] = True
+
+    design = get_design(args.design)
+    points = build_grid(design, vdd_values=args.vdd, cap_values=args.caps)
+    backend = make_backend(args.backend, args.slots, args.hosts, args.submit, args.nodes,
+                           args.failure_rate)
+    sweep = DistributedSweep(args.design.lower(), backend, points=points,
+                             chunk_size=args.chunk_size, settings=settings,
+                             simulator=simulator, work_dir=args.work_dir, store=args.store,
+                             max_attempts=args.max_attempts)
+    df = sweep.run()
+    output = args.output or design['sweep_file']
+    write_table(df, output)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
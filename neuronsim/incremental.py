@@ -0,0 +1,240 @@
+"""
+Incremental Cap1 x Cap2 heatmap and optimization score for growing sweeps.
+
+``create_combined_heatmaps`` pivots the whole table, interpolates both
+surfaces and normalizes them with global nanmin/nanmax every time it is
+called. IncrementalHeatmap keeps the pivot tables (as per-cell sums and
+counts, so a cell is the mean over VDD like ``pivot_table``), the
+interpolated display surfaces, the running minima and maxima and the
+optimization score. New rows only touch their own cells and the display
+points those cells bracket; the whole score is recomputed only when an
+extreme of the frequency or energy surface moves, since that rescales every
+normalized value.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .interpolation import axis_weights, display_axis
+
+FEMTO = 1e15
+
+
+def _nan_range(values):
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return np.nan, np.nan
+    return float(finite.min()), float(finite.max())
+
+
+def _score(frequency, energy, extremes):
+    f_min, f_max, e_min, e_max = extremes
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (frequency - f_min) / (f_max - f_min) * (1 - (energy - e_min) / (e_max - e_min))
+
+
+class ScoredSurface:
+    """
+    Frequency and energy arrays with their running extremes and score.
+
+    Parameters:
+    -----------
+    shape : tuple of int
+        Array shape (rows, columns)
+
+    Attributes:
+    -----------
+    frequency, energy, score : numpy.ndarray
+        Current values, NaN where unknown
+    best : tuple or None
+        (row, column) of the highest score
+    """
+
+    def __init__(self, shape):
+        self.frequency = np.full(shape, np.nan)
+        self.energy = np.full(shape, np.nan)
+        self.score = np.full(shape, np.nan)
+        self.extremes = (np.nan,) * 4
+        self.best = None
+        self.rescored = 0
+
+    def update(self, rows, cols, frequency, energy):
+        """
+        Replace the block np.ix_(rows, cols) and rescore what changed.
+
+        Returns:
+        --------
+        bool
+            True if the extremes moved and the whole surface was rescored
+        """
+        block = np.ix_(rows, cols)
+        old = [self.frequency[block].copy(), self.energy[block].copy()]
+        self.frequency[block] = frequency
+        self.energy[block] = energy
+
+        extremes = []
+        for surface, before, after in zip((self.frequency, self.energy), old,
+                                          (frequency, energy)):
+            low, high = self.extremes[len(extremes):len(extremes) + 2]
+            # A replaced value that held an extreme may have moved inward
+            if np.isnan(low) or np.any(before == low) or np.any(before == high):
+                low, high = _nan_range(surface)
+            else:
+                new_low, new_high = _nan_range(np.asarray(after, dtype=float))
+                low, high = np.fmin(low, new_low), np.fmax(high, new_high)
+            extremes += [float(low), float(high)]
+
+        if not np.array_equal(extremes, self.extremes, equal_nan=True):
+            self.extremes = tuple(extremes)
+            self.score = _score(self.frequency, self.energy, self.extremes)
+            self.rescored += 1
+            self.best = self._argmax(self.score)
+            return True
+
+        scores = _score(self.frequency[block], self.energy[block], self.extremes)
+        self.score[block] = scores
+        if self.best is None or (self.best[0] in rows and self.best[1] in cols):
+            self.best = self._argmax(self.score)
+        elif np.any(np.isfinite(scores)):
+            i, j = np.unravel_index(np.nanargmax(scores), scores.shape)
+            if scores[i, j] > self.score[self.best]:
+                self.best = (int(rows[i]), int(cols[j]))
+        return False
+
+    @staticmethod
+    def _argmax(score):
+        if not np.any(np.isfinite(score)):
+            return None
+        return tuple(int(i) for i in np.unravel_index(np.nanargmax(score), score.shape))
+
+
+class IncrementalHeatmap:
+    """
+    Cap1 x Cap2 frequency, energy and score surfaces fed row by row.
+
+    Parameters:
+    -----------
+    cap1_values, cap2_values : array-like
+        Capacitor axes of the sweep (F); Cap1 indexes the rows
+    num_points : int, optional
+        Display points per axis of the interpolated surfaces; only the
+        pivot cells are kept without it
+    space : str
+        'linear' or 'log' spacing and interpolation, as in interpolate_pivot()
+
+    Attributes:
+    -----------
+    cells : ScoredSurface
+        Pivot-table means over VDD, indexed (Cap1, Cap2)
+    display : ScoredSurface or None
+        Bilinearly interpolated surfaces on the display axes
+    """
+
+    def __init__(self, cap1_values, cap2_values, num_points=None, space='linear'):
+        self.y = np.unique(np.asarray(cap1_values, dtype=float)) * FEMTO
+        self.x = np.unique(np.asarray(cap2_values, dtype=float)) * FEMTO
+        shape = (len(self.y), len(self.x))
+        self._sums = np.zeros((2,) + shape)
+        self._counts = np.zeros(shape, dtype=int)
+        self.cells = ScoredSurface(shape)
+        self.display = None
+        if num_points is not None:
+            self.xi = display_axis(self.x, num_points, space)
+            self.yi = display_axis(self.y, num_points, space)
+            self._ix, self._wx, self._out_x = axis_weights(self.x, self.xi, space)
+            self._iy, self._wy, self._out_y = axis_weights(self.y, self.yi, space)
+            self.display = ScoredSurface((len(self.yi), len(self.xi)))
+
+    @classmethod
+    def from_points(cls, points, num_points=None, space='linear'):
+        """
+        Build the surfaces for the capacitor axes of a list of grid points.
+        """
+        return cls([p['Cap1'] for p in points], [p['Cap2'] for p in points],
+                   num_points, space)
+
+    def _indices(self, axis, values):
+        index = np.clip(np.searchsorted(axis, values), 0, len(axis) - 1)
+        lower = np.clip(index - 1, 0, len(axis) - 1)
+        index = np.where(np.abs(axis[lower] - values) < np.abs(axis[index] - values),
+                         lower, index)
+        if not np.allclose(axis[index], values, rtol=1e-6, atol=0):
+            raise ValueError("Rows with capacitor values outside the heatmap axes")
+        return index
+
+    def add(self, df):
+        """
+        Add sweep rows (Cap1, Cap2, Frequency, Energy_Per_Spike columns).
+
+        Rows that never completed a spike are ignored, as in
+        load_and_process_data().
+
+        Returns:
+        --------
+        int
+            Number of pivot cells that changed
+        """
+        df = df[df['Energy_Per_Spike'] != 0]
+        if not len(df):
+            return 0
+        rows = self._indices(self.y, df['Cap1'].to_numpy(dtype=float) * FEMTO)
+        cols = self._indices(self.x, df['Cap2'].to_numpy(dtype=float) * FEMTO)
+        np.add.at(self._sums[0], (rows, cols), df['Frequency'].to_numpy(dtype=float))
+        np.add.at(self._sums[1], (rows, cols), df['Energy_Per_Spike'].to_numpy(dtype=float))
+        np.add.at(self._counts, (rows, cols), 1)
+        changed = len(set(zip(rows.tolist(), cols.tolist())))
+
+        rows, cols = np.unique(rows), np.unique(cols)
+        block = np.ix_(rows, cols)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self._sums[(slice(None),) + block] / self._counts[block]
+        self.cells.update(rows, cols, means[0], means[1])
+        if self.display is not None:
+            self._update_display(rows, cols)
+        return changed
+
+    def _update_display(self, rows, cols):
+        # Display points whose bracketing cells include a changed one
+        d_rows = np.flatnonzero(np.isin(self._iy, rows) | np.isin(self._iy + 1, rows))
+        d_cols = np.flatnonzero(np.isin(self._ix, cols) | np.isin(self._ix + 1, cols))
+        iy, wy = self._iy[d_rows, None], self._wy[d_rows, None]
+        ix, wx = self._ix[d_cols], self._wx[d_cols]
+        values = []
+        for z in (self.cells.frequency, self.cells.energy):
+            lower = z[iy, ix] * (1 - wx) + z[iy, ix + 1] * wx
+            upper = z[iy + 1, ix] * (1 - wx) + z[iy + 1, ix + 1] * wx
+            zi = lower * (1 - wy) + upper * wy
+            zi[self._out_y[d_rows], :] = np.nan
+            zi[:, self._out_x[d_cols]] = np.nan
+            values.append(zi)
+        self.display.update(d_rows, d_cols, values[0], values[1])
+
+    def pivots(self):
+        """
+        Frequency and energy pivot tables, as returned by load_and_process_data().
+        """
+        tables = []
+        for values in (self.cells.frequency, self.cells.energy):
+            table = pd.DataFrame(values, index=pd.Index(self.y, name='Cap1_fF'),
+                                 columns=pd.Index(self.x, name='Cap2_fF'))
+            tables.append(table.dropna(how='all').dropna(axis=1, how='all'))
+        return tables[0], tables[1]
+
+    def optimal(self, display=False):
+        """
+        Highest-scoring pivot cell (or display point with display=True).
+
+        Returns:
+        --------
+        dict or None
+            'cap1_fF', 'cap2_fF', 'frequency', 'energy' and 'score'
+        """
+        surface = self.display if display else self.cells
+        if surface is None or surface.best is None:
+            return None
+        y, x = (self.yi, self.xi) if display else (self.y, self.x)
+        i, j = surface.best
+        return {'cap1_fF': float(y[i]), 'cap2_fF': float(x[j]),
+                'frequency': float(surface.frequency[i, j]),
+                'energy': float(surface.energy[i, j]),
+                'score': float(surface.score[i, j])}
@@ -0,0 +1,205 @@
+"""
+Interpolation of sweep pivot tables onto display grids.
+
+The Cap1 x Cap2 sweeps are rectilinear, so the value at any display pixel
+only depends on the four surrounding grid cells. interpolate_grid() computes
+the bracketing indices and weights once per axis and combines them, which is
+bilinear interpolation without triangulating the grid or materialising an
+(N*N, 2) array of query points. Interpolating in log10 of the coordinates
+matches the log-scaled axes of the heatmaps. Scattered or incomplete data
+still goes through scipy's Delaunay-based griddata.
+"""
+
+import numpy as np
+
+INTERPOLATION_SPACES = ('linear', 'log')
+INTERPOLATION_METHODS = ('auto', 'grid', 'delaunay')
+
+
+def display_axis(values, num_points, space='linear'):
+    """
+    Evenly spaced display coordinates spanning values.
+
+    Parameters:
+    -----------
+    values : array-like
+        Grid coordinates to span
+    num_points : int
+        Number of display coordinates
+    space : str
+        'linear' for even spacing, 'log' for even spacing in log10
+
+    Returns:
+    --------
+    numpy.ndarray
+    """
+    values = np.asarray(values, dtype=float)
+    if space == 'log':
+        return np.logspace(np.log10(values.min()), np.log10(values.max()), num_points)
+    return np.linspace(values.min(), values.max(), num_points)
+
+
+def _transform(values, space):
+    values = np.asarray(values, dtype=float)
+    return np.log10(values) if space == 'log' else values
+
+
+def is_rectilinear(x, y, z):
+    """
+    Check that z is a complete grid over strictly increasing axes x and y.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+    return (x.ndim == 1 and y.ndim == 1 and z.shape == (len(y), len(x))
+            and len(x) > 1 and len(y) > 1
+            and np.all(np.diff(x) > 0) and np.all(np.diff(y) > 0)
+            and bool(np.all(np.isfinite(z))))
+
+
+def _clip_to_range(points, low, high):
+    # log10(10**a) can land an ulp outside [low, high]: end points of a
+    # logspace axis count as inside and are clipped onto the range
+    tolerance = 1e-9 * (high - low)
+    outside = (points < low - tolerance) | (points > high + tolerance)
+    return np.clip(points, low, high), outside
+
+
+def _axis_weights(axis, points):
+    # Index of the lower neighbour and the weight of the upper one
+    points, outside = _clip_to_range(points, axis[0], axis[-1])
+    index = np.clip(np.searchsorted(axis, points, side='right') - 1, 0, len(axis) - 2)
+    weight = (points - axis[index]) / (axis[index + 1] - axis[index])
+    return index, weight, outside
+
+
+def axis_weights(axis, points, space='linear'):
+    """
+    Bracketing grid indices of display coordinates along one axis.
+
+    Returns:
+    --------
+    tuple : (index, weight, outside)
+        Index of the lower grid neighbour of every point, the weight of the
+        upper neighbour, and which points lie outside the axis
+    """
+    return _axis_weights(_transform(axis, space), _transform(points, space))
+
+
+def interpolate_grid(x, y, z, xi, yi, space='linear', tile_rows=None):
+    """
+    Bilinear interpolation of a rectilinear grid onto display axes.
+
+    Parameters:
+    -----------
+    x, y : array-like
+        Strictly increasing grid axes (columns and rows of z)
+    z : array-like
+        Values, shape (len(y), len(x))
+    xi, yi : array-like
+        1-D display axes
+    space : str
+        Interpolate in 'linear' coordinates or in 'log' (log10) coordinates
+    tile_rows : int, optional
+        Interpolate this many output rows at a time, which bounds the
+        temporaries to a few tiles; all rows at once by default
+
+    Returns:
+    --------
+    numpy.ndarray
+        Interpolated values, shape (len(yi), len(xi)); NaN outside the grid
+    """
+    z = np.asarray(z, dtype=float)
+    ix, wx, out_x = axis_weights(x, xi, space)
+    iy, wy, out_y = axis_weights(y, yi, space)
+
+    zi = np.empty((len(iy), len(ix)))
+    step = tile_rows or len(iy)
+    for start in range(0, len(iy), step):
+        rows = slice(start, start + step)
+        # Interpolate along x for the two bracketing rows, then along y
+        lower = z[iy[rows]]
+        upper = z[iy[rows] + 1]
+        lower = lower[:, ix] * (1 - wx) + lower[:, ix + 1] * wx
+        upper = upper[:, ix] * (1 - wx) + upper[:, ix + 1] * wx
+        np.multiply(lower, (1 - wy[rows])[:, None], out=zi[rows])
+        zi[rows] += upper * wy[rows][:, None]
+    zi[out_y, :] = np.nan
+    zi[:, out_x] = np.nan
+    return zi
+
+
+def interpolate_scattered(x, y, z, xi, yi, space='linear'):
+    """
+    Delaunay (scipy griddata) interpolation of scattered points.
+
+    Parameters:
+    -----------
+    x, y, z : array-like
+        Point coordinates and values; non-finite values are dropped
+    xi, yi : array-like
+        1-D display axes
+
+    Returns:
+    --------
+    numpy.ndarray
+        Interpolated values, shape (len(yi), len(xi))
+    """
+    from scipy.interpolate import griddata
+    x = np.ravel(x)
+    y = np.ravel(y)
+    z = np.ravel(z)
+    keep = np.isfinite(z)
+    points = (_transform(x[keep], space), _transform(y[keep], space))
+    axes = []
+    for values, display in zip(points, (xi, yi)):
+        display = _transform(display, space)
+        clipped, outside = _clip_to_range(display, values.min(), values.max())
+        # Points well beyond the data stay outside the hull (NaN)
+        axes.append(np.where(outside, display, clipped))
+    grid_x, grid_y = np.meshgrid(*axes)
+    return griddata(points, z[keep], (grid_x, grid_y), method='linear')
+
+
+def interpolate_pivot(pivot_table, num_points=100, space='linear', method='auto',
+                      tile_rows=None):
+    """
+    Interpolate a pivot table (rows: index, columns: columns) for display.
+
+    Parameters:
+    -----------
+    pivot_table : pandas.DataFrame
+        Values indexed by the y coordinate with the x coordinate as columns
+    num_points : int
+        Display points per axis
+    space : str
+        'linear' or 'log' spacing and interpolation
+    method : str
+        'grid' for the rectilinear path, 'delaunay' for griddata, 'auto' to
+        use the grid path whenever the table is a complete grid
+    tile_rows : int, optional
+        Row tile size of the rectilinear path (see interpolate_grid)
+
+    Returns:
+    --------
+    tuple : (xi, yi, zi)
+        1-D display axes and the interpolated values, shape (len(yi), len(xi))
+    """
+    if space not in INTERPOLATION_SPACES:
+        raise ValueError(f"Unknown interpolation space '{space}', expected one of: "
+                         f"{', '.join(INTERPOLATION_SPACES)}")
+    if method not in INTERPOLATION_METHODS:
+        raise ValueError(f"Unknown interpolation method '{method}', expected one of: "
+                         f"{', '.join(INTERPOLATION_METHODS)}")
+    x = np.asarray(pivot_table.columns, dtype=float)
+    y = np.asarray(pivot_table.index, dtype=float)
+    z = np.asarray(pivot_table.values, dtype=float)
+    xi = display_axis(x, num_points, space)
+    yi = display_axis(y, num_points, space)
+
+    if method == 'grid' or (method == 'auto' and is_rectilinear(x, y, z)):
+        zi = interpolate_grid(x, y, z, xi, yi, space, tile_rows)
+    else:
+        grid_x, grid_y = np.meshgrid(x, y)
+        zi = interpolate_scattered(grid_x, grid_y, z, xi, yi, space)
+    return xi, yi, zi
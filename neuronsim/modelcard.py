@@ -0,0 +1,131 @@
+"""
+Reading and rewriting the BSIM-CMG model cards.
+
+``asap7_TT_slvt.sp`` holds one ``.model`` statement per device type
+(``BSIMCMG_osdi_P`` and ``BSIMCMG_osdi_N``), each continued over ``+`` lines
+of ``name = value`` pairs. card_parameters() reads those values and
+set_parameters() returns the card text with some of them replaced, leaving
+every other line (comments, layout) untouched, so derived cards diff
+cleanly against the original.
+"""
+
+import os
+import re
+
+from .designs import MODEL_FILE
+from .spice import format_spice_number, parse_spice_number
+
+_ASSIGNMENT = re.compile(r'(?<![\w.])([A-Za-z_]\w*)(\s*=\s*)(\S+)')
+
+
+def read_card(path=None):
+    """
+    Return the text of a model card (MODEL_FILE by default).
+    """
+    with open(path or MODEL_FILE) as f:
+        return f.read()
+
+
+def _model_lines(text):
+    # Yields (line, model name or None) with the .model each '+' line continues
+    model = None
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped.lower().startswith('.model'):
+            fields = stripped.split()
+            model = fields[1] if len(fields) > 1 else None
+            yield line, None
+        elif stripped.startswith('+') and model is not None:
+            yield line, model
+        else:
+            if stripped and not stripped.startswith('*'):
+                model = None
+            yield line, None
+
+
+def card_parameters(text):
+    """
+    Parameters of every model in a card.
+
+    Returns:
+    --------
+    dict
+        Model name -> {parameter (lowercase): value}
+    """
+    models = {}
+    for line, model in _model_lines(text):
+        if model is None:
+            continue
+        values = models.setdefault(model, {})
+        for name, _, value in _ASSIGNMENT.findall(line):
+            try:
+                values[name.lower()] = parse_spice_number(value)
+            except ValueError:
+                pass
+    return models
+
+
+def set_parameters(text, changes):
+    """
+    Replace parameter values in a card.
+
+    Parameters:
+    -----------
+    text : str
+        Model card text
+    changes : dict
+        Model name -> {parameter: new value}
+
+    Returns:
+    --------
+    str
+        The card with the values replaced
+
+    Raises:
+    -------
+    KeyError
+        If a model or parameter is not in the card
+    """
+    pending = {model: {p.lower(): v for p, v in values.items()}
+               for model, values in changes.items()}
+    lines = []
+    for line, model in _model_lines(text):
+        targets = pending.get(model)
+        if targets:
+            def replace(match):
+                name = match.group(1).lower()
+                if name not in targets:
+                    return match.group(0)
+                value = format_spice_number(targets.pop(name))
+                # Padded to the old width to keep the card's columns aligned
+                return match.group(1) + match.group(2) + value.ljust(len(match.group(3)))
+            line = _ASSIGNMENT.sub(replace, line)
+        lines.append(line)
+    missing = [f'{model}.{name}' for model, names in pending.items() for name in names]
+    if missing:
+        raise KeyError(f"Not in the model card: {', '.join(missing)}")
+    return ''.join(lines)
+
+
+def write_card(text, path):
+    """
+    Write a card, leaving the file alone if it already has this content.
+
+    An untouched file keeps its modification time, so the result store's
+    cached model hash stays valid across reruns.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == text:
+                return path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def model_suffix(model):
+    """
+    Short device label of a model name, e.g. 'BSIMCMG_osdi_N' -> 'N'.
+    """
+    return model.rsplit('_', 1)[-1]
@@ -0,0 +1,363 @@
+"""
+Monte Carlo process variation over the BSIM-CMG model cards.
+
+Every sample perturbs selected parameters of both device cards in
+``asap7_TT_slvt.sp`` (by default the gate work function ``phig``, mobility
+``u0``, oxide thickness ``eot``, fin thickness ``tfin`` and body doping
+``nbody``), is written as a model file of its own and simulated at the
+requested grid points. Samples run as independent jobs across a process
+pool, each one a ``neuronsim.sweep.run_chunk`` with ``model_file`` pointing
+to its card.
+
+Draws are seeded per sample (seed, sample index), so a sample always gets
+the same card. With a result store the store key includes the card's hash,
+so rerunning, or raising --samples, simulates only the samples that are not
+stored yet.
+
+Example:
+    python -m neuronsim.montecarlo --design besrour --samples 500 --vdd 0.5 \
+        --caps 1e-15 --vary phig=normal:0.02 u0=normal:5% --store mc.db -o besrour_mc.txt
+"""
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .designs import RESULT_COLUMNS, get_design, parameter_columns
+from .modelcard import card_parameters, model_suffix, read_card, set_parameters, write_card
+from .store import ResultStore, model_hash, point_key, result_row
+from .sweep import DEFAULT_SETTINGS, build_grid, run_chunk, write_table
+
+Variation = namedtuple('Variation', ['kind', 'scale', 'relative'], defaults=(False,))
+
+DISTRIBUTIONS = ('normal', 'uniform', 'lognormal')
+
+# Rough die-to-die spreads for a 7 nm FinFET; phig in eV, the others relative
+DEFAULT_VARIATIONS = {
+    'phig': Variation('normal', 0.015),
+    'u0': Variation('normal', 0.05, relative=True),
+    'eot': Variation('normal', 0.02, relative=True),
+    'tfin': Variation('normal', 0.03, relative=True),
+    'nbody': Variation('lognormal', 0.1),
+}
+
+
+def parse_variation(text):
+    """
+    Parse 'name=kind:scale', e.g. 'phig=normal:0.02' or 'u0=uniform:5%'.
+
+    A scale with a % suffix is relative to the nominal value; lognormal
+    scales are the sigma of the log, always relative.
+
+    Returns:
+    --------
+    tuple : (name, Variation)
+    """
+    try:
+        name, spec = text.split('=', 1)
+        kind, scale = spec.split(':', 1)
+    except ValueError:
+        raise ValueError(f"Expected name=kind:scale, got '{text}'") from None
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{kind}', expected one of {', '.join(DISTRIBUTIONS)}")
+    relative = scale.endswith('%')
+    value = float(scale.rstrip('%'))
+    return name.lower(), Variation(kind, value / 100 if relative else value, relative)
+
+
+def draw(nominal, variation, rng):
+    """
+    Draw one value of a parameter around its nominal value.
+    """
+    if variation.kind == 'lognormal':
+        return nominal * np.exp(rng.normal(0, variation.scale))
+    if variation.kind == 'normal':
+        delta = rng.normal(0, variation.scale)
+    else:
+        delta = rng.uniform(-variation.scale, variation.scale)
+    return nominal * (1 + delta) if variation.relative else nominal + delta
+
+
+def sample_cards(samples, variations=None, seed=0, model_dir='montecarlo_models', card=None):
+    """
+    Write one perturbed model card per sample.
+
+    Parameters:
+    -----------
+    samples : int
+        Number of samples
+    variations : dict, optional
+        Parameter -> Variation, DEFAULT_VARIATIONS by default; applied to
+        every model in the card with independent draws
+    seed : int
+        Seed of the draws
+    model_dir : str
+        Directory of the sample cards
+    card : str, optional
+        Nominal card, MODEL_FILE by default
+
+    Returns:
+    --------
+    list of dict
+        Per sample: 'sample', 'model_file' and 'values' (column name such
+        as 'phig_N' -> drawn value)
+    """
+    variations = variations or DEFAULT_VARIATIONS
+    text = read_card(card)
+    nominal = card_parameters(text)
+    models = sorted(nominal)
+    missing = [name for name in variations if any(name not in nominal[m] for m in models)]
+    if missing:
+        raise KeyError(f"Not in every model of the card: {', '.join(missing)}")
+
+    result = []
+    for sample in range(samples):
+        rng = np.random.default_rng([seed, sample])
+        changes = {model: {name: draw(nominal[model][name], variation, rng)
+                           for name, variation in variations.items()} for model in models}
+        path = os.path.abspath(os.path.join(model_dir, f'mc{seed}_{sample:05d}.sp'))
+        write_card(set_parameters(text, changes), path)
+        values = {f'{name}_{model_suffix(model)}': changes[model][name]
+                  for model in models for name in variations}
+        result.append({'sample': sample, 'model_file': path, 'values': values})
+    return result
+
+
+def summarize(df, design):
+    """
+    Distribution of frequency and energy per spike at every grid point.
+
+    Samples that never completed a spike are counted but left out of the
+    statistics.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per grid point: 'Samples', 'Spiking' and the mean, standard
+        deviation and 5th/50th/95th percentiles of Frequency and
+        Energy_Per_Spike
+    """
+    columns = parameter_columns(get_design(design))
+    rows = []
+    for point, group in df.groupby(columns, sort=True):
+        point = point if isinstance(point, tuple) else (point,)
+        spiking = group[group['Energy_Per_Spike'] != 0]
+        row = dict(zip(columns, point), Samples=len(group), Spiking=len(spiking))
+        for column in ('Frequency', 'Energy_Per_Spike'):
+            values = spiking[column].to_numpy(dtype=float)
+            stats = [np.nan] * 5
+            if len(values):
+                stats = [values.mean(), values.std(ddof=1) if len(values) > 1 else 0.0,
+                         *np.percentile(values, [5, 50, 95])]
+            row.update(zip([f'{column}_{s}' for s in ('mean', 'std', 'p5', 'p50', 'p95')],
+                           stats))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def plot_distributions(df, output_path, style_params=None):
+    """
+    Histograms of frequency and energy per spike over the samples.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    style_params = style_params or {}
+    spiking = df[df['Energy_Per_Spike'] != 0]
+    fig, axes = plt.subplots(1, 2, figsize=style_params.get('figsize', (12, 4.5)),
+                             constrained_layout=True)
+    for ax, column, scale, label in ((axes[0], 'Frequency', 1e-6, 'Frequency (MHz)'),
+                                     (axes[1], 'Energy_Per_Spike', 1e15,
+                                      'Energy per spike (fJ)')):
+        ax.hist(spiking[column] * scale, bins=style_params.get('bins', 40),
+                color=style_params.get('color', '#1f77b4'), alpha=0.85)
+        ax.set_xlabel(label)
+        ax.set_ylabel('Samples')
+    fig.suptitle(f"{len(spiking)} of {len(df)} samples spiking")
+    fig.savefig(output_path, dpi=style_params.get('dpi', 200), bbox_inches='tight')
+    plt.close(fig)
+
+
+def run_monte_carlo(design, samples=100, variations=None, points=None, seed=0, workers=None,
+                    simulator=None, settings=None, store=None, output=None,
+                    model_dir='montecarlo_models', work_dir=None, timeout=None):
+    """
+    Simulate a design for many process samples in parallel.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    samples : int
+        Number of Monte Carlo samples
+    variations : dict, optional
+        Parameter -> Variation, see sample_cards()
+    points : list of dict, optional
+        Grid points simulated for every sample; by default VDD = 0.5 V with
+        every capacitor at 1 fF
+    seed : int
+        Seed of the draws
+    workers : int, optional
+        Concurrent simulator processes, defaults to the CPU count
+    simulator : str or list, optional
+        Simulator command
+    settings : dict, optional
+        Overrides for neuronsim.sweep.DEFAULT_SETTINGS
+    store : str or ResultStore, optional
+        Result store; stored samples are not simulated again
+    output : str, optional
+        Table of every sample, with its drawn parameters
+    model_dir : str
+        Directory of the per-sample model cards
+    work_dir : str, optional
+        Directory for the per-sample decks
+    timeout : float, optional
+        Per-sample simulator timeout in seconds
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per sample and point: 'Sample', the drawn parameters, the
+        swept parameters and the result columns
+    """
+    design_def = get_design(design)
+    if points is None:
+        points = build_grid(design_def, [0.5], [1e-15])
+    run_settings = dict(DEFAULT_SETTINGS)
+    if settings:
+        run_settings.update(settings)
+    run_settings['segment'] = None
+    if run_settings['backend'] == 'shared':
+        # libngspice holds one circuit per process; every sample reloads it
+        run_settings['extraction'] = 'numpy'
+
+    cards = sample_cards(samples, variations, seed, model_dir)
+    sample_settings = [dict(run_settings, model_file=c['model_file']) for c in cards]
+
+    own_store = isinstance(store, str)
+    if own_store:
+        store = ResultStore(store)
+    values = {}
+    keys = {}
+    if store is not None:
+        for s, card_settings in enumerate(sample_settings):
+            digest = model_hash(card_settings['model_file'])
+            for i, point in enumerate(points):
+                keys[s, i] = point_key(design, point, card_settings, digest)
+        found = store.lookup(list(keys.values()))
+        values = {si: found[key] for si, key in keys.items() if key in found}
+        print(f"{len(values)} of {samples * len(points)} sample points already in {store.path}")
+
+    if work_dir is None:
+        work_dir = os.path.join(model_dir, 'runs')
+    os.makedirs(work_dir, exist_ok=True)
+    jobs = []
+    for s, card_settings in enumerate(sample_settings):
+        pending = [i for i in range(len(points)) if (s, i) not in values]
+        if pending:
+            jobs.append({
+                'design': design,
+                'points': [points[i] for i in pending],
+                'indices': pending,
+                'index': s,
+                'work_dir': work_dir,
+                'settings': card_settings,
+                'simulator': simulator,
+                'timeout': timeout,
+                'keep': False,
+            })
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Simulating {len(jobs)} {design} process samples on {workers} workers")
+    start = time.time()
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_chunk, job): job for job in jobs}
+            for done, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                result = future.result()
+                completed = {(job['index'], i): tuple(row[-len(RESULT_COLUMNS):])
+                             for i, row in zip(job['indices'], result['rows']) if row is not None}
+                values.update(completed)
+                failed += len(job['indices']) - len(completed)
+                if store is not None and completed:
+                    store.insert([(keys[si], v) for si, v in completed.items()])
+                if done % max(1, len(jobs) // 20) == 0 or done == len(jobs):
+                    print(f"{done}/{len(jobs)} samples ({time.time() - start:.1f} s)")
+    finally:
+        if own_store:
+            store.close()
+
+    parameter_names = list(cards[0]['values']) if cards else []
+    rows = []
+    for s, card in enumerate(cards):
+        for i, point in enumerate(points):
+            if (s, i) in values:
+                rows.append([s] + [card['values'][n] for n in parameter_names] +
+                            result_row(design, point, values[s, i]))
+    columns = ['Sample'] + parameter_names + parameter_columns(design_def) + RESULT_COLUMNS
+    df = pd.DataFrame(rows, columns=columns)
+    df['Spikes'] = df['Spikes'].astype(int)
+    if failed:
+        print(f"Warning: {failed} sample points failed to simulate")
+    if output:
+        write_table(df, output)
+        print(f"Results written to {output}")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo process variation of a neuron design.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--samples', type=int, default=100, help='number of samples (default: 100)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the draws')
+    parser.add_argument('--vary', nargs='+', default=None, metavar='NAME=KIND:SCALE',
+                        help="perturbed parameters, e.g. phig=normal:0.02 u0=normal:5%% "
+                             "(default: phig, u0, eot, tfin and nbody)")
+    parser.add_argument('--vdd', type=float, nargs='+', default=[0.5], help='supply voltages')
+    parser.add_argument('--caps', type=float, nargs='+', default=[1e-15], help='capacitor values')
+    parser.add_argument('--tstop', default=None, help='transient stop time (e.g. 20n)')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent simulator processes')
+    parser.add_argument('--backend', choices=['batch', 'session', 'shared'], default=None,
+                        help='simulator backend, as in neuronsim.sweep')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--model-dir', default='montecarlo_models', help='directory of the sample cards')
+    parser.add_argument('--store', default=None, help='SQLite result store; reruns skip stored samples')
+    parser.add_argument('--figure', default=None, help='save frequency and energy histograms here')
+    parser.add_argument('-o', '--output', default=None, help='table of every sample')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+    settings = {}
+    if args.tstop:
+        settings['tstop'] = args.tstop
+    if args.backend:
+        settings['backend'] = args.backend
+    variations = dict(parse_variation(v) for v in args.vary) if args.vary else None
+
+    design = get_design(args.design)
+    points = build_grid(design, vdd_values=args.vdd, cap_values=args.caps)
+    df = run_monte_carlo(args.design.lower(), samples=args.samples, variations=variations,
+                         points=points, seed=args.seed, workers=args.workers,
+                         simulator=simulator, settings=settings, store=args.store,
+                         output=args.output, model_dir=args.model_dir)
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(summarize(df, args.design.lower()).to_string(index=False))
+    if args.figure:
+        plot_distributions(df, args.figure)
+        print(f"Histograms written to {args.figure}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+Minimal reader and SPICE netlister for the xschem schematics in this repository.
+
+xschem stores the net name of every wire in its ``lab=`` attribute, so a
+component pin is resolved by finding the wire segment it sits on. Symbol pin
+positions come from the ``.sym`` files next to the schematic, an installed
+xschem library if one can be found, or the built-in table of the stock
+``devices/`` symbols used by the neuron schematics.
+"""
+
+import os
+
+# Stock xschem symbols referenced by the schematics. Pins are listed in
+# netlist order as (name, x, y) in symbol coordinates.
+STOCK_SYMBOLS = {
+    'devices/capa.sym': {
+        'type': 'capacitor',
+        'format': '@name @pinlist @value m=@m',
+        'template': {'name': 'C0', 'm': '1', 'value': '1p'},
+        'pins': [('p', 0.0, -30.0), ('m', 0.0, 30.0)],
+    },
+    'devices/res.sym': {
+        'type': 'resistor',
+        'format': '@name @pinlist @value m=@m',
+        'template': {'name': 'R0', 'm': '1', 'value': '1k'},
+        'pins': [('p', 0.0, -30.0), ('m', 0.0, 30.0)],
+    },
+    'devices/isource.sym': {
+        'type': 'isource',
+        'format': '@name @pinlist @value',
+        'template': {'name': 'I0', 'value': '1m'},
+        'pins': [('p', 0.0, -30.0), ('m', 0.0, 30.0)],
+    },
+    'devices/vsource.sym': {
+        'type': 'vsource',
+        'format': '@name @pinlist @value',
+        'template': {'name': 'V1', 'value': '3'},
+        'pins': [('p', 0.0, -30.0), ('m', 0.0, 30.0)],
+    },
+    'devices/vdd.sym': {'type': 'label', 'format': '', 'template': {}, 'pins': []},
+    'devices/gnd.sym': {'type': 'label', 'format': '', 'template': {}, 'pins': []},
+    'devices/lab_pin.sym': {'type': 'label', 'format': '', 'template': {}, 'pins': []},
+    'devices/simulator_commands_shown.sym': {
+        'type': 'netlist_commands', 'format': '@value', 'template': {}, 'pins': [],
+    },
+    'devices/simulator_commands.sym': {
+        'type': 'netlist_commands', 'format': '@value', 'template': {}, 'pins': [],
+    },
+}
+
+# Locations searched for an installed xschem symbol library
+XSCHEM_LIBRARY_DIRS = [
+    '/usr/local/share/xschem/xschem_library',
+    '/usr/share/xschem/xschem_library',
+]
+
+_EPSILON = 1e-6
+
+
+def _split_records(text):
+    """
+    Split xschem file text into (tag, body) records.
+
+    A record starts with a single tag letter at the beginning of a line and
+    may span several lines inside brace-delimited attribute blocks.
+    """
+    records = []
+    i = 0
+    n = len(text)
+    while i < n:
+        while i < n and text[i] in ' \t\r\n':
+            i += 1
+        if i >= n:
+            break
+        tag = text[i]
+        i += 1
+        start = i
+        depth = 0
+        while i < n:
+            c = text[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+            elif c == '\n' and depth == 0:
+                break
+            i += 1
+        records.append((tag, text[start:i].strip()))
+    return records
+
+
+def _split_fields(body):
+    """
+    Split a record body into whitespace fields, keeping {...} blocks intact.
+    """
+    fields = []
+    i = 0
+    n = len(body)
+    while i < n:
+        if body[i].isspace():
+            i += 1
+            continue
+        if body[i] == '{':
+            depth = 0
+            start = i
+            while i < n:
+                c = body[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                i += 1
+            fields.append(body[start + 1:i - 1])
+        else:
+            start = i
+            while i < n and not body[i].isspace():
+                i += 1
+            fields.append(body[start:i])
+    return fields
+
+
+def _unescape(value):
+    out = []
+    i = 0
+    while i < len(value):
+        if value[i] == '\\' and i + 1 < len(value):
+            out.append(value[i + 1])
+            i += 2
+        else:
+            out.append(value[i])
+            i += 1
+    return ''.join(out)
+
+
+def parse_attributes(text):
+    """
+    Parse an xschem attribute block (``key=value`` pairs) into a dict.
+
+    Values may be bare tokens or double-quoted strings spanning several lines.
+    """
+    attrs = {}
+    i = 0
+    n = len(text)
+    while i < n:
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n:
+            break
+        start = i
+        while i < n and text[i] != '=' and not text[i].isspace():
+            i += 1
+        key = text[start:i]
+        if i >= n or text[i] != '=':
+            continue
+        i += 1
+        if i < n and text[i] == '"':
+            i += 1
+            start = i
+            while i < n and text[i] != '"':
+                if text[i] == '\\':
+                    i += 1
+                i += 1
+            value = text[start:i]
+            i += 1
+        else:
+            start = i
+            while i < n and not text[i].isspace():
+                if text[i] == '\\':
+                    i += 1
+                i += 1
+            value = text[start:i]
+        attrs[key] = _unescape(value)
+    return attrs
+
+
+def read_schematic(path):
+    """
+    Read the components and wires of an xschem schematic.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the .sch file
+
+    Returns:
+    --------
+    dict
+        'components': list of dicts with 'symbol', 'x', 'y', 'rot', 'flip', 'attrs'
+        'wires': list of dicts with 'x1', 'y1', 'x2', 'y2', 'label'
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+
+    components = []
+    wires = []
+    for tag, body in _split_records(text):
+        fields = _split_fields(body)
+        if tag == 'C' and len(fields) >= 6:
+            components.append({
+                'symbol': fields[0],
+                'x': float(fields[1]),
+                'y': float(fields[2]),
+                'rot': int(fields[3]),
+                'flip': int(fields[4]),
+                'attrs': parse_attributes(fields[5]),
+            })
+        elif tag == 'N' and len(fields) >= 5:
+            attrs = parse_attributes(fields[4])
+            wires.append({
+                'x1': float(fields[0]), 'y1': float(fields[1]),
+                'x2': float(fields[2]), 'y2': float(fields[3]),
+                'label': attrs.get('lab', ''),
+            })
+    return {'path': path, 'components': components, 'wires': wires}
+
+
+def read_symbol(path):
+    """
+    Read the netlisting information (type, format, pins) of an xschem symbol.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+
+    symbol = {'type': '', 'format': '', 'template': {}, 'pins': []}
+    seen_k = False
+    for tag, body in _split_records(text):
+        fields = _split_fields(body)
+        # xschem >= 3 keeps the symbol properties in K; older files use G/S
+        if tag in ('K', 'G', 'S') and fields and not (seen_k and tag != 'K'):
+            attrs = parse_attributes(fields[0])
+            if not attrs.get('type'):
+                continue
+            seen_k = seen_k or tag == 'K'
+            symbol['type'] = attrs.get('type', '')
+            symbol['format'] = attrs.get('format', '')
+            symbol['template'] = parse_attributes(attrs.get('template', ''))
+        elif tag == 'B' and len(fields) >= 6 and fields[0] == '5':
+            x1, y1, x2, y2 = (float(v) for v in fields[1:5])
+            attrs = parse_attributes(fields[5])
+            symbol['pins'].append((attrs.get('name', ''), (x1 + x2) / 2, (y1 + y2) / 2))
+    return symbol
+
+
+def find_symbol(reference, schematic_dir, library_dirs=None):
+    """
+    Resolve a symbol reference to its netlisting information.
+
+    The schematic directory is searched first, then any xschem libraries
+    (``XSCHEM_LIBRARY_PATH`` and the usual install locations), and finally
+    the built-in table of stock symbols.
+    """
+    search = [schematic_dir]
+    if library_dirs is not None:
+        search.extend(library_dirs)
+    env_path = os.environ.get('XSCHEM_LIBRARY_PATH')
+    if env_path:
+        search.extend(p for p in env_path.split(os.pathsep) if p)
+    search.extend(XSCHEM_LIBRARY_DIRS)
+
+    for directory in search:
+        candidate = os.path.join(directory, reference)
+        if os.path.isfile(candidate):
+            return read_symbol(candidate)
+    if reference in STOCK_SYMBOLS:
+        return STOCK_SYMBOLS[reference]
+    raise FileNotFoundError(f"Symbol '{reference}' not found for {schematic_dir}")
+
+
+def _transform(px, py, component):
+    """
+    Map a symbol-space point to schematic space (xschem ROTATION macro).
+    """
+    x = -px if component['flip'] else px
+    y = py
+    rot = component['rot'] % 4
+    if rot == 1:
+        x, y = -y, x
+    elif rot == 2:
+        x, y = -x, -y
+    elif rot == 3:
+        x, y = y, -x
+    return component['x'] + x, component['y'] + y
+
+
+def _on_segment(x, y, wire):
+    x1, y1, x2, y2 = wire['x1'], wire['y1'], wire['x2'], wire['y2']
+    if not (min(x1, x2) - _EPSILON <= x <= max(x1, x2) + _EPSILON and
+            min(y1, y2) - _EPSILON <= y <= max(y1, y2) + _EPSILON):
+        return False
+    return abs((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) <= _EPSILON * max(
+        1.0, abs(x2 - x1) + abs(y2 - y1))
+
+
+def _net_name(label):
+    # xschem prefixes auto-generated net names with '#', dropped in the netlist
+    return label[1:] if label.startswith('#') else label
+
+
+def _format_instance(symbol, attrs, nets):
+    fmt = symbol['format']
+    values = dict(symbol['template'])
+    values.update(attrs)
+    out = []
+    for token in fmt.split(' '):
+        if token == '@pinlist':
+            out.append(' '.join(nets))
+            continue
+        if '@' not in token:
+            out.append(token)
+            continue
+        prefix, _, rest = token.partition('@')
+        key = rest.rstrip(',')
+        out.append(prefix + values.get(key, '') + rest[len(key):])
+    return ' '.join(t for t in out if t)
+
+
+def netlist_schematic(path, library_dirs=None):
+    """
+    Produce the SPICE device lines and command blocks of a schematic.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the .sch file
+    library_dirs : list of str, optional
+        Extra directories searched for symbol files
+
+    Returns:
+    --------
+    dict
+        'devices': list of SPICE device lines in schematic order
+        'commands': list of simulator command blocks (the COMMANDS text)
+    """
+    schematic = read_schematic(path)
+    schematic_dir = os.path.dirname(os.path.abspath(path))
+    devices = []
+    commands = []
+
+    for component in schematic['components']:
+        symbol = find_symbol(component['symbol'], schematic_dir, library_dirs)
+        if symbol['type'] == 'netlist_commands':
+            commands.append(component['attrs'].get('value', ''))
+            continue
+        if not symbol['format'] or symbol['type'] == 'label':
+            continue
+
+        nets = []
+        for pin_name, px, py in symbol['pins']:
+            x, y = _transform(px, py, component)
+            label = next((w['label'] for w in schematic['wires']
+                          if w['label'] and _on_segment(x, y, w)), None)
+            if label is None:
+                raise ValueError(f"{os.path.basename(path)}: pin {pin_name} of "
+                                 f"{component['attrs'].get('name', '?')} is not connected")
+            nets.append(_net_name(label))
+        devices.append(_format_instance(symbol, component['attrs'], nets))
+
+    return {'devices': devices, 'commands': commands}
+
+
+def split_commands(commands):
+    """
+    Split a COMMANDS block into its netlist lines and its .control body.
+
+    Returns:
+    --------
+    tuple : (netlist_lines, control_lines)
+        Lines outside and inside the .control/.endc section, stripped,
+        with blank lines and comments removed
+    """
+    netlist_lines = []
+    control_lines = []
+    in_control = False
+    for raw in commands.splitlines():
+        line = raw.strip()
+        if not line or line.startswith('*'):
+            continue
+        lowered = line.lower()
+        if lowered.startswith('.control'):
+            in_control = True
+        elif lowered.startswith('.endc'):
+            in_control = False
+        elif in_control:
+            control_lines.append(line)
+        else:
+            netlist_lines.append(line)
+    return netlist_lines, control_lines
@@ -0,0 +1,492 @@
+"""
+Surrogate-model optimization of a neuron design's operating point.
+
+The ``*Optimal.sch`` decks simulate a single capacitor pair picked by eye
+from the heatmaps. Here every ngspice run is treated as an expensive
+black-box evaluation of (VDD, capacitors, NFFins, NFNFins, Isyn). Gaussian
+processes (``neuronsim.surrogate``) are fitted to log frequency, log energy
+per spike and the probability of spiking, and each iteration proposes a
+batch of points that is simulated in one process pool, one
+``neuronsim.sweep.run_chunk`` job per point.
+
+The batch is spread along the frequency / energy trade-off: each slot
+maximizes an upper confidence bound of w * freq_norm + (1 - w) *
+(1 - energy_norm) for a different weight w, weighted by the probability of
+spiking, and the surrogates are conditioned on their own prediction for a
+chosen point before the next one is picked (kriging believer). The sweep
+tables shipped with the design seed the surrogates, so the first batch
+already starts from the known good region.
+
+Example:
+    python -m neuronsim.optimize --design besrour --iterations 10 --batch-size 24 \
+        --store sweeps.db -o besrour_optimize.txt
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .analysis.optimal import optimization_score
+from .designs import RESULT_COLUMNS, data_path, get_design, parameter_columns
+from .spice import parse_spice_number
+from .surrogate import GaussianProcess
+
+# Run settings optimized next to VDD and the capacitors
+SETTING_COLUMNS = ['NFFins', 'NFNFins', 'Isyn']
+
+# Search bounds; the capacitor bounds come from the design's cap_values
+DEFAULT_BOUNDS = {
+    'VDD': (0.1, 0.9),
+    'NFFins': (1, 4),
+    'NFNFins': (1, 8),
+    'Isyn': (10e-9, 1e-6),
+}
+
+# Upper confidence bound exploration weight
+DEFAULT_KAPPA = 2.0
+
+# Largest training set of the surrogates; the warm-start tables hold up to
+# 29241 rows, far more than an O(n^3) Gaussian process needs
+MAX_TRAINING_POINTS = 300
+
+
+def search_space(design, bounds=None):
+    """
+    Optimized columns of a design with their bounds and scale.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    bounds : dict, optional
+        Overrides of DEFAULT_BOUNDS, or (low, high) per capacitor column
+
+    Returns:
+    --------
+    list of tuple
+        (column, low, high, scale) with scale 'linear', 'log' or 'integer'
+    """
+    bounds = dict(DEFAULT_BOUNDS, **(bounds or {}))
+    caps = design['cap_values']
+    space = [('VDD',) + tuple(bounds['VDD']) + ('linear',)]
+    for column in parameter_columns(design)[1:]:
+        low, high = bounds.get(column, (min(caps), max(caps)))
+        space.append((column, low, high, 'log'))
+    space.append(('NFFins',) + tuple(bounds['NFFins']) + ('integer',))
+    space.append(('NFNFins',) + tuple(bounds['NFNFins']) + ('integer',))
+    space.append(('Isyn',) + tuple(bounds['Isyn']) + ('log',))
+    return space
+
+
+def snap(value, column, scale):
+    """
+    Round a proposed value to something a deck can be run with.
+
+    VDD is kept on the 10 mV grid of the sweeps, fin counts are integers and
+    capacitors and currents keep three significant digits.
+    """
+    if column == 'VDD':
+        return round(float(value), 2)
+    if scale == 'integer':
+        return int(round(value))
+    return float(f'{value:.3g}')
+
+
+def to_unit(df, space):
+    """
+    Map the optimized columns of a table into the unit cube.
+    """
+    columns = []
+    for column, low, high, scale in space:
+        values = df[column].to_numpy(dtype=float)
+        if scale == 'log':
+            columns.append((np.log(values) - np.log(low)) / (np.log(high) - np.log(low)))
+        else:
+            columns.append((values - low) / (high - low))
+    return np.clip(np.column_stack(columns), 0, 1)
+
+
+def from_unit(u, space):
+    """
+    Map unit-cube points back to snapped parameter values.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One column per optimized parameter
+    """
+    data = {}
+    for k, (column, low, high, scale) in enumerate(space):
+        if scale == 'log':
+            values = np.exp(np.log(low) + u[:, k] * (np.log(high) - np.log(low)))
+        else:
+            values = low + u[:, k] * (high - low)
+        data[column] = [snap(v, column, scale) for v in values]
+    return pd.DataFrame(data)
+
+
+def load_warm_start(design_name, paths=None):
+    """
+    Load sweep tables as surrogate training data.
+
+    Tables without fin-count or Isyn columns were run with the sweep
+    defaults, so those columns are filled from neuronsim.sweep.DEFAULT_SETTINGS.
+
+    Parameters:
+    -----------
+    design_name : str
+        Design name
+    paths : list of str, optional
+        Sweep tables (or earlier optimizer histories); the design's sweep
+        and optimal tables by default
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Parameter, setting and result columns
+    """
+    from .sweep import DEFAULT_SETTINGS
+    from .tables import read_table
+
+    design = get_design(design_name)
+    if paths is None:
+        paths = [data_path(design, 'sweep_file'), data_path(design, 'optimal_file')]
+    defaults = {'NFFins': int(DEFAULT_SETTINGS['nffins']),
+                'NFNFins': int(DEFAULT_SETTINGS['nfnfins']),
+                'Isyn': parse_spice_number(DEFAULT_SETTINGS['isyn'])}
+    columns = parameter_columns(design) + SETTING_COLUMNS + RESULT_COLUMNS
+    frames = []
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"Warning: warm-start table {path} not found")
+            continue
+        df = read_table(path)
+        for column, value in defaults.items():
+            if column not in df:
+                df[column] = value
+        frames.append(df[columns])
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).drop_duplicates(
+        subset=columns[:-len(RESULT_COLUMNS)], keep='last').reset_index(drop=True)
+
+
+def _front_index(df):
+    spiking = df[df['Energy_Per_Spike'] > 0]
+    ordered = spiking.sort_values(['Energy_Per_Spike', 'Frequency'], ascending=[True, False])
+    frequency = ordered['Frequency'].to_numpy()
+    if not len(frequency):
+        return ordered.index
+    best = np.maximum.accumulate(frequency)
+    return ordered.index[np.concatenate([[True], frequency[1:] > best[:-1]])]
+
+
+def pareto_front(df):
+    """
+    Spiking points not dominated in (maximum frequency, minimum energy per spike).
+
+    Returns:
+    --------
+    pandas.DataFrame
+        The non-dominated rows, by increasing energy per spike
+    """
+    return df.loc[_front_index(df)].reset_index(drop=True)
+
+
+def _training_rows(history, max_points, rng):
+    # Keep the Pareto front and the best-scoring points, then fill up with
+    # a random sample so the surrogates still see the rest of the space
+    chosen = set(_front_index(history))
+    spiking = history[history['Energy_Per_Spike'] > 0]
+    if len(spiking) > 1:
+        score = np.nan_to_num(optimization_score(spiking['Frequency'], spiking['Energy_Per_Spike']))
+        chosen.update(spiking.index[np.argsort(score)[::-1][:max_points // 4]])
+    rest = np.setdiff1d(history.index.to_numpy(), list(chosen))
+    n_random = max(max_points - len(chosen), 0)
+    if len(rest) and n_random:
+        chosen.update(rng.choice(rest, size=min(n_random, len(rest)), replace=False))
+    return history.loc[sorted(chosen)]
+
+
+def propose_batch(history, space, batch_size, rng=None, kappa=DEFAULT_KAPPA,
+                  n_candidates=2048, max_training=MAX_TRAINING_POINTS):
+    """
+    Propose the next points to simulate.
+
+    Parameters:
+    -----------
+    history : pandas.DataFrame
+        Every evaluated point with parameter, setting and result columns
+    space : list of tuple
+        Search space from search_space()
+    batch_size : int
+        Number of points to propose
+    rng : numpy.random.Generator, optional
+        Random generator for the candidate set and training sample
+    kappa : float
+        Exploration weight of the upper confidence bound
+    n_candidates : int
+        Quasi-random candidates scored per proposal
+    max_training : int
+        Largest number of history rows the surrogates are fitted to
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Proposed points, one column per optimized parameter
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    columns = [s[0] for s in space]
+    train = _training_rows(history, max_training, rng)
+    spiking = train[train['Energy_Per_Spike'] > 0]
+    if len(spiking) < 2:
+        raise ValueError("Need at least two spiking points to fit the surrogates")
+
+    X_all = to_unit(train, space)
+    X = to_unit(spiking, space)
+    log_freq = np.log10(spiking['Frequency'].to_numpy(dtype=float))
+    log_energy = np.log10(spiking['Energy_Per_Spike'].to_numpy(dtype=float))
+    gp_freq = GaussianProcess().fit(X, log_freq)
+    gp_energy = GaussianProcess().fit(X, log_energy)
+    gp_spiking = GaussianProcess().fit(X_all, (train['Energy_Per_Spike'] > 0).to_numpy(float))
+    f_lo, f_range = log_freq.min(), np.ptp(log_freq) or 1.0
+    e_lo, e_range = log_energy.min(), np.ptp(log_energy) or 1.0
+
+    # Quasi-random candidates plus local moves around the current front
+    sobol = qmc.Sobol(len(space), seed=rng).random(n_candidates)
+    front = to_unit(pareto_front(history), space)
+    if len(front):
+        local = front[rng.integers(len(front), size=n_candidates // 2)]
+        local = np.clip(local + rng.normal(scale=0.05, size=local.shape), 0, 1)
+        sobol = np.vstack([sobol, local])
+    candidates = from_unit(sobol, space).drop_duplicates()
+    seen = history[columns].merge(candidates, on=columns, how='inner')
+    if len(seen):
+        candidates = candidates.merge(seen.drop_duplicates(), on=columns, how='left',
+                                      indicator=True)
+        candidates = candidates[candidates['_merge'] == 'left_only'].drop(columns='_merge')
+    candidates = candidates.reset_index(drop=True)
+    U = to_unit(candidates, space)
+
+    weights = np.linspace(0.1, 0.9, batch_size) if batch_size > 1 else np.array([0.5])
+    chosen = []
+    for w in weights:
+        if len(chosen) == len(candidates):
+            break
+        mf, sf = gp_freq.predict(U)
+        me, se = gp_energy.predict(U)
+        p_spike, _ = gp_spiking.predict(U)
+        freq_norm = (mf - f_lo) / f_range
+        energy_norm = (me - e_lo) / e_range
+        spread = np.hypot(w * sf / f_range, (1 - w) * se / e_range)
+        acquisition = (w * freq_norm + (1 - w) * (1 - energy_norm) + kappa * spread) * \
+            np.clip(p_spike, 0, 1)
+        acquisition[chosen] = -np.inf
+        best = int(np.argmax(acquisition))
+        chosen.append(best)
+        # Kriging believer: pretend the prediction was observed
+        gp_freq.add_observations(U[best:best + 1], mf[best:best + 1])
+        gp_energy.add_observations(U[best:best + 1], me[best:best + 1])
+        gp_spiking.add_observations(U[best:best + 1], p_spike[best:best + 1])
+    return candidates.loc[chosen].reset_index(drop=True)
+
+
+def evaluate_batch(design_name, proposals, settings=None, workers=None, simulator=None,
+                   store=None, work_dir=None, timeout=None):
+    """
+    Simulate proposed points in one process pool, one job per point.
+
+    Every point carries its own fin counts and Isyn, so the whole batch runs
+    in parallel whatever settings it mixes.
+
+    Parameters:
+    -----------
+    design_name : str
+        Design name
+    proposals : pandas.DataFrame
+        Points from propose_batch()
+    settings : dict, optional
+        Run settings shared by every point (tstop, extraction, ...)
+    workers, simulator, store, work_dir, timeout : see neuronsim.sweep.run_sweep()
+
+    Returns:
+    --------
+    pandas.DataFrame
+        The proposals that produced a result, with the result columns
+    """
+    from .store import ResultStore, model_hash, point_key
+    from .sweep import DEFAULT_SETTINGS, run_chunk
+
+    columns = parameter_columns(get_design(design_name))
+    output_columns = columns + SETTING_COLUMNS + RESULT_COLUMNS
+    records = proposals.to_dict('records')
+    points = [{c: record[c] for c in columns} for record in records]
+    point_settings = []
+    for record in records:
+        run_settings = dict(DEFAULT_SETTINGS)
+        run_settings.update(settings or {})
+        run_settings.update(nffins=int(record['NFFins']), nfnfins=int(record['NFNFins']),
+                            isyn=float(record['Isyn']))
+        if run_settings['backend'] == 'shared':
+            run_settings['extraction'] = 'numpy'
+        point_settings.append(run_settings)
+
+    own_store = isinstance(store, str)
+    if own_store:
+        store = ResultStore(store)
+    values = {}
+    keys = None
+    if store is not None:
+        keys = [point_key(design_name, point, s, model_hash(s['model_file']))
+                for point, s in zip(points, point_settings)]
+        found = store.lookup(keys)
+        values = {i: found[key] for i, key in enumerate(keys) if key in found}
+    pending = [i for i in range(len(points)) if i not in values]
+
+    own_work_dir = work_dir is None
+    if own_work_dir:
+        work_dir = tempfile.mkdtemp(prefix=f'{design_name}_optimize_')
+    os.makedirs(work_dir, exist_ok=True)
+    jobs = [{
+        'design': design_name,
+        'points': [points[i]],
+        'index': i,
+        'work_dir': work_dir,
+        'settings': point_settings[i],
+        'simulator': simulator,
+        'timeout': timeout,
+        'keep': False,
+    } for i in pending]
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1,
+                                                 len(jobs))) as pool:
+            for result in pool.map(run_chunk, jobs):
+                row = result['rows'][0]
+                if row is None:
+                    continue
+                i = result['index']
+                values[i] = tuple(row[-len(RESULT_COLUMNS):])
+                if store is not None:
+                    store.insert([(keys[i], values[i])])
+                    if result['rungs'][0] is not None:
+                        store.record_rungs([(keys[i], result['rungs'][0])])
+    if own_work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if own_store:
+        store.close()
+
+    rows = [[points[i][c] for c in columns] +
+            [int(records[i]['NFFins']), int(records[i]['NFNFins']), float(records[i]['Isyn'])] +
+            list(values[i]) for i in range(len(points)) if i in values]
+    df = pd.DataFrame(rows, columns=output_columns)
+    df['Spikes'] = df['Spikes'].astype(int)
+    return df
+
+
+def optimize(design, iterations=10, batch_size=8, warm_start=None, bounds=None, seed=0,
+             kappa=DEFAULT_KAPPA, evaluate=None, **sweep_options):
+    """
+    Run the batch Bayesian optimization loop.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    iterations : int
+        Number of batches to simulate
+    batch_size : int
+        Points simulated in parallel per iteration
+    warm_start : list of str, optional
+        Tables seeding the surrogates, see load_warm_start()
+    bounds : dict, optional
+        Search bound overrides, see search_space()
+    seed : int
+        Random seed of the candidate sets
+    kappa : float
+        Exploration weight of the upper confidence bound
+    evaluate : callable, optional
+        evaluate(proposals) -> DataFrame of results; runs evaluate_batch()
+        with sweep_options by default
+    **sweep_options
+        Passed to evaluate_batch()
+
+    Returns:
+    --------
+    tuple : (history, front)
+        Every evaluated point (warm start included, 'Iteration' 0) and the
+        Pareto front of frequency vs energy per spike
+    """
+    design_name = design.lower()
+    space = search_space(get_design(design_name), bounds)
+    rng = np.random.default_rng(seed)
+    if evaluate is None:
+        def evaluate(proposals):
+            return evaluate_batch(design_name, proposals, **sweep_options)
+
+    history = load_warm_start(design_name, warm_start).assign(Iteration=0)
+    print(f"Warm start: {len(history)} points, "
+          f"{len(pareto_front(history))} on the Pareto front")
+
+    for iteration in range(1, iterations + 1):
+        proposals = propose_batch(history, space, batch_size, rng, kappa)
+        if proposals.empty:
+            print("No unexplored candidates left")
+            break
+        results = evaluate(proposals).assign(Iteration=iteration)
+        history = pd.concat([history, results], ignore_index=True)
+        front = pareto_front(history)
+        print(f"Iteration {iteration}: {len(results)} points simulated, "
+              f"{int((results['Energy_Per_Spike'] > 0).sum())} spiking, "
+              f"{int((front['Iteration'] == iteration).sum())} new on the "
+              f"{len(front)}-point Pareto front")
+
+    return history, pareto_front(history)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bayesian optimization of a neuron design.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--iterations', type=int, default=10, help='batches to simulate (default: 10)')
+    parser.add_argument('--batch-size', type=int, default=8, help='points per batch (default: 8)')
+    parser.add_argument('--warm-start', nargs='+', default=None,
+                        help="seed tables (default: the design's sweep and optimal tables)")
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--kappa', type=float, default=DEFAULT_KAPPA,
+                        help=f'exploration weight (default: {DEFAULT_KAPPA})')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent ngspice processes')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--store', default=None, help='SQLite result store')
+    parser.add_argument('-o', '--output', default=None,
+                        help='history table; the Pareto front goes to <output>_pareto')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+
+    history, front = optimize(args.design, iterations=args.iterations,
+                              batch_size=args.batch_size, warm_start=args.warm_start,
+                              seed=args.seed, kappa=args.kappa, workers=args.workers,
+                              simulator=simulator, store=args.store)
+
+    print("\nPareto front (frequency vs energy per spike):")
+    print(front.drop(columns='Spikes').to_string(index=False, float_format='%.4g'))
+    if args.output:
+        from .sweep import write_table
+        root, ext = os.path.splitext(args.output)
+        write_table(history, args.output)
+        write_table(front, f'{root}_pareto{ext}')
+        print(f"History written to {args.output}, Pareto front to {root}_pareto{ext}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Reader for ngspice raw output files.
+
+Binary raw files are memory-mapped: every vector is returned as a strided
+NumPy view into the mapping, so nothing is parsed or copied until the data
+is actually used, and vectors that are not asked for are never touched.
+The views keep the mapping alive: it is unmapped once the RawFile is
+closed and the last view is gone. A file whose data stops short of its
+header's point count (a killed simulator) raises ValueError.
+ASCII raw files (``set filetype=ascii``) are parsed into regular arrays.
+"""
+
+import mmap
+
+import numpy as np
+
+from .waveforms import normalize_vector_name
+
+
+def _read_header(buffer, offset):
+    """
+    Parse one plot header starting at offset.
+
+    Returns:
+    --------
+    tuple : (header, data_offset)
+        header holds 'title', 'plotname', 'flags', 'n_variables', 'n_points',
+        'variables' (list of (name, type)) and 'format' ('binary' or 'ascii')
+    """
+    header = {'variables': []}
+    position = offset
+    reading_variables = False
+    while True:
+        end = buffer.find(b'\n', position)
+        if end < 0:
+            raise ValueError('Truncated raw file header')
+        line = bytes(buffer[position:end]).decode('latin-1').rstrip('\r')
+        position = end + 1
+
+        if reading_variables and line[:1] in ('\t', ' ') and line.strip():
+            fields = line.split()
+            header['variables'].append((normalize_vector_name(fields[1]),
+                                        fields[2] if len(fields) > 2 else ''))
+            continue
+        reading_variables = False
+
+        key, _, value = line.partition(':')
+        key = key.strip().lower()
+        value = value.strip()
+        if key == 'title':
+            header['title'] = value
+        elif key == 'plotname':
+            header['plotname'] = value
+        elif key == 'flags':
+            header['flags'] = value.lower().split()
+        elif key == 'no. variables':
+            header['n_variables'] = int(value)
+        elif key == 'no. points':
+            header['n_points'] = int(value)
+        elif key == 'variables':
+            reading_variables = True
+        elif key in ('binary', 'values'):
+            header['format'] = 'binary' if key == 'binary' else 'ascii'
+            return header, position
+
+
+def _parse_ascii_values(buffer, offset, header):
+    n_vars = header['n_variables']
+    n_points = header['n_points']
+    complex_data = 'complex' in header.get('flags', [])
+    values = np.empty((n_points, n_vars), dtype=complex if complex_data else float)
+    position = offset
+    for point in range(n_points):
+        for var in range(n_vars):
+            if position >= len(buffer):
+                raise ValueError(f'Truncated raw file: {point} of {n_points} points')
+            end = buffer.find(b'\n', position)
+            if end < 0:
+                end = len(buffer)
+            fields = bytes(buffer[position:end]).split()
+            position = end + 1
+            # The first line of a point starts with the point index
+            text = fields[-1].decode()
+            if complex_data:
+                real, imag = text.split(',')
+                values[point, var] = complex(float(real), float(imag))
+            else:
+                values[point, var] = float(text)
+    return values, position
+
+
+class RawFile:
+    """
+    An ngspice raw file opened for reading.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the .raw file
+
+    Attributes:
+    -----------
+    plots : list of dict
+        One entry per plot in the file with its header fields and vectors
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.plots = []
+        self._scan()
+
+    def _scan(self):
+        offset = 0
+        size = len(self._map)
+        while offset < size:
+            # Skip blank lines between consecutive plots
+            while offset < size and self._map[offset:offset + 1] in (b'\n', b'\r'):
+                offset += 1
+            if offset >= size:
+                break
+            header, data_offset = _read_header(self._map, offset)
+            complex_data = 'complex' in header.get('flags', [])
+            item = np.complex128 if complex_data else np.float64
+            names = [name for name, _ in header['variables']]
+
+            if header['format'] == 'binary':
+                # One record per time point holding every vector: each vector
+                # is a strided field view into the memory map
+                dtype = np.dtype({'names': _unique(names),
+                                  'formats': [item] * len(names)})
+                if data_offset + header['n_points'] * dtype.itemsize > size:
+                    raise ValueError(f"Truncated raw file {self.path}: {header['n_points']} "
+                                     f"points announced, {size - data_offset} data bytes")
+                records = np.ndarray(shape=(header['n_points'],), dtype=dtype,
+                                     buffer=self._map, offset=data_offset)
+                header['records'] = records
+                offset = data_offset + header['n_points'] * dtype.itemsize
+            else:
+                values, offset = _parse_ascii_values(self._map, data_offset, header)
+                header['values'] = values
+            header['names'] = names
+            self.plots.append(header)
+
+    def vector_names(self, plot=-1):
+        """
+        Return the vector names of a plot (the last one by default).
+        """
+        return list(self.plots[plot]['names'])
+
+    def vectors(self, names=None, plot=-1):
+        """
+        Return vectors of a plot as NumPy arrays.
+
+        Parameters:
+        -----------
+        names : list of str, optional
+            Vectors to return (e.g. ['time', 'v(net4)', 'i(vvdd)']); all by default
+        plot : int
+            Index of the plot, the last one by default
+
+        Returns:
+        --------
+        dict
+            Name -> array. For binary files these are read-only views into
+            the memory-mapped file; they stay valid after close().
+        """
+        header = self.plots[plot]
+        all_names = header['names']
+        if names is None:
+            names = all_names
+        vectors = {}
+        for name in names:
+            key = normalize_vector_name(name)
+            if key not in all_names:
+                raise KeyError(f"Vector '{name}' not in {self.path}; "
+                               f"available: {', '.join(all_names)}")
+            if 'records' in header:
+                vectors[key] = header['records'][key]
+            else:
+                vectors[key] = header['values'][:, all_names.index(key)]
+        return vectors
+
+    def close(self):
+        for header in self.plots:
+            header.pop('records', None)
+        # Views handed out by vectors() hold the map through their base, so
+        # it is left to be unmapped when the last of them is released
+        self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _unique(names):
+    # Structured dtypes need unique field names; later duplicates get a suffix
+    seen = {}
+    out = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            out.append(f'{name}#{seen[name]}')
+        else:
+            seen[name] = 0
+            out.append(name)
+    return out
+
+
+def read_raw(path, names=None, plot=-1):
+    """
+    Read vectors from an ngspice raw file into memory.
+
+    Only the requested vectors are copied out of the memory map. Use RawFile
+    directly to keep zero-copy views instead.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the .raw file
+    names : list of str, optional
+        Vectors to read, all by default
+    plot : int
+        Index of the plot, the last one by default
+
+    Returns:
+    --------
+    dict
+        Vector name -> numpy.ndarray
+    """
+    with RawFile(path) as raw:
+        return {name: np.array(vector) for name, vector in raw.vectors(names, plot).items()}
+
+
+def write_raw(path, vectors, title='neuronsim', plotname='Transient Analysis'):
+    """
+    Write real vectors to a binary raw file in ngspice's layout.
+
+    Parameters:
+    -----------
+    path : str
+        Output path
+    vectors : dict
+        Name -> 1-D array, all of the same length; the first entry is the scale
+    """
+    names = list(vectors)
+    n_points = len(vectors[names[0]])
+    lines = [
+        f'Title: {title}',
+        'Date: ',
+        f'Plotname: {plotname}',
+        'Flags: real',
+        f'No. Variables: {len(names)}',
+        f'No. Points: {n_points}',
+        'Variables:',
+    ]
+    for i, name in enumerate(names):
+        kind = 'time' if name == 'time' else ('current' if name.startswith('i(') else 'voltage')
+        lines.append(f'\t{i}\t{name}\t{kind}')
+    lines.append('Binary:')
+    data = np.column_stack([np.asarray(vectors[n], dtype=np.float64) for n in names])
+    with open(path, 'wb') as f:
+        f.write(('\n'.join(lines) + '\n').encode('latin-1'))
+        f.write(np.ascontiguousarray(data).tobytes())
@@ -0,0 +1,183 @@
+"""
+Long-lived simulator sessions that load the circuit and model card once.
+
+Every batch-mode run parses ``asap7_TT_slvt.sp`` and loads the BSIM-CMG
+OSDI module before simulating anything, which dominates when a sweep is
+split into many small chunks. A SimulatorSession starts the simulator in
+pipe mode (``ngspice -p deck.cir``) on a deck holding only the circuit and
+the simulator options, then feeds it the ``alter``/``tran``/``write``
+commands of each chunk over stdin. A marker ``echo`` after every batch of
+commands tells when the simulator is done with it.
+
+Sweep workers keep one session per design and fin counts (get_session), so
+a pool of N workers loads the model N times instead of once per chunk. The
+stub simulator understands ``-p`` as well, which exercises the same path
+without ngspice.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from .decks import deck_preamble, render_deck
+from .simulator import simulator_command, simulator_env
+
+_sessions = {}
+
+
+class SimulatorSession:
+    """
+    Simulator process in pipe mode with one design's circuit loaded.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    settings : dict
+        Run settings used for the circuit (fin counts, model card) and options
+        (threads)
+    simulator : str or list, optional
+        Simulator command, see neuronsim.simulator.simulator_command()
+    timeout : float, optional
+        Seconds to wait for the circuit and model to load
+    """
+
+    def __init__(self, design, settings, simulator=None, timeout=None):
+        self.directory = tempfile.mkdtemp(prefix='session_')
+        netlist_lines, options = deck_preamble(design, settings)
+        deck = os.path.join(self.directory, 'circuit.cir')
+        with open(deck, 'w') as f:
+            f.write(render_deck(netlist_lines, options, title='simulator session'))
+
+        command = simulator_command(simulator) + ['-p', deck]
+        self.process = subprocess.Popen(command, cwd=self.directory, env=simulator_env(),
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, universal_newlines=True,
+                                        bufsize=1)
+        # Lines are read on a thread so that run() can time out
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+        self._batches = 0
+        self.startup_log = self.run([], timeout=timeout)
+
+    def _read(self):
+        for line in self.process.stdout:
+            self._lines.put(line.rstrip('\n'))
+        self._lines.put(None)
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def run(self, commands, timeout=None):
+        """
+        Execute control commands and wait until the simulator has finished them.
+
+        Parameters:
+        -----------
+        commands : list of str
+            Control-language lines
+        timeout : float, optional
+            Seconds the whole batch may take; after that the session is
+            closed and TimeoutError raised
+
+        Returns:
+        --------
+        str
+            Simulator output of these commands
+
+        Raises:
+        -------
+        RuntimeError
+            If the simulator exits before finishing the commands
+        """
+        self._batches += 1
+        marker = f'neuronsim_batch_{self._batches}_done'
+        try:
+            self.process.stdin.write('\n'.join(list(commands) + [f'echo {marker}']) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise RuntimeError(f"Simulator session exited with status {self.process.poll()}")
+
+        log = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                self.close()
+                raise TimeoutError(f"Simulator session timed out after {timeout} s") from None
+            if line is None:
+                raise RuntimeError(f"Simulator session exited with status "
+                                   f"{self.process.wait()}:\n" + '\n'.join(log))
+            if marker in line:
+                return '\n'.join(log) + '\n'
+            log.append(line)
+
+    def close(self):
+        """
+        Quit the simulator and remove the session directory.
+        """
+        if self.alive:
+            try:
+                self.process.stdin.write('quit\n')
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def get_session(design_name, design, settings, simulator=None, timeout=None):
+    """
+    Return this process's session for a design, starting it if needed.
+
+    Sessions are keyed by simulator command, design and the settings that
+    shape the loaded circuit (fin counts, threads, model card, temperature,
+    warm starts, which leave capacitor initial conditions set, and solver
+    options, which stay set once a ladder rung sets them). A worker process
+    that exits closes the sessions' stdin, which ends the simulators too.
+    """
+    key = (tuple(simulator_command(simulator)), design_name, settings['nffins'],
+           settings['nfnfins'], settings['threads'], settings.get('model_file'),
+           settings.get('temperature'), bool(settings.get('warm_start')),
+           tuple(sorted((settings.get('solver_options') or {}).items())))
+    session = _sessions.get(key)
+    if session is None or not session.alive:
+        session = _sessions[key] = SimulatorSession(design, settings, simulator, timeout)
+    return session
+
+
+def run_in_session(design_name, design, commands, settings, cwd, simulator=None,
+                   timeout=None):
+    """
+    Run control commands in this process's session, inside directory cwd.
+
+    Returns:
+    --------
+    tuple : (returncode, log)
+        0 and the commands' output, or -1 and the error if the session
+        failed; a failed session is discarded and restarted on next use
+    """
+    try:
+        session = get_session(design_name, design, settings, simulator, timeout)
+        return 0, session.run([f'cd "{cwd}"'] + list(commands), timeout=timeout)
+    except (RuntimeError, TimeoutError, OSError) as e:
+        for key, session in list(_sessions.items()):
+            if not session.alive:
+                session.close()
+                del _sessions[key]
+        return -1, f"{e}\n"
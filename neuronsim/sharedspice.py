@@ -0,0 +1,288 @@
+"""
+In-process simulation through the ngspice shared library (libngspice).
+
+NgSpice loads ``libngspice`` with ctypes, hands it a circuit as a list of
+netlist lines (``ngSpice_Circ``), issues control commands
+(``ngSpice_Command``) and copies result vectors straight out of the
+simulator's memory (``ngGet_Vec_Info``) into NumPy arrays, so no waveform
+file is ever written. simulate_points() runs a list of grid points this way
+and returns their vectors for ``neuronsim.spikes``; the sweep engine uses it
+with ``backend='shared'``.
+
+The library is looked up in $NGSPICE_LIBRARY, then with
+ctypes.util.find_library('ngspice'). libngspice keeps global state, so a
+process holds a single NgSpice instance (get_ngspice()).
+"""
+
+import ctypes
+import ctypes.util
+import os
+
+import numpy as np
+
+from .decks import POINT_MARKER, capacitor_nodes, deck_preamble
+from .spice import format_spice_number
+from .waveforms import normalize_vector_name
+
+
+class _VectorInfo(ctypes.Structure):
+    _fields_ = [
+        ('v_name', ctypes.c_char_p),
+        ('v_type', ctypes.c_int),
+        ('v_flags', ctypes.c_short),
+        ('v_realdata', ctypes.POINTER(ctypes.c_double)),
+        ('v_compdata', ctypes.c_void_p),
+        ('v_length', ctypes.c_int),
+    ]
+
+
+_SendChar = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p)
+_SendStat = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_void_p)
+_ControlledExit = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_int, ctypes.c_bool, ctypes.c_bool,
+                                   ctypes.c_int, ctypes.c_void_p)
+_SendData = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                             ctypes.c_void_p)
+_SendInitData = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p)
+_BGThreadRunning = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_bool, ctypes.c_int, ctypes.c_void_p)
+
+_instance = None
+
+
+def find_library():
+    """
+    Locate libngspice.
+
+    Returns:
+    --------
+    str or None
+        $NGSPICE_LIBRARY if set, otherwise what ctypes finds for 'ngspice'
+    """
+    return os.environ.get('NGSPICE_LIBRARY') or ctypes.util.find_library('ngspice')
+
+
+class NgSpice:
+    """
+    Handle on a loaded libngspice.
+
+    Parameters:
+    -----------
+    library : str, optional
+        Path of the shared library, see find_library()
+
+    Raises:
+    -------
+    OSError
+        If the library cannot be found or loaded
+    """
+
+    def __init__(self, library=None):
+        library = library or find_library()
+        if not library:
+            raise OSError("libngspice not found; set NGSPICE_LIBRARY to its path")
+        self.lib = ctypes.CDLL(library)
+        self.output = []
+        self.exited = None
+
+        lib = self.lib
+        lib.ngSpice_Init.argtypes = [_SendChar, _SendStat, _ControlledExit, _SendData,
+                                     _SendInitData, _BGThreadRunning, ctypes.c_void_p]
+        lib.ngSpice_Command.argtypes = [ctypes.c_char_p]
+        lib.ngSpice_Circ.argtypes = [ctypes.POINTER(ctypes.c_char_p)]
+        lib.ngGet_Vec_Info.argtypes = [ctypes.c_char_p]
+        lib.ngGet_Vec_Info.restype = ctypes.POINTER(_VectorInfo)
+        lib.ngSpice_CurPlot.restype = ctypes.c_char_p
+        lib.ngSpice_AllVecs.argtypes = [ctypes.c_char_p]
+        lib.ngSpice_AllVecs.restype = ctypes.POINTER(ctypes.c_char_p)
+
+        # The callbacks must outlive the library's use of them
+        self._callbacks = (_SendChar(self._send_char), _SendStat(self._send_stat),
+                           _ControlledExit(self._controlled_exit), _SendData(),
+                           _SendInitData(), _BGThreadRunning(self._bg_running))
+        lib.ngSpice_Init(*self._callbacks, None)
+
+    def _send_char(self, text, ident, user):
+        line = text.decode(errors='replace')
+        # Lines arrive prefixed with their stream, e.g. 'stdout ...'
+        for prefix in ('stdout ', 'stderr '):
+            if line.startswith(prefix):
+                line = line[len(prefix):]
+        self.output.append(line)
+        return 0
+
+    def _send_stat(self, text, ident, user):
+        return 0
+
+    def _controlled_exit(self, status, unload, quit, ident, user):
+        self.exited = status
+        return status
+
+    def _bg_running(self, running, ident, user):
+        return 0
+
+    def command(self, line):
+        """
+        Execute one control command and return the output it printed.
+
+        Raises:
+        -------
+        RuntimeError
+            If ngspice rejects the command or has exited
+        """
+        start = len(self.output)
+        status = self.lib.ngSpice_Command(line.encode())
+        if status != 0 or self.exited is not None:
+            raise RuntimeError(f"ngspice command failed: {line}\n" +
+                               '\n'.join(self.output[start:]))
+        return '\n'.join(self.output[start:])
+
+    def load_circuit(self, lines):
+        """
+        Load a circuit given as netlist lines (title first, '.end' appended).
+        """
+        lines = list(lines)
+        if not lines or lines[-1].strip().lower() != '.end':
+            lines.append('.end')
+        array = (ctypes.c_char_p * (len(lines) + 1))(*[line.encode() for line in lines], None)
+        if self.lib.ngSpice_Circ(array) != 0:
+            raise RuntimeError("ngspice could not load the circuit:\n" + '\n'.join(self.output))
+
+    def vector_names(self):
+        """
+        Names of the vectors in the current plot.
+        """
+        plot = self.lib.ngSpice_CurPlot()
+        names = self.lib.ngSpice_AllVecs(plot)
+        result = []
+        i = 0
+        while names[i]:
+            result.append(names[i].decode())
+            i += 1
+        return result
+
+    def vector(self, name):
+        """
+        Copy one real vector of the current plot into a NumPy array.
+
+        'v(net4)' and 'i(vvdd)' are accepted as well as the plot's own
+        'net4' and 'vvdd#branch'.
+
+        Raises:
+        -------
+        KeyError
+            If the current plot has no such vector
+        """
+        candidates = [name]
+        lowered = name.lower()
+        if lowered.startswith('v(') and lowered.endswith(')'):
+            candidates.append(name[2:-1])
+        elif lowered.startswith('i(') and lowered.endswith(')'):
+            candidates.append(name[2:-1] + '#branch')
+        for candidate in candidates:
+            info = self.lib.ngGet_Vec_Info(candidate.encode())
+            if info and info.contents.v_realdata:
+                length = info.contents.v_length
+                return np.ctypeslib.as_array(info.contents.v_realdata, shape=(length,)).copy()
+        raise KeyError(name)
+
+    def vectors(self, names):
+        """
+        Copy several vectors; keys are normalized like neuronsim.waveforms.
+        """
+        return {normalize_vector_name(n): self.vector(n) for n in names}
+
+
+def get_ngspice(library=None):
+    """
+    Return this process's NgSpice instance, loading the library on first use.
+    """
+    global _instance
+    if _instance is None:
+        _instance = NgSpice(library)
+    return _instance
+
+
+def simulate_points(design, points, settings, circuit_key=None):
+    """
+    Simulate grid points in-process and return their waveforms.
+
+    The design's circuit is loaded once per process (and again when
+    circuit_key changes, e.g. other fin counts); every point then only
+    costs the alter commands and its transient. With settings['warm_start']
+    each point after the first starts from the previous point's final
+    capacitor voltages and runs for settings['warm_tstop'], as in
+    neuronsim.decks.sweep_control(); after a failed point the next one
+    starts from discharged capacitors.
+
+    Parameters:
+    -----------
+    design : dict
+        Design definition
+    points : list of dict
+        Grid points ({'VDD': ..., 'Cap1': ..., ...})
+    settings : dict
+        Run settings (isyn, tstep, tstop, fin counts, threads)
+    circuit_key : hashable, optional
+        Identity of the loaded circuit; defaults to the design's schematic,
+        fin counts, model card, temperature, solver options and whether it
+        is warm-started
+
+    Returns:
+    --------
+    tuple : (vectors, log)
+        One dict of 'time', 'v(<output node>)' and 'i(vvdd)' arrays per
+        point (None where the simulation failed) and the simulator output
+    """
+    ngspice = get_ngspice()
+    if circuit_key is None:
+        circuit_key = (design['schematic'], settings['nffins'], settings['nfnfins'],
+                       settings['threads'], settings.get('model_file'),
+                       settings.get('temperature'), bool(settings.get('warm_start')),
+                       tuple(sorted((settings.get('solver_options') or {}).items())))
+    start = len(ngspice.output)
+    if getattr(ngspice, 'circuit_key', None) != circuit_key:
+        netlist_lines, options = deck_preamble(design, settings)
+        ngspice.load_circuit([f"* {design['schematic']} (shared library)"] + netlist_lines)
+        for line in options:
+            ngspice.command(line)
+        ngspice.circuit_key = circuit_key
+
+    node = f"v({design['output_node']})"
+    warm = settings.get('warm_start')
+    chain = warm and settings.get('warm_chain', True)
+    capacitors = capacitor_nodes(design) if warm else {}
+    results = []
+    ngspice.command(f"alter Isyn = {settings['isyn']}")
+    for k, point in enumerate(points):
+        try:
+            ngspice.command(f"alter Vvdd dc={format_spice_number(point['VDD'])}")
+            for column, device in design['capacitors'].items():
+                ngspice.command(f'alter {device} = {format_spice_number(point[column])}')
+            chained = chain and k > 0
+            if warm and not chained:
+                for device in capacitors:
+                    ngspice.command(f'alter {device} ic=0')
+            tstop = settings['warm_tstop'] if chained else settings['tstop']
+            ngspice.command(f'echo {POINT_MARKER.format(k)}')
+            ngspice.command(f"tran {settings['tstep']} {tstop} uic")
+            vectors = ngspice.vectors(['time', node, 'i(vvdd)'])
+            for device, terminals in capacitors.items():
+                voltage = sum(sign * ngspice.vector(f'v({n})')[-1]
+                              for sign, n in zip((1, -1), terminals) if n)
+                ngspice.command(f'alter {device} ic={format_spice_number(float(voltage))}')
+            results.append(vectors)
+        except (RuntimeError, KeyError):
+            results.append(None)
+            # Do not hand the failed point's initial state on to the next one
+            for device in capacitors:
+                try:
+                    ngspice.command(f'alter {device} ic=0')
+                except RuntimeError:
+                    pass
+        try:
+            ngspice.command('destroy all')
+        except RuntimeError:
+            pass
+    log = '\n'.join(ngspice.output[start:]) + '\n'
+    # The library lives as long as the worker process: keep only this call's output
+    del ngspice.output[:]
+    return results, log
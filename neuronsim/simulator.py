@@ -0,0 +1,131 @@
+"""
+Batch-mode ngspice invocation.
+
+The simulator command defaults to ``ngspice`` and can be overridden with the
+``NGSPICE`` environment variable or per call, e.g. to point at the stub
+simulator in ``neuronsim.stubsim`` on machines without ngspice.
+"""
+
+import asyncio
+import os
+import shlex
+import subprocess
+import sys
+
+# Command line that runs the bundled stub simulator in place of ngspice
+STUB_SIMULATOR = [sys.executable, '-m', 'neuronsim.stubsim']
+
+
+def simulator_command(simulator=None):
+    """
+    Resolve the simulator command line as a list of arguments.
+
+    Parameters:
+    -----------
+    simulator : str or list, optional
+        Command string or argument list. Defaults to $NGSPICE or 'ngspice'.
+    """
+    if simulator is None:
+        simulator = os.environ.get('NGSPICE', 'ngspice')
+    if isinstance(simulator, str):
+        return shlex.split(simulator)
+    return list(simulator)
+
+
+def simulator_env():
+    """
+    Environment for a simulator process.
+    """
+    env = dict(os.environ)
+    # Let the stub simulator import this package regardless of cwd
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(
+        p for p in [repo_root, env.get('PYTHONPATH', '')] if p)
+    return env
+
+
+def run_deck(deck_path, simulator=None, cwd=None, timeout=None):
+    """
+    Run one netlist in ngspice batch mode.
+
+    Parameters:
+    -----------
+    deck_path : str
+        Path to the netlist to simulate
+    simulator : str or list, optional
+        Simulator command, see simulator_command()
+    cwd : str, optional
+        Working directory for the run; defaults to the deck's directory
+    timeout : float, optional
+        Seconds after which the simulator is killed
+
+    Returns:
+    --------
+    tuple : (returncode, log)
+        Simulator exit status and combined stdout/stderr text
+    """
+    if cwd is None:
+        cwd = os.path.dirname(os.path.abspath(deck_path))
+    command = simulator_command(simulator) + ['-b', os.path.abspath(deck_path)]
+
+    try:
+        proc = subprocess.run(command, cwd=cwd, env=simulator_env(), timeout=timeout,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              universal_newlines=True)
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout or ''
+        if isinstance(output, bytes):
+            output = output.decode(errors='replace')
+        return -1, output + f"\nSimulation timed out after {timeout} s\n"
+    return proc.returncode, proc.stdout
+
+
+async def stream_deck(deck_path, on_line, simulator=None, cwd=None, timeout=None):
+    """
+    Run one netlist in ngspice batch mode, handing over its output line by line.
+
+    Parameters:
+    -----------
+    deck_path : str
+        Path to the netlist to simulate
+    on_line : callable
+        on_line(line) is called with every stdout/stderr line (without the
+        newline) as soon as the simulator prints it
+    simulator, cwd, timeout : see run_deck()
+
+    Returns:
+    --------
+    tuple : (returncode, log)
+        Simulator exit status and combined stdout/stderr text
+
+    The simulator is killed if the coroutine is cancelled.
+    """
+    if cwd is None:
+        cwd = os.path.dirname(os.path.abspath(deck_path))
+    command = simulator_command(simulator) + ['-b', os.path.abspath(deck_path)]
+    proc = await asyncio.create_subprocess_exec(
+        *command, cwd=cwd, env=simulator_env(),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+
+    lines = []
+
+    async def read():
+        async for raw in proc.stdout:
+            line = raw.decode(errors='replace').rstrip('\r\n')
+            lines.append(line)
+            on_line(line)
+        return await proc.wait()
+
+    try:
+        returncode = await asyncio.wait_for(read(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        lines.append(f"Simulation timed out after {timeout} s")
+        return -1, '\n'.join(lines) + '\n'
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return returncode, '\n'.join(lines) + '\n'
@@ -0,0 +1,46 @@
+"""
+SPICE number syntax shared by the deck writers, the result store and the
+simulator front ends.
+
+parse_spice_number() reads values with scale suffixes ('0.04n', '1meg')
+as they appear in schematics and control blocks; format_spice_number()
+writes floats back without losing precision, with the same 12 significant
+digits the result store keys on.
+"""
+
+import math
+import re
+
+_SUFFIXES = {
+    't': 1e12, 'g': 1e9, 'meg': 1e6, 'k': 1e3, 'm': 1e-3,
+    'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15, 'a': 1e-18,
+}
+
+_NUMBER = re.compile(r'^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)([a-zA-Z]*)$')
+
+
+def parse_spice_number(text):
+    """
+    Convert a SPICE number with an optional scale suffix (e.g. '0.04n') to float.
+    """
+    match = _NUMBER.match(text.strip())
+    if not match:
+        raise ValueError(f"Not a SPICE number: {text!r}")
+    value = float(match.group(1))
+    suffix = match.group(2).lower()
+    if suffix.startswith('meg'):
+        return value * 1e6
+    if suffix and suffix[0] in _SUFFIXES:
+        return value * _SUFFIXES[suffix[0]]
+    return value
+
+
+def format_spice_number(value):
+    """
+    Format a float for a deck or a results table: integers without a
+    decimal point, anything else (including nan and inf) with 12
+    significant digits.
+    """
+    if math.isfinite(value) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return f'{value:.12g}'
@@ -0,0 +1,198 @@
+"""
+Static power characterization from one DC sweep per design.
+
+The static schematics (``BesrourStatic.sch`` and the others) run a 20 ns
+transient per supply voltage and average the last 20% of ``power_vdd`` in
+an interpreted ``dowhile`` loop: 81 transients per design. With the
+synaptic current off the neuron sits at its operating point, so the same
+numbers come from a single ``dc Vvdd 0.1 0.9 0.01`` sweep with the supply
+power -v(vdd!)*i(Vvdd) computed as one vector (static_mode='dc', see
+neuronsim.decks.static_control). The transient mode is kept as a fallback
+and, with --validate, as a reference the DC result is checked against.
+
+Tables go to ``<design>_static.txt`` in the working directory; the
+repository's reference tables in ``static/`` are only rewritten with
+--update-data.
+
+Example:
+    python -m neuronsim.staticpower --design all
+    python -m neuronsim.staticpower --design besrour --validate -o besrour_static.txt
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .decks import (STATIC_FILE, STATIC_MODES, deck_preamble, read_static_power,
+                    render_deck, static_control)
+from .designs import DESIGNS, VDD_VALUES, data_path, get_design
+from .simulator import run_deck
+from .spice import format_spice_number
+
+
+def measure_static(design_name, vdd_values=None, settings=None, directory=None,
+                   simulator=None, timeout=None, cap=None):
+    """
+    Simulate a design's static power deck.
+
+    Parameters:
+    -----------
+    design_name : str
+        Design name
+    vdd_values : list of float, optional
+        Supply voltages, 0.1 V to 0.9 V in 10 mV steps by default
+    settings : dict, optional
+        Overrides for neuronsim.sweep.DEFAULT_SETTINGS; 'static_mode'
+        selects 'dc' (default) or 'tran'
+    directory : str, optional
+        Where the deck runs and is kept; a temporary directory by default
+    simulator : str or list, optional
+        Simulator command
+    timeout : float, optional
+        Simulator timeout in seconds
+    cap : float, optional
+        Value of every capacitor (F), the design's 'static_cap' by default
+
+    Returns:
+    --------
+    tuple : (rows, returncode, log)
+        (VDD, static power) pairs, the simulator exit status and output
+    """
+    from .sweep import DEFAULT_SETTINGS
+
+    design = get_design(design_name)
+    run_settings = dict(DEFAULT_SETTINGS)
+    run_settings.update(settings or {})
+    vdd_values = list(vdd_values) if vdd_values is not None else VDD_VALUES
+    keep = directory is not None
+    directory = directory or tempfile.mkdtemp(prefix=f'{design_name}_static_')
+    os.makedirs(directory, exist_ok=True)
+
+    netlist_lines, options = deck_preamble(design, run_settings)
+    deck = os.path.join(directory, f"static_{run_settings['static_mode']}.cir")
+    with open(deck, 'w') as f:
+        f.write(render_deck(netlist_lines,
+                            static_control(design, vdd_values, run_settings, options, cap),
+                            title=f"{design_name} static power ({run_settings['static_mode']})"))
+    returncode, log = run_deck(deck, simulator=simulator, cwd=directory, timeout=timeout)
+    try:
+        rows = read_static_power(os.path.join(directory, STATIC_FILE))
+    except OSError:
+        rows = []
+    if not keep:
+        shutil.rmtree(directory, ignore_errors=True)
+    return rows, returncode, log
+
+
+def write_static_table(rows, path):
+    """
+    Write (VDD, power) pairs as a 'VDD Static_Power' table like static/*neuron.txt.
+    """
+    with open(path, 'w') as f:
+        f.write('VDD Static_Power\n')
+        for vdd, power in rows:
+            f.write(f'{format_spice_number(round(vdd, 12))} {format_spice_number(power)}\n')
+
+
+def compare_static(rows, reference):
+    """
+    Relative deviation of static power values from reference values.
+
+    Returns:
+    --------
+    list of tuple
+        (VDD, power, reference power, relative deviation) at every VDD
+        present in both
+    """
+    expected = {round(v, 9): p for v, p in reference}
+    result = []
+    for vdd, power in rows:
+        ref = expected.get(round(vdd, 9))
+        if ref is not None:
+            deviation = (power - ref) / ref if ref else float('inf')
+            result.append((vdd, power, ref, deviation))
+    return result
+
+
+def _measure_job(job):
+    return job['design'], job['mode'], measure_static(
+        job['design'], job['vdd_values'], {'static_mode': job['mode']},
+        job['directory'], job['simulator'], job['timeout'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the static power of neuron designs.')
+    parser.add_argument('--design', nargs='+', default=['all'],
+                        help="designs to characterize, or 'all' (default)")
+    parser.add_argument('--mode', choices=STATIC_MODES, default='dc',
+                        help='one dc sweep (default) or a transient per VDD')
+    parser.add_argument('--validate', action='store_true',
+                        help='also run the transient mode and report the deviation')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='relative deviation accepted by --validate (default: 0.05)')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--work-dir', default=None, help='keep the decks and raw output here')
+    parser.add_argument('--timeout', type=float, default=None, help='simulator timeout in seconds')
+    parser.add_argument('-o', '--output', default=None,
+                        help='output table (one design only; default: <design>_static.txt)')
+    parser.add_argument('--update-data', action='store_true',
+                        help="overwrite the repository's reference tables in static/")
+    args = parser.parse_args()
+
+    names = list(DESIGNS) if args.design == ['all'] else [n.lower() for n in args.design]
+    for name in names:
+        get_design(name)
+    if args.output and len(names) != 1:
+        parser.error('--output needs a single --design')
+    if args.output and args.update_data:
+        parser.error('--output and --update-data are exclusive')
+    if args.update_data and args.stub:
+        parser.error('--update-data would replace the reference tables with stub results')
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+
+    modes = [args.mode] + (['tran'] if args.validate and args.mode != 'tran' else [])
+    jobs = [{'design': name, 'mode': mode, 'vdd_values': args.vdd, 'simulator': simulator,
+             'timeout': args.timeout,
+             'directory': os.path.join(args.work_dir, f'{name}_{mode}') if args.work_dir else None}
+            for name in names for mode in modes]
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        results = {(name, mode): result for name, mode, result in pool.map(_measure_job, jobs)}
+
+    failed = False
+    for name in names:
+        rows, returncode, log = results[name, args.mode]
+        if not rows:
+            print(f"{name}: no static power written (simulator exited with {returncode})\n{log}")
+            failed = True
+            continue
+        if args.update_data:
+            output = data_path(DESIGNS[name], 'static_file', None)
+        else:
+            output = args.output or f'{name}_static.txt'
+        write_static_table(rows, output)
+        print(f"{name}: {len(rows)} supplies ({args.mode}) written to {output}")
+        if len(modes) > 1:
+            reference = results[name, 'tran'][0]
+            deviations = compare_static(rows, reference)
+            if not deviations:
+                print(f"{name}: the transient reference produced no values")
+                failed = True
+                continue
+            vdd, _, _, worst = max(deviations, key=lambda row: abs(row[3]))
+            status = 'ok' if abs(worst) <= args.tolerance else 'MISMATCH'
+            print(f"{name}: largest dc/tran deviation {worst * 100:+.2f}% at {vdd:g} V ({status})")
+            failed |= status != 'ok'
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Persistent SQLite store of simulated grid points.
+
+Every result is keyed by the design, the swept parameters (VDD and the
+capacitors), the run settings that change the answer (Isyn, transient step
+and stop time, fin counts, energy integration rule, temperature, segment
+tolerance, warm-start window, first ladder rung and a hash of the solver
+option overrides) and a hash of the transistor model card. A sweep
+given a store only simulates the points that are not in it yet and commits
+each chunk as soon as it finishes, so an interrupted multi-day sweep resumes
+where it stopped instead of restarting from the first VDD.
+
+The solver-settings rung each result converged with (neuronsim.convergence)
+is kept next to it in a second table.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .designs import MODEL_FILE, get_design, parameter_columns
+from .spice import parse_spice_number
+
+# Run settings that are part of a result's identity
+KEY_SETTINGS = ['isyn', 'tstep', 'tstop', 'nffins', 'nfnfins', 'integration']
+
+# ngspice simulates at 27 C when a deck has no .temp line
+DEFAULT_TEMPERATURE = 27.0
+
+_KEY_COLUMNS = """
+    design TEXT NOT NULL,
+    vdd REAL NOT NULL,
+    cap1 REAL NOT NULL,
+    cap2 REAL NOT NULL,
+    isyn REAL NOT NULL,
+    tstep REAL NOT NULL,
+    tstop REAL NOT NULL,
+    nffins INTEGER NOT NULL,
+    nfnfins INTEGER NOT NULL,
+    integration TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    segment_rtol REAL NOT NULL,
+    warm_tstop REAL NOT NULL,
+    warm_settle REAL NOT NULL,
+    first_rung TEXT NOT NULL,
+    solver_hash TEXT NOT NULL,
+    model_hash TEXT NOT NULL,"""
+
+_PRIMARY_KEY = """
+    PRIMARY KEY (design, vdd, cap1, cap2, isyn, tstep, tstop, nffins, nfnfins,
+                 integration, temperature, segment_rtol, warm_tstop, warm_settle,
+                 first_rung, solver_hash, model_hash)"""
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results ({_KEY_COLUMNS}
+    spikes INTEGER NOT NULL,
+    frequency REAL NOT NULL,
+    energy_per_spike REAL NOT NULL,
+    created REAL NOT NULL,{_PRIMARY_KEY}
+)
+"""
+
+_RUNG_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS rungs ({_KEY_COLUMNS}
+    rung TEXT NOT NULL,{_PRIMARY_KEY}
+)
+"""
+
+_KEY_FIELDS = ['design', 'vdd', 'cap1', 'cap2', 'isyn', 'tstep', 'tstop',
+               'nffins', 'nfnfins', 'integration', 'temperature', 'segment_rtol',
+               'warm_tstop', 'warm_settle', 'first_rung', 'solver_hash', 'model_hash']
+
+_hash_cache = {}
+
+
+def model_hash(path=None):
+    """
+    Return a short SHA-256 digest of a model card file (MODEL_FILE by default).
+    """
+    path = path or MODEL_FILE
+    stat = os.stat(path)
+    cache_key = (path, stat.st_mtime, stat.st_size)
+    if cache_key not in _hash_cache:
+        with open(path, 'rb') as f:
+            _hash_cache[cache_key] = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _hash_cache[cache_key]
+
+
+def _canonical(value):
+    # Round-trip through 12 significant digits so that 0.1e-15 typed in a
+    # deck and 1e-16 computed in Python map onto the same key
+    if isinstance(value, str):
+        value = parse_spice_number(value)
+    return float(f'{float(value):.12g}')
+
+
+def solver_hash(options):
+    """
+    Return a short digest of solver option overrides, '' when there are none.
+    """
+    if not options:
+        return ''
+    text = json.dumps(sorted((str(name).lower(), str(value)) for name, value in options.items()))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def point_key(design, point, settings, model_digest):
+    """
+    Build the store key of one grid point.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    point : dict
+        Grid point ({'VDD': ..., 'Cap1': ..., ...})
+    settings : dict
+        Run settings containing at least KEY_SETTINGS
+    model_digest : str
+        Model card hash from model_hash()
+
+    Returns:
+    --------
+    tuple
+        Values of the store's primary key columns
+    """
+    caps = [point[c] for c in parameter_columns(get_design(design))[1:]]
+    caps = caps + [0.0] * (2 - len(caps))
+    # The in-deck counting loop always used the fixed-dt rule
+    integration = settings.get('integration', 'trapezoid')
+    if settings.get('extraction') == 'ngspice':
+        integration = 'legacy'
+    temperature = settings.get('temperature')
+    if temperature is None:
+        temperature = DEFAULT_TEMPERATURE
+    # Extrapolated from a converged segment: keyed by its tolerance, 0 otherwise
+    segment_rtol = 0.0
+    if settings.get('extraction') != 'ngspice' and settings.get('segment'):
+        segment_rtol = settings.get('convergence_rtol', 0.01)
+    # Steady-state window after a warm start, 0 / 0 for a cold start
+    warm_tstop = warm_settle = 0.0
+    if settings.get('warm_start'):
+        warm_tstop, warm_settle = settings['warm_tstop'], settings['warm_settle']
+    # Points that converge on the first rung ran with its options
+    ladder = settings.get('ladder')
+    first_rung = ladder[0] if ladder else 'deck'
+    return (design.lower(), _canonical(point['VDD']), _canonical(caps[0]),
+            _canonical(caps[1]), _canonical(settings['isyn']),
+            _canonical(settings['tstep']), _canonical(settings['tstop']),
+            int(settings['nffins']), int(settings['nfnfins']), integration,
+            _canonical(temperature), _canonical(segment_rtol), _canonical(warm_tstop),
+            _canonical(warm_settle), first_rung, solver_hash(settings.get('solver_options')),
+            model_digest)
+
+
+class ResultStore:
+    """
+    SQLite-backed table of simulated grid points.
+
+    Parameters:
+    -----------
+    path : str
+        Database file, created if it does not exist
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(_SCHEMA)
+        self.connection.execute(_RUNG_SCHEMA)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, keys):
+        """
+        Fetch stored results for a list of keys.
+
+        Returns:
+        --------
+        dict
+            key -> (spikes, frequency, energy_per_spike) for every stored key
+        """
+        found = {}
+        wanted = set(keys)
+        if not wanted:
+            return found
+        # Narrow the scan to the designs and model hashes being asked for
+        for design, digest in {(k[0], k[-1]) for k in wanted}:
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(_KEY_FIELDS)}, spikes, frequency, energy_per_spike "
+                "FROM results WHERE design = ? AND model_hash = ?", (design, digest))
+            for row in cursor:
+                key = tuple(row[:len(_KEY_FIELDS)])
+                if key in wanted:
+                    found[key] = tuple(row[len(_KEY_FIELDS):])
+        return found
+
+    def insert(self, entries):
+        """
+        Store results, replacing any previous values for the same keys.
+
+        Parameters:
+        -----------
+        entries : list of (key, (spikes, frequency, energy_per_spike))
+        """
+        now = time.time()
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO results ({', '.join(_KEY_FIELDS)}, spikes, "
+            f"frequency, energy_per_spike, created) VALUES "
+            f"({', '.join('?' * (len(_KEY_FIELDS) + 4))})",
+            [tuple(key) + (int(values[0]), float(values[1]), float(values[2]), now)
+             for key, values in entries])
+        self.connection.commit()
+
+    def record_rungs(self, entries):
+        """
+        Record the ladder rung each result converged with.
+
+        Parameters:
+        -----------
+        entries : list of (key, rung)
+        """
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO rungs ({', '.join(_KEY_FIELDS)}, rung) VALUES "
+            f"({', '.join('?' * (len(_KEY_FIELDS) + 1))})",
+            [tuple(key) + (rung,) for key, rung in entries])
+        self.connection.commit()
+
+    def rung_counts(self, design=None):
+        """
+        Count the recorded rungs.
+
+        Returns:
+        --------
+        dict
+            (design, integration) -> {rung: number of points}
+        """
+        query = 'SELECT design, integration, rung, COUNT(*) FROM rungs'
+        parameters = ()
+        if design is not None:
+            query += ' WHERE design = ?'
+            parameters = (design.lower(),)
+        counts = {}
+        for name, integration, rung, n in self.connection.execute(
+                query + ' GROUP BY design, integration, rung', parameters):
+            counts.setdefault((name, integration), {})[rung] = n
+        return counts
+
+    def count(self, design=None):
+        """
+        Return the number of stored results, optionally for one design.
+        """
+        if design is None:
+            return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return self.connection.execute('SELECT COUNT(*) FROM results WHERE design = ?',
+                                       (design.lower(),)).fetchone()[0]
+
+
+def result_row(design, point, values):
+    """
+    Combine a grid point and its stored values into a sweep-table row.
+    """
+    columns = parameter_columns(get_design(design))
+    return [point[c] for c in columns] + list(values)
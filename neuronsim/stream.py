@@ -0,0 +1,419 @@
+"""
+Streaming sweep with live analysis.
+
+``neuronsim.sweep`` only sees a chunk's results once its ngspice process has
+exited. Here the chunk decks run as asyncio subprocesses and their console
+output is read while they simulate: every ``At VDD=... Spikes=... Freq=...
+Energy/Spike=...`` line (in-deck extraction, as echoed by the original
+decks) or ``Wrote wave00000.raw`` line (Python extraction) completes one grid
+point, which is committed to the result store straight away.
+
+Every ``refresh_every`` points the partial table is scored with the
+optimization score of the analysis scripts, the current best point is
+printed, the heatmap surfaces are updated cell by cell
+(``neuronsim.incremental``), and the partial table and heatmap image are
+rewritten if requested. With
+``patience`` set, the sweep stops by itself once the best point has not
+moved for that many refreshes; a sweep stopped early (or killed) resumes
+from the store like any other.
+
+Example:
+    python -m neuronsim.stream --design besrour --workers 24 --store sweeps.db \
+        --refresh-every 100 --figure live_heatmap.png -o besrourneuron.txt
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from .adaptive import score_points
+from .decks import write_chunk_deck
+from .designs import RESULT_COLUMNS, get_design, parameter_columns
+from .incremental import IncrementalHeatmap
+from .simulator import stream_deck
+from .spice import parse_spice_number
+from .store import ResultStore, model_hash, point_key, result_row
+from .sweep import DEFAULT_SETTINGS, build_grid, chunk_points, extract_point, write_table
+
+# Field names of the decks' console line and the table columns they fill
+ECHO_FIELDS = {'Spikes': 'Spikes', 'Freq': 'Frequency', 'Energy/Spike': 'Energy_Per_Spike'}
+
+_ECHO_LINE = re.compile(r'^\s*At\s+VDD=')
+_ECHO_FIELD = re.compile(r'([\w/]+)=(\S+)')
+_WROTE_LINE = re.compile(r'^\s*Wrote\s+wave(\d+)\.(?:raw|txt)\s*$')
+
+
+def parse_echo_line(line):
+    """
+    Parse an 'At VDD=... V Cap1=... F ... Energy/Spike=... J' console line.
+
+    Returns:
+    --------
+    dict or None
+        Column name -> value for the swept parameters and RESULT_COLUMNS,
+        or None if the line is not a complete result line
+    """
+    if not _ECHO_LINE.match(line):
+        return None
+    row = {}
+    for name, value in _ECHO_FIELD.findall(line):
+        try:
+            row[ECHO_FIELDS.get(name, name)] = parse_spice_number(value)
+        except ValueError:
+            return None
+    if not all(c in row for c in RESULT_COLUMNS):
+        return None
+    return row
+
+
+class LiveAnalysis:
+    """
+    Partial sweep results, rescored as points arrive.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    points : list of dict
+        Grid points of the sweep
+    refresh_every : int
+        Number of new points between two refreshes
+    output : str, optional
+        Partial table rewritten at every refresh
+    figure : str, optional
+        Heatmap image rewritten at every refresh (two-capacitor designs)
+    patience : int, optional
+        Number of consecutive refreshes with an unchanged best point after
+        which the sweep is considered resolved
+    """
+
+    def __init__(self, design, points, refresh_every=50, output=None, figure=None,
+                 patience=None):
+        self.design = design
+        self.points = points
+        self.columns = parameter_columns(get_design(design))
+        self.refresh_every = max(int(refresh_every), 1)
+        self.output = output
+        self.figure = figure
+        self.patience = patience
+        self.results = {}
+        self.heatmap = None
+        if len(self.columns) == 3:
+            self.heatmap = IncrementalHeatmap.from_points(points)
+        self._in_heatmap = set()
+        self.best = None
+        self.stable = 0
+        self._since_refresh = 0
+        self._start = time.time()
+
+    def add(self, index, values):
+        """
+        Record one point's (spikes, frequency, energy_per_spike).
+
+        Returns:
+        --------
+        bool
+            True when the sweep is resolved (see patience)
+        """
+        self.results[index] = tuple(values)
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh_every:
+            self.refresh()
+        return self.resolved
+
+    @property
+    def resolved(self):
+        return self.patience is not None and self.stable >= self.patience
+
+    def table(self):
+        """
+        Points received so far as a sweep table in grid order.
+        """
+        rows = [result_row(self.design, self.points[i], self.results[i])
+                for i in sorted(self.results)]
+        df = pd.DataFrame(rows, columns=self.columns + RESULT_COLUMNS)
+        df['Spikes'] = df['Spikes'].astype(int)
+        return df
+
+    def refresh(self):
+        """
+        Rescore the partial sweep, report the best point and rewrite the outputs.
+        """
+        self._since_refresh = 0
+        scores = score_points(self.results)
+        best = max(scores, key=scores.get, default=None)
+        if best is not None and scores[best] > 0:
+            if best == self.best:
+                self.stable += 1
+            else:
+                self.best, self.stable = best, 0
+            point = self.points[best]
+            print(f"[{len(self.results)}/{len(self.points)} points, "
+                  f"{time.time() - self._start:.1f} s] best so far: " +
+                  ', '.join(f"{c}={point[c]:g}" for c in self.columns) +
+                  f" (score {scores[best]:.3f})")
+        else:
+            print(f"[{len(self.results)}/{len(self.points)} points] no spiking points yet")
+
+        if self.heatmap is not None:
+            new = sorted(set(self.results) - self._in_heatmap)
+            self._in_heatmap.update(new)
+            rows = [result_row(self.design, self.points[i], self.results[i]) for i in new]
+            self.heatmap.add(pd.DataFrame(rows, columns=self.columns + RESULT_COLUMNS))
+            optimal = self.heatmap.optimal()
+            if optimal is not None:
+                print(f"    heatmap optimum: Cap1={optimal['cap1_fF']:.2f} fF, "
+                      f"Cap2={optimal['cap2_fF']:.2f} fF (score {optimal['score']:.3f})")
+
+        if self.output is not None:
+            write_table(self.table(), self.output)
+        if self.figure is not None and self.heatmap is not None:
+            self.render_heatmap()
+
+    def render_heatmap(self):
+        from .analysis.heatmaps import create_combined_heatmaps
+        from .analysis.styles import get_style
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        frequency_pivot, energy_pivot = self.heatmap.pivots()
+        if frequency_pivot.shape[0] < 2 or frequency_pivot.shape[1] < 2:
+            return
+        style = get_style('heatmap', self.design)
+        style.update({'show': False, 'output_path': self.figure})
+        try:
+            create_combined_heatmaps(frequency_pivot, energy_pivot, style)
+        except ValueError as e:
+            print(f"Heatmap not updated: {e}")
+        plt.close('all')
+
+
+def _echo_key(values):
+    # Echo lines print the swept values with 6 significant digits
+    return tuple(float(f'{v:.6g}') for v in values)
+
+
+async def _stream_chunk(job, slots, on_point):
+    """
+    Simulate one chunk, calling on_point(k, values) for each finished point.
+
+    Result lines are matched to points by the swept values they carry, and
+    waveforms ending before tstop (an aborted transient) are dropped, so a
+    failed point is left without a result instead of a wrong one.
+    """
+    design = get_design(job['design'])
+    columns = parameter_columns(design)
+    positions = {_echo_key(point[c] for c in columns): k for k, point in enumerate(job['points'])}
+    settings = job['settings']
+    in_deck = settings['extraction'] == 'ngspice'
+    tstop = parse_spice_number(str(settings['tstop']))
+    async with slots:
+        chunk_dir = tempfile.mkdtemp(prefix=f"chunk{job['index']:05d}_", dir=job['work_dir'])
+        deck = os.path.join(chunk_dir, 'sweep.cir')
+        write_chunk_deck(design, job['points'], deck, settings,
+                         title=f"{job['design']} sweep chunk {job['index']}")
+        echoed = set()
+
+        def on_line(line):
+            if in_deck:
+                row = parse_echo_line(line)
+                if row is None or not all(c in row for c in columns):
+                    return
+                k = positions.get(_echo_key(row[c] for c in columns))
+                if k is not None and k not in echoed:
+                    echoed.add(k)
+                    on_point(k, [row[c] for c in RESULT_COLUMNS])
+                return
+            match = _WROTE_LINE.match(line)
+            if not match:
+                return
+            k = int(match.group(1))
+            path = os.path.join(chunk_dir, line.split()[-1])
+            try:
+                values, _ = extract_point(path, design, job['points'][k], tstop,
+                                          settings['integration'], length=tstop)
+            except (OSError, KeyError, ValueError, IndexError):
+                return
+            if not job['keep']:
+                os.remove(path)
+            on_point(k, values)
+
+        try:
+            returncode, _ = await stream_deck(deck, on_line, simulator=job['simulator'],
+                                              cwd=chunk_dir, timeout=job['timeout'])
+        finally:
+            if not job['keep']:
+                shutil.rmtree(chunk_dir, ignore_errors=True)
+    return returncode
+
+
+async def _stream_jobs(jobs, workers, on_point):
+    slots = asyncio.Semaphore(workers)
+    stop = asyncio.Event()
+
+    def record(index):
+        def callback(k, values):
+            if on_point(index, k, values):
+                stop.set()
+        return callback
+
+    tasks = [asyncio.ensure_future(_stream_chunk(job, slots, record(job['index'])))
+             for job in jobs]
+    stopper = asyncio.ensure_future(stop.wait())
+    pending = set(tasks)
+    while pending and not stop.is_set():
+        done, pending = await asyncio.wait(pending | {stopper},
+                                           return_when=asyncio.FIRST_COMPLETED)
+        pending.discard(stopper)
+    for task in pending:
+        task.cancel()
+    stopper.cancel()
+    await asyncio.gather(*tasks, stopper, return_exceptions=True)
+    return stop.is_set()
+
+
+def stream_sweep(design, points=None, workers=None, chunk_size=None, simulator=None,
+                 settings=None, output=None, store=None, refresh_every=50, figure=None,
+                 patience=None, work_dir=None, timeout=None, keep_decks=False):
+    """
+    Run a design's sweep while analyzing its results as they are printed.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    points, workers, chunk_size, simulator, settings, work_dir, timeout,
+    keep_decks, store : see neuronsim.sweep.run_sweep()
+        Early termination (settings['segment']) and warm starts are not used here
+    output : str, optional
+        Results table, rewritten at every refresh and at the end
+    refresh_every, figure, patience : see LiveAnalysis
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Every point with a result (stored or simulated), in grid order
+    """
+    design_def = get_design(design)
+    if points is None:
+        points = build_grid(design_def)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    run_settings = dict(DEFAULT_SETTINGS)
+    if settings:
+        run_settings.update(settings)
+    run_settings['segment'] = None
+    # Results are extracted as lines arrive, over the full cold transient
+    run_settings['warm_start'] = False
+
+    live = LiveAnalysis(design, points, refresh_every, output, figure, patience)
+    own_store = isinstance(store, str)
+    if own_store:
+        store = ResultStore(store)
+    keys = None
+    if store is not None:
+        digest = model_hash(run_settings['model_file'])
+        keys = [point_key(design, point, run_settings, digest) for point in points]
+        found = store.lookup(keys)
+        live.results.update({i: found[key] for i, key in enumerate(keys) if key in found})
+        print(f"{len(live.results)} of {len(points)} points already in {store.path}")
+    pending = [i for i in range(len(points)) if i not in live.results]
+
+    own_work_dir = work_dir is None
+    if own_work_dir:
+        work_dir = tempfile.mkdtemp(prefix=f'{design}_stream_')
+    os.makedirs(work_dir, exist_ok=True)
+
+    size = chunk_size or max(1, math.ceil(len(pending) / (workers * 4)))
+    chunks = chunk_points(pending, size)
+    jobs = [{
+        'design': design,
+        'points': [points[i] for i in chunk],
+        'index': n,
+        'work_dir': work_dir,
+        'settings': run_settings,
+        'simulator': simulator,
+        'timeout': timeout,
+        'keep': keep_decks,
+    } for n, chunk in enumerate(chunks)]
+
+    def on_point(n, k, values):
+        index = chunks[n][k]
+        if store is not None:
+            store.insert([(keys[index], values)])
+        return live.add(index, values)
+
+    stopped = False
+    if jobs:
+        print(f"Streaming {len(pending)} {design} grid points in {len(chunks)} chunks "
+              f"on {workers} workers")
+        stopped = asyncio.run(_stream_jobs(jobs, workers, on_point))
+
+    if own_work_dir and not keep_decks:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if own_store:
+        store.close()
+
+    live.refresh()
+    if stopped:
+        print(f"Stopped early: best point unchanged for {patience} refreshes "
+              f"({len(live.results)} of {len(points)} points simulated)")
+    elif len(live.results) < len(points):
+        print(f"Warning: {len(points) - len(live.results)} of {len(points)} points have "
+              f"no result; rerun with the same store to simulate only those")
+    if output is not None:
+        print(f"Results written to {output}")
+    return live.table()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a neuron design sweep and analyze results while it runs.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent ngspice processes')
+    parser.add_argument('--chunk-size', type=int, default=None, help='grid points per netlist')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages to sweep')
+    parser.add_argument('--caps', type=float, nargs='+', default=None, help='capacitor values to sweep')
+    parser.add_argument('--tstop', default=None, help='transient stop time (e.g. 20n)')
+    parser.add_argument('--extraction', choices=['numpy', 'ngspice'], default=None,
+                        help='count spikes in Python (default) or in the ngspice deck')
+    parser.add_argument('--refresh-every', type=int, default=50,
+                        help='points between two live refreshes (default: 50)')
+    parser.add_argument('--figure', default=None, help='heatmap image updated at every refresh')
+    parser.add_argument('--patience', type=int, default=None,
+                        help='stop once the best point is unchanged for this many refreshes')
+    parser.add_argument('--store', default=None, help='SQLite result store; reruns skip stored points')
+    parser.add_argument('-o', '--output', default=None, help='results table, updated live')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+    settings = {}
+    if args.tstop:
+        settings['tstop'] = args.tstop
+    if args.extraction:
+        settings['extraction'] = args.extraction
+
+    design = get_design(args.design)
+    points = build_grid(design, vdd_values=args.vdd, cap_values=args.caps)
+    stream_sweep(args.design.lower(), points=points, workers=args.workers,
+                 chunk_size=args.chunk_size, simulator=simulator, settings=settings,
+                 output=args.output or design['sweep_file'], store=args.store,
+                 refresh_every=args.refresh_every, figure=args.figure,
+                 patience=args.patience)
+
+
+if __name__ == "__main__":
+    main()
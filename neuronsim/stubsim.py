@@ -0,0 +1,452 @@
+"""
+Stand-in for ``ngspice -b`` used to exercise the sweep tooling without ngspice.
+
+Only the subset of the control language emitted by the sweep engine is
+understood: ``set``, ``let`` with plain arithmetic, ``alter``, ``tran``,
+``dc`` (of Vvdd), ``op``, ``wrdata``, ``write`` (binary raw files),
+``echo`` with ``>``/``>>`` redirection, ``cd`` and ``destroy``. ``tran``
+does not solve the circuit; it evaluates a closed-form relaxation-oscillator
+model of the supply, capacitors and synaptic current so that results vary
+smoothly across a grid, and ``wrdata`` writes a pulse-train waveform with
+matching spikes and supply current. Loop and branch blocks are not
+interpreted: a ``dowhile`` block is taken to be the spike-counting (or
+static power averaging) loop and sets ``count``, ``spike_energy`` and
+``static_power`` from that model. ``dc`` and ``op`` give the model's
+leakage; after a ``dc`` any vector other than v(vdd!) and i(...) is taken
+to be the derived supply power.
+
+The model's state is the phase of its oscillation, held by a membrane
+node: every capacitor node other than the output (the node written by
+``write``/``wrdata``) ramps from 0 to MEMBRANE_SWING over a period and the
+output spikes as it passes mid-swing. ``v(node)`` in a ``let`` gives a
+node's voltage at the end of the last transient, and the ``ic`` of a
+capacitor on a membrane node (``alter C1 ic=...``, as written by warm
+starts) sets the phase the next transient starts from, taking the output's
+last voltage for a terminal on the output node. Without an ic the
+transient starts at phase 0, like the schematics' ``.ic`` state.
+
+To exercise the convergence retries (neuronsim.convergence), the supply
+voltages listed in $NEURONSIM_STUB_FAIL_VDD abort their transient halfway
+with "Timestep too small" unless ``set gmin`` is at least 1e-12.
+
+With ``-p`` (pipe mode, like ``ngspice -p``) the deck's control block is
+run and further commands are then read from stdin until ``quit`` or EOF.
+
+Usage: python -m neuronsim.stubsim -b deck.cir
+       python -m neuronsim.stubsim -p deck.cir
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+
+from .spice import format_spice_number, parse_spice_number
+
+_BLOCK_START = ('dowhile', 'while', 'if', 'foreach', 'repeat')
+
+# Supply voltages whose transients fail to converge with a small gmin
+FAIL_VDD_ENV = 'NEURONSIM_STUB_FAIL_VDD'
+
+# Voltage range of the membrane ramp (V)
+MEMBRANE_SWING = 0.1
+
+_GROUND = ('0', 'gnd', 'gnd!')
+
+
+def synthetic_response(vdd, capacitance, isyn, tstop):
+    """
+    Closed-form stand-in for a spiking neuron transient.
+
+    Returns:
+    --------
+    tuple : (spike_count, spiking_freq, energy_per_spike)
+    """
+    if vdd < 0.13 or isyn <= 0:
+        # Mirrors the sub-threshold rows of the real sweeps: one start-up
+        # crossing that never resets, so no completed spike energy
+        return 1, 1 / tstop, 0.0
+    c_total = capacitance + 0.15e-15
+    period = synthetic_period(vdd, capacitance, isyn)
+    # Spikes start half a period after the .ic state and then every period
+    count = max(int(tstop / period + 0.5), 1)
+    energy = (c_total + 0.3e-15) * vdd ** 2 * (1.2 + 0.4 * vdd)
+    return count, count / tstop, energy
+
+
+def synthetic_leakage(vdd):
+    """
+    Supply current of the closed-form neuron at rest (A, flowing into the supply).
+    """
+    return 1e-9 / max(vdd, 1e-3)
+
+
+def synthetic_waveforms(vdd, capacitance, isyn, tstep, tstop, phase=None):
+    """
+    Pulse-train waveforms consistent with synthetic_response().
+
+    The time axis has the nominal step plus extra points clustered before
+    every edge, like the adaptive steps ngspice takes around transitions.
+    phase (fraction of a period, 0 at the schematics' .ic state) starts the
+    transient part way through the oscillation; spikes start whenever the
+    phase passes 0.5.
+
+    Returns:
+    --------
+    tuple : (time, v_out, i_vdd)
+    """
+    count, _, energy = synthetic_response(vdd, capacitance, isyn, tstop)
+    time = np.arange(0.0, tstop + tstep / 2, tstep)
+    leak = synthetic_leakage(vdd)
+
+    if energy == 0.0:
+        # Start-up crossing that never resets
+        v_out = 0.3 * vdd * np.minimum(time / 1e-9, 1.0)
+        i_vdd = np.full_like(time, -leak)
+        return time, v_out, i_vdd
+
+    if phase is None and count == 1:
+        # A single start-up spike in the middle of the run
+        period = tstop
+        starts = np.array([0.5 * tstop])
+    else:
+        period = synthetic_period(vdd, capacitance, isyn)
+        first = (0.5 - (phase or 0.0)) % 1.0 * period
+        starts = np.arange(first - period, tstop, period)
+    width = min(max(0.3 * period, 3 * tstep), 0.5 * period)
+    # A spike in progress at the start of a warm-started transient is kept
+    starts = starts[starts + width > 0]
+    edges = np.concatenate((starts, starts + width))
+    refined = (edges[:, None] - tstep * np.array([0.6, 0.3, 0.1])[None, :]).ravel()
+    time = np.union1d(time, refined[(refined > 0) & (refined < tstop)])
+
+    spike = np.zeros_like(time, dtype=bool)
+    for start in starts:
+        spike |= (time >= start) & (time < start + width)
+    v_out = np.where(spike, vdd, 0.0)
+    i_vdd = np.where(spike, -energy / width / vdd, -leak)
+    return time, v_out, i_vdd
+
+
+def synthetic_period(vdd, capacitance, isyn):
+    """
+    Spike period of the closed-form neuron model.
+    """
+    c_total = capacitance + 0.15e-15
+    return c_total * 0.6 * vdd / isyn + 40e-12 / vdd
+
+
+def synthetic_membrane(vdd, capacitance, isyn, time, phase=None):
+    """
+    Membrane node voltage of the closed-form neuron, see synthetic_waveforms().
+    """
+    period = synthetic_period(vdd, capacitance, isyn)
+    return MEMBRANE_SWING * ((np.asarray(time) / period + (phase or 0.0)) % 1.0)
+
+
+class StubSimulator:
+    """
+    Interpreter for the control-language subset written by the sweep engine.
+    """
+
+    def __init__(self, deck_text):
+        self.devices = {}
+        self.variables = {}
+        self.control = []
+        self.transient = None
+        self.waveforms = None
+        self.sweep = None
+        self.options = {}
+        self.capacitors = {}
+        self.ic = {}
+        self.output_node = None
+        self.final_voltages = {}
+        self._depth = 0
+        self._parse(deck_text)
+
+    def _parse(self, text):
+        in_control = False
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line or line.startswith('*'):
+                continue
+            lowered = line.lower()
+            if lowered.startswith('.control'):
+                in_control = True
+            elif lowered.startswith('.endc'):
+                in_control = False
+            elif in_control:
+                self.control.append(line)
+            elif not line.startswith('.'):
+                self._add_device(line)
+
+    def _add_device(self, line):
+        fields = line.split()
+        if len(fields) < 4:
+            return
+        name = fields[0].lower()
+        if name.startswith('c'):
+            self.capacitors[name] = tuple(None if n.lower() in _GROUND else n.lower()
+                                          for n in fields[1:3])
+        value = fields[3]
+        for field in fields[3:]:
+            if field.lower().startswith('dc='):
+                value = field[3:]
+        try:
+            self.devices[name] = parse_spice_number(value)
+        except ValueError:
+            pass
+
+    def _substitute(self, text):
+        def replace(match):
+            name = match.group(1)
+            if name in self.variables:
+                return format_spice_number(self.variables[name])
+            return match.group(0)
+        return re.sub(r'\$&?(\w+)', replace, text)
+
+    def _evaluate(self, expression):
+        expression = self._substitute(expression)
+        # Node voltages at the end of the last transient
+        expression = re.sub(r'\bv\(([^)]+)\)',
+                            lambda m: format_spice_number(self._final_voltage(m.group(1)))
+                            if self.final_voltages else m.group(0),
+                            expression, flags=re.IGNORECASE)
+        expression = re.sub(r'\b([a-zA-Z_]\w*)\b',
+                            lambda m: format_spice_number(self.variables[m.group(1)])
+                            if m.group(1) in self.variables else m.group(0),
+                            expression)
+        for word, operator in (('eq', '=='), ('ne', '!='), ('gt', '>'), ('lt', '<')):
+            expression = re.sub(rf'\b{word}\b', operator, expression)
+        if not re.match(r'^[0-9eE+\-*/()<>=!. ]+$', expression):
+            return None
+        try:
+            return float(eval(expression, {'__builtins__': {}}, {}))
+        except (SyntaxError, ZeroDivisionError, TypeError):
+            return None
+
+    def _final_voltage(self, node):
+        node = node.strip().lower()
+        if node in _GROUND:
+            return 0.0
+        return self.final_voltages.get('output' if node == self.output_node else 'membrane', 0.0)
+
+    def _alter(self, args):
+        parameter = re.match(r'(\S+)\s+(\w+)\s*=\s*(\S+)', args.strip())
+        if parameter and parameter.group(2).lower() == 'ic':
+            self.ic[parameter.group(1).lower()] = parse_spice_number(
+                self._substitute(parameter.group(3)))
+            return
+        if parameter and parameter.group(2).lower() != 'dc':
+            # Other instance parameters leave the model alone
+            return
+        match = re.match(r'(\S+)\s*(?:dc\s*)?=?\s*(\S+)$', args.strip(), re.IGNORECASE)
+        if not match:
+            return
+        name, value = match.group(1).lower(), match.group(2)
+        self.devices[name] = parse_spice_number(self._substitute(value))
+
+    def _tran(self, args):
+        fields = args.split()
+        tstep = parse_spice_number(fields[0])
+        tstop = parse_spice_number(fields[1])
+        vdd = self.devices.get('vvdd', 0.7)
+        isyn = self.devices.get('isyn', 100e-9)
+        capacitance = sum(v for k, v in self.devices.items() if k.startswith('c'))
+        phase = self._phase()
+        self.transient = synthetic_response(vdd, capacitance, isyn, tstop)
+        self.sweep = None
+        self.waveforms = (vdd,) + synthetic_waveforms(vdd, capacitance, isyn, tstep, tstop,
+                                                      phase)
+        self.final_voltages = {
+            'output': float(self.waveforms[2][-1]),
+            'membrane': float(synthetic_membrane(vdd, capacitance, isyn, tstop, phase)),
+        }
+        if self._fails(vdd):
+            time, v_out, i_vdd = self.waveforms[1:]
+            kept = time <= tstop / 2
+            self.waveforms = (vdd, time[kept], v_out[kept], i_vdd[kept])
+            print(f"doAnalyses: TRAN:  Timestep too small; time = {format_spice_number(tstop / 2)}")
+            print("run simulation(s) aborted")
+            return
+        print(f"Transient analysis {fields[0]} {fields[1]} completed")
+
+    def _phase(self):
+        # Phase held by the ic of a capacitor on the membrane node, if any
+        for name, value in self.ic.items():
+            positive, negative = self.capacitors.get(name, (None, None))
+            if positive is None or positive == self.output_node:
+                continue
+            membrane = value
+            if negative is not None and negative == self.output_node:
+                membrane += self.final_voltages.get('output', 0.0)
+            if membrane:
+                return min(max(membrane / MEMBRANE_SWING, 0.0), 1.0) % 1.0
+        return None
+
+    def _fails(self, vdd):
+        failing = os.environ.get(FAIL_VDD_ENV, '').replace(',', ' ').split()
+        if not any(abs(float(v) - vdd) < 1e-9 for v in failing):
+            return False
+        try:
+            return parse_spice_number(self.options.get('gmin', '1e-12')) < 1e-12
+        except ValueError:
+            return True
+
+    def _dc(self, args):
+        fields = args.split()
+        start, stop, step = (parse_spice_number(f) for f in fields[1:4])
+        vdd = np.arange(start, stop + step / 2, step)
+        self.sweep = (vdd, -np.array([synthetic_leakage(v) for v in vdd]))
+        print(f"DC analysis {fields[0]} {fields[1]} {fields[2]} {fields[3]} completed")
+
+    def _op(self):
+        vdd = self.devices.get('vvdd', 0.7)
+        self.variables['static_power'] = vdd * synthetic_leakage(vdd)
+        print("Operating point completed")
+
+    def _sweep_vectors(self, names):
+        vdd, i_vdd = self.sweep
+        vectors = {'v-sweep': vdd}
+        for vector in names:
+            name = vector.lower()
+            if name.startswith('i('):
+                vectors[name] = i_vdd
+            elif name in ('v(vdd!)', 'vdd!'):
+                vectors[name] = vdd
+            else:
+                vectors[name] = -vdd * i_vdd
+        return vectors
+
+    def _vectors(self, names):
+        if self.sweep is not None:
+            return self._sweep_vectors(names)
+        vdd, time, v_out, i_vdd = self.waveforms
+        vectors = {'time': time}
+        for vector in names:
+            name = vector.lower()
+            if name.startswith('i('):
+                vectors[name] = i_vdd
+            elif name in ('v(vdd!)', 'vdd!'):
+                vectors[name] = np.full_like(time, vdd)
+            else:
+                vectors[name] = v_out
+        return vectors
+
+    def _wrdata(self, args):
+        fields = args.split()
+        if (self.waveforms is None and self.sweep is None) or not fields:
+            return
+        vectors = self._vectors(fields[1:])
+        with open(fields[0], 'w') as f:
+            f.write(' '.join(f'{n:<15}' for n in vectors) + '\n')
+            np.savetxt(f, np.column_stack(list(vectors.values())), fmt='%.8e')
+
+    def _write(self, args):
+        fields = args.split()
+        if self.waveforms is None or not fields:
+            return
+        from .rawfile import write_raw
+        write_raw(fields[0], self._vectors(fields[1:]))
+
+    def _echo(self, args):
+        target = None
+        mode = 'w'
+        match = re.match(r'(.*?)\s*(>>|>)\s*(\S+)\s*$', args)
+        if match:
+            args, mode, target = match.group(1), 'a' if match.group(2) == '>>' else 'w', match.group(3)
+        text = self._substitute(args)
+        if target is None:
+            print(text, flush=True)
+        else:
+            with open(target, mode) as f:
+                f.write(text + '\n')
+
+    def run(self):
+        for line in self.control:
+            if not self.execute(line):
+                break
+        return 0
+
+    def execute(self, line):
+        """
+        Execute one control line; returns False on quit/exit.
+        """
+        line = line.strip()
+        if not line or line.startswith('*'):
+            return True
+        command, _, args = line.partition(' ')
+        command = command.lower()
+        if self._depth:
+            if command in _BLOCK_START:
+                self._depth += 1
+            elif command == 'end':
+                self._depth -= 1
+            return True
+        if command in _BLOCK_START:
+            self._depth = 1
+            if command == 'dowhile' and self.transient is not None:
+                count, _, energy = self.transient
+                self.variables['count'] = count
+                self.variables['spike_energy'] = energy * count
+                vdd, time, _, i_vdd = self.waveforms
+                tail = i_vdd[len(i_vdd) - len(i_vdd) // 5:]
+                self.variables['static_power'] = float(np.mean(-vdd * tail))
+        elif command == 'set':
+            name, _, value = args.partition('=')
+            if value.strip():
+                self.options[name.strip().lower()] = value.strip()
+        elif command == 'let':
+            name, _, expression = args.partition('=')
+            value = self._evaluate(expression)
+            if value is not None:
+                self.variables[name.strip()] = value
+        elif command == 'alter':
+            self._alter(args)
+        elif command == 'tran':
+            self._tran(args)
+        elif command == 'dc':
+            self._dc(args)
+        elif command == 'op':
+            self._op()
+        elif command in ('wrdata', 'write'):
+            nodes = re.findall(r'\bv\(([^)]+)\)', args, re.IGNORECASE)
+            if nodes:
+                self.output_node = nodes[0].strip().lower()
+            if command == 'wrdata':
+                self._wrdata(args)
+            else:
+                self._write(args)
+        elif command == 'echo':
+            self._echo(args)
+        elif command == 'cd':
+            os.chdir(args.strip().strip('"'))
+        elif command == 'destroy':
+            self.transient = None
+            self.waveforms = None
+            self.sweep = None
+        elif command in ('quit', 'exit'):
+            return False
+        return True
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    decks = [a for a in args if not a.startswith('-')]
+    if len(decks) != 1:
+        print("Usage: python -m neuronsim.stubsim -b deck.cir")
+        return 1
+    with open(decks[0], 'r') as f:
+        deck_text = f.read()
+    simulator = StubSimulator(deck_text)
+    simulator.run()
+    if '-p' in args:
+        for line in sys.stdin:
+            if not simulator.execute(line):
+                break
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
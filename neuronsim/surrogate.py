@@ -0,0 +1,127 @@
+"""
+Gaussian-process surrogate for expensive simulations.
+
+A plain NumPy/SciPy Gaussian process with a squared-exponential kernel and
+one length scale per input (automatic relevance determination). Inputs are
+expected in the unit cube; targets are standardized internally. The
+hyperparameters are fitted by maximizing the log marginal likelihood with
+L-BFGS-B.
+"""
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.optimize import minimize
+
+# Bounds of the fitted log hyperparameters
+LENGTH_SCALE_BOUNDS = (1e-2, 1e1)
+NOISE_BOUNDS = (1e-6, 1e-1)
+
+
+def rbf_kernel(a, b, length_scales, variance):
+    """
+    Squared-exponential kernel matrix between the rows of a and b.
+    """
+    a = np.asarray(a, dtype=float) / length_scales
+    b = np.asarray(b, dtype=float) / length_scales
+    sq = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2 * a @ b.T
+    return variance * np.exp(-0.5 * np.maximum(sq, 0))
+
+
+class GaussianProcess:
+    """
+    Gaussian-process regression with an ARD squared-exponential kernel.
+
+    Parameters:
+    -----------
+    length_scales : float or array, optional
+        Initial length scales (in unit-cube coordinates)
+    noise : float
+        Initial noise variance of the standardized targets
+    """
+
+    def __init__(self, length_scales=0.3, noise=1e-3):
+        self.length_scales = length_scales
+        self.variance = 1.0
+        self.noise = noise
+        self.X = None
+
+    def _negative_log_likelihood(self, params, X, y):
+        d = X.shape[1]
+        length_scales = np.exp(params[:d])
+        variance = np.exp(params[d])
+        noise = np.exp(params[d + 1])
+        K = rbf_kernel(X, X, length_scales, variance) + noise * np.eye(len(X))
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            return 1e25
+        alpha = cho_solve((L, True), y)
+        return 0.5 * y @ alpha + np.log(np.diag(L)).sum() + 0.5 * len(X) * np.log(2 * np.pi)
+
+    def fit(self, X, y, optimize=True):
+        """
+        Fit the process to observations.
+
+        Parameters:
+        -----------
+        X : numpy.ndarray
+            Inputs, shape (n, d), in the unit cube
+        y : numpy.ndarray
+            Targets, shape (n,)
+        optimize : bool
+            Fit the hyperparameters; otherwise keep the current ones
+
+        Returns:
+        --------
+        GaussianProcess
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean = y.mean()
+        self.y_std = y.std() or 1.0
+        ys = (y - self.y_mean) / self.y_std
+        d = X.shape[1]
+
+        if optimize:
+            start = np.concatenate([np.log(np.broadcast_to(self.length_scales, d)),
+                                    [np.log(self.variance), np.log(self.noise)]])
+            bounds = ([tuple(np.log(LENGTH_SCALE_BOUNDS))] * d +
+                      [(np.log(1e-2), np.log(1e2)), tuple(np.log(NOISE_BOUNDS))])
+            result = minimize(self._negative_log_likelihood, start, args=(X, ys),
+                              method='L-BFGS-B', bounds=bounds)
+            self.length_scales = np.exp(result.x[:d])
+            self.variance = float(np.exp(result.x[d]))
+            self.noise = float(np.exp(result.x[d + 1]))
+
+        self._condition(X, ys)
+        return self
+
+    def _condition(self, X, ys):
+        self.X = X
+        self.ys = ys
+        K = rbf_kernel(X, X, self.length_scales, self.variance) + self.noise * np.eye(len(X))
+        self._factor = cho_factor(K, lower=True)
+        self._alpha = cho_solve(self._factor, ys)
+
+    def add_observations(self, X, y):
+        """
+        Condition on extra observations without refitting the hyperparameters.
+        """
+        ys = (np.asarray(y, dtype=float) - self.y_mean) / self.y_std
+        self._condition(np.vstack([self.X, X]), np.concatenate([self.ys, ys]))
+
+    def predict(self, X):
+        """
+        Posterior mean and standard deviation at X.
+
+        Returns:
+        --------
+        tuple : (mean, std) arrays of shape (n,)
+        """
+        X = np.asarray(X, dtype=float)
+        Ks = rbf_kernel(X, self.X, self.length_scales, self.variance)
+        mean = Ks @ self._alpha
+        v = solve_triangular(self._factor[0], Ks.T, lower=True)
+        var = np.maximum(self.variance - (v * v).sum(0), 1e-12)
+        return mean * self.y_std + self.y_mean, np.sqrt(var) * self.y_std
@@ -0,0 +1,777 @@
+"""
+Parallel VDD x capacitor sweeps for the neuron designs.
+
+The grid that Besrour.sch, Danneville.sch and Sourikopolous.sch walk with
+nested ``foreach`` loops in a single ngspice session is split into chunks
+here. Each chunk becomes its own netlist (``neuronsim.decks``: circuit
+extracted from the schematic plus a flat control block covering only that
+chunk's points) and
+is simulated by a separate batch-mode ngspice process. The rows produced by
+all chunks are merged into the usual
+``VDD Cap1 Cap2 Spikes Frequency Energy_Per_Spike`` table.
+
+By default the netlists only dump the output and supply-current vectors
+to a binary raw file after each transient and spikes are counted in Python
+by ``neuronsim.spikes``; ``extraction='ngspice'`` keeps the original
+interpreted counting loop inside the deck instead.
+
+With ``backend='shared'`` each worker simulates in-process through
+libngspice (``neuronsim.sharedspice``) and spikes are extracted from the
+vectors in memory; the spike counting always happens in Python then.
+With ``backend='session'`` each worker process keeps one simulator running
+in pipe mode with the circuit and model loaded (``neuronsim.session``) and
+sends it the commands of every chunk, instead of starting a batch-mode
+ngspice per chunk.
+
+With ``segment`` set, every point is first simulated for that much time
+only. Points whose last inter-spike intervals and spike energies already
+agree within ``convergence_rtol`` are extrapolated to the full ``tstop``
+(``neuronsim.spikes.extrapolate_spikes``); only the others are rerun with
+a transient ``segment_growth`` times longer, up to the full ``tstop``.
+
+Points that fail to converge are simulated again with progressively more
+robust solver settings (``ladder``, see ``neuronsim.convergence``), and the
+settings each point converged with are recorded in the result store.
+
+With ``warm_start`` the points are walked along a snake-shaped path
+(path_order: Cap2 within Cap1 within VDD, every inner axis reversing
+direction at each step of the outer ones) so that consecutive points of a
+chunk are grid neighbours. Only the first point of a chunk starts from the
+schematics' ``.ic`` state and runs the full ``tstop``; every following point
+starts from the capacitor voltages at the end of the previous transient and
+runs for ``warm_tstop``, of which the first ``warm_settle`` is discarded.
+Every point is measured over its trailing ``warm_tstop - warm_settle`` of
+steady spiking, with the spike count scaled to ``tstop``, so warm-started
+tables leave out the start-up transient of a cold run.
+
+Example:
+    python -m neuronsim.sweep --design besrour --workers 24 --store sweeps.db \
+        -o besrourneuron.txt
+"""
+
+import argparse
+import itertools
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .convergence import (DEFAULT_LADDER, LADDER, convergence_failure, rung_settings,
+                          started_points)
+from .decks import (RESULTS_FILE, WAVEFORM_FILES, deck_preamble, sweep_control,
+                    write_chunk_deck)
+from .designs import RESULT_COLUMNS, VDD_VALUES, get_design, parameter_columns
+from .session import run_in_session
+from .simulator import run_deck
+from .spice import format_spice_number, parse_spice_number
+from .spikes import INTEGRATION_METHODS, LOW_FRACTION, extract_spikes, extrapolate_spikes
+from .store import ResultStore, model_hash, point_key, result_row
+from .waveforms import load_waveform
+
+# Per-run settings; strings are passed to ngspice verbatim
+DEFAULT_SETTINGS = {
+    'isyn': '100n',
+    'tstep': '0.04n',
+    'tstop': '20n',
+    'nffins': 1,
+    'nfnfins': 5,
+    'threads': 1,
+    'extraction': 'numpy',
+    'integration': 'trapezoid',
+    'waveform_format': 'raw',
+    'backend': 'batch',
+    'segment': None,
+    'segment_growth': 4,
+    'convergence_window': 4,
+    'convergence_rtol': 0.01,
+    # Model card included by the decks; None is designs.MODEL_FILE
+    'model_file': None,
+    # Circuit temperature in degrees C; None leaves ngspice's default (27 C)
+    'temperature': None,
+    # Static power from one dc sweep of Vvdd, or a transient per VDD ('tran')
+    'static_mode': 'dc',
+    # Length of the behavior transients, 30 ns as in the *Plotting.sch decks
+    'behavior_tstop': '30n',
+    # Seed each point with the previous point's final capacitor voltages
+    'warm_start': False,
+    'warm_tstop': '8n',
+    'warm_settle': '2n',
+    # False starts every point of a warm-start chunk cold (retried points)
+    'warm_chain': True,
+    # Solver-setting rungs tried in turn on convergence failures, see
+    # neuronsim.convergence; 'solver_options' overrides the decks' set lines
+    'ladder': DEFAULT_LADDER,
+    'solver_options': None,
+}
+
+
+def build_grid(design, vdd_values=None, cap_values=None):
+    """
+    Build the list of grid points swept by a design's sweep schematic.
+
+    Points are ordered like the nested foreach loops of the decks: VDD
+    outermost, then Cap1, then Cap2.
+
+    Parameters:
+    -----------
+    design : str or dict
+        Design name or definition
+    vdd_values : list of float, optional
+        Supply voltages, defaults to 0.1 V to 0.9 V in 10 mV steps
+    cap_values : list of float, optional
+        Capacitor values applied to every swept capacitor
+
+    Returns:
+    --------
+    list of dict
+        One {'VDD': ..., 'Cap1': ..., ...} mapping per grid point
+    """
+    if isinstance(design, str):
+        design = get_design(design)
+    if vdd_values is None:
+        vdd_values = VDD_VALUES
+    if cap_values is None:
+        cap_values = design['cap_values']
+
+    columns = parameter_columns(design)
+    axes = [vdd_values] + [cap_values] * (len(columns) - 1)
+    return [dict(zip(columns, values)) for values in itertools.product(*axes)]
+
+
+def path_order(points, columns):
+    """
+    Order grid points along a snake-shaped path through the grid.
+
+    The first column is walked slowest. Every other axis reverses its
+    direction whenever the axes outside it step, so consecutive points differ
+    in one column by one grid step, as far as the points form a full grid.
+
+    Parameters:
+    -----------
+    points : list of dict
+        Grid points
+    columns : list of str
+        Swept columns, outermost first (see parameter_columns())
+
+    Returns:
+    --------
+    list of int
+        Indices into points in path order
+    """
+    levels = [{value: rank for rank, value in enumerate(sorted({p[c] for p in points}))}
+              for c in columns]
+
+    def position(i):
+        key = []
+        offset = 0
+        for column, ranks in zip(columns, levels):
+            rank = ranks[points[i][column]]
+            if offset % 2:
+                rank = len(ranks) - 1 - rank
+            key.append(rank)
+            offset = offset * len(ranks) + rank
+        return key
+
+    return sorted(range(len(points)), key=position)
+
+
+def chunk_points(points, chunk_size):
+    """
+    Split grid points into consecutive chunks of at most chunk_size points.
+    """
+    return [points[i:i + chunk_size] for i in range(0, len(points), chunk_size)]
+
+
+def read_results(path, n_columns):
+    """
+    Read the rows a chunk deck appended to its results file.
+
+    Returns:
+    --------
+    list of list of float
+        One row per completed grid point, in simulation order
+    """
+    rows = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, 'r') as f:
+        next(f, None)
+        for line in f:
+            fields = line.split()
+            if len(fields) != n_columns:
+                continue
+            try:
+                rows.append([float(v) for v in fields])
+            except ValueError:
+                continue
+    return rows
+
+
+class AbortedTransient(ValueError):
+    """
+    A point's waveform ends before the transient length it was run for.
+    """
+
+
+def extract_point(source, design, point, tstop, integration='trapezoid', compare_legacy=False,
+                  segment=None, window=4, rtol=0.01, settle=None, length=None):
+    """
+    Compute the result columns of one grid point from its waveforms.
+
+    source is the point's waveform file, or the vectors themselves (a dict
+    with 'time', the output node voltage and 'i(vvdd)').
+
+    With segment (the simulated length, shorter than tstop) the result is
+    extrapolated to tstop, or None is returned while the spikes have not
+    converged within rtol over the last window spikes.
+
+    With settle (s) the waveform before it is discarded, as after a warm
+    start: spikes are measured from the first time the output is low after
+    settle, the frequency is the inverse of their mean interval, the spike
+    count is that frequency over tstop and the energy per spike is the mean
+    over the spikes completed in the window.
+
+    With length (the simulated transient length, s) a waveform ending
+    earlier, i.e. a transient the simulator aborted, raises AbortedTransient.
+
+    Returns:
+    --------
+    tuple : (values, legacy_energy)
+        Result columns, and the fixed-dt energy per spike of the original
+        decks when compare_legacy is set (None otherwise)
+    """
+    node = f"v({design['output_node']})"
+    if isinstance(source, dict):
+        vectors = source
+    else:
+        vectors = load_waveform(source, ['time', node, 'i(vvdd)'])
+    if length is not None and vectors['time'][-1] < length * (1 - 1e-6):
+        raise AbortedTransient(f"Transient stopped at {vectors['time'][-1]:g} s of {length:g} s")
+    waveform = (vectors['time'], vectors[node], vectors['i(vvdd)'], point['VDD'])
+    if settle is not None:
+        return _settled_values(*waveform, settle, tstop, integration), None
+    if segment is not None and segment < tstop:
+        short = extract_spikes(*waveform, sim_time=segment, integration=integration,
+                               per_spike=True)
+        result = extrapolate_spikes(short, tstop, window, rtol)
+        if result is None:
+            return None, None
+        return [result['spikes'], result['frequency'], result['energy_per_spike']], None
+    result = extract_spikes(*waveform, sim_time=tstop, integration=integration)
+    legacy = None
+    if compare_legacy:
+        legacy = extract_spikes(*waveform, sim_time=tstop,
+                                integration='legacy')['energy_per_spike']
+    return [result['spikes'], result['frequency'], result['energy_per_spike']], legacy
+
+
+def _settled_values(time, v_out, i_vdd, vdd, settle, tstop, integration):
+    # Result columns over the waveform after settle, from a sample below the
+    # low threshold so that a spike in progress is not counted
+    time, v_out, i_vdd = (np.asarray(v, dtype=float) for v in (time, v_out, i_vdd))
+    after = time >= settle
+    low = np.flatnonzero(after & (v_out < LOW_FRACTION * vdd))
+    start = low[0] if len(low) else np.argmax(after)
+    window = time[-1] - time[start]
+    result = extract_spikes(time[start:], v_out[start:], i_vdd[start:], vdd,
+                            sim_time=window, integration=integration, per_spike=True)
+    if not result['energy_per_spike'] or not window > 0:
+        # No completed spike: the output never resets, nothing to scale
+        return [result['spikes'], result['spikes'] / tstop, 0.0]
+    starts = result['spike_times']
+    frequency = result['frequency']
+    if len(starts) > 1:
+        # Spikes per window are too few to count: use the mean interval
+        frequency = (len(starts) - 1) / (starts[-1] - starts[0])
+    # A spike still in flight at the end of the short window is not diluted in
+    energy = result['energy_per_spike'] * result['spikes'] / len(result['spike_energies'])
+    return [int(round(frequency * tstop)), frequency, energy]
+
+
+def run_chunk(job):
+    """
+    Simulate one chunk of grid points. Executed in a worker process.
+
+    The points are simulated with the first rung of settings['ladder']
+    (neuronsim.convergence). A point whose own transient failed to converge
+    is simulated again with the next rung; points the simulator never
+    reached (it stopped at an earlier point) are run again with the same
+    rung. Retried points of a warm-started chunk are no longer grid
+    neighbours and start cold.
+
+    Parameters:
+    -----------
+    job : dict
+        'design', 'points', 'index', 'work_dir', 'settings', 'simulator',
+        'timeout', 'keep' (keep the deck directory after the run) and
+        optionally 'segment' (transient length to simulate instead of tstop);
+        with settings['warm_start'] the points should be neighbours in
+        path_order()
+
+    Returns:
+    --------
+    dict
+        'index', 'rows' (one result row or None per point, in chunk order),
+        'missing' (points without a result), 'unconverged' (chunk positions
+        of the points whose segment was too short to extrapolate),
+        'rungs' (ladder rung of each point's result, None without one),
+        'returncode', 'log' and
+        'legacy_energy' ((energy, fixed-dt energy) pairs when
+        settings['compare_legacy'] is set)
+    """
+    settings = job['settings']
+    points = job['points']
+    ladder = list(settings.get('ladder') or [None])
+    rows = [None] * len(points)
+    rungs = [None] * len(points)
+    unconverged = []
+    legacy_energy = []
+    logs = []
+    queue = [(0, list(range(len(points))))]
+    while queue:
+        level, todo = queue.pop(0)
+        rung = ladder[level]
+        run_settings = rung_settings(settings, rung)
+        if len(todo) < len(points):
+            run_settings = dict(run_settings, warm_chain=False)
+        attempt = _simulate_chunk(job, [points[k] for k in todo], run_settings, rung)
+        logs.append(attempt['log'])
+        returncode = attempt['returncode']
+        legacy_energy.extend(attempt['legacy_energy'])
+        failure = convergence_failure(attempt['log'])
+        retry = []
+        unrun = []
+        for k, (row, status) in enumerate(zip(attempt['rows'], attempt['status'])):
+            if row is not None:
+                rows[todo[k]] = row
+                rungs[todo[k]] = rung
+            elif status == 'unconverged':
+                unconverged.append(todo[k])
+            elif status == 'unrun':
+                unrun.append(todo[k])
+            elif status == 'aborted' or (status == 'failed' and failure is not None):
+                retry.append(todo[k])
+        if unrun and len(unrun) < len(todo):
+            queue.append((level, unrun))
+        if retry and level + 1 < len(ladder):
+            logs.append(f"{len(retry)} points failed to converge with the {rung} settings "
+                        f"({failure})\n")
+            queue.append((level + 1, retry))
+
+    return {
+        'index': job['index'],
+        'rows': rows,
+        'missing': [p for k, (p, row) in enumerate(zip(points, rows))
+                    if row is None and k not in unconverged],
+        'unconverged': sorted(unconverged),
+        'rungs': rungs,
+        'returncode': returncode,
+        'log': ''.join(logs),
+        'legacy_energy': legacy_energy,
+    }
+
+
+def _simulate_chunk(job, points, settings, rung=None):
+    # One simulator run over points with these settings. Besides the rows,
+    # the status of every point: 'ok', 'unconverged' (segment too short),
+    # 'aborted' (its waveform stops early), 'failed' or 'unrun' (the
+    # simulator never started its transient)
+    design = get_design(job['design'])
+    columns = parameter_columns(design)
+    segment = job.get('segment')
+    deck_settings = settings if segment is None else dict(settings, tstop=segment)
+    prefix = f"chunk{job['index']:05d}_" + (f'{rung}_' if rung else '')
+    chunk_dir = tempfile.mkdtemp(prefix=prefix, dir=job['work_dir'])
+    backend = settings.get('backend', 'batch')
+    in_memory = None
+    if backend == 'shared':
+        # Vectors come straight from libngspice; nothing is written to disk
+        from .sharedspice import simulate_points
+        in_memory, log = simulate_points(design, points, deck_settings)
+        returncode = 0 if any(v is not None for v in in_memory) else -1
+    elif backend == 'session':
+        netlist_lines, options = deck_preamble(design, deck_settings)
+        returncode, log = run_in_session(job['design'], design,
+                                         sweep_control(design, points, deck_settings,
+                                                       options),
+                                         deck_settings, os.path.abspath(chunk_dir),
+                                         simulator=job['simulator'], timeout=job.get('timeout'))
+    else:
+        deck = os.path.join(chunk_dir, 'sweep.cir')
+        write_chunk_deck(design, points, deck, deck_settings,
+                         title=f"{job['design']} sweep chunk {job['index']}")
+        returncode, log = run_deck(deck, simulator=job['simulator'], cwd=chunk_dir,
+                                   timeout=job.get('timeout'))
+
+    started = started_points(log)
+    status = ['failed' if k in started else 'unrun' for k in range(len(points))]
+    legacy_energy = []
+    if settings['extraction'] == 'ngspice' and in_memory is None:
+        rows = read_results(os.path.join(chunk_dir, RESULTS_FILE),
+                            len(columns) + len(RESULT_COLUMNS))
+        rows = rows[:len(points)]
+        rows += [None] * (len(points) - len(rows))
+    else:
+        tstop = parse_spice_number(str(settings['tstop']))
+        lengths = [tstop] * len(points)
+        if segment is not None:
+            segment = parse_spice_number(str(segment))
+            lengths = [segment] * len(points)
+        waveform_file = WAVEFORM_FILES[settings.get('waveform_format', 'raw')]
+        settles = [None] * len(points)
+        if settings.get('warm_start'):
+            settle = parse_spice_number(str(settings['warm_settle']))
+            warm_tstop = parse_spice_number(str(settings['warm_tstop']))
+            chained = [k > 0 and settings.get('warm_chain', True) for k in range(len(points))]
+            # Cold points are measured over the same trailing window
+            settles = [settle if c else tstop - (warm_tstop - settle) for c in chained]
+            lengths = [warm_tstop if c else tstop for c in chained]
+        rows = []
+        for k, point in enumerate(points):
+            path = os.path.join(chunk_dir, waveform_file.format(k))
+            source = path if in_memory is None else in_memory[k]
+            if source is None:
+                rows.append(None)
+                continue
+            try:
+                values, legacy = extract_point(source, design, point, tstop,
+                                               settings['integration'],
+                                               settings.get('compare_legacy', False),
+                                               segment, settings.get('convergence_window', 4),
+                                               settings.get('convergence_rtol', 0.01),
+                                               settles[k], lengths[k])
+            except AbortedTransient:
+                rows.append(None)
+                status[k] = 'aborted'
+                continue
+            except (OSError, KeyError, ValueError, IndexError):
+                rows.append(None)
+                continue
+            if not job.get('keep') and in_memory is None:
+                os.remove(path)
+            if values is None:
+                rows.append(None)
+                status[k] = 'unconverged'
+                continue
+            rows.append([point[c] for c in columns] + values)
+            if legacy is not None:
+                legacy_energy.append((values[2], legacy))
+    for k, row in enumerate(rows):
+        if row is not None:
+            status[k] = 'ok'
+
+    if not job.get('keep'):
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    return {
+        'rows': rows,
+        'status': status,
+        'returncode': returncode,
+        'log': log,
+        'legacy_energy': legacy_energy,
+    }
+
+
+def report_legacy_difference(pairs, integration):
+    """
+    Print how far the decks' fixed-dt energy per spike is from the integral.
+
+    Parameters:
+    -----------
+    pairs : list of (energy, legacy_energy)
+        Energy per spike from the chosen integration and from the legacy rule
+    integration : str
+        Name of the chosen integration method
+    """
+    pairs = [(e, l) for e, l in pairs if e > 0]
+    if not pairs:
+        return
+    energy, legacy = (np.array(v) for v in zip(*pairs))
+    deviation = (legacy - energy) / energy
+    print(f"\nLegacy fixed-dt energy vs {integration} integration "
+          f"({len(pairs)} spiking points):")
+    print(f"Median deviation: {np.median(deviation) * 100:+.2f}%")
+    print(f"Largest deviation: {deviation[np.argmax(np.abs(deviation))] * 100:+.2f}%")
+
+
+def write_table(df, path):
+    """
+    Write a sweep table in the whitespace-separated format of the decks.
+
+    Text columns (e.g. a process corner) are written as they are.
+    """
+    with open(path, 'w') as f:
+        f.write(' '.join(df.columns) + '\n')
+        for row in df.itertuples(index=False):
+            f.write(' '.join(v if isinstance(v, str) else format_spice_number(v)
+                             for v in row) + '\n')
+
+
+def segment_lengths(settings):
+    """
+    Transient lengths simulated in turn when early termination is enabled.
+
+    Returns:
+    --------
+    list of str
+        settings['segment'] grown by segment_growth until the full tstop,
+        which is always last; just [tstop] without a segment or with the
+        in-deck spike counting
+    """
+    tstop = str(settings['tstop'])
+    if not settings.get('segment') or settings['extraction'] == 'ngspice':
+        return [tstop]
+    end = parse_spice_number(tstop)
+    length = parse_spice_number(str(settings['segment']))
+    segments = []
+    while length < end:
+        segments.append(format_spice_number(length))
+        length *= settings.get('segment_growth', 4)
+    return segments + [tstop]
+
+
+def run_sweep(design, points=None, workers=None, chunk_size=None, simulator=None,
+              settings=None, output=None, work_dir=None, timeout=None, keep_decks=False,
+              store=None):
+    """
+    Run a design's parameter sweep across a pool of ngspice processes.
+
+    Parameters:
+    -----------
+    design : str
+        Design name
+    points : list of dict, optional
+        Grid points to simulate, defaults to build_grid(design)
+    workers : int, optional
+        Number of concurrent simulator processes, defaults to the CPU count
+    chunk_size : int, optional
+        Grid points per netlist; by default each worker gets about four chunks
+    simulator : str or list, optional
+        Simulator command, see neuronsim.simulator.simulator_command()
+    settings : dict, optional
+        Overrides for DEFAULT_SETTINGS
+    output : str, optional
+        Path of the merged results table
+    work_dir : str, optional
+        Directory for the per-chunk netlists, a temporary one by default
+    timeout : float, optional
+        Per-chunk simulator timeout in seconds
+    keep_decks : bool
+        Keep the per-chunk netlists and logs for inspection
+    store : str or ResultStore, optional
+        Result store; points already in it are not simulated again and each
+        finished chunk is committed to it immediately
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Merged results in grid order
+    """
+    design_def = get_design(design)
+    columns = parameter_columns(design_def) + RESULT_COLUMNS
+    if points is None:
+        points = build_grid(design_def)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    run_settings = dict(DEFAULT_SETTINGS)
+    if settings:
+        run_settings.update(settings)
+    if run_settings['backend'] == 'shared':
+        run_settings['extraction'] = 'numpy'
+    if run_settings['warm_start'] and (run_settings['segment'] or
+                                       run_settings['extraction'] == 'ngspice'):
+        raise ValueError("warm_start cannot be combined with segment or "
+                         "extraction='ngspice'")
+    for rung in run_settings['ladder'] or ():
+        rung_settings(run_settings, rung)
+
+    own_store = isinstance(store, str)
+    if own_store:
+        store = ResultStore(store)
+    values = {}
+    keys = None
+    if store is not None:
+        digest = model_hash(run_settings['model_file'])
+        keys = [point_key(design, point, run_settings, digest) for point in points]
+        found = store.lookup(keys)
+        values = {i: found[key] for i, key in enumerate(keys) if key in found}
+        print(f"{len(values)} of {len(points)} points already in {store.path}")
+    pending = [i for i in range(len(points)) if i not in values]
+    if run_settings['warm_start']:
+        pending = [i for i in path_order(points, parameter_columns(design_def))
+                   if i not in values]
+
+    own_work_dir = work_dir is None
+    if own_work_dir:
+        work_dir = tempfile.mkdtemp(prefix=f'{design}_sweep_')
+    os.makedirs(work_dir, exist_ok=True)
+
+    n_missing = 0
+    legacy_energy = []
+    rung_counts = {}
+    segments = segment_lengths(run_settings)
+    for n_segment, segment in enumerate(segments):
+        if not pending:
+            break
+        size = chunk_size or max(1, math.ceil(len(pending) / (workers * 4)))
+        chunks = chunk_points(pending, size)
+        final = n_segment == len(segments) - 1
+        jobs = [{
+            'design': design,
+            'points': [points[i] for i in chunk],
+            'index': n,
+            'work_dir': work_dir,
+            'settings': run_settings,
+            'segment': None if final else segment,
+            'simulator': simulator,
+            'timeout': timeout,
+            'keep': keep_decks,
+        } for n, chunk in enumerate(chunks)]
+
+        length = '' if len(segments) == 1 else f" for {segment}"
+        print(f"Simulating {len(pending)} {design} grid points{length} in {len(chunks)} "
+              f"chunks on {workers} workers")
+        start = time.time()
+        retry = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_chunk, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                chunk = chunks[result['index']]
+                completed = {i: tuple(row[-len(RESULT_COLUMNS):])
+                             for i, row in zip(chunk, result['rows']) if row is not None}
+                values.update(completed)
+                rungs = {i: rung for i, row, rung in zip(chunk, result['rows'], result['rungs'])
+                         if row is not None and rung is not None}
+                for rung in rungs.values():
+                    rung_counts[rung] = rung_counts.get(rung, 0) + 1
+                legacy_energy.extend(result['legacy_energy'])
+                retry.extend(chunk[k] for k in result['unconverged'])
+                if store is not None and completed:
+                    store.insert([(keys[i], v) for i, v in completed.items()])
+                    store.record_rungs([(keys[i], rung) for i, rung in rungs.items()])
+                if result['missing']:
+                    n_missing += len(result['missing'])
+                    print(f"Warning: chunk {result['index']} exited with status "
+                          f"{result['returncode']} leaving {len(result['missing'])} points "
+                          f"unsimulated")
+                print(f"Chunk {done}/{len(chunks)} done ({time.time() - start:.1f} s)")
+        if not final:
+            print(f"{len(pending) - len(retry)} points converged within {segment}, "
+                  f"{len(retry)} need a longer transient")
+        pending = sorted(retry)
+
+    if own_work_dir and not keep_decks:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if len(rung_counts) > 1:
+        print("Solver settings the points converged with: " +
+              ', '.join(f'{rung} {rung_counts[rung]}' for rung in LADDER if rung in rung_counts))
+    if legacy_energy:
+        report_legacy_difference(legacy_energy, run_settings['integration'])
+    if own_store:
+        store.close()
+
+    rows = [result_row(design, points[i], values[i])
+            for i in range(len(points)) if i in values]
+    df = pd.DataFrame(rows, columns=columns)
+    df['Spikes'] = df['Spikes'].astype(int)
+    if n_missing:
+        print(f"Warning: {n_missing} of {len(points)} points have no result; "
+              f"rerun with the same store to simulate only those")
+    if output is not None:
+        write_table(df, output)
+        print(f"Results written to {output}")
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a neuron design sweep in parallel.')
+    parser.add_argument('--design', required=True, help='besrour, danneville or sourikopoulos')
+    parser.add_argument('--workers', type=int, default=None, help='concurrent ngspice processes')
+    parser.add_argument('--chunk-size', type=int, default=None, help='grid points per netlist')
+    parser.add_argument('--simulator', default=None, help='simulator command (default: $NGSPICE or ngspice)')
+    parser.add_argument('--stub', action='store_true', help='use the bundled stub simulator')
+    parser.add_argument('--vdd', type=float, nargs='+', default=None, help='supply voltages to sweep')
+    parser.add_argument('--caps', type=float, nargs='+', default=None, help='capacitor values to sweep')
+    parser.add_argument('--tstop', default=None, help='transient stop time (e.g. 20n)')
+    parser.add_argument('--extraction', choices=['numpy', 'ngspice'], default=None,
+                        help='count spikes in Python (default) or in the ngspice deck')
+    parser.add_argument('--integration', choices=INTEGRATION_METHODS, default=None,
+                        help='energy integration rule for Python extraction (default: trapezoid)')
+    parser.add_argument('--waveform-format', choices=sorted(WAVEFORM_FILES), default=None,
+                        help='per-point waveform dump: binary raw (default) or wrdata text')
+    parser.add_argument('--backend', choices=['batch', 'session', 'shared'], default=None,
+                        help='one ngspice per chunk (default), one persistent session per '
+                             'worker, or in-process libngspice')
+    parser.add_argument('--segment', default=None,
+                        help='simulate this long first (e.g. 100n) and stop once spiking converges')
+    parser.add_argument('--convergence-rtol', type=float, default=None,
+                        help='relative spread of the last ISIs and spike energies '
+                             'accepted as converged (default: 0.01)')
+    parser.add_argument('--warm-start', action='store_true',
+                        help='walk the grid along a path and start each point from the '
+                             'previous point\'s final capacitor voltages')
+    parser.add_argument('--warm-tstop', default=None,
+                        help='transient length of warm-started points (default: 8n)')
+    parser.add_argument('--warm-settle', default=None,
+                        help='settling time discarded from warm-started points (default: 2n)')
+    parser.add_argument('--ladder', nargs='+', choices=list(LADDER), default=None,
+                        help='solver settings tried in turn when a point fails to converge '
+                             '(default: deck robust rescue; start with fast for cheaper runs)')
+    parser.add_argument('--model-file', default=None,
+                        help='model card included instead of SimulationModeling/asap7_TT_slvt.sp')
+    parser.add_argument('--compare-legacy', action='store_true',
+                        help='report the deviation of the decks\' fixed-dt energy per spike')
+    parser.add_argument('--work-dir', default=None, help='keep per-chunk netlists here')
+    parser.add_argument('--store', default=None, help='SQLite result store; reruns skip stored points')
+    parser.add_argument('-o', '--output', default=None, help='merged results table')
+    args = parser.parse_args()
+
+    simulator = args.simulator
+    if args.stub:
+        from .simulator import STUB_SIMULATOR
+        simulator = STUB_SIMULATOR
+    settings = {}
+    if args.tstop:
+        settings['tstop'] = args.tstop
+    if args.extraction:
+        settings['extraction'] = args.extraction
+    if args.integration:
+        settings['integration'] = args.integration
+    if args.compare_legacy:
+        settings['compare_legacy'] = True
+    if args.waveform_format:
+        settings['waveform_format'] = args.waveform_format
+    if args.backend:
+        settings['backend'] = args.backend
+    if args.segment:
+        settings['segment'] = args.segment
+    if args.convergence_rtol is not None:
+        settings['convergence_rtol'] = args.convergence_rtol
+    if args.warm_start:
+        settings['warm_start'] = True
+    if args.warm_tstop:
+        settings['warm_tstop'] = args.warm_tstop
+    if args.warm_settle:
+        settings['warm_settle'] = args.warm_settle
+    if args.ladder:
+        settings['ladder'] = args.ladder
+    if args.model_file:
+        settings['model_file'] = os.path.abspath(args.model_file)
+
+    design = get_design(args.design)
+    output = args.output or design['sweep_file']
+    points = build_grid(design, vdd_values=args.vdd, cap_values=args.caps)
+    run_sweep(args.design.lower(), points=points, workers=args.workers,
+              chunk_size=args.chunk_size, simulator=simulator, settings=settings,
+              output=output, work_dir=args.work_dir,
+              keep_decks=args.work_dir is not None, store=args.store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Loader for the whitespace-separated sweep tables with a columnar cache.
+
+The sweep tables (``VDD Cap1 Cap2 Spikes Frequency Energy_Per_Spike``) are
+plain text and the large ones take far longer to parse than to plot. The
+first read of a table converts it to typed columns saved next to it in a
+``__tablecache__`` directory; later reads load the columns directly. A cache
+entry records the size, modification time and SHA-256 of its source and is
+rebuilt as soon as the source changes. A changed mtime with identical
+contents (e.g. after a git checkout) only refreshes the recorded mtime.
+
+``.npz`` is the default cache format since it needs nothing beyond NumPy;
+``fmt='parquet'`` uses pandas' Parquet support and needs pyarrow.
+"""
+
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = '__tablecache__'
+CACHE_FORMATS = ('npz', 'parquet')
+# Bumped whenever the cached layout changes
+CACHE_VERSION = 1
+
+
+def _read_source(path):
+    # The bytes of a table and the state they were read in. The stat is taken
+    # before reading, so a write racing the read leaves a stale mtime behind
+    # and the next read_table() rehashes instead of trusting the cache.
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+    return data, {'version': CACHE_VERSION, 'size': stat.st_size,
+                  'mtime_ns': stat.st_mtime_ns, 'sha256': hashlib.sha256(data).hexdigest()}
+
+
+def cache_path(path, fmt='npz'):
+    """
+    Return the cache file used for a table.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIR, f'{name}.{fmt}')
+
+
+def parse_table(path):
+    """
+    Parse a whitespace-separated table with a header row.
+
+    path is a file name or a binary file object.
+
+    Integer-valued columns such as Spikes keep an integer dtype, everything
+    else is float64.
+    """
+    return pd.read_csv(path, sep=r'\s+')
+
+
+def _save_npz(df, target, state):
+    # Text columns are stored as fixed-width strings; object arrays would need pickle
+    arrays = {f'column_{i}': df[c].to_numpy().astype(str) if df[c].dtype == object
+              else df[c].to_numpy() for i, c in enumerate(df.columns)}
+    meta = dict(state, columns=list(df.columns))
+    arrays['meta'] = np.array(json.dumps(meta))
+    temp = f'{target}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temp, target)
+
+
+def _load_npz(target):
+    with np.load(target, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        columns = {c: data[f'column_{i}'] for i, c in enumerate(meta.pop('columns'))}
+    return pd.DataFrame(columns), meta
+
+
+def _save_parquet(df, target, state):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'neuronsim'] = json.dumps(state).encode()
+    temp = f'{target}.{os.getpid()}.tmp'
+    pq.write_table(table.replace_schema_metadata(metadata), temp)
+    os.replace(temp, target)
+
+
+def _load_parquet(target):
+    import pyarrow.parquet as pq
+    table = pq.read_table(target)
+    meta = json.loads(table.schema.metadata[b'neuronsim'])
+    return table.to_pandas(), meta
+
+
+_BACKENDS = {
+    'npz': (_save_npz, _load_npz),
+    'parquet': (_save_parquet, _load_parquet),
+}
+
+
+def read_table(path, cache=True, fmt='npz'):
+    """
+    Read a sweep table, going through the columnar cache.
+
+    Parameters:
+    -----------
+    path : str
+        Whitespace-separated text table
+    cache : bool
+        Use and maintain the cache; False always parses the text
+    fmt : str
+        Cache format, 'npz' (default) or 'parquet' (needs pyarrow)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        The table with its original column names and order
+    """
+    if fmt not in CACHE_FORMATS:
+        raise ValueError(f"Unknown cache format '{fmt}', expected one of: "
+                         f"{', '.join(CACHE_FORMATS)}")
+    if not cache:
+        return parse_table(path)
+
+    save, load = _BACKENDS[fmt]
+    target = cache_path(path, fmt)
+    stat = os.stat(path)
+    meta = None
+    if os.path.exists(target):
+        try:
+            df, meta = load(target)
+        except Exception:
+            # Unreadable or foreign cache file: rebuild it below
+            meta = None
+    if meta is not None and meta.get('version') == CACHE_VERSION \
+            and meta.get('size') == stat.st_size:
+        if meta.get('mtime_ns') == stat.st_mtime_ns:
+            return df
+        data, state = _read_source(path)
+        if state['sha256'] == meta.get('sha256'):
+            _write_cache(save, df, target, state)
+            return df
+    else:
+        data, state = _read_source(path)
+
+    # Parse the very bytes the recorded hash was computed from
+    df = parse_table(io.BytesIO(data))
+    _write_cache(save, df, target, state)
+    return df
+
+
+def _write_cache(save, df, target, state):
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        save(df, target, state)
+    except OSError:
+        # A read-only data directory just means no cache
+        pass
+
+
+def clear_cache(path, fmt=None):
+    """
+    Remove the cached copies of a table.
+    """
+    for name in ([fmt] if fmt else CACHE_FORMATS):
+        target = cache_path(path, name)
+        if os.path.exists(target):
+            os.remove(target)
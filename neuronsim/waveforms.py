@@ -0,0 +1,70 @@
+"""
+Readers for waveform files written by ngspice.
+
+Text files come from ``wrdata``; binary ``.raw`` files from ``write`` are
+handled by ``neuronsim.rawfile``. load_waveform() picks the reader from the
+file extension.
+"""
+
+import numpy as np
+
+
+def normalize_vector_name(name):
+    """
+    Map ngspice vector names onto one spelling, e.g. 'Vvdd#branch' -> 'i(vvdd)'.
+    """
+    name = name.strip().lower()
+    if name.endswith('#branch'):
+        return f'i({name[:-len("#branch")]})'
+    return name
+
+
+def read_wrdata(path):
+    """
+    Read a text file written by ngspice ``wrdata`` with ``wr_vecnames`` set.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the waveform file
+
+    Returns:
+    --------
+    dict
+        Vector name (lowercase, e.g. 'time', 'v(net4)', 'i(vvdd)') -> numpy.ndarray.
+        Without ``wr_singlescale`` ngspice repeats the time column before
+        every vector; only the first column of each name is kept.
+    """
+    with open(path, 'r') as f:
+        names = [normalize_vector_name(n) for n in f.readline().split()]
+    data = np.loadtxt(path, skiprows=1, ndmin=2)
+    vectors = {}
+    for column, name in enumerate(names):
+        if name not in vectors:
+            vectors[name] = data[:, column]
+    return vectors
+
+
+def load_waveform(path, names=None):
+    """
+    Load vectors from a ``wrdata`` text file or an ngspice ``.raw`` file.
+
+    Parameters:
+    -----------
+    path : str
+        Waveform file; '.raw' files are read with the memory-mapped reader
+    names : list of str, optional
+        Vectors to return, all by default
+
+    Returns:
+    --------
+    dict
+        Vector name -> numpy.ndarray
+    """
+    if path.lower().endswith('.raw'):
+        from .rawfile import read_raw
+        return read_raw(path, names)
+    vectors = read_wrdata(path)
+    if names is None:
+        return vectors
+    return {normalize_vector_name(n): vectors[normalize_vector_name(n)] for n in names}
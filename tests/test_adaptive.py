@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neuronsim.adaptive import adaptive_sweep, best_point, boundary_midpoints, score_points
+from neuronsim.analysis.optimal import optimization_score
+from neuronsim.designs import DESIGNS, RESULT_COLUMNS, data_path, get_design, parameter_columns
+from neuronsim.tables import read_table
+
+
+def table_lookup(table, columns):
+    def evaluate(points):
+        return table.merge(pd.DataFrame(points), on=columns)
+    return evaluate
+
+
+@pytest.mark.parametrize('name', sorted(DESIGNS))
+def test_adaptive_sweep_finds_the_exhaustive_optimum(name):
+    design = get_design(name)
+    columns = parameter_columns(design)
+    table = read_table(data_path(design, 'sweep_file'))
+    df = adaptive_sweep(name, evaluate=table_lookup(table, columns))
+    assert len(df) < len(table) / 10
+
+    def optimum(rows):
+        spiking = rows[rows['Energy_Per_Spike'] != 0]
+        score = np.nan_to_num(optimization_score(spiking['Frequency'].to_numpy(),
+                                                 spiking['Energy_Per_Spike'].to_numpy()))
+        return spiking.iloc[int(np.argmax(score))][columns].tolist()
+
+    assert optimum(df) == optimum(table)
+
+
+def test_no_spiking_points(capsys):
+    columns = parameter_columns(get_design('danneville'))
+
+    def silent(points):
+        df = pd.DataFrame(points)
+        for column in RESULT_COLUMNS:
+            df[column] = 0
+        return df
+
+    df = adaptive_sweep('danneville', evaluate=silent)
+    assert (df['Energy_Per_Spike'] == 0).all()
+    assert 'no spiking points' in capsys.readouterr().out
+
+    df = adaptive_sweep('danneville', evaluate=lambda points: pd.DataFrame(
+        columns=columns + RESULT_COLUMNS))
+    assert df.empty
+    assert 'no spiking points' in capsys.readouterr().out
+
+
+def test_best_point_and_boundary():
+    assert best_point({}) is None
+    assert best_point({(0,): (0, 0.0, 0.0), (1,): (0, 0.0, 0.0)}) is None
+    results = {(0,): (0, 0.0, 0.0), (4,): (3, 1.5e8, 1e-15), (8,): (2, 1e8, 2e-15)}
+    assert best_point(results) == (4,)
+    assert score_points(results)[(0,)] == 0.0
+    assert boundary_midpoints(results, 4, (9,)) == {(2,)}
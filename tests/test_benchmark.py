@@ -0,0 +1,60 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from neuronsim import benchmark
+from neuronsim.benchmark import (BENCHMARKS, compare, run_benchmarks, save_baseline,
+                                 sweep_table, synthetic_waveform, waveform_file)
+from neuronsim.tables import parse_table
+from neuronsim.waveforms import load_waveform
+
+
+def test_datasets_are_reproducible(tmp_path):
+    first, second = tmp_path / 'a', tmp_path / 'b'
+    first.mkdir()
+    second.mkdir()
+    path = sweep_table('1k', str(first))
+    assert open(path).read() == open(sweep_table('1k', str(second))).read()
+    assert len(parse_table(path)) == 1000
+
+    vectors = synthetic_waveform(1000)
+    for fmt in ('txt', 'raw'):
+        loaded = load_waveform(waveform_file('1k', str(first), fmt))
+        for name in ('time', 'v(net4)', 'i(vvdd)'):
+            np.testing.assert_allclose(loaded[name], vectors[name], rtol=1e-7)
+
+
+def test_every_benchmark_runs_on_the_small_datasets(tmp_path):
+    report = run_benchmarks(sizes=['1k'], repeat=1, data_dir=str(tmp_path))
+    assert set(report['results']) == {f'{name}[1k]' for name in BENCHMARKS}
+    assert all(len(r['runs']) == 1 and r['min'] > 0 for r in report['results'].values())
+    assert report['machine']['numpy'] == np.__version__
+
+
+def test_compare_flags_slower_medians(tmp_path):
+    report = {'machine': {'time': 'now'},
+              'results': {'a[1k]': {'median': 2.0}, 'b[1k]': {'median': 1.0},
+                          'new[1k]': {'median': 1.0}}}
+    baseline = {'machine': {'time': 'then'},
+                'results': {'a[1k]': {'median': 1.0}, 'b[1k]': {'median': 1.0}}}
+    path = save_baseline(baseline, 'main', str(tmp_path))
+    with open(path) as f:
+        assert json.load(f) == baseline
+    assert compare(report, baseline) == [('a[1k]', 1.0, 2.0, 2.0), ('b[1k]', 1.0, 1.0, 1.0)]
+
+
+def test_regressions_exit_with_status_1(tmp_path, monkeypatch, capsys):
+    # A baseline that ran in no time makes everything a regression
+    report = run_benchmarks(['score.extract_spikes'], ['1k'], 1, str(tmp_path / 'data'))
+    for result in report['results'].values():
+        result['median'] /= 100
+    save_baseline(report, 'fast', str(tmp_path))
+    monkeypatch.setattr(sys, 'argv', ['benchmark', '-k', 'score.extract_spikes',
+                                      '--sizes', '1k', '--repeat', '1',
+                                      '--compare', 'fast', '--results-dir', str(tmp_path)])
+    with pytest.raises(SystemExit) as exit_info:
+        benchmark.main()
+    assert exit_info.value.code == 1
+    assert 'REGRESSION' in capsys.readouterr().out
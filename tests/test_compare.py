@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neuronsim.analysis.compare import align_on_vdd, compare_designs, load_designs, summary_table
+
+
+@pytest.fixture(scope='module')
+def datasets():
+    return load_designs()
+
+
+def test_alignment_keeps_each_design_range(datasets):
+    aligned = align_on_vdd(datasets)
+    vdds = set()
+    for data in datasets:
+        for table, column in ((data['sweep'], 'Frequency'), (data['static'], 'Static_Power')):
+            key = f"{data['label']}_{column}"
+            rows = aligned[aligned[key].notna()]
+            np.testing.assert_allclose(rows['VDD'], table['VDD'].round(2).sort_values())
+            np.testing.assert_allclose(rows[key], table.sort_values('VDD')[column])
+            vdds |= set(table['VDD'].round(2))
+    assert sorted(vdds) == list(aligned['VDD'])
+
+
+def test_alignment_without_data():
+    aligned = align_on_vdd([{'label': 'BLIF', 'sweep': None, 'static': None}])
+    assert list(aligned.columns) == ['VDD']
+    assert aligned.empty
+
+
+def test_summary_matches_the_optimal_sweeps(datasets):
+    summary = summary_table(datasets).set_index('Design')
+    for data in datasets:
+        row = summary.loc[data['label']]
+        sweep = data['sweep'].set_index('VDD')
+        assert sweep.loc[row['Optimal_VDD'], 'Frequency'] == row['Frequency']
+        assert row['Static_Power'] == np.interp(row['Optimal_VDD'], data['static']['VDD'],
+                                                data['static']['Static_Power'])
+
+
+def test_compare_designs_writes_the_report(tmp_path):
+    pytest.importorskip('matplotlib')
+    import matplotlib
+    matplotlib.use('Agg')
+    summary, aligned = compare_designs(output_dir=str(tmp_path))
+    assert len(summary) == 3
+    written = pd.read_csv(tmp_path / 'design_comparison_vdd.txt', sep=' ')
+    assert len(written) == len(aligned)
+    for name in ('design_comparison.txt', 'design_comparison.png',
+                 'design_comparison_behavior.png'):
+        assert (tmp_path / name).exists()
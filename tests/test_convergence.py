@@ -0,0 +1,71 @@
+import pytest
+
+from neuronsim.convergence import (LADDER, convergence_failure, report_rungs, rung_settings,
+                                   started_points)
+from neuronsim.decks import deck_preamble
+from neuronsim.designs import get_design
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.store import ResultStore
+from neuronsim.stubsim import FAIL_VDD_ENV
+from neuronsim.sweep import DEFAULT_SETTINGS, build_grid, run_sweep
+
+
+def test_convergence_failure_returns_the_whole_line():
+    log = ("Simulating point 0\n"
+           "Doing analysis at TEMP = 27.000000\n"
+           "Error: Timestep too small; time = 1.2e-09, timestep = 1.25e-22: "
+           "trouble with node net4\n"
+           "tran simulation(s) aborted\n")
+    assert convergence_failure(log) == ("Error: Timestep too small; time = 1.2e-09, "
+                                        "timestep = 1.25e-22: trouble with node net4")
+    assert convergence_failure("warning: singular matrix:  check node net2") == \
+        "warning: singular matrix:  check node net2"
+
+
+@pytest.mark.parametrize('log', [None, '', 'Simulating point 0\nTransient analysis completed\n'])
+def test_clean_logs_have_no_convergence_failure(log):
+    assert convergence_failure(log) is None
+
+
+def test_started_points():
+    log = ("Simulating point 0\nTransient analysis completed\n"
+           "Simulating point 12  \nSimulating point 3 of 4\n  Simulating point 5\n")
+    assert started_points(log) == {0, 12}
+    assert started_points(None) == set()
+
+
+def test_rung_settings_merge_over_the_solver_options():
+    settings = dict(DEFAULT_SETTINGS, solver_options={'reltol': '1e-4', 'gmin': '1e-15'})
+    rescue = rung_settings(settings, 'rescue')
+    assert rescue['solver_options'] == dict(LADDER['rescue'], reltol='1e-4')
+    assert settings['solver_options'] == {'reltol': '1e-4', 'gmin': '1e-15'}
+    assert rung_settings(settings, 'deck')['solver_options'] == settings['solver_options']
+    assert rung_settings(settings, None) is settings
+    with pytest.raises(ValueError, match="Unknown ladder rung 'slow'"):
+        rung_settings(settings, 'slow')
+
+
+def test_rungs_override_the_deck_options():
+    design = get_design('besrour')
+    _, deck = deck_preamble(design, DEFAULT_SETTINGS)
+    _, robust = deck_preamble(design, rung_settings(DEFAULT_SETTINGS, 'robust'))
+    assert 'set itl4 = 5000' in robust and 'set maxord = 2' in robust
+    assert len(robust) == len(set(robust))
+    # The deck's own options keep their place, the rung's new ones are appended
+    names = [line.split('=')[0] for line in robust]
+    assert names[:len(deck)] == [line.split('=')[0] for line in deck]
+
+
+def test_report_rungs(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(FAIL_VDD_ENV, '0.6')
+    store = str(tmp_path / 'sweeps.db')
+    run_sweep('besrour', build_grid('besrour', [0.5, 0.6], [1e-15]), workers=1,
+              simulator=STUB_SIMULATOR, store=store)
+    capsys.readouterr()
+    with ResultStore(store) as results:
+        report_rungs(results)
+        report_rungs(results, 'danneville')
+    assert capsys.readouterr().out.splitlines() == [
+        'besrour [trapezoid]: 2 points: deck 1 (50.0%), robust 1 (50.0%)',
+        f'No ladder rungs recorded in {store}',
+    ]
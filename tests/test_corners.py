@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pytest
+
+from neuronsim.corners import PHIG_SHIFT, U0_SPREAD, corner_cards, corner_changes, run_corners
+from neuronsim.designs import MODEL_FILE
+from neuronsim.modelcard import card_parameters, read_card
+from neuronsim.simulator import STUB_SIMULATOR
+
+NOMINAL = card_parameters(read_card())
+NMOS, PMOS = 'BSIMCMG_osdi_N', 'BSIMCMG_osdi_P'
+
+
+@pytest.mark.parametrize('corner, n_speed, p_speed', [
+    ('TT', 0, 0), ('FF', 1, 1), ('SS', -1, -1), ('FS', 1, -1), ('SF', -1, 1),
+])
+def test_corner_changes_move_vth_and_mobility(corner, n_speed, p_speed):
+    changes = corner_changes(corner, NOMINAL)
+    # A fast NMOS has a lower work function, a fast PMOS a higher one
+    assert changes[NMOS]['phig'] == pytest.approx(NOMINAL[NMOS]['phig'] - n_speed * PHIG_SHIFT,
+                                                  rel=1e-12, abs=0)
+    assert changes[PMOS]['phig'] == pytest.approx(NOMINAL[PMOS]['phig'] + p_speed * PHIG_SHIFT,
+                                                  rel=1e-12, abs=0)
+    assert changes[NMOS]['u0'] == pytest.approx(NOMINAL[NMOS]['u0'] * (1 + n_speed * U0_SPREAD),
+                                                rel=1e-12, abs=0)
+    assert changes[PMOS]['u0'] == pytest.approx(NOMINAL[PMOS]['u0'] * (1 + p_speed * U0_SPREAD),
+                                                rel=1e-12, abs=0)
+
+
+@pytest.mark.parametrize('corner', ['F', 'FFF', 'FX'])
+def test_unknown_corner(corner):
+    with pytest.raises(ValueError, match='Unknown corner'):
+        corner_changes(corner, NOMINAL)
+
+
+def test_corner_cards(tmp_path):
+    paths = corner_cards(['tt', 'FS'], str(tmp_path))
+    assert paths['TT'] == MODEL_FILE
+    assert paths['FS'] == str(tmp_path / 'asap7_FS_slvt.sp')
+    written = card_parameters(read_card(paths['FS']))
+    for model, changes in corner_changes('FS', NOMINAL).items():
+        for name, value in changes.items():
+            assert written[model][name] == pytest.approx(value, rel=1e-6, abs=0)
+
+
+def test_stub_corner_run(tmp_path, capsys):
+    kwargs = dict(corners=['TT', 'FF'], temperatures=[25, 125], vdd_values=[0.5, 0.6],
+                  workers=2, simulator=STUB_SIMULATOR, store=str(tmp_path / 'corners.db'),
+                  work_dir=str(tmp_path / 'runs'), model_dir=str(tmp_path / 'models'))
+    df = run_corners('besrour', output=str(tmp_path / 'corners.txt'), **kwargs)
+    assert list(df.columns) == ['Corner', 'Temperature', 'VDD', 'Cap1', 'Cap2', 'Spikes',
+                                'Frequency', 'Energy_Per_Spike', 'Static_Power']
+    assert list(zip(df['Corner'], df['Temperature'], df['VDD'])) == [
+        (c, t, v) for c in ('TT', 'FF') for t in (25, 125) for v in (0.5, 0.6)]
+    assert (df['Spikes'] > 0).all()
+    assert not df['Static_Power'].isna().any()
+    for condition in ('TT_25C', 'FF_25C', 'TT_125C', 'FF_125C'):
+        deck = tmp_path / 'runs' / f'besrour_{condition}' / 'behavior' / 'behavior.cir'
+        text = deck.read_text()
+        assert f".temp {condition.split('_')[1][:-1]}" in text
+        assert ('asap7_FF_slvt.sp' in text) == condition.startswith('FF')
+    assert os.path.exists(tmp_path / 'corners.txt')
+
+    capsys.readouterr()
+    again = run_corners('besrour', analyses=['optimal'], **kwargs)
+    assert '8 of 8 corner sweep points already in' in capsys.readouterr().out
+    np.testing.assert_array_equal(again['Energy_Per_Spike'], df['Energy_Per_Spike'])
+
+
+def test_unknown_analysis():
+    with pytest.raises(ValueError, match='Unknown analyses'):
+        run_corners('besrour', analyses=['ac'])
@@ -0,0 +1,30 @@
+import re
+
+from neuronsim.decks import behavior_control, deck_preamble, write_decks
+from neuronsim.designs import SIMULATION_DIR, get_design
+from neuronsim.sweep import DEFAULT_SETTINGS
+
+
+def plotting_tran(design):
+    with open(f"{SIMULATION_DIR}/{design['behavior_schematic']}") as f:
+        return re.search(r'^\s*(tran .*)$', f.read(), re.M).group(1).strip()
+
+
+def test_behavior_decks_run_as_long_as_the_plotting_schematics():
+    design = get_design('besrour')
+    _, options = deck_preamble(design, DEFAULT_SETTINGS)
+    point = {'VDD': 0.3, 'Cap1': 2e-15, 'Cap2': 2e-15}
+    control = behavior_control(design, point, DEFAULT_SETTINGS, options)
+    assert 'tran 0.04n 30n UIC' in control
+    assert plotting_tran(design) == 'tran 0.04n 30n UIC'
+    assert control[-len(design['behavior_nodes']):] == [
+        f'wrdata {node}_data.txt time v({node})' for node in design['behavior_nodes']]
+
+
+def test_behavior_tstop_is_independent_of_the_sweep_tstop(tmp_path):
+    settings = {'tstop': '50n', 'behavior_tstop': '40n'}
+    paths = write_decks('danneville', 'behavior', str(tmp_path),
+                        points=[{'VDD': 0.3, 'Cap': 1e-15}], settings=settings)
+    text = open(paths[0]).read()
+    assert 'tran 0.04n 40n UIC' in text
+    assert '50n' not in text
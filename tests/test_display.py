@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from neuronsim.analysis.heatmaps import normalize_data
+from neuronsim.display import display_points, memory_report, score_surface
+
+
+def test_display_points_of_one_subplot():
+    assert display_points((18, 6), 155, ncols=3) == 930
+    assert display_points((6, 9), 100, ncols=3) == 900
+    assert display_points((0.01, 0.01), 1) == 2
+
+
+@pytest.mark.parametrize('tile_rows', [1, 7, 256])
+def test_tiled_score_matches_the_full_computation(tile_rows):
+    rng = np.random.default_rng(0)
+    z_freq = rng.uniform(1e6, 1e9, (50, 40))
+    z_energy = rng.uniform(1e-17, 1e-15, (50, 40))
+    z_freq[3, 4] = np.nan
+    z_energy[10, 20] = np.nan
+    expected = normalize_data(z_freq) * (1 - normalize_data(z_energy))
+    np.testing.assert_allclose(score_surface(z_freq, z_energy, tile_rows), expected,
+                               rtol=1e-12, equal_nan=True)
+
+
+def test_memory_report(capsys):
+    with memory_report('Test block') as report:
+        np.ones(2**20)
+    assert report['peak_bytes'] >= 8 * 2**20
+    assert 'Test block: peak memory' in capsys.readouterr().out
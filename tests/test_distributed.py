@@ -0,0 +1,21 @@
+from neuronsim.distributed import DistributedSweep, SimulatedClusterBackend
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.sweep import build_grid, run_sweep
+
+POINTS = build_grid('besrour', [0.5, 0.6], [1e-15, 2e-15])
+
+
+def test_failed_jobs_are_retried(tmp_path):
+    # With seed 1 the second of the first four jobs fails
+    backend = SimulatedClusterBackend(nodes=2, slots_per_node=2, failure_rate=0.4, seed=1)
+    sweep = DistributedSweep('besrour', backend, points=POINTS, chunk_size=1,
+                             simulator=STUB_SIMULATOR, work_dir=str(tmp_path / 'work'),
+                             store=str(tmp_path / 'sweeps.db'), max_attempts=10)
+    df = sweep.run(poll_interval=0.05)
+    states = [job['state'] for job in sweep.jobs]
+    assert 'failed' in states
+    assert max(job['attempt'] for job in sweep.jobs) > 1
+    assert len(df) == len(POINTS)
+
+    reference = run_sweep('besrour', POINTS, workers=2, simulator=STUB_SIMULATOR)
+    assert df.equals(reference)
@@ -0,0 +1,65 @@
+import re
+
+import numpy as np
+import pytest
+
+from neuronsim.analysis.heatmaps import create_combined_heatmaps, load_and_process_data
+from neuronsim.analysis.styles import get_style
+from neuronsim.designs import data_path, get_design
+from neuronsim.incremental import IncrementalHeatmap
+from neuronsim.tables import read_table
+
+
+def heatmap_optimum(path, num_points, capsys):
+    import matplotlib
+    matplotlib.use('Agg')
+    style = get_style('heatmap', 'besrour')
+    style.update({'show': False, 'interpolation_points': num_points, 'render_mode': 'full'})
+    style.pop('output_path', None)
+    capsys.readouterr()
+    create_combined_heatmaps(*load_and_process_data(path), style)
+    block = capsys.readouterr().out.split('Optimization Score Optimal Point:')[1]
+    score, cap1, cap2 = (float(v) for v in re.findall(r':\s*([-\d.e+]+)', block)[:3])
+    return {'score': score, 'cap1_fF': cap1, 'cap2_fF': cap2}
+
+
+def fed_in_chunks(table, num_points, chunks=7, seed=0):
+    heatmap = IncrementalHeatmap(table['Cap1'], table['Cap2'], num_points)
+    order = np.random.default_rng(seed).permutation(len(table))
+    for part in np.array_split(order, chunks):
+        heatmap.add(table.iloc[part])
+    return heatmap
+
+
+@pytest.mark.parametrize('name', ['besrour', 'sourikopoulos'])
+def test_incremental_optimum_matches_the_heatmap_script(name, capsys):
+    pytest.importorskip('matplotlib')
+    path = data_path(get_design(name), 'sweep_file')
+    heatmap = fed_in_chunks(read_table(path), 100)
+    expected = heatmap_optimum(path, 100, capsys)
+    optimal = heatmap.optimal(display=True)
+    assert f"{optimal['score']:.3g}" == f"{expected['score']:.3g}"
+    assert f"{optimal['cap1_fF']:.2f}" == f"{expected['cap1_fF']:.2f}"
+    assert f"{optimal['cap2_fF']:.2f}" == f"{expected['cap2_fF']:.2f}"
+
+
+def test_cells_match_the_pivot_tables():
+    path = data_path(get_design('besrour'), 'sweep_file')
+    heatmap = fed_in_chunks(read_table(path), None, chunks=13, seed=1)
+    frequency, energy = load_and_process_data(path)
+    pivot_frequency, pivot_energy = heatmap.pivots()
+    np.testing.assert_allclose(pivot_frequency.to_numpy(), frequency.to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(pivot_energy.to_numpy(), energy.to_numpy(), rtol=1e-12)
+    score = ((frequency - np.nanmin(frequency)) / (np.nanmax(frequency) - np.nanmin(frequency)) *
+             (1 - (energy - np.nanmin(energy)) / (np.nanmax(energy) - np.nanmin(energy))))
+    i, j = np.unravel_index(np.nanargmax(score.to_numpy()), score.shape)
+    optimal = heatmap.optimal()
+    assert (optimal['cap1_fF'], optimal['cap2_fF']) == (score.index[i], score.columns[j])
+    assert optimal['score'] == pytest.approx(score.iloc[i, j], rel=1e-12)
+
+
+def test_rows_outside_the_axes_are_rejected():
+    heatmap = IncrementalHeatmap([1e-16, 2e-16], [1e-16, 2e-16])
+    table = read_table(data_path(get_design('besrour'), 'sweep_file'))
+    with pytest.raises(ValueError):
+        heatmap.add(table[table['Energy_Per_Spike'] != 0].head(50))
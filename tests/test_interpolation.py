@@ -0,0 +1,23 @@
+import numpy as np
+
+from neuronsim.interpolation import interpolate_grid, interpolate_scattered
+
+X = np.array([1e-16, 2e-16, 4e-16])
+Y = np.array([1e-16, 1e-15])
+Z = np.arange(6.0).reshape(2, 3)
+# Display axis ends a rounding error beyond the grid, as np.logspace can give
+XI = np.array([1e-16 * (1 - 1e-12), 4e-16 * (1 + 1e-12), 1e-15])
+YI = np.array([1e-16 * (1 - 1e-12), 1e-15 * (1 + 1e-12)])
+
+
+def test_log_grid_keeps_the_edges():
+    zi = interpolate_grid(X, Y, Z, XI, YI, space='log')
+    np.testing.assert_allclose(zi[:, :2], [[0, 2], [3, 5]])
+    assert np.isnan(zi[:, 2]).all()
+
+
+def test_log_scattered_keeps_the_edges():
+    grid_x, grid_y = np.meshgrid(X, Y)
+    zi = interpolate_scattered(grid_x, grid_y, Z, XI, YI, space='log')
+    np.testing.assert_allclose(zi[:, :2], [[0, 2], [3, 5]])
+    assert np.isnan(zi[:, 2]).all()
@@ -0,0 +1,28 @@
+import pytest
+
+from neuronsim.modelcard import card_parameters, read_card, set_parameters
+
+
+def test_set_parameters_changes_only_the_target_line():
+    card = read_card()
+    changed = set_parameters(card, {'BSIMCMG_osdi_N': {'phig': 4.25}})
+    old_lines = card.splitlines(keepends=True)
+    new_lines = changed.splitlines(keepends=True)
+    assert len(old_lines) == len(new_lines)
+    differing = [(old, new) for old, new in zip(old_lines, new_lines) if old != new]
+    assert len(differing) == 1
+    old, new = differing[0]
+    assert 'phig' in old and len(old) == len(new)
+    assert card_parameters(changed)['BSIMCMG_osdi_N']['phig'] == 4.25
+    assert card_parameters(changed)['BSIMCMG_osdi_P'] == card_parameters(card)['BSIMCMG_osdi_P']
+
+
+def test_set_parameters_without_changes_is_identical():
+    card = read_card()
+    assert set_parameters(card, {}) == card
+    assert set_parameters(card, {'BSIMCMG_osdi_P': {}}) == card
+
+
+def test_set_parameters_unknown_parameter():
+    with pytest.raises(KeyError):
+        set_parameters(read_card(), {'BSIMCMG_osdi_N': {'nosuchparam': 1.0}})
@@ -0,0 +1,57 @@
+import pytest
+
+from neuronsim.analysis.runner import run_analysis
+
+# Report printed by the original danneville optimal/optplot.py on dannevilleoptimal.txt
+DANNEVILLE_REPORT = """
+Values at 0.3V:
+  Frequency: 1.50 GHz
+  Energy: 670.31 zJ
+
+Analysis Results:
+--------------------------------------------------
+Maximum Frequency Point:
+  Supply Voltage: 0.610 V
+  Frequency: 3.05 GHz
+
+Minimum Energy Point:
+  Supply Voltage: 0.140 V
+  Energy: 252.64 zJ
+
+Optimal Point (Balanced Score):
+  Supply Voltage: 0.610 V
+  Frequency: 3.05 GHz
+  Energy: 8.78 aJ
+  Score: 0.939
+--------------------------------------------------
+"""
+
+
+@pytest.fixture(autouse=True)
+def agg_backend():
+    matplotlib = pytest.importorskip('matplotlib')
+    matplotlib.use('Agg')
+
+
+def test_danneville_keeps_its_original_report(tmp_path, capsys, monkeypatch):
+    import matplotlib.pyplot as plt
+    monkeypatch.setattr(plt, 'close', lambda *args: None)
+    run_analysis('optimal', 'danneville', show=False, output_path=str(tmp_path / 'd.png'))
+    assert capsys.readouterr().out == DANNEVILLE_REPORT
+    axes = plt.gcf().axes
+    assert [ax.get_title() for ax in axes] == ['Energy per Spike', 'Spiking Frequency',
+                                               'Optimization Score']
+    assert axes[0].lines[0].get_color() == 'darkblue'
+    plt.close('all')
+
+
+def test_other_designs_print_the_summary(tmp_path, capsys):
+    summary = run_analysis('optimal', 'besrour', show=False, output_path=str(tmp_path / 'b.png'))
+    out = capsys.readouterr().out
+    assert 'Summary Statistics:' in out and 'Analysis Results:' not in out
+    assert f"Optimal voltage point: {summary['optimal']['vdd']:.3f}V" in out
+
+
+def test_unknown_report():
+    with pytest.raises(ValueError):
+        run_analysis('optimal', 'besrour', show=False, style_overrides={'report': 'full'})
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from neuronsim.designs import get_design, parameter_columns
+from neuronsim.optimize import (from_unit, load_warm_start, optimize, pareto_front,
+                                propose_batch, search_space, to_unit)
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.surrogate import GaussianProcess
+
+
+def test_gaussian_process_interpolates_its_observations():
+    rng = np.random.default_rng(1)
+    X = rng.uniform(size=(30, 2))
+    y = np.sin(4 * X[:, 0]) + X[:, 1] ** 2
+    gp = GaussianProcess().fit(X, y)
+    mean, std = gp.predict(X)
+    np.testing.assert_allclose(mean, y, atol=0.05)
+    far_mean, far_std = gp.predict(np.array([[3.0, 3.0]]))
+    assert far_std[0] > 10 * std.max()
+
+
+def test_unit_cube_round_trip():
+    space = search_space(get_design('besrour'))
+    u = np.random.default_rng(2).uniform(size=(20, len(space)))
+    params = from_unit(u, space)
+    assert params['NFFins'].between(1, 4).all() and params['VDD'].between(0.1, 0.9).all()
+    np.testing.assert_array_equal(from_unit(to_unit(params, space), space), params)
+
+
+def test_pareto_front_is_not_dominated():
+    df = pd.DataFrame({'Frequency': [1e9, 2e9, 1.5e9, 3e9, 2e9, 0.0],
+                       'Energy_Per_Spike': [1e-16, 2e-16, 3e-16, 4e-16, 1.5e-16, 0.0]})
+    front = pareto_front(df)
+    assert list(front['Frequency']) == [1e9, 2e9, 3e9]
+    assert list(front['Energy_Per_Spike']) == [1e-16, 1.5e-16, 4e-16]
+
+
+@pytest.mark.parametrize('name', ['besrour', 'danneville'])
+def test_propose_batch_on_the_seed_tables(name):
+    design = get_design(name)
+    space = search_space(design)
+    history = load_warm_start(name)
+    assert len(history) > 1000
+    batch = propose_batch(history, space, 4, np.random.default_rng(0), n_candidates=256,
+                          max_training=80)
+    columns = [s[0] for s in space]
+    assert list(batch.columns) == columns
+    assert len(batch.drop_duplicates()) == 4
+    assert history[columns].merge(batch, on=columns).empty
+    for column, low, high, _ in space:
+        assert batch[column].between(low, high).all()
+
+
+def test_optimize_with_the_stub(tmp_path):
+    columns = parameter_columns(get_design('danneville'))
+    history, front = optimize('danneville', iterations=1, batch_size=2, seed=0,
+                              simulator=STUB_SIMULATOR, workers=2, work_dir=str(tmp_path))
+    new = history[history['Iteration'] == 1]
+    assert len(new) == 2
+    assert new[columns + ['Spikes', 'Frequency', 'Energy_Per_Spike']].notna().all().all()
+    assert len(front) and (front['Energy_Per_Spike'] > 0).all()
+    assert len(front.merge(history, on=list(front.columns))) == len(front)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from neuronsim.rawfile import RawFile, read_raw, write_raw
+
+VECTORS = {
+    'time': np.linspace(0, 1e-9, 5),
+    'v(net4)': np.array([0.0, 0.1, 0.5, 0.2, 0.0]),
+    'i(vvdd)': np.array([-1e-6, -2e-6, -3e-6, -2e-6, -1e-6]),
+}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'wave.raw')
+    write_raw(path, VECTORS)
+    vectors = read_raw(path)
+    assert list(vectors) == list(VECTORS)
+    for name, values in VECTORS.items():
+        np.testing.assert_array_equal(vectors[name], values)
+    assert list(read_raw(path, ['V(NET4)'])) == ['v(net4)']
+
+
+def test_views_outlive_the_file(tmp_path):
+    path = str(tmp_path / 'wave.raw')
+    write_raw(path, VECTORS)
+    with RawFile(path) as raw:
+        views = raw.vectors(['time', 'v(net4)'])
+    raw.close()
+    np.testing.assert_array_equal(views['v(net4)'], VECTORS['v(net4)'])
+    assert float(views['time'].sum()) == pytest.approx(VECTORS['time'].sum())
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / 'wave.raw'
+    write_raw(str(path), VECTORS)
+    path.write_bytes(path.read_bytes()[:-12])
+    with pytest.raises(ValueError, match='Truncated'):
+        read_raw(str(path))
+
+
+def test_unknown_vector(tmp_path):
+    path = str(tmp_path / 'wave.raw')
+    write_raw(path, VECTORS)
+    with pytest.raises(KeyError):
+        read_raw(path, ['v(net9)'])
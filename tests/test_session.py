@@ -0,0 +1,52 @@
+import sys
+import time
+
+import pytest
+
+from neuronsim.designs import get_design
+from neuronsim.session import SimulatorSession, run_in_session
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.sweep import DEFAULT_SETTINGS, build_grid, run_sweep
+
+# Answers the startup batch, then prints a line every 0.1 s without ever
+# finishing the next batch
+CHATTY = '''
+import sys, time
+for line in sys.stdin:
+    if line.startswith('echo neuronsim_batch_1_done'):
+        print('neuronsim_batch_1_done', flush=True)
+    elif line.startswith('echo neuronsim_batch_'):
+        while True:
+            print('still running', flush=True)
+            time.sleep(0.1)
+'''
+
+
+def test_session_runs_in_a_directory_with_spaces(tmp_path):
+    cwd = tmp_path / 'besrour optimal'
+    cwd.mkdir()
+    returncode, log = run_in_session('besrour', get_design('besrour'), ['echo done > out.txt'],
+                                     DEFAULT_SETTINGS, str(cwd), simulator=STUB_SIMULATOR)
+    assert returncode == 0, log
+    assert (cwd / 'out.txt').read_text().strip() == 'done'
+
+
+def test_timeout_covers_the_whole_batch(tmp_path):
+    script = tmp_path / 'chatty.py'
+    script.write_text(CHATTY)
+    session = SimulatorSession(get_design('besrour'), DEFAULT_SETTINGS,
+                               simulator=[sys.executable, str(script)], timeout=10)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        session.run(['tran 0.04n 20n'], timeout=0.5)
+    # The deadline plus close()'s 5 s grace period before killing the process
+    assert time.monotonic() - start < 8
+    assert not session.alive
+
+
+def test_session_and_batch_sweeps_agree():
+    points = build_grid('danneville', [0.4, 0.6], [1e-15, 2e-15])
+    batch = run_sweep('danneville', points=points, simulator=STUB_SIMULATOR, workers=1)
+    session = run_sweep('danneville', points=points, simulator=STUB_SIMULATOR, workers=1,
+                        settings={'backend': 'session'})
+    assert session.equals(batch)
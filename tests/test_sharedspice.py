@@ -0,0 +1,114 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from neuronsim import sharedspice
+from neuronsim.designs import get_design
+from neuronsim.sharedspice import NgSpice, find_library, simulate_points
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.spice import parse_spice_number
+from neuronsim.stubsim import StubSimulator
+from neuronsim.sweep import DEFAULT_SETTINGS, build_grid, extract_point, run_sweep
+from neuronsim.waveforms import normalize_vector_name
+
+POINTS = build_grid('besrour', [0.5, 0.6], [1e-15, 2e-15])
+
+
+class StubNgSpice(NgSpice):
+    """
+    NgSpice with the library calls answered by the stub simulator.
+    """
+
+    def __init__(self):
+        self.output = []
+        self.exited = None
+        self.simulator = None
+        self.circuits = 0
+
+    def command(self, line):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.simulator.execute(line)
+        self.output.extend(stdout.getvalue().splitlines())
+        return stdout.getvalue()
+
+    def load_circuit(self, lines):
+        self.simulator = StubSimulator('\n'.join(lines))
+        self.circuits += 1
+
+    def vector(self, name):
+        if self.simulator.waveforms is None:
+            raise KeyError(name)
+        if name == 'time':
+            return self.simulator.waveforms[1]
+        return self.simulator._vectors([name])[name.lower()]
+
+    def vectors(self, names):
+        return {normalize_vector_name(n): self.vector(n) for n in names}
+
+
+@pytest.fixture
+def stub_ngspice(monkeypatch):
+    ngspice = StubNgSpice()
+    monkeypatch.setattr(sharedspice, '_instance', ngspice)
+    return ngspice
+
+
+def test_find_library_prefers_the_environment(monkeypatch):
+    monkeypatch.setenv('NGSPICE_LIBRARY', '/opt/ngspice/lib/libngspice.so')
+    assert find_library() == '/opt/ngspice/lib/libngspice.so'
+
+
+def test_missing_library_raises_oserror(monkeypatch):
+    monkeypatch.delenv('NGSPICE_LIBRARY', raising=False)
+    monkeypatch.setattr(sharedspice.ctypes.util, 'find_library', lambda name: None)
+    with pytest.raises(OSError, match='NGSPICE_LIBRARY'):
+        NgSpice()
+
+
+def test_send_char_strips_the_stream_prefix():
+    ngspice = NgSpice.__new__(NgSpice)
+    ngspice.output = []
+    ngspice._send_char(b'stdout Reference value : 1.0', 0, None)
+    ngspice._send_char(b'stderr Warning: singular matrix', 0, None)
+    ngspice._send_char(b'plain', 0, None)
+    assert ngspice.output == ['Reference value : 1.0', 'Warning: singular matrix', 'plain']
+
+
+def test_shared_points_match_the_batch_sweep(tmp_path, stub_ngspice):
+    design = get_design('besrour')
+    settings = dict(DEFAULT_SETTINGS)
+    vectors, log = simulate_points(design, POINTS, settings)
+    assert len(vectors) == len(POINTS) and all(v is not None for v in vectors)
+    assert stub_ngspice.output == []
+
+    tstop = parse_spice_number(settings['tstop'])
+    shared = [extract_point(v, design, p, tstop)[0] for v, p in zip(vectors, POINTS)]
+    batch = run_sweep('besrour', POINTS, workers=1, chunk_size=len(POINTS),
+                      simulator=STUB_SIMULATOR,
+                      settings={'extraction': 'numpy', 'integration': 'trapezoid'})
+    np.testing.assert_allclose(np.array(shared),
+                               batch[['Spikes', 'Frequency', 'Energy_Per_Spike']].to_numpy(),
+                               rtol=1e-6, atol=0)
+
+    # The circuit is loaded once per circuit key
+    simulate_points(design, POINTS[:1], settings)
+    assert stub_ngspice.circuits == 1
+    simulate_points(design, POINTS[:1], dict(settings, nffins=settings['nffins'] + 1))
+    assert stub_ngspice.circuits == 2
+
+
+def test_failed_point_is_none(stub_ngspice, monkeypatch):
+    design = get_design('besrour')
+    vector = StubNgSpice.vector
+
+    def fail_second(self, name):
+        if self.simulator.devices['vvdd'] == 0.6:
+            raise KeyError(name)
+        return vector(self, name)
+
+    monkeypatch.setattr(StubNgSpice, 'vector', fail_second)
+    vectors, _ = simulate_points(design, POINTS, dict(DEFAULT_SETTINGS))
+    assert [v is None for v in vectors] == [p['VDD'] == 0.6 for p in POINTS]
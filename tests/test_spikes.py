@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from neuronsim.spikes import compare_integration, extract_spikes, extrapolate_spikes
+from neuronsim.stubsim import synthetic_waveforms
+
+# 1 ns steps, 1 mA drawn from a 1 V supply: 1 pJ per nanosecond of spike
+TIME = np.arange(11) * 1e-9
+I_VDD = np.full(11, -1e-3)
+
+
+def test_two_completed_spikes():
+    v_out = np.array([0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 0], dtype=float)
+    result = extract_spikes(TIME, v_out, I_VDD, 1.0)
+    assert result['spikes'] == 2
+    assert result['frequency'] == pytest.approx(2 / 10e-9)
+    np.testing.assert_allclose(result['spike_times'], [2e-9, 6e-9])
+    # Samples 2..4 and 6..8: two 1 ns intervals per spike
+    assert result['energy_per_spike'] == pytest.approx(2e-12)
+
+
+def test_legacy_counts_every_sample_of_a_spike():
+    v_out = np.array([0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 0], dtype=float)
+    result = extract_spikes(TIME, v_out, I_VDD, 1.0, integration='legacy')
+    # Three samples per spike times time[1] - time[0]
+    assert result['energy_per_spike'] == pytest.approx(3e-12)
+
+
+def test_spike_in_flight_counts_without_energy():
+    v_out = np.array([0, 0, 1, 1, 0, 0, 1, 1, 1, 1, 1], dtype=float)
+    result = extract_spikes(TIME, v_out, I_VDD, 1.0)
+    assert result['spikes'] == 2
+    # Only the first spike has ended: 2 pJ shared over both starts
+    assert result['energy_per_spike'] == pytest.approx(1e-12)
+
+
+def test_hysteresis_holds_between_thresholds():
+    # 0.1 V lies between the 0.05 V reset and 0.2 V set thresholds
+    v_out = np.array([0, 0, 1, 0.1, 1, 0.01, 0, 0, 0, 0, 0])
+    result = extract_spikes(TIME, v_out, I_VDD, 1.0)
+    assert result['spikes'] == 1
+    assert result['energy_per_spike'] == pytest.approx(3e-12)
+
+
+def test_trapezoid_follows_adaptive_steps():
+    time = np.array([0, 2, 3, 4, 6, 7]) * 1e-9
+    v_out = np.array([0, 1, 1, 0, 0, 0], dtype=float)
+    i_vdd = np.full(6, -1e-3)
+    trapezoid = extract_spikes(time, v_out, i_vdd, 1.0)
+    legacy = extract_spikes(time, v_out, i_vdd, 1.0, integration='legacy')
+    assert trapezoid['energy_per_spike'] == pytest.approx(2e-12)
+    assert legacy['energy_per_spike'] == pytest.approx(6e-12)
+
+
+def test_unknown_integration():
+    with pytest.raises(ValueError):
+        extract_spikes(TIME, np.zeros(11), I_VDD, 1.0, integration='midpoint')
+
+
+@pytest.mark.parametrize('integration', ['trapezoid', 'simpson', 'rectangle', 'legacy'])
+def test_per_spike_energies_add_up_to_the_total(integration):
+    time = np.array([0, 1, 1.5, 2, 3, 4, 5, 5.2, 6, 7, 8, 9]) * 1e-9
+    v_out = np.array([0, 1, 1, 1, 0, 0, 1, 1, 1, 0, 0, 0], dtype=float)
+    i_vdd = -np.linspace(1e-3, 2e-3, len(time))
+    result = extract_spikes(time, v_out, i_vdd, 1.0, integration=integration, per_spike=True)
+    assert len(result['spike_energies']) == 2
+    assert np.sum(result['spike_energies']) == pytest.approx(2 * result['energy_per_spike'], rel=1e-12, abs=0)
+
+
+@pytest.mark.parametrize('integration', ['trapezoid', 'simpson', 'rectangle', 'legacy'])
+def test_extrapolation_matches_the_full_run(integration):
+    tstop, segment = 100e-9, 20e-9
+    stub = synthetic_waveforms(0.5, 2e-16, 1e-7, 0.01e-9, tstop)
+    # Alternating 0.02 ns and 0.06 ns steps, which the legacy rule gets wrong
+    time = np.concatenate(([0.0], np.cumsum(np.tile([0.02e-9, 0.06e-9], 1250))))
+    v_out, i_vdd = (np.interp(time, stub[0], values) for values in stub[1:])
+    full = extract_spikes(time, v_out, i_vdd, 0.5, sim_time=tstop, integration=integration)
+    keep = time <= segment
+    short = extract_spikes(time[keep], v_out[keep], i_vdd[keep], 0.5, sim_time=segment,
+                           integration=integration, per_spike=True)
+    # The stub's spike edges fall on a 4-period cycle of time steps: average over two
+    predicted = extrapolate_spikes(short, tstop, window=8, rtol=0.2)
+    assert predicted is not None
+    assert abs(predicted['spikes'] - full['spikes']) <= 1
+    assert predicted['frequency'] == pytest.approx(full['frequency'], rel=0.02)
+    assert predicted['energy_per_spike'] == pytest.approx(full['energy_per_spike'], rel=0.02, abs=0)
+
+
+def deck_loop(v_out, power, dt, vth, low_th):
+    # The dowhile loop of the *Optimal.sch decks, sample by sample
+    count, last_state, spike_energy, current = 0, 0, 0.0, 0.0
+    for i in range(len(v_out) - 1):
+        if v_out[i] > vth and last_state == 0:
+            count += 1
+            last_state = 1
+            current = 0.0
+        if last_state == 1:
+            current += power[i] * dt
+        if v_out[i] < low_th:
+            if last_state == 1:
+                spike_energy += current
+            last_state = 0
+    return count, spike_energy / count if count else 0.0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorized_extraction_matches_the_deck_loop(seed):
+    rng = np.random.default_rng(seed)
+    time = np.arange(2000) * 0.04e-9
+    # Noisy pulses that dwell between the thresholds and end in flight
+    v_out = np.clip(np.repeat(rng.choice([0.0, 0.03, 0.1, 0.5], 200), 10) +
+                    rng.normal(0, 0.02, 2000), 0, None)
+    i_vdd = -rng.uniform(1e-6, 1e-5, 2000)
+    result = extract_spikes(time, v_out, i_vdd, 0.5, integration='legacy')
+    count, energy = deck_loop(v_out, -0.5 * i_vdd, time[1] - time[0], 0.1, 0.025)
+    assert result['spikes'] == count > 0
+    assert result['energy_per_spike'] == pytest.approx(energy, rel=1e-9, abs=0)
+
+
+def test_integration_follows_the_time_vector():
+    # One spike from 1 ns to 3 ns on uneven steps, power rising linearly
+    # then quadratically: p(t) = 1 mW * (t / 1 ns)^2 inside the spike
+    time = np.concatenate((np.linspace(0, 1e-9, 3), np.geomspace(1.01e-9, 3e-9, 60),
+                           np.linspace(3.2e-9, 5e-9, 4)))
+    v_out = np.where((time >= 1e-9) & (time < 3e-9), 1.0, 0.0)
+    i_vdd = -1e-3 * (time / 1e-9) ** 2
+    energies = compare_integration(time, v_out, i_vdd, 1.0)
+    # Integral of the samples from the rising one to the first one below
+    # the low threshold
+    start = np.flatnonzero(v_out)[0]
+    stop = np.flatnonzero(v_out)[-1] + 1
+    exact = 1e-3 * (time[stop] ** 3 - time[start] ** 3) / 3 / 1e-18
+    assert energies['simpson'] == pytest.approx(exact, rel=1e-6, abs=0)
+    assert energies['trapezoid'] == pytest.approx(exact, rel=1e-3, abs=0)
+    assert energies['legacy'] != pytest.approx(exact, rel=0.1, abs=0)
@@ -0,0 +1,69 @@
+import os
+import re
+import shutil
+
+import pytest
+
+from neuronsim.decks import deck_preamble, static_control
+from neuronsim.designs import DESIGNS, SIMULATION_DIR, VDD_VALUES, data_path, get_design
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.spice import parse_spice_number
+from neuronsim.staticpower import compare_static, measure_static
+from neuronsim.sweep import DEFAULT_SETTINGS
+from neuronsim.tables import read_table
+
+
+def schematic_caps(design):
+    with open(os.path.join(SIMULATION_DIR, design['static_schematic'])) as f:
+        text = f.read()
+    return {device: parse_spice_number(value)
+            for device, value in re.findall(r'alter (C\d+) = (\S+)', text)}
+
+
+def deck_caps(control):
+    return {device: parse_spice_number(value)
+            for device, value in (re.fullmatch(r'alter (C\d+) = (\S+)', line).groups()
+                                  for line in control if re.fullmatch(r'alter C\d+ = \S+', line))}
+
+
+@pytest.mark.parametrize('mode', ['dc', 'tran'])
+@pytest.mark.parametrize('name', sorted(DESIGNS))
+def test_static_decks_use_the_schematic_capacitance(name, mode):
+    design = get_design(name)
+    settings = dict(DEFAULT_SETTINGS, static_mode=mode)
+    _, options = deck_preamble(design, settings)
+    control = static_control(design, VDD_VALUES, settings, options)
+    assert deck_caps(control) == schematic_caps(design)
+    if mode == 'dc':
+        assert 'dc Vvdd 0.1 0.9 0.01' in control
+    else:
+        assert sum(line.startswith('tran ') for line in control) == len(VDD_VALUES)
+
+
+def test_danneville_static_cap():
+    design = get_design('danneville')
+    assert design['static_cap'] == 0.125e-15
+    _, options = deck_preamble(design, DEFAULT_SETTINGS)
+    assert 'alter C1 = 1.25e-16' in static_control(design, [0.5], DEFAULT_SETTINGS, options)
+
+
+def test_stub_static_run_covers_the_reference_supplies(tmp_path):
+    design = get_design('danneville')
+    reference = read_table(data_path(design, 'static_file', None))
+    rows, returncode, log = measure_static('danneville', directory=str(tmp_path),
+                                           simulator=STUB_SIMULATOR)
+    assert returncode == 0, log
+    deviations = compare_static(rows, list(zip(reference['VDD'], reference['Static_Power'])))
+    assert [round(row[0], 2) for row in deviations] == list(reference['VDD'].round(2))
+    assert 'alter C1 = 1.25e-16' in open(tmp_path / 'static_dc.cir').read()
+
+
+@pytest.mark.skipif(shutil.which('ngspice') is None, reason='ngspice is not installed')
+def test_danneville_static_power_matches_the_reference(tmp_path):
+    design = get_design('danneville')
+    reference = read_table(data_path(design, 'static_file', None))
+    rows, returncode, log = measure_static('danneville', directory=str(tmp_path))
+    assert returncode == 0, log
+    deviations = compare_static(rows, list(zip(reference['VDD'], reference['Static_Power'])))
+    assert len(deviations) == len(reference)
+    assert max(abs(row[3]) for row in deviations) < 0.05
@@ -0,0 +1,39 @@
+from neuronsim.store import DEFAULT_TEMPERATURE, ResultStore, point_key
+from neuronsim.sweep import DEFAULT_SETTINGS
+
+POINT = {'VDD': 0.5, 'Cap1': 1e-15, 'Cap2': 2e-15}
+
+
+def _key(point=POINT, **settings):
+    return point_key('besrour', point, dict(DEFAULT_SETTINGS, **settings), 'card')
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'sweeps.db')
+    key = _key()
+    with ResultStore(path) as store:
+        store.insert([(key, (3, 1.5e8, 8.5e-16))])
+        store.record_rungs([(key, 'robust')])
+    with ResultStore(path) as store:
+        assert store.lookup([key, _key(dict(POINT, VDD=0.6))]) == {key: (3, 1.5e8, 8.5e-16)}
+        assert store.count('Besrour') == 1
+        assert store.rung_counts() == {('besrour', 'trapezoid'): {'robust': 1}}
+
+
+def test_key_is_stable_across_spellings():
+    assert _key({'VDD': 0.5, 'Cap1': '0.1e-14', 'Cap2': 2e-15}) == _key()
+    assert _key(isyn='100n') == _key(isyn=1e-7)
+    assert _key(temperature=DEFAULT_TEMPERATURE) == _key()
+    assert _key(ladder=None) == _key()
+    assert (_key(solver_options={'gmin': '1e-12', 'itl1': 500}) ==
+            _key(solver_options={'itl1': 500, 'gmin': '1e-12'}))
+
+
+def test_key_separates_settings():
+    keys = {_key(), _key(temperature=25), _key(warm_start=True),
+            _key(segment='5n'), _key(ladder=('fast', 'deck')),
+            _key(solver_options={'gmin': '1e-12'}), _key(extraction='ngspice')}
+    assert len(keys) == 7
+    # The integration column holds the integration rule only
+    assert {key[9] for key in keys} == {'trapezoid', 'legacy'}
+
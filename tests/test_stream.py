@@ -0,0 +1,50 @@
+import pytest
+
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.stream import LiveAnalysis, parse_echo_line, stream_sweep
+from neuronsim.sweep import build_grid, run_sweep
+
+POINTS = build_grid('besrour', [0.4, 0.6], [1e-16, 1e-15])
+
+
+def test_parse_echo_line():
+    line = ('At VDD=0.5 V Cap1=1e-16 F Cap2=2e-16 F Spikes=12 Spikes Freq=6e+08 Hz '
+            'Energy/Spike=3.5e-16 J')
+    assert parse_echo_line(line) == {'VDD': 0.5, 'Cap1': 1e-16, 'Cap2': 2e-16, 'Spikes': 12,
+                                     'Frequency': 6e8, 'Energy_Per_Spike': 3.5e-16}
+    assert parse_echo_line('At VDD=0.5 V Cap1=1e-16 F Spikes=12 Spikes') is None
+    assert parse_echo_line('Doing analysis at TEMP = 27.000000') is None
+
+
+@pytest.mark.parametrize('extraction', ['ngspice', 'numpy'])
+def test_streamed_sweep_matches_the_batch_sweep(extraction):
+    settings = {'extraction': extraction}
+    batch = run_sweep('besrour', points=POINTS, simulator=STUB_SIMULATOR, workers=2,
+                      settings=settings)
+    streamed = stream_sweep('besrour', points=POINTS, simulator=STUB_SIMULATOR, workers=2,
+                            chunk_size=3, settings=settings, refresh_every=2)
+    assert streamed.equals(batch)
+
+
+def test_streamed_results_resume_from_the_store(tmp_path, capsys):
+    store = str(tmp_path / 'sweeps.db')
+    first = stream_sweep('besrour', points=POINTS, simulator=STUB_SIMULATOR, workers=2,
+                         store=store, output=str(tmp_path / 'partial.txt'))
+    assert (tmp_path / 'partial.txt').exists()
+    capsys.readouterr()
+    second = stream_sweep('besrour', points=POINTS, simulator=STUB_SIMULATOR, workers=2,
+                          store=store)
+    assert f'{len(POINTS)} of {len(POINTS)} points already in' in capsys.readouterr().out
+    assert second.equals(first)
+
+
+def test_patience_resolves_a_stable_best_point(capsys):
+    live = LiveAnalysis('besrour', POINTS, refresh_every=1, patience=2)
+    results = [(10, 5e8, 2e-16), (20, 1e9, 1e-16), (0, 0.0, 0.0), (5, 2.5e8, 3e-16),
+               (4, 2e8, 4e-16)]
+    resolved = [live.add(i, values) for i, values in enumerate(results)]
+    # Best from the second point on, unchanged at the next two refreshes
+    assert resolved == [False, False, False, True, True]
+    assert live.best == 1
+    assert len(live.table()) == len(results)
+    assert 'heatmap optimum' in capsys.readouterr().out
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.store import ResultStore
+from neuronsim.stubsim import FAIL_VDD_ENV
+from neuronsim.sweep import build_grid, run_sweep, write_table
+from neuronsim.tables import read_table
+
+POINTS = build_grid('besrour', [0.5, 0.6], [1e-15, 2e-15])
+
+
+def test_run_sweep_on_the_stub(tmp_path, capsys):
+    output = str(tmp_path / 'besrour.txt')
+    store = str(tmp_path / 'sweeps.db')
+    df = run_sweep('besrour', POINTS, workers=2, simulator=STUB_SIMULATOR,
+                   output=output, store=store)
+    assert len(df) == len(POINTS)
+    assert list(df.columns) == ['VDD', 'Cap1', 'Cap2', 'Spikes', 'Frequency',
+                                'Energy_Per_Spike']
+    assert (df['Spikes'] > 0).all()
+    # Larger capacitors slow the neuron down
+    first = df.set_index(['VDD', 'Cap1', 'Cap2'])['Frequency']
+    assert first[0.5, 2e-15, 2e-15] < first[0.5, 1e-15, 1e-15]
+    pd.testing.assert_frame_equal(read_table(output, cache=False), df, check_dtype=False)
+
+    capsys.readouterr()
+    again = run_sweep('besrour', POINTS, workers=2, simulator=STUB_SIMULATOR, store=store)
+    assert f"{len(POINTS)} of {len(POINTS)} points already in" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(again, df)
+
+
+def test_failing_points_retry_on_the_next_rung(tmp_path, monkeypatch):
+    monkeypatch.setenv(FAIL_VDD_ENV, '0.6')
+    store = str(tmp_path / 'sweeps.db')
+    df = run_sweep('besrour', POINTS, workers=1, chunk_size=len(POINTS),
+                   simulator=STUB_SIMULATOR, store=store)
+    assert len(df) == len(POINTS)
+    with ResultStore(store) as results:
+        assert results.rung_counts() == {('besrour', 'trapezoid'): {'deck': 4, 'robust': 4}}
+
+
+def test_failing_points_without_a_ladder_are_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv(FAIL_VDD_ENV, '0.6')
+    df = run_sweep('besrour', POINTS, workers=1, chunk_size=len(POINTS),
+                   simulator=STUB_SIMULATOR, settings={'ladder': ('deck',)})
+    assert sorted(df['VDD'].unique()) == [0.5]
+
+
+def test_write_table_with_missing_values(tmp_path):
+    path = tmp_path / 'table.txt'
+    df = pd.DataFrame({'VDD': [0.5, 0.6], 'Spikes': [3, 0],
+                       'Frequency': [1.5e8, np.nan], 'Energy_Per_Spike': [1 / 3 * 1e-15, np.inf]})
+    write_table(df, str(path))
+    assert path.read_text().splitlines() == [
+        'VDD Spikes Frequency Energy_Per_Spike',
+        '0.5 3 150000000 3.33333333333e-16',
+        '0.6 0 nan inf',
+    ]
@@ -0,0 +1,62 @@
+import os
+
+from neuronsim.tables import cache_path, read_table
+
+TABLE = """VDD Cap1 Cap2 Spikes Frequency Energy_Per_Spike
+0.5 1e-15 1e-15 3 150000000 8.5e-16
+0.6 1e-15 1e-15 2 100000000 1.2e-15
+"""
+
+
+def _write(path, text, mtime_ns=None):
+    path.write_text(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_is_written_and_reused(tmp_path):
+    table = tmp_path / 'sweep.txt'
+    _write(table, TABLE)
+    first = read_table(str(table))
+    assert os.path.exists(cache_path(str(table)))
+    assert read_table(str(table)).equals(first)
+    assert list(first.columns) == TABLE.split('\n')[0].split()
+
+
+def test_changed_source_rebuilds_cache(tmp_path):
+    table = tmp_path / 'sweep.txt'
+    _write(table, TABLE, 1_000_000_000_000_000_000)
+    read_table(str(table))
+    # Same size, new contents and a new mtime
+    _write(table, TABLE.replace('8.5e-16', '9.5e-16'), 1_000_000_001_000_000_000)
+    assert read_table(str(table))['Energy_Per_Spike'][0] == 9.5e-16
+    # A different size is noticed without hashing
+    _write(table, TABLE + '0.7 1e-15 1e-15 1 50000000 2e-15\n')
+    assert len(read_table(str(table))) == 3
+
+
+def test_touched_source_keeps_cache(tmp_path):
+    table = tmp_path / 'sweep.txt'
+    _write(table, TABLE, 1_000_000_000_000_000_000)
+    first = read_table(str(table))
+    _write(table, TABLE, 1_000_000_002_000_000_000)
+    assert read_table(str(table)).equals(first)
+
+
+def test_write_during_parse_is_not_cached_as_current(tmp_path, monkeypatch):
+    from neuronsim import tables
+
+    table = tmp_path / 'sweep.txt'
+    _write(table, TABLE, 1_000_000_000_000_000_000)
+    parse = tables.parse_table
+
+    def parse_then_rewrite(source):
+        df = parse(source)
+        # A sweep rewrites the table while the old contents are being parsed
+        _write(table, TABLE.replace('8.5e-16', '9.5e-16'), 1_000_000_001_000_000_000)
+        return df
+
+    monkeypatch.setattr(tables, 'parse_table', parse_then_rewrite)
+    assert read_table(str(table))['Energy_Per_Spike'][0] == 8.5e-16
+    monkeypatch.setattr(tables, 'parse_table', parse)
+    assert read_table(str(table))['Energy_Per_Spike'][0] == 9.5e-16
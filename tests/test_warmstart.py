@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from neuronsim.decks import write_chunk_deck
+from neuronsim.designs import get_design
+from neuronsim.rawfile import read_raw
+from neuronsim.simulator import STUB_SIMULATOR
+from neuronsim.spice import parse_spice_number
+from neuronsim.stubsim import StubSimulator, synthetic_period
+from neuronsim.sweep import DEFAULT_SETTINGS, build_grid, run_sweep
+
+WARM = dict(DEFAULT_SETTINGS, warm_start=True)
+
+
+@pytest.mark.parametrize('name', ['besrour', 'danneville', 'sourikopoulos'])
+def test_chained_point_starts_from_the_previous_phase(name, tmp_path, monkeypatch):
+    design = get_design(name)
+    grid = build_grid(design, [0.6], [1e-16, 3e-16])
+    points = [grid[0], grid[-1]]
+    monkeypatch.chdir(tmp_path)
+    write_chunk_deck(design, points, 'chunk.cir', WARM)
+    StubSimulator(open('chunk.cir').read()).run()
+
+    isyn = parse_spice_number(WARM['isyn'])
+    tstop = parse_spice_number(WARM['tstop'])
+    tstep = parse_spice_number(WARM['tstep'])
+    first, second = (synthetic_period(0.6, sum(p[c] for c in design['capacitors']), isyn)
+                     for p in points)
+    # Phase 0 at the cold start, spikes at phase 0.5
+    expected = (0.5 - tstop / first) % 1.0 * second
+    assert abs(expected - 0.5 * second) > 5 * tstep
+
+    waveform = read_raw('wave00001.raw')
+    v_out = waveform[f"v({design['output_node']})"]
+    rising = np.flatnonzero((v_out[1:] > 0.3) & (v_out[:-1] < 0.3)) + 1
+    assert waveform['time'][rising[0]] == pytest.approx(expected, abs=tstep)
+
+
+def test_warm_and_cold_sweeps_agree(tmp_path):
+    points = build_grid('besrour', [0.5, 0.7], [1e-16, 3e-16])
+    cold = run_sweep('besrour', points, workers=1, simulator=STUB_SIMULATOR)
+    warm = run_sweep('besrour', points, workers=1, chunk_size=len(points),
+                     simulator=STUB_SIMULATOR, settings={'warm_start': True})
+    tstop = parse_spice_number(DEFAULT_SETTINGS['tstop'])
+    isyn = parse_spice_number(DEFAULT_SETTINGS['isyn'])
+    for (_, c), (_, w) in zip(cold.iterrows(), warm.iterrows()):
+        assert abs(w['Spikes'] - c['Spikes']) <= 1
+        # The cold frequency is a whole number of spikes over tstop
+        assert abs(w['Frequency'] - c['Frequency']) <= 1 / tstop
+        period = synthetic_period(w['VDD'], w['Cap1'] + w['Cap2'], isyn)
+        assert w['Frequency'] == pytest.approx(1 / period, rel=0.03)
+        assert w['Energy_Per_Spike'] == pytest.approx(c['Energy_Per_Spike'], rel=0.15, abs=0)